@@ -1,5 +1,6 @@
 """Модуль авторизации администратора в sqladmin."""
-from typing import Self
+import time
+from typing import Any, Self
 
 from sqladmin.authentication import AuthenticationBackend
 from starlette.requests import Request
@@ -8,6 +9,7 @@ from starlette.responses import RedirectResponse
 from app.core.config import get_admin_settings
 from app.core.exceptions.results import Err
 from app.core.meta import Session
+from app.db.mixins.permissions import PermissionModeEnum
 from app.db.repositories.admins import AdminRepository
 from app.services import auth
 
@@ -15,7 +17,22 @@ admin_settings = get_admin_settings()
 
 
 class AdminAuthBackend(AuthenticationBackend):
-    """Backend для авторизации администратора в админ-панели."""
+    """Backend для авторизации администратора в админ-панели.
+
+    Parameters
+    ----------
+    secret_key
+        секретный ключ сессии.
+    check_ttl
+        сколько секунд подтвержденное существование администратора не проверяется повторно
+        (Default: ``0`` - проверять при каждом запросе).
+    """
+
+    def __init__(self: Self, secret_key: str, *, check_ttl: float = 0) -> None:
+        """Экземпляр backend'а авторизации."""
+        super().__init__(secret_key=secret_key)
+        self.check_ttl = check_ttl
+        self._checked_until: dict[Any, float] = {}
 
     async def login(self: Self, request: Request) -> bool:
         """Метод входа администратора в админ-панель."""
@@ -41,29 +58,65 @@ class AdminAuthBackend(AuthenticationBackend):
         request.session.clear()
         return True
 
-    async def authenticate(self: Self, request: Request) -> RedirectResponse | None:
-        """Метод проверки токена администратора для предоставления доступа к админ-панели."""
-        token = request.session.get("token")
+    def get_token_user_id(self: Self, request: Request) -> Any | None:  # noqa: ANN401
+        """Возвращает идентификатор администратора из токена сессии (``None`` - токена нет).
 
+        Токен только проверяется: в базу данных запрос не отправляется, новый токен не выдается и
+        сессия не меняется.
+        """
+        token = request.session.get("token")
         if not token:
-            return RedirectResponse(request.url_for("admin:login"), status_code=302)
-
+            return None
         result = auth.decode_jwt_token(token, is_refresh_token=True)
         if isinstance(result, Err):
-            # TODO: сделать что-то для того, чтобы было понятно, что это ошибка токена
-            return RedirectResponse(request.url_for("admin:login"), status_code=302)
-        decoded = result.unwrap()
-        if 'user_id' not in decoded:
-            # TODO: сделать что-то для того, чтобы было понятно, что это ошибка токена
-            return RedirectResponse(request.url_for("admin:login"), status_code=302)
+            return None
+        return result.unwrap().get('user_id')
+
+    async def admin_exists(self: Self, user_id: Any) -> bool:  # noqa: ANN401
+        """Существует ли администратор (результат запоминается на ``check_ttl`` секунд)."""
+        now = time.monotonic()
+        if self._checked_until.get(user_id, 0) > now:
+            return True
         async with Session() as session:
             repo = AdminRepository(session)
-            admin = await repo.get(item_identity=decoded['user_id'], ignore_permissions=True)
+            admin = await repo.get(item_identity=user_id, ignore_permissions=True)
         if not admin:
+            self._checked_until.pop(user_id, None)
+            return False
+        if self.check_ttl > 0:
+            self._checked_until[user_id] = now + self.check_ttl
+        return True
+
+    async def authenticate(self: Self, request: Request) -> RedirectResponse | None:
+        """Метод проверки токена администратора для предоставления доступа к админ-панели."""
+        user_id = self.get_token_user_id(request)
+        if user_id is None or not await self.admin_exists(user_id):
             # TODO: сделать что-то для того, чтобы было понятно, что это ошибка токена
             return RedirectResponse(request.url_for("admin:login"), status_code=302)
-        new_token = auth.encode_jwt_token(admin.id, is_admin=True, is_refresh_token=True)
+        new_token = auth.encode_jwt_token(user_id, is_admin=True, is_refresh_token=True)
         request.session.update({"token": new_token})
 
+    async def get_principal(self: Self, request: Request) -> str | None:
+        """Идентификатор администратора для ETag страниц (``None`` - администратор не вошел)."""
+        user_id = self.get_token_user_id(request)
+        if user_id is None:
+            return None
+        return f'admin:{user_id}'
+
+    async def get_permission_mode(self: Self, request: Request) -> PermissionModeEnum | None:
+        """Режим доступа к админ-панели: ``ADMIN`` для администратора, иначе ``None``.
+
+        Выполняет полную проверку (``authenticate``): ответ из кэша отдается без обработчиков
+        админ-панели, поэтому существование администратора проверяется здесь, а новый токен
+        записывается в сессию запроса. Повторная проверка в обработчике при промахе кэша
+        использует запомненный результат (``check_ttl``).
+        """
+        if await self.authenticate(request) is not None:
+            return None
+        return PermissionModeEnum.ADMIN
+
 
-authentication_backend = AdminAuthBackend(secret_key=admin_settings.secret_key.get_secret_value())
+authentication_backend = AdminAuthBackend(
+    secret_key=admin_settings.secret_key.get_secret_value(),
+    check_ttl=admin_settings.auth_check_ttl,
+)
@@ -0,0 +1,26 @@
+"""Модуль базовой страницы (view) админ-панели."""
+from typing import TYPE_CHECKING, Any
+
+from sqladmin import ModelView
+
+from app.core.cache import bump_table_versions
+
+if TYPE_CHECKING:
+    from app.core.models.tables.base import Base
+
+
+class BaseAdminView(ModelView):
+    """Базовая страница модели: изменение записи сбрасывает кэш ответов по таблице модели."""
+
+    async def after_model_change(
+        self: 'BaseAdminView',
+        data: dict[str, Any],
+        model: 'Base',
+        is_created: bool,  # noqa: FBT001
+    ) -> None:
+        """Увеличивает версию таблицы модели после создания или изменения записи."""
+        bump_table_versions(self.model.__table__.name)
+
+    async def after_model_delete(self: 'BaseAdminView', model: 'Base') -> None:
+        """Увеличивает версию таблицы модели после удаления записи."""
+        bump_table_versions(self.model.__table__.name)
@@ -1,15 +1,17 @@
 """Модуль страниц (views) списков просмотра в админ-панели."""
 import wtforms  # type: ignore
-from sqladmin import ModelView
 
+from app.admin.views.base import BaseAdminView
 from app.core.models.tables.watch_list import Anime, Kinopoisk
+from app.db.repositories.watch_list import AnimeRepository, KinopoiskRepository
 from app.utils.admin import enum_field_verbose
 
 
-class AnimeAdminView(ModelView, model=Anime):
+class AnimeAdminView(BaseAdminView, model=Anime):
     """Страница просмотренного аниме."""
 
     icon = 'fa-solid fa-wheelchair-move'
+    repository_class = AnimeRepository
     can_create = False
     can_edit = True
     can_delete = False
@@ -39,10 +41,11 @@ class AnimeAdminView(ModelView, model=Anime):
     ]
 
 
-class KinopoiskAdminView(ModelView, model=Kinopoisk):
+class KinopoiskAdminView(BaseAdminView, model=Kinopoisk):
     """Страница просмотренного элементов кинопоиска."""
 
     icon = 'fa solid fa-film'
+    repository_class = KinopoiskRepository
     can_create = False
     can_edit = True
     can_delete = False
@@ -1,5 +1,5 @@
 """Модуль фундаментальных core-элементов проекта.
 
-Содержит модули конфига и метаданных sqlalchemy, а также пакеты для работы с исключениями, моделями,
-схемами и настройками проекта.
+Содержит модули конфига и метаданных sqlalchemy, а также пакеты для работы с исключениями,
+middleware, моделями, схемами и настройками проекта.
 """
@@ -0,0 +1,438 @@
+"""Модуль кэша ответов с инвалидацией по версиям таблиц.
+
+Каждая запись кэша хранит версии таблиц (``TableVersions``), из которых она построена. Запись
+годится, пока версии не изменились: методы записи ``BaseRepository`` (и сохранение в админ-панели)
+увеличивают версию таблицы после фиксации транзакции, и все записи кэша с этой таблицей
+становятся недействительными без перебора ключей.
+
+Кэш (``ResponseCache``):
+
+* свежая запись (моложе ``ttl``) отдается сразу;
+* устаревшая, но не старше ``ttl + stale_ttl``, тоже отдается сразу, а в фоне строится новая
+  (stale-while-revalidate);
+* при промахе значение строится один раз: одновременные запросы того же ключа ждут результат
+  первого (объединение запросов), поэтому промах по горячему ключу - один запрос к базе данных.
+
+Хранилище - ``MemoryCacheBackend`` (LRU в памяти процесса) или ``RedisCacheBackend``
+(Redis-совместимый сервер, пакет ``redis`` - необязательная зависимость). Версии таблиц хранятся
+там же: с хранилищем в памяти инвалидация видна только процессу, который изменил данные (другие
+воркеры увидят изменения через ``ttl + stale_ttl``), с Redis - всем воркерам.
+
+Независимо от кэша ответов процесс считает поколения записи таблиц (``get_write_generations``):
+поколение увеличивается сразу после фиксации изменений таблицы в этом процессе. Ими пользуется
+объединение запросов чтения репозиториев: запрос после фиксации не получает результат более
+раннего запроса.
+"""
+import asyncio
+import collections
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_logger
+from app.core.metrics import Counter, registry
+from app.core.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = get_logger('app')
+RESPONSE_CACHE_REQUESTS: Counter = registry.register(
+    Counter(
+        'response_cache_requests_total',
+        'Количество обращений к кэшу ответов по результату.',
+        ('result',),
+    ),
+)
+REDIS_NOT_INSTALLED_MESSAGE = 'Для кэша в Redis установите пакет redis: poetry install -E redis.'
+VERSION_KEY_PREFIX = 'table-version:'
+CHANGED_TABLES_KEY = 'cache_changed_tables'
+write_generations: collections.Counter[str] = collections.Counter()
+
+
+class CacheBackend(Protocol):
+    """Хранилище кэша."""
+
+    async def get(self: 'CacheBackend', key: str) -> bytes | None:
+        """Возвращает значение по ключу."""
+        ...
+
+    async def get_many(self: 'CacheBackend', keys: Sequence[str]) -> list[bytes | None]:
+        """Возвращает значения по ключам."""
+        ...
+
+    async def set(self: 'CacheBackend', key: str, value: bytes, ttl: float) -> None:  # noqa: A003
+        """Сохраняет значение на ``ttl`` секунд."""
+        ...
+
+    async def incr(self: 'CacheBackend', key: str) -> int:
+        """Увеличивает счетчик по ключу на 1 и возвращает новое значение."""
+        ...
+
+
+class MemoryCacheBackend:
+    """Хранилище кэша в памяти процесса: LRU на ``max_size`` значений.
+
+    Счетчики (``incr``) хранятся отдельно и не вытесняются.
+    """
+
+    def __init__(self: 'MemoryCacheBackend', max_size: int = 1024) -> None:
+        """Экземпляр хранилища на ``max_size`` значений."""
+        if max_size <= 0:
+            msg = 'max_size кэша должен быть больше 0.'
+            raise ValueError(msg)
+        self.max_size = max_size
+        self._values: collections.OrderedDict[str, tuple[float, bytes]] = collections.OrderedDict()
+        self._counters: dict[str, int] = {}
+
+    def __len__(self: 'MemoryCacheBackend') -> int:
+        """Количество значений в хранилище."""
+        return len(self._values)
+
+    def get_nowait(self: 'MemoryCacheBackend', key: str) -> bytes | None:
+        """Возвращает значение по ключу (синхронно)."""
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        item = self._values.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def get(self: 'MemoryCacheBackend', key: str) -> bytes | None:
+        """Возвращает значение по ключу."""
+        return self.get_nowait(key)
+
+    async def get_many(self: 'MemoryCacheBackend', keys: Sequence[str]) -> list[bytes | None]:
+        """Возвращает значения по ключам."""
+        return [self.get_nowait(key) for key in keys]
+
+    async def set(  # noqa: A003
+        self: 'MemoryCacheBackend',
+        key: str,
+        value: bytes,
+        ttl: float,
+    ) -> None:
+        """Сохраняет значение на ``ttl`` секунд, вытесняя самые давно использованные."""
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def incr_nowait(self: 'MemoryCacheBackend', key: str) -> int:
+        """Увеличивает счетчик по ключу на 1 (синхронно)."""
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def incr(self: 'MemoryCacheBackend', key: str) -> int:
+        """Увеличивает счетчик по ключу на 1 и возвращает новое значение."""
+        return self.incr_nowait(key)
+
+
+class RedisCacheBackend:
+    """Хранилище кэша в Redis-совместимом сервере.
+
+    Parameters
+    ----------
+    client
+        асинхронный клиент (``redis.asyncio.Redis`` или совместимый).
+    prefix
+        префикс ключей (Default: ``'my-site:'``).
+    """
+
+    def __init__(
+        self: 'RedisCacheBackend',
+        client: Any,  # noqa: ANN401
+        prefix: str = 'my-site:',
+    ) -> None:
+        """Экземпляр хранилища."""
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls: type['RedisCacheBackend'], url: str) -> 'RedisCacheBackend':
+        """Создает хранилище по адресу сервера (``redis://host:6379/0``).
+
+        Raises
+        ------
+        RuntimeError
+            если пакет ``redis`` не установлен.
+        """
+        try:
+            from redis import asyncio as redis_asyncio  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError(REDIS_NOT_INSTALLED_MESSAGE) from exc
+        return cls(redis_asyncio.from_url(url))
+
+    async def get(self: 'RedisCacheBackend', key: str) -> bytes | None:
+        """Возвращает значение по ключу."""
+        return await self.client.get(self.prefix + key)
+
+    async def get_many(self: 'RedisCacheBackend', keys: Sequence[str]) -> list[bytes | None]:
+        """Возвращает значения по ключам."""
+        if not keys:
+            return []
+        return await self.client.mget([self.prefix + key for key in keys])
+
+    async def set(  # noqa: A003
+        self: 'RedisCacheBackend',
+        key: str,
+        value: bytes,
+        ttl: float,
+    ) -> None:
+        """Сохраняет значение на ``ttl`` секунд."""
+        await self.client.set(self.prefix + key, value, px=max(int(ttl * 1000), 1))
+
+    async def incr(self: 'RedisCacheBackend', key: str) -> int:
+        """Увеличивает счетчик по ключу на 1 и возвращает новое значение."""
+        return await self.client.incr(self.prefix + key)
+
+
+class TableVersions:
+    """Версии таблиц в хранилище кэша.
+
+    Версия таблицы увеличивается при изменении ее данных; записи кэша сравнивают сохраненные версии
+    с текущими.
+    """
+
+    def __init__(self: 'TableVersions', backend: CacheBackend) -> None:
+        """Экземпляр версий таблиц в хранилище ``backend``."""
+        self.backend = backend
+        self._pending: set[asyncio.Task[Any]] = set()
+
+    async def get(self: 'TableVersions', tables: Sequence[str]) -> tuple[int, ...]:
+        """Возвращает текущие версии таблиц."""
+        values = await self.backend.get_many([VERSION_KEY_PREFIX + table for table in tables])
+        return tuple(int(value) if value is not None else 0 for value in values)
+
+    async def bump(self: 'TableVersions', table: str) -> None:
+        """Увеличивает версию таблицы."""
+        await self.backend.incr(VERSION_KEY_PREFIX + table)
+
+    def bump_nowait(self: 'TableVersions', tables: Iterable[str]) -> None:
+        """Увеличивает версии таблиц из синхронного кода.
+
+        Хранилище в памяти обновляется сразу, для остальных увеличение выполняется задачей event
+        loop'а (без event loop'а - не выполняется).
+        """
+        for table in tables:
+            key = VERSION_KEY_PREFIX + table
+            if isinstance(self.backend, MemoryCacheBackend):
+                self.backend.incr_nowait(key)
+                continue
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logger.warning('CACHE W1: версия таблицы "%s" не увеличена: нет event loop.', table)
+                continue
+            task = loop.create_task(self.backend.incr(key))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    """Запись кэша.
+
+    Attributes
+    ----------
+    versions
+        версии таблиц, из которых построено значение.
+    created_at
+        время создания записи (unix-время).
+    value
+        значение.
+    """
+
+    versions: tuple[int, ...]
+    created_at: float
+    value: bytes
+
+    def dump(self: 'CacheEntry') -> bytes:
+        """Сериализует запись: заголовок JSON, перевод строки и значение."""
+        header = orjson.dumps({'versions': self.versions, 'created_at': self.created_at})
+        return header + b'\n' + self.value
+
+    @classmethod
+    def load(cls: type['CacheEntry'], data: bytes) -> 'CacheEntry':
+        """Восстанавливает запись."""
+        header, _, value = data.partition(b'\n')
+        content = orjson.loads(header)
+        return cls(
+            versions=tuple(content['versions']),
+            created_at=content['created_at'],
+            value=value,
+        )
+
+
+class ResponseCache:
+    """Кэш значений с инвалидацией по версиям таблиц, stale-while-revalidate и объединением.
+
+    Parameters
+    ----------
+    backend
+        хранилище кэша.
+    ttl
+        время жизни свежей записи в секундах.
+    stale_ttl
+        сколько секунд после ``ttl`` запись отдается, пока в фоне строится новая.
+    clock
+        функция текущего времени (Default: ``time.time``; время записи сравнивается между
+        процессами, поэтому не ``time.monotonic``).
+    """
+
+    def __init__(
+        self: 'ResponseCache',
+        backend: CacheBackend,
+        *,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Экземпляр кэша."""
+        if ttl <= 0 or stale_ttl < 0:
+            msg = 'ttl кэша должен быть больше 0, а stale_ttl - не меньше 0.'
+            raise ValueError(msg)
+        self.backend = backend
+        self.versions = TableVersions(backend)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self._flight: SingleFlight[bytes | None] = SingleFlight('response_cache')
+        self._background: set[asyncio.Task[Any]] = set()
+
+    async def get_or_set(
+        self: 'ResponseCache',
+        key: str,
+        tables: Sequence[str],
+        compute: Callable[[], Awaitable[bytes | None]],
+    ) -> bytes | None:
+        """Возвращает значение из кэша или строит его функцией ``compute``.
+
+        ``compute`` возвращает ``None``, если значение нельзя кэшировать (например, ответ с
+        ошибкой); тогда ``None`` возвращается и ожидавшим результат запросам - они строят значение
+        сами. Построение значения объединяется только у запросов с одинаковыми версиями таблиц:
+        запрос, прочитавший версии после изменения данных, не получит значение, построенное до него.
+        """
+        versions = await self.versions.get(tables)
+        data = await self.backend.get(key)
+        entry = CacheEntry.load(data) if data is not None else None
+        if entry is not None and entry.versions == versions:
+            age = self.clock() - entry.created_at
+            if age < self.ttl:
+                RESPONSE_CACHE_REQUESTS.inc('hit')
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                RESPONSE_CACHE_REQUESTS.inc('stale')
+                if (key, versions) not in self._flight:
+                    task = asyncio.create_task(self._revalidate(key, versions, compute))
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+                return entry.value
+        value, shared = await self._flight.do(
+            (key, versions),
+            functools.partial(self._compute, key, versions, compute),
+        )
+        RESPONSE_CACHE_REQUESTS.inc('coalesced' if shared else 'miss')
+        if shared and value is None:
+            return await compute()
+        return value
+
+    async def _compute(
+        self: 'ResponseCache',
+        key: str,
+        versions: tuple[int, ...],
+        compute: Callable[[], Awaitable[bytes | None]],
+    ) -> bytes | None:
+        value = await compute()
+        if value is not None:
+            entry = CacheEntry(versions=versions, created_at=self.clock(), value=value)
+            await self.backend.set(key, entry.dump(), self.ttl + self.stale_ttl)
+        return value
+
+    async def _revalidate(
+        self: 'ResponseCache',
+        key: str,
+        versions: tuple[int, ...],
+        compute: Callable[[], Awaitable[bytes | None]],
+    ) -> None:
+        try:
+            await self._flight.do(
+                (key, versions),
+                functools.partial(self._compute, key, versions, compute),
+            )
+        except Exception:
+            logger.exception('CACHE E1: не удалось обновить значение по ключу "%s".', key)
+
+
+response_cache: ResponseCache | None = None
+
+
+def configure_response_cache(
+    *,
+    url: str | None,
+    ttl: float,
+    stale_ttl: float,
+    max_size: int,
+) -> ResponseCache:
+    """Создает кэш ответов процесса: в Redis по адресу ``url`` или в памяти (``url=None``)."""
+    global response_cache  # noqa: PLW0603
+    backend: CacheBackend = RedisCacheBackend.from_url(url) if url else MemoryCacheBackend(max_size)
+    response_cache = ResponseCache(backend, ttl=ttl, stale_ttl=stale_ttl)
+    return response_cache
+
+
+def mark_table_changed(session: 'AsyncSession', table: str) -> None:
+    """Отмечает изменение данных таблицы в транзакции сессии.
+
+    Версия таблицы увеличивается после фиксации транзакции (при откате - не увеличивается).
+    """
+    session.sync_session.info.setdefault(CHANGED_TABLES_KEY, set()).add(table)
+
+
+def has_uncommitted_changes(session: 'AsyncSession') -> bool:
+    """Есть ли в сессии изменения, еще не зафиксированные в базе данных.
+
+    Учитываются изменения, отмеченные ``mark_table_changed``, и объекты сессии, которые еще не
+    отправлены в базу данных.
+    """
+    return bool(
+        session.sync_session.info.get(CHANGED_TABLES_KEY)
+        or session.new
+        or session.dirty
+        or session.deleted,
+    )
+
+
+def get_write_generations(*tables: str) -> tuple[int, ...]:
+    """Возвращает поколения записи таблиц в процессе (растут после каждой фиксации изменений)."""
+    return tuple(write_generations[table] for table in tables)
+
+
+def bump_table_versions(*tables: str) -> None:
+    """Увеличивает версии таблиц, данные которых уже изменены и зафиксированы."""
+    write_generations.update(tables)
+    if response_cache is not None:
+        response_cache.versions.bump_nowait(tables)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_changed_tables(session: Session) -> None:
+    tables = session.info.pop(CHANGED_TABLES_KEY, None)
+    if tables:
+        bump_table_versions(*tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_tables(session: Session) -> None:
+    session.info.pop(CHANGED_TABLES_KEY, None)
@@ -3,17 +3,32 @@
 Содержит кэшированные функции, возвращающие инициализированные экземпляры `pydantic.BaseSettings`,
 а также другие объекты, подходящие под критерии данного модуля (экземпляр класса для логирования,
 например).
+
+Все группы настроек создаются за один проход (или загружаются из снимка) при первом обращении к
+любой из них - см. ``app.core.settings.loader``.
 """
 import logging
-import logging.config
 from functools import lru_cache
 
+from app.core.logs.bootstrap import configure_logging
 from app.core.settings.admin import AdminSettings
 from app.core.settings.app import AppSettings
 from app.core.settings.auth import AuthSettings
 from app.core.settings.base import PathSettings
 from app.core.settings.db import DatabaseSettings
-from app.core.settings.logger import log_settings
+from app.core.settings.loader import SettingsSnapshot, get_settings_snapshot
+
+
+@lru_cache
+def get_settings() -> SettingsSnapshot:
+    """Функция достает все настройки проекта.
+
+    Returns
+    -------
+    SettingsSnapshot
+        снимок всех групп настроек.
+    """
+    return get_settings_snapshot()
 
 
 @lru_cache
@@ -25,7 +40,7 @@ def get_path_settings() -> PathSettings:
     PathSettings
         настройки путей.
     """
-    return PathSettings()
+    return get_settings().paths
 
 
 @lru_cache
@@ -37,7 +52,7 @@ def get_application_settings() -> AppSettings:
     AppSettings
         настройки приложения.
     """
-    return AppSettings()
+    return get_settings().app
 
 
 @lru_cache
@@ -49,7 +64,7 @@ def get_database_settings() -> DatabaseSettings:
     DatabaseSettings
         настройки базы данных.
     """
-    return DatabaseSettings()
+    return get_settings().db
 
 
 @lru_cache
@@ -61,7 +76,7 @@ def get_admin_settings() -> AdminSettings:
     AdminSettings
         настройки админ-панели.
     """
-    return AdminSettings()
+    return get_settings().admin
 
 
 @lru_cache
@@ -73,13 +88,16 @@ def get_auth_settings() -> AuthSettings:
     AuthSettings
         настройки системы аутентификации.
     """
-    return AuthSettings()
+    return get_settings().auth
 
 
 @lru_cache
 def get_logger(name: str) -> logging.Logger:
     """Возвращает логгер по его имени.
 
+    Логирование настраивается один раз на процесс при первом вызове (см.
+    ``app.core.logs.bootstrap``).
+
     Parameters
     ----------
     name : str
@@ -90,5 +108,5 @@ def get_logger(name: str) -> logging.Logger:
     logging.Logger
         экземпляр логгера.
     """
-    logging.config.dictConfig(log_settings)
+    configure_logging()
     return logging.getLogger(name)
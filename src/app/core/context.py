@@ -0,0 +1,162 @@
+"""Модуль контекстных переменных обработки запроса.
+
+Значения переменных видны во всем коде, выполняемом в рамках одной задачи asyncio (в том числе в
+событиях SQLAlchemy), и не пересекаются между параллельными запросами.
+"""
+import contextlib
+import contextvars
+import functools
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+from sqlalchemy import event
+from starlette.routing import Mount, Route, WebSocketRoute
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.engine import Connection, Engine
+    from starlette.routing import BaseRoute
+    from starlette.types import Scope
+
+P = ParamSpec('P')
+R = TypeVar('R')
+UNMATCHED_ROUTE = '<unmatched>'
+DB_STARTED_AT_KEY = 'request_context_db_started_at'
+
+_route_templates: 'weakref.WeakKeyDictionary[Any, dict[Any, str]]' = weakref.WeakKeyDictionary()
+
+
+@dataclass(slots=True)
+class RequestContext:
+    """Контекст HTTP-запроса.
+
+    Объект изменяемый: время запросов к базе данных накапливается в нем из событий SQLAlchemy,
+    которые выполняются в копии контекста задачи.
+
+    Attributes
+    ----------
+    request_id
+        идентификатор запроса (заголовок ``X-Request-ID`` или сгенерированный).
+    method
+        HTTP-метод.
+    path
+        путь запроса.
+    scope
+        ASGI scope запроса (по нему после маршрутизации определяется шаблон пути маршрута).
+    db_time
+        суммарное время запросов к базе данных в секундах.
+    db_statements
+        количество запросов к базе данных.
+    """
+
+    request_id: str
+    method: str
+    path: str
+    scope: 'Scope' = field(repr=False)
+    db_time: float = 0.0
+    db_statements: int = 0
+
+    @property
+    def route(self: 'RequestContext') -> str:
+        """Шаблон пути маршрута, который обрабатывает запрос."""
+        return get_route(self.scope)
+
+
+request_context: contextvars.ContextVar[RequestContext | None] = contextvars.ContextVar(
+    'request_context',
+    default=None,
+)
+repository_method: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    'repository_method',
+    default=None,
+)
+
+
+def track_repository_method(
+    func: Callable[P, Awaitable[R]],
+) -> Callable[P, Awaitable[R]]:
+    """Декоратор метода репозитория: на время вызова устанавливает ``repository_method``.
+
+    Значение - ``<класс репозитория>.<метод>``, например, ``AnimeRepository.list``.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        self: Any = args[0]
+        token = repository_method.set(f'{type(self).__name__}.{func.__name__}')
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            repository_method.reset(token)
+
+    return wrapper
+
+
+def get_route_templates(routes: 'Sequence[BaseRoute]', prefix: str = '') -> dict[Any, str]:
+    """Возвращает шаблоны путей маршрутов по их обработчикам (``scope['endpoint']``).
+
+    Обработчики, которые нельзя использовать ключом словаря (например, ``Router``), пропускаются.
+    """
+    templates: dict[Any, str] = {}
+    for route in routes:
+        if isinstance(route, Mount):
+            with contextlib.suppress(TypeError):
+                templates.setdefault(route.app, f'{prefix}{route.path}/{{path:path}}')
+            mounted = get_route_templates(route.routes, prefix + route.path)
+            for endpoint, template in mounted.items():
+                templates.setdefault(endpoint, template)
+        elif isinstance(route, Route | WebSocketRoute):
+            with contextlib.suppress(TypeError):
+                templates.setdefault(route.endpoint, f'{prefix}{route.path}')
+    return templates
+
+
+def get_route(scope: 'Scope') -> str:
+    """Возвращает шаблон пути маршрута, который обработал запрос (``/admin/{identity}/list``).
+
+    Шаблоны маршрутов приложения собираются при первом запросе к нему. До маршрутизации и для
+    запросов, не подошедших ни к одному маршруту, возвращается ``<unmatched>``.
+    """
+    endpoint = scope.get('endpoint')
+    app = scope.get('app')
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+    templates = _route_templates.get(app)
+    if templates is None:
+        templates = get_route_templates(getattr(app, 'routes', []))
+        _route_templates[app] = templates
+    try:
+        return templates.get(endpoint, UNMATCHED_ROUTE)
+    except TypeError:
+        return UNMATCHED_ROUTE
+
+
+def _before_cursor_execute(conn: 'Connection', *_: Any) -> None:  # noqa: ANN401
+    if request_context.get() is not None:
+        conn.info[DB_STARTED_AT_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: 'Connection', *_: Any) -> None:  # noqa: ANN401
+    started_at = conn.info.pop(DB_STARTED_AT_KEY, None)
+    context = request_context.get()
+    if started_at is None or context is None:
+        return
+    context.db_time += time.perf_counter() - started_at
+    context.db_statements += 1
+
+
+def install_db_timing(engine: 'Engine') -> None:
+    """Подключает подсчет времени запросов к базе данных в контексте HTTP-запроса.
+
+    Для асинхронного движка передается ``engine.sync_engine``. Повторный вызов ничего не делает.
+    """
+    for name, listener in (
+        ('before_cursor_execute', _before_cursor_execute),
+        ('after_cursor_execute', _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
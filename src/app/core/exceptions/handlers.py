@@ -1,17 +1,28 @@
 """Модуль обработчиков исключений для FastAPI."""
 from typing import TYPE_CHECKING
 
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
 if TYPE_CHECKING:
     from fastapi import Request
 
     from app.core.exceptions.http.base import BaseVerboseHTTPException
 
+JSON_MEDIA_TYPE = 'application/json'
+
 
 async def verbose_http_exception_handler(
     _: 'Request',
     exc: 'BaseVerboseHTTPException',
-) -> JSONResponse:
-    """Обработчик кастомных исключений, выбрасываемых вручную."""
-    return JSONResponse(status_code=exc.status_code, content=exc.as_dict(), headers=exc.headers)
+) -> Response:
+    """Обработчик кастомных исключений, выбрасываемых вручную.
+
+    Тело ответа берется из кэша подготовленных тел (``BaseVerboseHTTPException.as_bytes``) и
+    отправляется без повторной сериализации.
+    """
+    return Response(
+        content=exc.as_bytes(),
+        status_code=exc.status_code,
+        headers=exc.headers,
+        media_type=JSON_MEDIA_TYPE,
+    )
@@ -1,10 +1,14 @@
+import functools
 from string import Template
 from typing import Any, Self, TypedDict
 
+import orjson
 from abstractcp import Abstract, abstract_class_property
 from fastapi import HTTPException, status
 
 ABSTRACT_PROPERTY_DEFAULT_VALUE = '<abstract property>'
+RENDER_CACHE_SIZE = 1024
+CACHED_ARGUMENT_TYPES = (str, int)
 
 
 class VerboseHTTPExceptionDict(TypedDict):
@@ -17,6 +21,57 @@ class VerboseHTTPExceptionDict(TypedDict):
     attr: str | None
 
 
+def _format_template(template: Template | str, mapping: dict[str, object]) -> str:
+    if isinstance(template, Template):
+        return template.safe_substitute(**mapping)
+    return template.format(**mapping)
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _format_template_cached(
+    template: Template | str,
+    items: tuple[tuple[str, str | int], ...],
+) -> str:
+    return _format_template(template, dict(items))
+
+
+def format_template(template: Template | str, mapping: dict[str, object]) -> str:
+    """Заполняет шаблон сообщения исключения.
+
+    Результат для одного шаблона и одинаковых аргументов кэшируется (не больше
+    ``RENDER_CACHE_SIZE`` вариантов). Кэшируются только аргументы типов ``str`` и ``int``: у
+    равных значений других типов строковое представление может различаться (например,
+    ``Decimal('1.0')`` и ``Decimal('1')``, ``0.0`` и ``-0.0``), поэтому они подставляются без кэша.
+    """
+    if not all(type(value) in CACHED_ARGUMENT_TYPES for value in mapping.values()):
+        return _format_template(template, mapping)
+    items = tuple(sorted(mapping.items()))
+    return _format_template_cached(template, items)  # type: ignore[arg-type]
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_body(
+    code: str,
+    type_: str,
+    message: str,
+    loc: str | None,
+    attr: str | None,
+) -> bytes:
+    """Возвращает тело ответа исключения в JSON (тела кэшируются по содержимому).
+
+    Кэш ограничен ``RENDER_CACHE_SIZE`` вариантами: сообщения из аргументов запроса не
+    увеличивают память без ограничений.
+    """
+    content: VerboseHTTPExceptionDict = {
+        'code': code,
+        'type': type_,
+        'message': message,
+        'loc': loc,
+        'attr': attr,
+    }
+    return orjson.dumps(content)
+
+
 class BaseHTTPException(HTTPException):
     """Класс HTTP-исключения со status_code по умолчанию."""
 
@@ -57,10 +112,8 @@ class BaseVerboseHTTPException(BaseHTTPException, Abstract):
             self.message = message
         if template:
             self.template = template
-        if mapping and isinstance(self.template, Template):
-            self.message = self.template.safe_substitute(**mapping)
-        elif mapping and isinstance(self.template, str):
-            self.message = self.template.format(**mapping)
+        if mapping and self.template is not None:
+            self.message = format_template(self.template, mapping)
         self.headers = headers
 
     def _get_attribute(self: Self, name: str) -> Any:  # noqa: ANN401
@@ -108,10 +161,8 @@ class BaseVerboseHTTPException(BaseHTTPException, Abstract):
 
         Если бы шаблон не был определен, то на месте сообщения была бы строка ``'abc'``.
         """
-        if isinstance(self.template, Template):
-            self.message = self.template.safe_substitute(**mapping)
-        elif isinstance(self.template, str):
-            self.message = self.template.format(**mapping)
+        if self.template is not None:
+            self.message = format_template(self.template, mapping)
         return self
 
     def with_attr(self: Self, attr_name: str) -> Self:
@@ -190,3 +241,7 @@ class BaseVerboseHTTPException(BaseHTTPException, Abstract):
             "loc": self.loc,
             "attr": self.attr,
         }
+
+    def as_bytes(self: Self) -> bytes:
+        """Возвращает тело ответа исключения в JSON (см. ``render_body``)."""
+        return render_body(self.code, self.type_, self.message, self.loc, self.attr)
@@ -0,0 +1 @@
+"""Пакет инфраструктуры логирования: очереди, форматтеры, фильтры и настройка логгеров."""
@@ -0,0 +1,128 @@
+"""Модуль однократной настройки логирования процесса.
+
+``logging.config.dictConfig`` закрывает и заново создает все обработчики (и заново открывает
+файлы), поэтому настройки применяются один раз на процесс - при первом вызове
+``configure_logging`` (его делает ``app.core.config.get_logger``). В дочернем процессе после fork
+(например, воркеры gunicorn/uvicorn) обработчики остаются от родителя, а потоки очередей логов
+(``app.core.logs.queues``) запускаются заново.
+
+Уровни логгеров и обработчиков можно перечитать из файла настроек без пересоздания обработчиков:
+``reload_levels`` или сигнал ``SIGHUP`` процессу приложения (см. ``install_reload_signal``).
+"""
+import asyncio
+import contextlib
+import logging
+import logging.config
+import os
+import signal
+import threading
+from collections.abc import Iterator
+from typing import Any
+
+from app.core.logs.queues import get_queue_settings, queue_logging
+from app.core.settings.logger import load_log_settings, log_settings
+
+_lock = threading.Lock()
+_configured = False
+
+
+def configure_logging(settings: dict[str, Any] | None = None, *, force: bool = False) -> None:
+    """Настраивает логирование процесса, если оно еще не настроено.
+
+    Parameters
+    ----------
+    settings
+        настройки ``dictConfig`` (Default: ``None`` - настройки проекта).
+    force
+        применить настройки заново, даже если логирование уже настроено (Default: ``False``).
+    """
+    global _configured  # noqa: PLW0603
+    settings = log_settings if settings is None else settings
+    with _lock:
+        if force or not _configured:
+            queue_logging.stop()
+            logging.config.dictConfig(settings)
+            _configured = True
+        enabled, max_size, drop_policy = get_queue_settings(settings)
+        if enabled and not queue_logging.listeners:
+            queue_logging.start(
+                settings.get('loggers', {}),
+                max_size=max_size,
+                drop_policy=drop_policy,
+            )
+
+
+def is_configured() -> bool:
+    """Настроено ли логирование процесса."""
+    return _configured
+
+
+def iter_handlers() -> Iterator[logging.Handler]:
+    """Возвращает обработчики всех логгеров, включая перенесенные в потоки очередей."""
+    loggers = [logging.getLogger()]
+    loggers.extend(
+        logger
+        for logger in list(logging.Logger.manager.loggerDict.values())
+        if isinstance(logger, logging.Logger)
+    )
+    seen: set[int] = set()
+    handlers = [handler for logger in loggers for handler in logger.handlers]
+    for listener in list(queue_logging.listeners.values()):
+        handlers.extend(listener.handlers)
+    for handler in handlers:
+        if id(handler) not in seen:
+            seen.add(id(handler))
+            yield handler
+
+
+def reload_levels(settings: dict[str, Any] | None = None) -> dict[str, str]:
+    """Применяет уровни логгеров и обработчиков из настроек, не пересоздавая обработчики.
+
+    Parameters
+    ----------
+    settings
+        настройки логирования (Default: ``None`` - настройки перечитываются из файла).
+
+    Returns
+    -------
+    dict[str, str]
+        установленные уровни логгеров (корневой логгер - ``root``).
+    """
+    settings = load_log_settings() if settings is None else settings
+    levels: dict[str, str] = {}
+    for name, logger_settings in settings.get('loggers', {}).items():
+        if 'level' in logger_settings:
+            logging.getLogger(name).setLevel(logger_settings['level'])
+            levels[name] = logger_settings['level']
+    if 'level' in settings.get('root', {}):
+        logging.getLogger().setLevel(settings['root']['level'])
+        levels['root'] = settings['root']['level']
+    handlers_settings = settings.get('handlers', {})
+    for handler in iter_handlers():
+        handler_settings = handlers_settings.get(handler.name, {})
+        if 'level' in handler_settings:
+            handler.setLevel(handler_settings['level'])
+    logging.getLogger('app').info('LOGGING I1: уровни логирования перечитаны: %s.', levels)
+    return levels
+
+
+async def install_reload_signal(signum: int = getattr(signal, 'SIGHUP', 1)) -> None:
+    """Обработчик запуска приложения: ``SIGHUP`` перечитывает уровни логирования.
+
+    Сигнал обрабатывается в event loop'е, а не в обработчике сигнала: так перечитывание не
+    прерывает запись лога, держащую блокировку очереди или обработчика.
+    """
+    loop = asyncio.get_running_loop()
+    with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+        loop.add_signal_handler(signum, reload_levels)
+
+
+def _after_fork_in_child() -> None:
+    global _lock  # noqa: PLW0603
+    _lock = threading.Lock()
+    queue_logging.detach()
+    if _configured:
+        configure_logging()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,182 @@
+"""Модуль фильтров логов.
+
+``RateLimitFilter`` ограничивает частоту повторяющихся сообщений по их коду
+(``CHECK-PERMISSION E2``, ``TOKEN-DECODE E1``): за окно ``period`` секунд пропускаются первые
+``limit`` записей с кодом, а остальные - с вероятностью ``sample_rate``. Подавленные записи
+считаются (метрика ``log_records_suppressed_total``), а по окончании окна в лог пишется запись
+``LOGGING W2`` с их количеством. Сводка пишется при следующей записи через фильтр (любой, не
+только с этим кодом) или при вызове ``flush``.
+
+Фильтр подключается к логгеру в настройках логирования (``static/default_logger_settings.json``)
+и работает в потоке, который пишет лог, - до очереди (``app.core.logs.queues``)::
+
+    "filters": {
+        "rate_limit": {
+            "()": "app.core.logs.filters.RateLimitFilter",
+            "rules": {"CHECK-PERMISSION E2": {"limit": 10, "period": 60, "sample_rate": 0.01}}
+        }
+    }
+
+Правило можно задать и для префикса кода: ``CHECK-PERMISSION`` действует на все коды
+``CHECK-PERMISSION <...>``, если для кода нет собственного правила. Окно считается для каждого кода
+отдельно.
+"""
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from app.core.logs.formatters import get_log_code
+from app.core.metrics import Counter, registry
+
+LOG_RECORDS_SUPPRESSED: Counter = registry.register(
+    Counter(
+        'log_records_suppressed_total',
+        'Количество записей логов, подавленных ограничением частоты.',
+        ('code',),
+    ),
+)
+SUMMARY_MESSAGE = 'LOGGING W2: подавлено похожих сообщений "%s": %s за %.0f с.'
+
+
+class RateLimitRule(NamedTuple):
+    """Правило ограничения частоты сообщений с кодом.
+
+    Attributes
+    ----------
+    limit
+        количество записей, которые пропускаются за окно.
+    period
+        длительность окна в секундах.
+    sample_rate
+        доля пропускаемых записей сверх ``limit`` от ``0`` до ``1`` (Default: ``0``).
+    """
+
+    limit: int
+    period: float
+    sample_rate: float = 0.0
+
+
+@dataclass(slots=True)
+class _Window:
+    started_at: float
+    logger_name: str
+    passed: int = 0
+    suppressed: int = 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Фильтр, ограничивающий частоту записей с одинаковым кодом сообщения.
+
+    Parameters
+    ----------
+    rules
+        правила по кодам сообщений или их префиксам: ``RateLimitRule`` или словари с его полями.
+    clock
+        функция текущего времени в секундах (Default: ``time.monotonic``).
+    """
+
+    def __init__(
+        self: 'RateLimitFilter',
+        rules: dict[str, RateLimitRule | dict[str, Any]] | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Инициализация фильтра."""
+        super().__init__()
+        self.rules: dict[str, RateLimitRule] = {}
+        for code, rule in (rules or {}).items():
+            if isinstance(rule, dict):
+                rule = RateLimitRule(**rule)  # noqa: PLW2901
+            if rule.limit < 0 or rule.period <= 0 or not 0 <= rule.sample_rate <= 1:
+                msg = f'некорректное правило ограничения частоты логов "{code}": {rule}.'
+                raise ValueError(msg)
+            self.rules[code] = rule
+        self.clock = clock
+        self.flush_interval = min((rule.period for rule in self.rules.values()), default=0.0)
+        self._windows: dict[str, _Window] = {}
+        self._next_flush = 0.0
+        self._lock = threading.Lock()
+
+    def get_rule(self: 'RateLimitFilter', code: str) -> RateLimitRule | None:
+        """Возвращает правило для кода сообщения: собственное или правило его префикса."""
+        rule = self.rules.get(code)
+        if rule is None:
+            rule = self.rules.get(code.split(' ', 1)[0])
+        return rule
+
+    def filter(self: 'RateLimitFilter', record: logging.LogRecord) -> bool:  # noqa: A003
+        """Пропускает ли фильтр запись."""
+        if not self.rules:
+            return True
+        now = self.clock()
+        summaries: list[tuple[str, _Window]] = []
+        allowed = True
+        with self._lock:
+            if now >= self._next_flush:
+                self._next_flush = now + self.flush_interval
+                summaries.extend(self._pop_expired(now))
+            code = get_log_code(record.getMessage())
+            rule = self.get_rule(code) if code is not None else None
+            if code is not None and rule is not None:
+                allowed = self._check(code, rule, record, now, summaries)
+        self._emit_summaries(summaries, now)
+        return allowed
+
+    def flush(self: 'RateLimitFilter') -> None:
+        """Пишет сводки по всем окнам с подавленными записями и начинает окна заново."""
+        now = self.clock()
+        with self._lock:
+            summaries = [
+                (code, window) for code, window in self._windows.items() if window.suppressed
+            ]
+            self._windows.clear()
+        self._emit_summaries(summaries, now)
+
+    def _check(
+        self: 'RateLimitFilter',
+        code: str,
+        rule: RateLimitRule,
+        record: logging.LogRecord,
+        now: float,
+        summaries: list[tuple[str, '_Window']],
+    ) -> bool:
+        window = self._windows.get(code)
+        if window is not None and now - window.started_at >= rule.period:
+            if window.suppressed:
+                summaries.append((code, window))
+            window = None
+        if window is None:
+            window = self._windows[code] = _Window(started_at=now, logger_name=record.name)
+        if window.passed < rule.limit:
+            window.passed += 1
+            return True
+        if rule.sample_rate and random.random() < rule.sample_rate:  # noqa: S311
+            return True
+        window.suppressed += 1
+        LOG_RECORDS_SUPPRESSED.inc(code)
+        return False
+
+    def _pop_expired(self: 'RateLimitFilter', now: float) -> list[tuple[str, '_Window']]:
+        expired: list[tuple[str, _Window]] = []
+        for code, window in list(self._windows.items()):
+            rule = self.get_rule(code)
+            if rule is None or now - window.started_at >= rule.period:
+                del self._windows[code]
+                if window.suppressed:
+                    expired.append((code, window))
+        return expired
+
+    @staticmethod
+    def _emit_summaries(summaries: list[tuple[str, '_Window']], now: float) -> None:
+        # NOTE: сводки пишутся вне блокировки: запись снова проходит через фильтр логгера.
+        for code, window in summaries:
+            logging.getLogger(window.logger_name).warning(
+                SUMMARY_MESSAGE,
+                code,
+                window.suppressed,
+                now - window.started_at,
+            )
@@ -0,0 +1,142 @@
+"""Модуль форматтеров логов.
+
+``JSONFormatter`` выводит запись одной JSON-строкой (orjson): время, уровень, логгер, сообщение и
+его код (``CHECK-PERMISSION E2``), место вызова, поля процесса и контекст запроса - идентификатор
+запроса, метод, путь и шаблон маршрута, метод репозитория, время и количество запросов к базе
+данных. Поля процесса (хост, pid) вычисляются один раз на процесс и пересчитываются после fork.
+
+Контекст берется из контекстных переменных ``app.core.context``. Если запись прошла через очередь
+(``app.core.logs.queues``), форматирование выполняется в другом потоке, поэтому используется копия
+контекста, сохраненная в записи при постановке в очередь (атрибут ``context``).
+"""
+import contextvars
+import datetime
+import logging
+import os
+import re
+import socket
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
+
+import orjson
+
+from app.core.context import repository_method, request_context
+
+if TYPE_CHECKING:
+    T = TypeVar('T')
+
+LOG_CODE_PATTERN = re.compile(r'([A-Z][A-Z0-9-]* [A-Z]\d+):')
+STANDARD_RECORD_ATTRIBUTES = frozenset(
+    (*vars(logging.makeLogRecord({})), 'message', 'asctime', 'context', 'taskName'),
+)
+_process_fields: dict[str, Any] | None = None
+
+
+def get_log_code(message: str) -> str | None:
+    """Возвращает код сообщения лога (``'TOKEN-DECODE E1'``), если сообщение с него начинается."""
+    match = LOG_CODE_PATTERN.match(message)
+    return match.group(1) if match else None
+
+
+def get_process_fields() -> dict[str, Any]:
+    """Возвращает поля процесса: имя хоста и pid (вычисляются один раз на процесс)."""
+    global _process_fields  # noqa: PLW0603
+    if _process_fields is None:
+        _process_fields = {'hostname': socket.gethostname(), 'pid': os.getpid()}
+    return _process_fields
+
+
+def _reset_process_fields() -> None:
+    global _process_fields  # noqa: PLW0603
+    _process_fields = None
+
+
+os.register_at_fork(after_in_child=_reset_process_fields)
+
+
+def get_context_value(
+    variable: 'contextvars.ContextVar[T]',
+    context: contextvars.Context | None,
+) -> 'T | None':
+    """Возвращает значение переменной из сохраненной копии контекста или из текущего контекста."""
+    if context is None:
+        return variable.get(None)
+    return context.get(variable)
+
+
+class JSONFormatter(logging.Formatter):
+    """Форматтер записей логов в JSON.
+
+    Parameters
+    ----------
+    fmt, datefmt, style, validate
+        параметры ``logging.Formatter`` (не используются в JSON, оставлены для совместимости с
+        ``logging.config.dictConfig``).
+    static_fields
+        постоянные поля каждой записи, например, ``{"service": "my-site"}`` (Default: ``None``).
+    max_message_length
+        максимальная длина сообщения (Default: ``None`` - без ограничения).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: 'JSONFormatter',
+        fmt: str | None = None,
+        datefmt: str | None = None,
+        style: Literal['%', '{', '$'] = '%',
+        validate: bool = True,  # noqa: FBT001, FBT002
+        *,
+        static_fields: dict[str, Any] | None = None,
+        max_message_length: int | None = None,
+    ) -> None:
+        """Инициализация форматтера."""
+        super().__init__(fmt, datefmt, style, validate)
+        self.static_fields = dict(static_fields or {})
+        self.max_message_length = max_message_length
+
+    def get_fields(self: 'JSONFormatter', record: logging.LogRecord) -> dict[str, Any]:
+        """Возвращает поля записи лога."""
+        message = record.getMessage()
+        if self.max_message_length is not None:
+            message = message[: self.max_message_length]
+        fields: dict[str, Any] = {
+            'timestamp': datetime.datetime.fromtimestamp(record.created, tz=datetime.UTC),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': message,
+        }
+        if (code := get_log_code(message)) is not None:
+            fields['code'] = code
+        fields.update(
+            module=record.module,
+            function=record.funcName,
+            line=record.lineno,
+            thread=record.threadName,
+        )
+        fields.update(get_process_fields())
+        fields.update(self.static_fields)
+        context = getattr(record, 'context', None)
+        request = get_context_value(request_context, context)
+        if request is not None:
+            fields.update(
+                request_id=request.request_id,
+                method=request.method,
+                path=request.path,
+                route=request.route,
+                db_time_ms=round(request.db_time * 1000, 3),
+                db_statements=request.db_statements,
+            )
+        if (method := get_context_value(repository_method, context)) is not None:
+            fields['repository_method'] = method
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                fields[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            fields['exception'] = record.exc_text
+        if record.stack_info:
+            fields['stack'] = self.formatStack(record.stack_info)
+        return fields
+
+    def format(self: 'JSONFormatter', record: logging.LogRecord) -> str:  # noqa: A003
+        """Возвращает запись лога JSON-строкой."""
+        return orjson.dumps(self.get_fields(record), default=str).decode()
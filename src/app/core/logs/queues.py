@@ -0,0 +1,212 @@
+"""Модуль неблокирующей записи логов через очередь.
+
+Обработчики логгеров (вывод в консоль, запись в файлы) переносятся в фоновый поток
+``QueueListener``: логгер только кладет запись в ограниченную очередь, а форматирование и запись на
+диск выполняются вне event loop'а. Если очередь переполнена, запись отбрасывается по политике
+``drop_policy`` (новая запись или самая старая в очереди), а отброшенные записи считаются:
+счетчик обработчика ``dropped`` и метрика ``log_records_dropped_total``. Когда в очереди снова есть
+место, в нее добавляется запись ``LOGGING W1`` с количеством отброшенных записей.
+
+Включается секцией ``queue`` настроек логирования (``static/default_logger_settings.json``)::
+
+    "queue": {"enabled": true, "max_size": 10000, "drop_policy": "drop_new"}
+"""
+import atexit
+import contextvars
+import copy
+import enum
+import logging
+import logging.handlers
+import queue
+from collections.abc import Iterable
+from typing import Any
+
+from app.core.metrics import Counter, registry
+
+LOG_RECORDS_DROPPED: Counter = registry.register(
+    Counter(
+        'log_records_dropped_total',
+        'Количество записей логов, отброшенных из-за переполнения очереди.',
+        ('logger',),
+    ),
+)
+DEFAULT_MAX_SIZE = 10_000
+
+
+class DropPolicyEnum(str, enum.Enum):
+    """Enum политик переполнения очереди логов."""
+
+    DROP_NEW = 'drop_new'
+    DROP_OLD = 'drop_old'
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Обработчик, который кладет записи в ограниченную очередь и не блокирует вызывающий код.
+
+    В отличие от ``QueueHandler`` запись не форматируется в вызывающем потоке: подставляются
+    только аргументы сообщения (объекты аргументов могут измениться, пока запись ждет в очереди),
+    а форматирование (в том числе трейсбека) выполняют обработчики в фоновом потоке. В запись
+    сохраняется копия контекстных переменных (атрибут ``context``) для форматтеров.
+    """
+
+    def __init__(
+        self: 'BoundedQueueHandler',
+        records: 'queue.Queue[Any]',
+        *,
+        logger_name: str,
+        drop_policy: DropPolicyEnum = DropPolicyEnum.DROP_NEW,
+    ) -> None:
+        """Обработчик очереди ``records`` логгера ``logger_name``."""
+        super().__init__(records)
+        self.logger_name = logger_name
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self: 'BoundedQueueHandler', record: logging.LogRecord) -> logging.LogRecord:
+        """Подставляет аргументы в сообщение копии записи и сохраняет контекст."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.context = contextvars.copy_context()
+        return record
+
+    def _drop(self: 'BoundedQueueHandler') -> None:
+        self.dropped += 1
+        self._unreported += 1
+        LOG_RECORDS_DROPPED.inc(self.logger_name)
+
+    def enqueue(self: 'BoundedQueueHandler', record: logging.LogRecord) -> None:
+        """Кладет запись в очередь; при переполнении отбрасывает запись по политике."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.drop_policy == DropPolicyEnum.DROP_NEW:
+                self._drop()
+                return
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:  # pragma: no cover
+                pass
+            else:
+                self._drop()
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:  # pragma: no cover
+                self._drop()
+                return
+        if self._unreported:
+            self._report_dropped(record)
+
+    def _report_dropped(self: 'BoundedQueueHandler', record: logging.LogRecord) -> None:
+        summary = logging.makeLogRecord(
+            {
+                'name': record.name,
+                'levelno': logging.WARNING,
+                'levelname': logging.getLevelName(logging.WARNING),
+                'msg': (
+                    f'LOGGING W1: очередь логов переполнена, отброшено записей: '
+                    f'{self._unreported}.'
+                ),
+                'pathname': __file__,
+                'filename': 'queues.py',
+                'module': 'queues',
+                'funcName': 'enqueue',
+            },
+        )
+        try:
+            self.queue.put_nowait(summary)
+        except queue.Full:
+            return
+        self._unreported = 0
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """Фоновый поток, передающий записи из очереди обработчикам логгера."""
+
+    def enqueue_sentinel(self: 'BoundedQueueListener') -> None:
+        """Сигнал остановки ждет места в очереди: он не должен быть отброшен."""
+        self.queue.put(self._sentinel)  # type: ignore
+
+
+class QueueLogging:
+    """Перенос обработчиков логгеров в фоновые потоки.
+
+    Для каждого логгера с обработчиками создается своя очередь и поток ``BoundedQueueListener``,
+    а обработчики логгера заменяются одним ``BoundedQueueHandler``.
+    """
+
+    def __init__(self: 'QueueLogging') -> None:
+        """Экземпляр без подключенных логгеров."""
+        self.listeners: dict[str, BoundedQueueListener] = {}
+        self.handlers: dict[str, BoundedQueueHandler] = {}
+
+    def start(
+        self: 'QueueLogging',
+        logger_names: Iterable[str],
+        *,
+        max_size: int = DEFAULT_MAX_SIZE,
+        drop_policy: DropPolicyEnum = DropPolicyEnum.DROP_NEW,
+    ) -> None:
+        """Переносит обработчики логгеров ``logger_names`` в фоновые потоки."""
+        if max_size <= 0:
+            msg = 'max_size очереди логов должен быть больше 0.'
+            raise ValueError(msg)
+        for name in logger_names:
+            logger = logging.getLogger(name)
+            if name in self.listeners or not logger.handlers:
+                continue
+            records: 'queue.Queue[Any]' = queue.Queue(maxsize=max_size)
+            handlers = list(logger.handlers)
+            handler = BoundedQueueHandler(records, logger_name=name, drop_policy=drop_policy)
+            listener = BoundedQueueListener(records, *handlers, respect_handler_level=True)
+            for target in handlers:
+                logger.removeHandler(target)
+            logger.addHandler(handler)
+            listener.start()
+            self.listeners[name] = listener
+            self.handlers[name] = handler
+
+    def stop(self: 'QueueLogging') -> None:
+        """Дописывает записи из очередей и возвращает обработчики логгерам."""
+        for name, listener in self.listeners.items():
+            logger = logging.getLogger(name)
+            logger.removeHandler(self.handlers[name])
+            listener.stop()
+            for handler in listener.handlers:
+                logger.addHandler(handler)
+        self.listeners.clear()
+        self.handlers.clear()
+
+    def detach(self: 'QueueLogging') -> None:
+        """Возвращает обработчики логгерам, не останавливая потоки.
+
+        Нужен в дочернем процессе после fork: потоков ``QueueListener`` в нем нет, и ждать их
+        остановки нельзя.
+        """
+        for name, listener in self.listeners.items():
+            logger = logging.getLogger(name)
+            logger.removeHandler(self.handlers[name])
+            for handler in listener.handlers:
+                logger.addHandler(handler)
+        self.listeners.clear()
+        self.handlers.clear()
+
+    @property
+    def dropped(self: 'QueueLogging') -> int:
+        """Количество отброшенных записей всех логгеров."""
+        return sum(handler.dropped for handler in self.handlers.values())
+
+
+queue_logging = QueueLogging()
+atexit.register(queue_logging.stop)
+
+
+def get_queue_settings(log_settings: dict[str, Any]) -> tuple[bool, int, DropPolicyEnum]:
+    """Достает из настроек логирования: включена ли очередь, ее размер и политику переполнения."""
+    settings = log_settings.get('queue', {})
+    return (
+        bool(settings.get('enabled', False)),
+        int(settings.get('max_size', DEFAULT_MAX_SIZE)),
+        DropPolicyEnum(settings.get('drop_policy', DropPolicyEnum.DROP_NEW.value)),
+    )
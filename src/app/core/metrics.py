@@ -0,0 +1,355 @@
+"""Модуль метрик приложения в формате Prometheus.
+
+Метрики хранятся в памяти процесса и обновляются без блокировок: значения - обычные словари и
+списки, которые меняются из потока event loop'а (запись из других потоков защищена только GIL, и
+редкие гонки там допустимы для метрик). Ответ эндпоинта ``/metrics`` собирается при запросе
+Prometheus в текстовом формате 0.0.4.
+
+Помимо метрик HTTP-запросов (см. ``app.core.middlewares.metrics``) собираются:
+
+- состояние пула подключений движка ``app.core.meta`` и время ожидания подключения из пула;
+- количество SQL-запросов по методам репозиториев (``app.core.context.repository_method``);
+- отказы в доступе ``PermissionMixin.check_permissions``;
+- длительность создания и проверки JWT-токенов ``app.services.auth``.
+"""
+import bisect
+import math
+import time
+from collections.abc import Callable, Iterator, Sequence
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.responses import Response
+
+from app.core.context import repository_method
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.pool import ConnectionPoolEntry, Pool
+    from starlette.requests import Request
+
+    LabelValues = tuple[str, ...]
+    Sample = tuple[str, LabelValues, float]
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+UNKNOWN_LABEL = '<unknown>'
+
+
+def format_value(value: float) -> str:
+    """Возвращает значение метрики в текстовом формате Prometheus."""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if value == int(value):
+        return f'{int(value)}.0'
+    return repr(value)
+
+
+def escape_label_value(value: str) -> str:
+    """Экранирует значение метки."""
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def format_sample(
+    name: str,
+    label_names: Sequence[str],
+    label_values: 'LabelValues',
+    value: float,
+) -> str:
+    """Возвращает строку одного значения метрики."""
+    if not label_names:
+        return f'{name} {format_value(value)}'
+    labels = ','.join(
+        f'{label_name}="{escape_label_value(label_value)}"'
+        for label_name, label_value in zip(label_names, label_values, strict=True)
+    )
+    return f'{name}{{{labels}}} {format_value(value)}'
+
+
+class Metric:
+    """Базовый класс метрики.
+
+    Значения меток передаются позиционно в порядке ``label_names``: так обновление метрики не
+    создает промежуточных словарей.
+    """
+
+    type_name = 'untyped'
+
+    def __init__(
+        self: 'Metric',
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """Экземпляр метрики ``name`` с описанием ``documentation`` и метками ``label_names``."""
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def collect(self: 'Metric') -> 'Iterator[Sample]':
+        """Возвращает значения метрики: имя, значения меток и значение."""
+        raise NotImplementedError()
+
+    def clear(self: 'Metric') -> None:
+        """Сбрасывает значения метрики."""
+        raise NotImplementedError()
+
+    def render(self: 'Metric') -> list[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}',
+        ]
+        for name, label_values, value in self.collect():
+            label_names = self.label_names
+            if len(label_values) > len(label_names):
+                label_names = (*label_names, 'le')
+            lines.append(format_sample(name, label_names, label_values, value))
+        return lines
+
+
+class Counter(Metric):
+    """Счетчик: значение только растет."""
+
+    type_name = 'counter'
+
+    def __init__(
+        self: 'Counter',
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """Экземпляр счетчика."""
+        super().__init__(name, documentation, label_names)
+        self._values: dict['LabelValues', float] = {}
+
+    def inc(self: 'Counter', *label_values: str, amount: float = 1) -> None:
+        """Увеличивает счетчик с метками ``label_values`` на ``amount``."""
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self: 'Counter', *label_values: str) -> float:
+        """Возвращает значение счетчика с метками ``label_values``."""
+        return self._values.get(label_values, 0)
+
+    def collect(self: 'Counter') -> 'Iterator[Sample]':  # noqa: D102
+        for label_values, value in list(self._values.items()):
+            yield self.name, label_values, value
+
+    def clear(self: 'Counter') -> None:  # noqa: D102
+        self._values.clear()
+
+
+class Gauge(Counter):
+    """Датчик: значение может расти и уменьшаться."""
+
+    type_name = 'gauge'
+
+    def dec(self: 'Gauge', *label_values: str, amount: float = 1) -> None:
+        """Уменьшает значение с метками ``label_values`` на ``amount``."""
+        self._values[label_values] = self._values.get(label_values, 0) - amount
+
+    def set(self: 'Gauge', *label_values: str, value: float) -> None:  # noqa: A003
+        """Устанавливает значение с метками ``label_values``."""
+        self._values[label_values] = value
+
+
+class CallbackGauge(Metric):
+    """Датчик, значения которого вычисляются функцией в момент сбора метрик."""
+
+    type_name = 'gauge'
+
+    def __init__(
+        self: 'CallbackGauge',
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """Экземпляр датчика (функция устанавливается через ``set_function``)."""
+        super().__init__(name, documentation, label_names)
+        self._function: 'Callable[[], dict[LabelValues, float]] | None' = None
+
+    def set_function(
+        self: 'CallbackGauge',
+        function: 'Callable[[], dict[LabelValues, float]] | None',
+    ) -> None:
+        """Устанавливает функцию, возвращающую значения по меткам."""
+        self._function = function
+
+    def collect(self: 'CallbackGauge') -> 'Iterator[Sample]':  # noqa: D102
+        if self._function is None:
+            return
+        for label_values, value in self._function().items():
+            yield self.name, label_values, value
+
+    def clear(self: 'CallbackGauge') -> None:  # noqa: D102
+        # NOTE: значения датчика не хранятся: их каждый раз вычисляет функция.
+        return
+
+
+class Histogram(Metric):
+    """Гистограмма: количество наблюдений по корзинам, их сумма и количество."""
+
+    type_name = 'histogram'
+
+    def __init__(
+        self: 'Histogram',
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Экземпляр гистограммы с верхними границами корзин ``buckets``."""
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # NOTE: для каждого набора меток хранится список: количества по корзинам, количество в
+        #       корзине +Inf и сумма наблюдений.
+        self._values: dict['LabelValues', list[float]] = {}
+
+    def observe(self: 'Histogram', value: float, *label_values: str) -> None:
+        """Добавляет наблюдение ``value`` с метками ``label_values``."""
+        values = self._values.get(label_values)
+        if values is None:
+            values = self._values.setdefault(label_values, [0] * (len(self.buckets) + 2))
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def get_count(self: 'Histogram', *label_values: str) -> int:
+        """Возвращает количество наблюдений с метками ``label_values``."""
+        values = self._values.get(label_values)
+        return int(sum(values[:-1])) if values else 0
+
+    def collect(self: 'Histogram') -> 'Iterator[Sample]':  # noqa: D102
+        for label_values, values in list(self._values.items()):
+            cumulative = 0.0
+            for bucket, count in zip((*self.buckets, math.inf), values, strict=False):
+                cumulative += count
+                yield f'{self.name}_bucket', (*label_values, format_value(bucket)), cumulative
+            yield f'{self.name}_sum', label_values, values[-1]
+            yield f'{self.name}_count', label_values, cumulative
+
+    def clear(self: 'Histogram') -> None:  # noqa: D102
+        self._values.clear()
+
+
+class Registry:
+    """Реестр метрик процесса."""
+
+    def __init__(self: 'Registry') -> None:
+        """Экземпляр пустого реестра."""
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self: 'Registry', metric: Metric) -> Any:  # noqa: ANN401
+        """Добавляет метрику в реестр и возвращает ее."""
+        if metric.name in self._metrics:
+            msg = f'Метрика {metric.name} уже зарегистрирована.'
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def clear(self: 'Registry') -> None:
+        """Сбрасывает значения всех метрик."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+    def render(self: 'Registry') -> bytes:
+        """Возвращает все метрики в текстовом формате Prometheus."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return ('\n'.join(lines) + '\n').encode()
+
+
+registry = Registry()
+HTTP_REQUEST_DURATION: Histogram = registry.register(
+    Histogram(
+        'http_request_duration_seconds',
+        'Длительность обработки HTTP-запросов.',
+        ('method', 'route', 'status'),
+    ),
+)
+HTTP_REQUESTS_IN_PROGRESS: Gauge = registry.register(
+    Gauge('http_requests_in_progress', 'Количество обрабатываемых HTTP-запросов.', ('method',)),
+)
+DB_POOL_CONNECTIONS: CallbackGauge = registry.register(
+    CallbackGauge(
+        'db_pool_connections',
+        'Подключения пула базы данных: размер, занятые, свободные и сверх размера пула.',
+        ('state',),
+    ),
+)
+DB_POOL_CHECKOUT_DURATION: Histogram = registry.register(
+    Histogram(
+        'db_pool_checkout_duration_seconds',
+        'Время получения подключения из пула (ожидание и открытие нового подключения).',
+        buckets=FAST_BUCKETS,
+    ),
+)
+DB_STATEMENTS: Counter = registry.register(
+    Counter(
+        'db_statements_total',
+        'Количество SQL-запросов по методам репозиториев.',
+        ('repository_method',),
+    ),
+)
+PERMISSION_DENIALS: Counter = registry.register(
+    Counter(
+        'permission_denials_total',
+        'Количество отказов в доступе.',
+        ('repository', 'method', 'mode'),
+    ),
+)
+JWT_DURATION: Histogram = registry.register(
+    Histogram(
+        'jwt_duration_seconds',
+        'Длительность создания и проверки JWT-токенов.',
+        ('operation',),
+        buckets=FAST_BUCKETS,
+    ),
+)
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул подключений, который замеряет время получения подключения."""
+
+    def _do_get(self: 'MeteredAsyncQueuePool') -> 'ConnectionPoolEntry':
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - started_at)
+
+
+def get_pool_state(pool: 'Pool') -> dict['LabelValues', float]:
+    """Возвращает состояние пула подключений по меткам ``state``."""
+    state: dict['LabelValues', float] = {}
+    for name in ('size', 'checkedout', 'checkedin', 'overflow'):
+        method = getattr(pool, name, None)
+        if method is not None:
+            state[(name,)] = method()
+    return state
+
+
+def _count_statement(*_: Any) -> None:  # noqa: ANN401
+    DB_STATEMENTS.inc(repository_method.get() or UNKNOWN_LABEL)
+
+
+def install_db_metrics(engine: 'Engine') -> None:
+    """Подключает метрики пула и SQL-запросов движка (для асинхронного - ``sync_engine``)."""
+    DB_POOL_CONNECTIONS.set_function(lambda: get_pool_state(engine.pool))
+    if not event.contains(engine, 'before_cursor_execute', _count_statement):
+        event.listen(engine, 'before_cursor_execute', _count_statement)
+
+
+def uninstall_db_metrics(engine: 'Engine') -> None:
+    """Отключает метрики пула и SQL-запросов движка."""
+    DB_POOL_CONNECTIONS.set_function(None)
+    if event.contains(engine, 'before_cursor_execute', _count_statement):
+        event.remove(engine, 'before_cursor_execute', _count_statement)
+
+
+async def metrics_endpoint(_: 'Request') -> Response:
+    """Эндпоинт метрик для Prometheus."""
+    return Response(content=registry.render(), headers={'content-type': CONTENT_TYPE})
@@ -0,0 +1 @@
+"""Пакет ASGI middleware проекта."""
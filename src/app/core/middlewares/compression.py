@@ -0,0 +1,122 @@
+"""Модуль middleware сжатия ответов.
+
+Ответ сжимается (brotli, если установлен пакет ``brotli`` и клиент его принимает, иначе gzip),
+если его тело не меньше ``minimum_size`` байт, тип содержимого текстовый и ответ еще не сжат.
+Потоковые ответы (тело из нескольких частей) и ответы на ``HEAD`` отдаются как есть. Тела от
+``THREAD_COMPRESSION_SIZE`` байт сжимаются в отдельном потоке, чтобы не блокировать event loop.
+"""
+import asyncio
+from typing import TYPE_CHECKING
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.utils import http as http_utils
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSIBLE_MEDIA_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+DEFAULT_QUALITY = {http_utils.GZIP: 6, http_utils.BROTLI: 5}
+THREAD_COMPRESSION_SIZE = 256 * 1024
+
+
+class CompressionMiddleware:
+    """ASGI middleware сжатия ответов.
+
+    Parameters
+    ----------
+    app
+        ASGI-приложение.
+    minimum_size
+        минимальный размер тела ответа в байтах, начиная с которого ответ сжимается.
+    quality
+        степень сжатия по кодировкам (Default: ``None`` - gzip 6, brotli 5).
+    """
+
+    def __init__(
+        self: 'CompressionMiddleware',
+        app: 'ASGIApp',
+        *,
+        minimum_size: int = 1024,
+        quality: dict[str, int] | None = None,
+    ) -> None:
+        """Инициализация middleware."""
+        if minimum_size < 0:
+            msg = 'minimum_size должен быть не меньше 0.'
+            raise ValueError(msg)
+        self.app = app
+        self.minimum_size = minimum_size
+        self.quality = {**DEFAULT_QUALITY, **(quality or {})}
+        self.encodings = http_utils.get_supported_encodings()
+
+    async def __call__(
+        self: 'CompressionMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса: сжатие тела ответа, если клиент это поддерживает."""
+        if scope['type'] != 'http' or scope['method'] == 'HEAD':
+            await self.app(scope, receive, send)
+            return
+        encoding = http_utils.choose_encoding(
+            Headers(scope=scope).get('accept-encoding', ''),
+            self.encodings,
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        start_message: 'Message | None' = None
+        passthrough = False
+
+        async def send_wrapper(message: 'Message') -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message['type'] == 'http.response.start':
+                start_message = message
+                if not self._is_compressible(Headers(raw=message['headers'])):
+                    passthrough = True
+                    await send(message)
+                return
+            if start_message is None:  # pragma: no cover
+                await send(message)
+                return
+            passthrough = True
+            body: bytes = message.get('body', b'')
+            if message.get('more_body', False) or len(body) < self.minimum_size:
+                await send(start_message)
+                await send(message)
+                return
+            quality = self.quality.get(encoding)
+            if len(body) >= THREAD_COMPRESSION_SIZE:
+                compressed = await asyncio.to_thread(
+                    http_utils.compress,
+                    body,
+                    encoding,
+                    quality=quality,
+                )
+            else:
+                compressed = http_utils.compress(body, encoding, quality=quality)
+            headers = MutableHeaders(scope=start_message)
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(compressed))
+            headers.add_vary_header('Accept-Encoding')
+            await send(start_message)
+            await send({**message, 'body': compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _is_compressible(headers: Headers) -> bool:
+        if 'content-encoding' in headers:
+            return False
+        media_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+        return media_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
@@ -0,0 +1,170 @@
+"""Модуль middleware условных GET-запросов (ETag).
+
+Для страниц-ресурсов (``ConditionalResource``: список или одна запись репозитория) ETag
+вычисляется до обработки запроса по версии записей (``BaseRepository.version``), версии
+приложения и пользователю (``get_principal``). Если ETag совпадает с ``If-None-Match``, клиенту
+сразу возвращается ``304`` - страница не строится, основные запросы к базе данных не выполняются.
+Иначе ETag добавляется к успешному ответу.
+
+ETag слабый (``W/``): тело страницы определяется данными, но не обязано совпадать побайтно
+(например, после сжатия). Пользователь входит в ETag, поэтому страница другого пользователя не
+совпадет с сохраненной копией. Для неавторизованных клиентов (``get_principal`` возвращает
+``None``) ETag не вычисляется, и версия записей не запрашивается.
+
+Middleware должно стоять после middleware сессии: пользователь определяется по сессии, а не по
+байтам cookie, которые меняются при каждом ответе.
+"""
+import hashlib
+import re
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_200_OK
+
+from app.core.config import get_logger
+from app.utils import http as http_utils
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from app.db.repositories.base import BaseRepository
+
+    PrincipalResolver = Callable[[Request], Awaitable[str | None]]
+
+logger = get_logger('app')
+
+
+class ConditionalResource(NamedTuple):
+    """Ресурс, для которого поддерживаются условные запросы.
+
+    Attributes
+    ----------
+    pattern
+        регулярное выражение пути ресурса; группа ``identity`` - идентификатор записи (если
+        группы нет, ресурс - список всех записей).
+    repository_class
+        класс репозитория записей ресурса.
+    identity_type
+        преобразование идентификатора из пути (Default: ``str``). ``ValueError`` означает, что
+        идентификатор некорректный, и запрос обрабатывается без ETag.
+    """
+
+    pattern: re.Pattern[str]
+    repository_class: type['BaseRepository[Any, Any]']
+    identity_type: Callable[[str], Any] = str
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware условных GET-запросов.
+
+    Parameters
+    ----------
+    app
+        ASGI-приложение.
+    resources
+        ресурсы с условными запросами.
+    session_factory
+        фабрика сессий базы данных для получения версии записей.
+    get_principal
+        функция, возвращающая идентификатор пользователя по запросу (``None`` - обработать
+        запрос без ETag). Функция не должна менять сессию.
+    version
+        версия приложения (входит в ETag, чтобы новая версия страниц не совпадала со старой).
+    cache_control
+        заголовок ``Cache-Control`` ответов ресурсов (Default: ``'private, no-cache'`` - хранить
+        только в браузере и проверять перед каждым использованием).
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: 'ConditionalGetMiddleware',
+        app: 'ASGIApp',
+        *,
+        resources: Sequence[ConditionalResource],
+        session_factory: 'async_sessionmaker[AsyncSession]',
+        get_principal: 'PrincipalResolver',
+        version: str = '',
+        cache_control: str = 'private, no-cache',
+    ) -> None:
+        """Инициализация middleware."""
+        self.app = app
+        self.resources = tuple(resources)
+        self.session_factory = session_factory
+        self.get_principal = get_principal
+        self.version = version
+        self.cache_control = cache_control
+
+    def match(
+        self: 'ConditionalGetMiddleware',
+        path: str,
+    ) -> tuple[ConditionalResource, Any] | None:
+        """Находит ресурс по пути и идентификатор записи (``None`` для списка)."""
+        for resource in self.resources:
+            match = resource.pattern.fullmatch(path)
+            if match is None:
+                continue
+            identity = match.groupdict().get('identity')
+            if identity is None:
+                return resource, None
+            try:
+                return resource, resource.identity_type(identity)
+            except ValueError:
+                return None
+        return None
+
+    async def get_etag(
+        self: 'ConditionalGetMiddleware',
+        resource: ConditionalResource,
+        identity: Any,  # noqa: ANN401
+        principal: str,
+    ) -> str | None:
+        """Вычисляет ETag ресурса (``None``, если версию записей получить не удалось)."""
+        try:
+            async with self.session_factory() as session:
+                version = await resource.repository_class(session).version(item_identity=identity)
+        except SQLAlchemyError:
+            logger.exception('CONDITIONAL-GET E1: не удалось получить версию записей.')
+            return None
+        principal_hash = hashlib.sha256(principal.encode()).hexdigest()[:16]
+        return 'W/' + http_utils.make_etag(f'{self.version}:{version}:{principal_hash}'.encode())
+
+    async def __call__(
+        self: 'ConditionalGetMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса: ``304`` для актуальной копии, иначе ответ с ETag."""
+        matched = None
+        if scope['type'] == 'http' and scope['method'] in {'GET', 'HEAD'}:
+            matched = self.match(scope['path'])
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        principal = await self.get_principal(Request(scope, receive))
+        if principal is None:
+            await self.app(scope, receive, send)
+            return
+        etag = await self.get_etag(*matched, principal)
+        if etag is None:
+            await self.app(scope, receive, send)
+            return
+        response_headers = {'ETag': etag, 'Cache-Control': self.cache_control, 'Vary': 'Cookie'}
+        if http_utils.etag_matches(Headers(scope=scope).get('if-none-match'), etag):
+            await Response(status_code=304, headers=response_headers)(scope, receive, send)
+            return
+
+        async def send_wrapper(message: 'Message') -> None:
+            if message['type'] == 'http.response.start' and message['status'] == HTTP_200_OK:
+                message_headers = MutableHeaders(scope=message)
+                if 'etag' not in message_headers:
+                    message_headers['ETag'] = etag
+                    message_headers['Cache-Control'] = self.cache_control
+                    message_headers.add_vary_header('Cookie')
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,62 @@
+"""Модуль middleware контекста HTTP-запроса.
+
+Middleware устанавливает ``app.core.context.request_context`` на время обработки запроса и
+возвращает идентификатор запроса в заголовке ``X-Request-ID``. Идентификатор берется из заголовка
+запроса (например, выставленного балансировщиком) или генерируется.
+"""
+import re
+import uuid
+from typing import TYPE_CHECKING
+
+from app.core.context import RequestContext, request_context
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_ID_HEADER = b'x-request-id'
+REQUEST_ID_PATTERN = re.compile(rb'[\w.-]{1,128}')
+
+
+def get_request_id(scope: 'Scope') -> str:
+    """Возвращает идентификатор запроса из заголовка или новый, если заголовок некорректен."""
+    for name, value in scope.get('headers', ()):
+        if name == REQUEST_ID_HEADER and REQUEST_ID_PATTERN.fullmatch(value):
+            return value.decode()
+    return uuid.uuid4().hex
+
+
+class RequestContextMiddleware:
+    """ASGI middleware контекста HTTP-запроса."""
+
+    def __init__(self: 'RequestContextMiddleware', app: 'ASGIApp') -> None:
+        """Инициализация middleware."""
+        self.app = app
+
+    async def __call__(
+        self: 'RequestContextMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса в контексте."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        context = RequestContext(
+            request_id=get_request_id(scope),
+            method=scope['method'],
+            path=scope['path'],
+            scope=scope,
+        )
+        request_id_header = (REQUEST_ID_HEADER, context.request_id.encode())
+
+        async def send_wrapper(message: 'Message') -> None:
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message.get('headers', ()), request_id_header]
+            await send(message)
+
+        token = request_context.set(context)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_context.reset(token)
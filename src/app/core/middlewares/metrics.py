@@ -0,0 +1,55 @@
+"""Модуль middleware метрик HTTP-запросов.
+
+Для каждого запроса замеряется длительность (гистограмма по методу, маршруту и статусу ответа) и
+количество одновременно обрабатываемых запросов. Метка маршрута - шаблон пути
+(``/admin/{identity}/list``), а не сам путь: так количество наборов меток ограничено количеством
+маршрутов.
+"""
+import time
+from typing import TYPE_CHECKING
+
+from app.core.context import get_route
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class MetricsMiddleware:
+    """ASGI middleware метрик HTTP-запросов."""
+
+    def __init__(self: 'MetricsMiddleware', app: 'ASGIApp') -> None:
+        """Инициализация middleware."""
+        self.app = app
+
+    async def __call__(
+        self: 'MetricsMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса с замером длительности."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        method = scope['method']
+        status = 500
+
+        async def send_wrapper(message: 'Message') -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(method)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec(method)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started_at,
+                method,
+                get_route(scope),
+                str(status),
+            )
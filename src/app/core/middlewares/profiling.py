@@ -0,0 +1,360 @@
+"""Модуль выборочного профилирования запросов.
+
+Middleware профилирует долю ``sample_rate`` HTTP-запросов статистическим профайлером: фоновый поток
+раз в ``interval`` секунд снимает стек задачи asyncio, которая обрабатывает запрос. Если задача
+выполняется, берется стек потока event loop'а, если ждет (например, ответа базы данных) - цепочка
+``await`` ее корутин с пометкой ``<await>``. Время запросов к базе данных считается по событиям
+SQLAlchemy ``before_cursor_execute``/``after_cursor_execute``.
+
+Профили запросов дольше ``threshold`` секунд сохраняются в формате speedscope
+(https://www.speedscope.app, там же строится flamegraph). Остальные запросы не профилируются:
+выключенное профилирование не добавляет middleware вовсе, а для невыбранного запроса его цена -
+одно случайное число.
+"""
+import asyncio
+import collections
+import contextvars
+import pathlib
+import random
+import re
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from sqlalchemy import event
+
+from app.core.config import get_logger
+from app.utils.datetime import get_utc_now
+
+if TYPE_CHECKING:
+    from types import CodeType, FrameType
+
+    from sqlalchemy.engine import Connection, Engine
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+    Stack = tuple[CodeType | str, ...]
+
+logger = get_logger('app')
+AWAIT_FRAME = '<await>'
+DB_STARTED_AT_KEY = 'profiling_db_started_at'
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+FILENAME_UNSAFE_CHARACTERS = re.compile(r'[^\w.-]+')
+current_profile: contextvars.ContextVar['RequestProfile | None'] = contextvars.ContextVar(
+    'current_profile',
+    default=None,
+)
+
+
+class RequestProfile:
+    """Профиль одного HTTP-запроса: собранные стеки и время запросов к базе данных."""
+
+    def __init__(
+        self: 'RequestProfile',
+        *,
+        method: str,
+        path: str,
+        task: 'asyncio.Task[Any]',
+        thread_id: int,
+    ) -> None:
+        """Экземпляр профиля запроса, обрабатываемого задачей ``task`` в потоке ``thread_id``."""
+        self.method = method
+        self.path = path
+        self.task = task
+        self.loop = task.get_loop()
+        self.thread_id = thread_id
+        self.started_at = get_utc_now()
+        self.db_time = 0.0
+        self.db_statements = 0
+        self.duration = 0.0
+        self.samples: collections.Counter['Stack'] = collections.Counter()
+        self._started_at = time.perf_counter()
+
+    @property
+    def db_share(self: 'RequestProfile') -> float:
+        """Доля времени запроса, проведенная в запросах к базе данных."""
+        if not self.duration:
+            return 0.0
+        return min(self.db_time / self.duration, 1.0)
+
+    def finish(self: 'RequestProfile') -> None:
+        """Фиксирует длительность запроса."""
+        self.duration = time.perf_counter() - self._started_at
+
+    def _get_running_stack(self: 'RequestProfile', frame: 'FrameType') -> 'Stack':
+        """Стек выполняющейся задачи: кадры потока от корутины задачи до текущего кадра."""
+        coro = self.task.get_coro()
+        root = getattr(coro, 'cr_frame', None)
+        stack: list['CodeType | str'] = []
+        current: 'FrameType | None' = frame
+        while current is not None:
+            stack.append(current.f_code)
+            if current is root:
+                break
+            current = current.f_back
+        return tuple(reversed(stack))
+
+    def _get_awaiting_stack(self: 'RequestProfile') -> 'Stack':
+        """Стек ожидающей задачи: цепочка ``await`` ее корутин."""
+        stack: list['CodeType | str'] = []
+        awaitable: Any = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None)
+            if frame is None:
+                break
+            stack.append(frame.f_code)
+            awaitable = getattr(awaitable, 'cr_await', None) or getattr(
+                awaitable,
+                'gi_yieldfrom',
+                None,
+            )
+        stack.append(AWAIT_FRAME)
+        return tuple(stack)
+
+    def add_sample(self: 'RequestProfile', frames: dict[int, 'FrameType']) -> None:
+        """Добавляет в профиль стек задачи по снимку кадров всех потоков."""
+        if self.task.done():
+            return
+        frame = frames.get(self.thread_id)
+        if frame is not None and asyncio.current_task(self.loop) is self.task:
+            stack = self._get_running_stack(frame)
+        else:
+            stack = self._get_awaiting_stack()
+        self.samples[stack] += 1
+
+    def to_speedscope(self: 'RequestProfile', interval: float) -> dict[str, Any]:
+        """Возвращает профиль в формате speedscope (каждый снимок весит ``interval`` секунд)."""
+        frames: list[dict[str, Any]] = []
+        frame_indexes: dict['CodeType | str', int] = {}
+        samples: list[list[int]] = []
+        weights: list[float] = []
+        for stack, count in self.samples.copy().items():
+            sample: list[int] = []
+            for code in stack:
+                if code not in frame_indexes:
+                    frame_indexes[code] = len(frames)
+                    if isinstance(code, str):
+                        frames.append({'name': code})
+                    else:
+                        frames.append(
+                            {
+                                'name': code.co_qualname,
+                                'file': code.co_filename,
+                                'line': code.co_firstlineno,
+                            },
+                        )
+                sample.append(frame_indexes[code])
+            samples.append(sample)
+            weights.append(count * interval)
+        name = (
+            f'{self.method} {self.path}: {self.duration * 1000:.1f} мс, '
+            f'база данных {self.db_share:.0%} ({self.db_statements} запросов)'
+        )
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'app.core.middlewares.profiling',
+            'activeProfileIndex': 0,
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': name,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': self.duration,
+                    'samples': samples,
+                    'weights': weights,
+                },
+            ],
+        }
+
+
+class Sampler:
+    """Фоновый поток, снимающий стеки профилируемых запросов.
+
+    Поток запускается с первым профилем и завершается, когда профилей не остается.
+    """
+
+    def __init__(self: 'Sampler', interval: float) -> None:
+        """Экземпляр сэмплера с периодом снятия стеков ``interval`` секунд."""
+        self.interval = interval
+        self._profiles: dict[int, RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def add(self: 'Sampler', profile: RequestProfile) -> None:
+        """Начинает профилирование запроса."""
+        with self._lock:
+            self._profiles[id(profile)] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='request-profiler',
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def remove(self: 'Sampler', profile: RequestProfile) -> None:
+        """Заканчивает профилирование запроса.
+
+        После возврата профиль больше не изменяется: стеки снимаются под той же блокировкой.
+        """
+        with self._lock:
+            self._profiles.pop(id(profile), None)
+
+    def sample(self: 'Sampler') -> None:
+        """Снимает стеки всех профилируемых запросов."""
+        frames = sys._current_frames()  # noqa: SLF001
+        with self._lock:
+            for profile in self._profiles.values():
+                profile.add_sample(frames)
+
+    def _run(self: 'Sampler') -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+            self.sample()
+
+
+def _before_cursor_execute(conn: 'Connection', *_: Any) -> None:  # noqa: ANN401
+    if current_profile.get() is not None:
+        conn.info[DB_STARTED_AT_KEY] = time.perf_counter()
+
+
+def _after_cursor_execute(conn: 'Connection', *_: Any) -> None:  # noqa: ANN401
+    started_at = conn.info.pop(DB_STARTED_AT_KEY, None)
+    profile = current_profile.get()
+    if started_at is None or profile is None:
+        return
+    profile.db_time += time.perf_counter() - started_at
+    profile.db_statements += 1
+
+
+def install_db_timing(engine: 'Engine') -> None:
+    """Подключает подсчет времени запросов к базе данных профилируемых HTTP-запросов.
+
+    Для асинхронного движка передается ``engine.sync_engine``. Повторный вызов ничего не делает.
+    """
+    for name, listener in (
+        ('before_cursor_execute', _before_cursor_execute),
+        ('after_cursor_execute', _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, listener):
+            event.listen(engine, name, listener)
+
+
+def get_profile_filename(profile: RequestProfile) -> str:
+    """Возвращает имя файла профиля: время начала, метод, путь и длительность запроса."""
+    path = FILENAME_UNSAFE_CHARACTERS.sub('_', profile.path).strip('_') or 'root'
+    return (
+        f'{profile.started_at:%Y%m%dT%H%M%S.%f}-{profile.method}-{path}-'
+        f'{profile.duration * 1000:.0f}ms.speedscope.json'
+    )
+
+
+def save_profile(
+    profile: RequestProfile,
+    output_dir: pathlib.Path,
+    interval: float,
+) -> pathlib.Path:
+    """Сохраняет профиль запроса в формате speedscope и возвращает путь к файлу."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / get_profile_filename(profile)
+    path.write_bytes(orjson.dumps(profile.to_speedscope(interval)))
+    return path
+
+
+class ProfilingMiddleware:
+    """ASGI middleware выборочного профилирования HTTP-запросов.
+
+    Parameters
+    ----------
+    app
+        ASGI-приложение.
+    sample_rate
+        доля профилируемых запросов от ``0`` до ``1``.
+    interval
+        период снятия стеков в секундах.
+    threshold
+        минимальная длительность запроса в секундах, при которой профиль сохраняется.
+    output_dir
+        директория для файлов профилей.
+    """
+
+    def __init__(
+        self: 'ProfilingMiddleware',
+        app: 'ASGIApp',
+        *,
+        sample_rate: float,
+        interval: float,
+        threshold: float,
+        output_dir: pathlib.Path,
+    ) -> None:
+        """Инициализация middleware."""
+        if not 0 <= sample_rate <= 1:
+            msg = 'sample_rate должен быть в диапазоне от 0 до 1.'
+            raise ValueError(msg)
+        if interval <= 0:
+            msg = 'interval должен быть больше 0.'
+            raise ValueError(msg)
+        self.app = app
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.output_dir = output_dir
+        self.sampler = Sampler(interval)
+
+    async def __call__(
+        self: 'ProfilingMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса: выбранные запросы выполняются под профайлером."""
+        if scope['type'] != 'http' or random.random() >= self.sample_rate:  # noqa: S311
+            await self.app(scope, receive, send)
+            return
+        task = asyncio.current_task()
+        if task is None:  # pragma: no cover
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile(
+            method=scope['method'],
+            path=scope['path'],
+            task=task,
+            thread_id=threading.get_ident(),
+        )
+        token = current_profile.set(profile)
+        self.sampler.add(profile)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile.finish()
+            self.sampler.remove(profile)
+            current_profile.reset(token)
+            if profile.duration >= self.threshold:
+                await self._save(profile)
+
+    async def _save(self: 'ProfilingMiddleware', profile: RequestProfile) -> None:
+        try:
+            path = await asyncio.to_thread(
+                save_profile,
+                profile,
+                self.output_dir,
+                self.sampler.interval,
+            )
+        except OSError:
+            logger.exception('PROFILING E1: не удалось сохранить профиль запроса.')
+            return
+        logger.info(
+            'PROFILING I1: %s %s выполнен за %.1f мс (база данных %.0f%%), профиль: %s.',
+            profile.method,
+            profile.path,
+            profile.duration * 1000,
+            profile.db_share * 100,
+            path,
+        )
@@ -0,0 +1,170 @@
+"""Модуль middleware кэша ответов.
+
+Успешные (``200``) ответы на ``GET`` к ресурсам (``CachedResource``) сохраняются в кэше ответов
+(``app.core.cache.ResponseCache``) по режиму доступа клиента, схеме, хосту, пути и параметрам
+запроса (ссылки в ответе строятся по адресу запроса). Запись кэша недействительна после
+изменения любой из таблиц ресурса. Если режим доступа клиента определить нельзя (например, клиент
+не авторизован), запрос обрабатывается без кэша.
+
+Ответ из кэша отдается без обработчиков приложения, поэтому функция режима доступа должна
+полностью проверять клиента (в том числе его существование), а не только подпись токена.
+Изменения сессии, сделанные приложением при построении ответа для самого запроса, переносятся в
+сессию запроса.
+
+Middleware должно стоять после middleware сессии: cookie сессии в кэшированный ответ не попадает.
+"""
+import re
+from collections.abc import Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.status import HTTP_200_OK
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+    from app.core.cache import ResponseCache
+    from app.db.mixins.permissions import PermissionModeEnum
+
+    PermissionModeResolver = Callable[[Request], Awaitable[PermissionModeEnum | None]]
+
+
+class CachedResource(NamedTuple):
+    """Ресурс, ответы которого кэшируются.
+
+    Attributes
+    ----------
+    pattern
+        регулярное выражение пути ресурса.
+    tables
+        таблицы, из данных которых строится ответ.
+    """
+
+    pattern: re.Pattern[str]
+    tables: tuple[str, ...]
+
+
+def dump_response(messages: Sequence['Message']) -> bytes | None:
+    """Сериализует ответ для кэша (``None``, если ответ кэшировать нельзя).
+
+    Кэшируются только успешные ответы без cookie.
+    """
+    start, *body_messages = messages
+    headers = Headers(raw=start['headers'])
+    if start['status'] != HTTP_200_OK or 'set-cookie' in headers:
+        return None
+    body = b''.join(message.get('body', b'') for message in body_messages)
+    return orjson.dumps(headers.items()) + b'\n' + body
+
+
+def load_response(data: bytes) -> list['Message']:
+    """Восстанавливает сообщения ответа из кэша."""
+    header, _, body = data.partition(b'\n')
+    headers = [
+        (name.encode('latin-1'), value.encode('latin-1')) for name, value in orjson.loads(header)
+    ]
+    return [
+        {'type': 'http.response.start', 'status': HTTP_200_OK, 'headers': headers},
+        {'type': 'http.response.body', 'body': body},
+    ]
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware кэша ответов.
+
+    Parameters
+    ----------
+    app
+        ASGI-приложение.
+    cache
+        кэш ответов.
+    resources
+        кэшируемые ресурсы.
+    get_permission_mode
+        функция, полностью проверяющая клиента и определяющая его режим доступа по запросу
+        (``None`` - не кэшировать). Может изменять сессию запроса.
+    """
+
+    def __init__(
+        self: 'ResponseCacheMiddleware',
+        app: 'ASGIApp',
+        *,
+        cache: 'ResponseCache',
+        resources: Sequence[CachedResource],
+        get_permission_mode: 'PermissionModeResolver',
+    ) -> None:
+        """Инициализация middleware."""
+        self.app = app
+        self.cache = cache
+        self.resources = tuple(resources)
+        self.get_permission_mode = get_permission_mode
+
+    def match(self: 'ResponseCacheMiddleware', path: str) -> CachedResource | None:
+        """Находит ресурс по пути."""
+        for resource in self.resources:
+            if resource.pattern.fullmatch(path):
+                return resource
+        return None
+
+    async def render(
+        self: 'ResponseCacheMiddleware',
+        scope: 'Scope',
+    ) -> tuple[list['Message'], dict[str, Any] | None]:
+        """Обрабатывает запрос приложением и возвращает сообщения ответа и сессию после обработки.
+
+        Запрос обрабатывается с копией ``scope`` и сессии: значение может строиться в фоне, после
+        отправки ответа клиенту.
+        """
+        messages: list['Message'] = []
+
+        async def receive() -> 'Message':
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message: 'Message') -> None:
+            messages.append(message)
+
+        scope = dict(scope)
+        if 'session' in scope:
+            scope['session'] = dict(scope['session'])
+        await self.app(scope, receive, send)
+        return messages, scope.get('session')
+
+    async def __call__(
+        self: 'ResponseCacheMiddleware',
+        scope: 'Scope',
+        receive: 'Receive',
+        send: 'Send',
+    ) -> None:
+        """Обработка запроса: ответ из кэша или от приложения с сохранением в кэш."""
+        resource = None
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            resource = self.match(scope['path'])
+        if resource is None:
+            await self.app(scope, receive, send)
+            return
+        mode = await self.get_permission_mode(Request(scope, receive))
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        query = '&'.join(sorted(scope['query_string'].decode('latin-1').split('&')))
+        host = Headers(scope=scope).get('host', '')
+        key = f'response:{mode.name}:{scope["scheme"]}://{host}{scope["path"]}?{query}'
+        rendered: list['Message'] | None = None
+
+        async def compute() -> bytes | None:
+            nonlocal rendered
+            messages, session = await self.render(scope)
+            if rendered is None:
+                rendered = messages
+                if session is not None and session != scope['session']:
+                    scope['session'].clear()
+                    scope['session'].update(session)
+            return dump_response(messages)
+
+        data = await self.cache.get_or_set(key, resource.tables, compute)
+        if rendered is None and data is not None:
+            rendered = load_response(data)
+        for message in rendered or ():
+            await send(message)
@@ -0,0 +1,248 @@
+"""Модуль декларативного секционирования (partitioning) таблиц.
+
+Секционирование включается атрибутом модели ``partitioning`` (см. ``WatchListElementBase``):
+таблица создается как ``PARTITION BY LIST/RANGE``, а ключ секционирования добавляется в первичный
+ключ (этого требует PostgreSQL). Сами секции создаются отдельно: функциями-помощниками в миграциях
+и командой ``manage.py db create-partitions`` для будущих периодов.
+"""
+import datetime
+import enum
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from app.utils.datetime import get_utc_now
+
+if TYPE_CHECKING:
+    from alembic.operations import Operations
+    from sqlalchemy.sql.elements import ColumnElement
+
+    from app.core.models.tables.base import Base
+
+MONTHS_IN_YEAR = 12
+INCORRECT_INTERVAL_MESSAGE = 'Интервал секционирования должен делить год на равные части (1-12).'
+LIST_VALUES_NOT_SET_MESSAGE_TEMPLATE = (
+    'Колонка {column} не является Enum: значения для секций нужно передать явно.'
+)
+
+
+class PartitionStrategyEnum(str, enum.Enum):
+    """Enum стратегий секционирования."""
+
+    LIST = 'LIST'
+    RANGE = 'RANGE'
+
+
+class Partition(NamedTuple):
+    """Секция таблицы: название и граница (выражение после ``FOR VALUES``)."""
+
+    name: str
+    bound: str
+
+    def get_create_ddl(self: 'Partition', table_name: str) -> str:
+        """Возвращает SQL для создания секции (ничего не делает, если секция уже существует)."""
+        return (
+            f'CREATE TABLE IF NOT EXISTS {self.name} PARTITION OF {table_name} '
+            f'FOR VALUES {self.bound}'
+        )
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    """Описание секционирования таблицы.
+
+    Attributes
+    ----------
+    strategy
+        стратегия секционирования: по списку значений или по диапазону.
+    column
+        колонка - ключ секционирования.
+    interval_months
+        размер диапазона в месяцах (только для ``RANGE``). Должен делить год на равные части, чтобы
+        границы секций не зависели от даты создания.
+    """
+
+    strategy: PartitionStrategyEnum
+    column: str
+    interval_months: int = 1
+
+    def __post_init__(self: 'Partitioning') -> None:  # noqa: D105
+        if self.interval_months <= 0 or MONTHS_IN_YEAR % self.interval_months:
+            raise ValueError(INCORRECT_INTERVAL_MESSAGE)
+
+    @property
+    def partition_by(self: 'Partitioning') -> str:
+        """Выражение ``PARTITION BY`` для создания таблицы."""
+        return f'{self.strategy.value} ({self.column})'
+
+    def get_range_partitions(
+        self: 'Partitioning',
+        table_name: str,
+        *,
+        start: datetime.date,
+        count: int,
+    ) -> list[Partition]:
+        """Возвращает ``count`` секций-диапазонов, начиная с периода, в который попадает ``start``.
+
+        Пример названия секции: ``anime_p2026_10``.
+        """
+        month_index = start.year * MONTHS_IN_YEAR + start.month - 1
+        month_index -= month_index % self.interval_months
+        partitions: list[Partition] = []
+        for _ in range(count):
+            lower = _get_date_from_month_index(month_index)
+            month_index += self.interval_months
+            upper = _get_date_from_month_index(month_index)
+            partitions.append(
+                Partition(
+                    name=f'{table_name}_p{lower.year}_{lower.month:02d}',
+                    bound=f"FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')",
+                ),
+            )
+        return partitions
+
+    def get_list_partitions(
+        self: 'Partitioning',
+        table_name: str,
+        values: Iterable[str | enum.Enum],
+    ) -> list[Partition]:
+        """Возвращает по секции на каждое значение ключа.
+
+        Для Enum в секцию попадает название элемента (так Enum хранится в базе данных).
+        Пример названия секции: ``anime_watched``.
+        """
+        partitions: list[Partition] = []
+        for value in values:
+            db_value = value.name if isinstance(value, enum.Enum) else value
+            partitions.append(
+                Partition(name=f'{table_name}_{db_value.lower()}', bound=f"IN ('{db_value}')"),
+            )
+        return partitions
+
+    def get_model_partitions(
+        self: 'Partitioning',
+        model: type['Base'],
+        *,
+        start: datetime.date | None = None,
+        count: int = 1,
+    ) -> list[Partition]:
+        """Возвращает секции модели.
+
+        Для ``LIST`` - по секции на каждое значение Enum-колонки, для ``RANGE`` - ``count`` секций,
+        начиная с ``start`` (по умолчанию - с текущей даты).
+
+        Raises
+        ------
+        ValueError
+            если для ``LIST`` колонка не является Enum.
+        """
+        table_name = model.__tablename__
+        if self.strategy == PartitionStrategyEnum.RANGE:
+            start = start or get_utc_now().date()
+            return self.get_range_partitions(table_name, start=start, count=count)
+        enum_class = getattr(model.__table__.columns[self.column].type, 'enum_class', None)
+        if enum_class is None:
+            msg = LIST_VALUES_NOT_SET_MESSAGE_TEMPLATE.format(column=self.column)
+            raise ValueError(msg)
+        return self.get_list_partitions(table_name, enum_class)
+
+    def get_filters(
+        self: 'Partitioning',
+        model: type['Base'],
+        *,
+        values: Sequence[Any] | None = None,
+        lower: Any = None,  # noqa: ANN401
+        upper: Any = None,  # noqa: ANN401
+    ) -> list['ColumnElement[bool]']:
+        """Возвращает фильтры по ключу секционирования.
+
+        Условие на ключ секционирования позволяет планировщику отбросить лишние секции (partition
+        pruning): ``values`` - для ``LIST``, полуинтервал ``[lower, upper)`` - для ``RANGE``.
+        """
+        column = getattr(model, self.column)
+        filters: list['ColumnElement[bool]'] = []
+        if values is not None:
+            filters.append(column.in_(values))
+        if lower is not None:
+            filters.append(column >= lower)
+        if upper is not None:
+            filters.append(column < upper)
+        return filters
+
+
+def _get_date_from_month_index(month_index: int) -> datetime.date:
+    """Переводит номер месяца от начала эры в дату первого числа этого месяца."""
+    year, month = divmod(month_index, MONTHS_IN_YEAR)
+    return datetime.date(year, month + 1, 1)
+
+
+def get_default_partition_ddl(table_name: str) -> str:
+    """Возвращает SQL для создания секции по умолчанию (для строк вне других секций)."""
+    return f'CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT'
+
+
+def create_partitions(
+    op: 'Operations',
+    table_name: str,
+    partitions: Iterable[Partition],
+    *,
+    with_default: bool = True,
+) -> None:
+    """Помощник для миграций: создает секции таблицы.
+
+    Parameters
+    ----------
+    op
+        операции alembic (``from alembic import op``).
+    table_name
+        название секционированной таблицы.
+    partitions
+        секции для создания.
+    with_default
+        создавать ли секцию по умолчанию? По умолчанию True.
+    """
+    for partition in partitions:
+        op.execute(partition.get_create_ddl(table_name))
+    if with_default:
+        op.execute(get_default_partition_ddl(table_name))
+
+
+def convert_to_partitioned_table(
+    op: 'Operations',
+    table_name: str,
+    partitioning: Partitioning,
+    partitions: Iterable[Partition],
+    *,
+    primary_key: Sequence[str] = ('id',),
+) -> None:
+    """Помощник для миграций: переводит существующую таблицу в секционированную.
+
+    Создает новую таблицу с теми же колонками, значениями по умолчанию и CHECK-ограничениями,
+    создает секции, копирует данные и удаляет старую таблицу. Индексы, триггеры и зависимые
+    представления нужно удалить до вызова и создать заново после.
+
+    Parameters
+    ----------
+    op
+        операции alembic (``from alembic import op``).
+    table_name
+        название таблицы.
+    partitioning
+        описание секционирования.
+    partitions
+        секции для создания (секция по умолчанию создается всегда).
+    primary_key
+        колонки первичного ключа без ключа секционирования (Default: ``('id',)``).
+    """
+    old_table_name = f'{table_name}_unpartitioned'
+    primary_key_columns = ', '.join([*primary_key, partitioning.column])
+    op.execute(f'ALTER TABLE {table_name} RENAME TO {old_table_name}')
+    op.execute(
+        f'CREATE TABLE {table_name} '
+        f'(LIKE {old_table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY {partitioning.partition_by}',
+    )
+    op.execute(f'ALTER TABLE {table_name} ADD PRIMARY KEY ({primary_key_columns})')
+    create_partitions(op, table_name, partitions)
+    op.execute(f'INSERT INTO {table_name} SELECT * FROM {old_table_name}')  # noqa: S608
+    op.execute(f'DROP TABLE {old_table_name}')
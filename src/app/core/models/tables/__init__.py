@@ -1,4 +1,6 @@
 """Пакет таблиц моделей данных проекта."""
 from .admins import Admin  # type: ignore
 from .base import Base  # type: ignore
+from .history import ChangeHistory  # type: ignore
+from .versions import TableVersion  # type: ignore
 from .watch_list import Anime, Kinopoisk  # type: ignore
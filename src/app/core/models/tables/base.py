@@ -1,4 +1,5 @@
 """Модуль базовых таблиц моделей данных проекта."""
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel
@@ -9,12 +10,124 @@ from sqlalchemy.orm import DeclarativeBase
 from app.core.config import get_logger
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     FieldSequence = set[str]
     OptionalFieldSequence = FieldSequence | None
+    ChangedFields = set[str]
+    DiffPair = tuple['Base', 'dict[str, Any] | BaseModel | Base']
 
 logger = get_logger('app')
 ATTR_NOT_FOUND_TEMPLATE = 'Атрибут "{field}" не был найден в модели {class_name}.'
 NOT_LOADED_VALUE = '<Not loaded>'
+TRUNCATED_VALUE_SUFFIX = '...'
+INCORRECT_DIFF_ITEM_TYPE_TEMPLATE = (
+    'Был передан item неправильного типа данных. '
+    'Ожидались: Dict, BaseModel, {class_name}. Пришёл: {item_type}.'
+)
+
+
+@lru_cache
+def _get_diff_column_keys(
+    model: type['Base'],
+    include_fields: frozenset[str] | None = None,
+) -> tuple[str, ...]:
+    """Отдает кортеж названий колонок модели, участвующих в сравнении.
+
+    Результат кэшируется для каждой пары (модель, include_fields), поэтому обход
+    ``__table__.columns`` выполняется только один раз.
+
+    Parameters
+    ----------
+    model
+        класс модели данных sqlalchemy.
+    include_fields
+        поля, которыми нужно ограничить сравнение. Если не переданы, сравниваются все колонки.
+
+    Returns
+    -------
+    tuple[str, ...]
+        названия колонок для сравнения.
+    """
+    keys = model.__table__.columns.keys()
+    if not include_fields:
+        return tuple(keys)
+    return tuple(key for key in keys if key in include_fields)
+
+
+@lru_cache
+def _get_diff_schema_keys(
+    column_keys: tuple[str, ...],
+    schema: type[BaseModel],
+) -> tuple[str, ...]:
+    """Отдает кортеж названий колонок, которые присутствуют в pydantic-схеме.
+
+    Parameters
+    ----------
+    column_keys
+        названия колонок модели для сравнения.
+    schema
+        класс pydantic-схемы.
+
+    Returns
+    -------
+    tuple[str, ...]
+        названия колонок, присутствующих в полях схемы.
+    """
+    return tuple(key for key in column_keys if key in schema.model_fields)
+
+
+@lru_cache
+def _get_repr_plan(
+    model: type['Base'],
+    include_fields: frozenset[str] | None = None,
+    max_elements: int | None = None,
+) -> tuple[str, ...]:
+    """Отдает кортеж названий колонок для компактного строкового представления модели.
+
+    Колонка ``id`` (если есть) всегда идет первой. Результат кэшируется для каждого набора
+    параметров, поэтому при логировании колонки модели не обходятся заново.
+
+    Parameters
+    ----------
+    model
+        класс модели данных sqlalchemy.
+    include_fields
+        поля, которые нужно выводить. Если не переданы, выводятся все колонки.
+    max_elements
+        максимальное количество выводимых колонок.
+
+    Returns
+    -------
+    tuple[str, ...]
+        названия колонок в порядке вывода.
+    """
+    keys = model.__table__.columns.keys()
+    plan = ['id'] if 'id' in keys else []
+    plan.extend(
+        key for key in keys if key != 'id' and (not include_fields or key in include_fields)
+    )
+    if max_elements:
+        plan = plan[:max_elements]
+    return tuple(plan)
+
+
+class LazyModelRepr:
+    """Ленивое строковое представление экземпляра модели.
+
+    Предназначено для передачи в аргументы логгера: строка собирается только тогда, когда запись
+    лога действительно будет выведена.
+    """
+
+    __slots__ = ('_item',)
+
+    def __init__(self: 'LazyModelRepr', item: 'Base') -> None:
+        self._item = item
+
+    def __repr__(self: 'LazyModelRepr') -> str:  # noqa: D105
+        return self._item.compact_repr()
+
+    __str__ = __repr__
 
 
 class Base(DeclarativeBase):
@@ -23,6 +136,7 @@ class Base(DeclarativeBase):
     __abstract__ = True
 
     max_repr_elements: int | None = None
+    max_compact_repr_value_length: int = 50
     differ_include_fields: 'OptionalFieldSequence' = None
     repr_include_fields: 'OptionalFieldSequence' = None
     default_include_fields: 'OptionalFieldSequence' = None
@@ -209,16 +323,12 @@ class Base(DeclarativeBase):
         bool
             является ли сравниваемый объект сходим с другим объектом модели.
         """
-        item_dict = {col.name: getattr(item, col.name) for col in item.__table__.columns}
-        self_dict = {col.name: getattr(self, col.name) for col in self.__table__.columns}
         _include_fields = include_fields or self.differ_include_fields
-        for field, value in item_dict.items():
-            if _include_fields and field not in _include_fields:
-                continue
-            self_field_value = self_dict[field]
-            if self_field_value != value:
-                return True
-        return False
+        column_keys = _get_diff_column_keys(
+            self.__class__,
+            frozenset(_include_fields) if _include_fields else None,
+        )
+        return any(getattr(self, field) != getattr(item, field) for field in column_keys)
 
     def is_different_from(
         self: 'Base',
@@ -252,12 +362,71 @@ class Base(DeclarativeBase):
             return self._is_model_different_from(item, *include_fields)
         if isinstance(item, dict):  # type: ignore
             return self._is_dict_different_from(item, *include_fields)
-        msg = (
-            'Был передан item неправильного типа данных. '
-            f'Ожидались: Dict, BaseModel, {self.__class__.__name__}. Пришёл: {type(item)}.'
+        msg = INCORRECT_DIFF_ITEM_TYPE_TEMPLATE.format(
+            class_name=self.__class__.__name__,
+            item_type=type(item),
         )
         raise TypeError(msg)
 
+    @classmethod
+    def diff_many(
+        cls: type['Base'],
+        pairs: 'Iterable[DiffPair]',
+        include_fields: set[str] | None = None,
+    ) -> list['ChangedFields']:
+        """Пакетное сравнение экземпляров моделей с переданными данными.
+
+        В отличие от ``is_different_from`` не останавливается на первом отличии, а возвращает
+        полный набор измененных полей для каждой пары. Сравниваются только колонки модели
+        (ограниченные ``include_fields`` или ``differ_include_fields`` класса), кортежи названий
+        которых вычисляются один раз для модели и схемы. pydantic-схемы не сериализуются через
+        ``model_dump``: значения берутся напрямую из атрибутов. Из словарей сравниваются только
+        те колонки, которые в них присутствуют.
+
+        Parameters
+        ----------
+        pairs
+            последовательность пар (экземпляр модели, данные для сравнения).
+        include_fields
+            поля, которыми нужно ограничить сравнение (Default: ``None``).
+
+        Returns
+        -------
+        list[set[str]]
+            множества измененных полей для каждой пары в порядке их передачи.
+
+        Raises
+        ------
+        TypeError
+            выбрасывается, когда был передан невалидный тип данных для сравнения.
+        """
+        _include_fields = include_fields or cls.differ_include_fields
+        frozen_include_fields = frozenset(_include_fields) if _include_fields else None
+        result: list['ChangedFields'] = []
+        for self_item, item in pairs:
+            column_keys = _get_diff_column_keys(self_item.__class__, frozen_include_fields)
+            if isinstance(item, BaseModel):
+                keys = _get_diff_schema_keys(column_keys, item.__class__)
+                changed = {key for key in keys if getattr(self_item, key) != getattr(item, key)}
+            elif isinstance(item, self_item.__class__):
+                changed = {
+                    key for key in column_keys if getattr(self_item, key) != getattr(item, key)
+                }
+            elif isinstance(item, dict):  # type: ignore
+                changed = {
+                    key
+                    for key in column_keys
+                    if key in item and getattr(self_item, key) != item[key]
+                }
+            else:
+                msg = INCORRECT_DIFF_ITEM_TYPE_TEMPLATE.format(
+                    class_name=self_item.__class__.__name__,
+                    item_type=type(item),
+                )
+                raise TypeError(msg)
+            result.append(changed)
+        return result
+
     def __repr__(self: 'Base') -> str:
         """Строковая репрезентация экземпляра класса модели.
 
@@ -299,3 +468,38 @@ class Base(DeclarativeBase):
             values_pairs_list = values_pairs_list[: self.max_repr_elements]
         values_pairs = ', '.join(values_pairs_list)
         return f'{class_name}({values_pairs})'
+
+    def compact_repr(self: 'Base') -> str:
+        """Компактная строковая репрезентация экземпляра класса модели.
+
+        В отличие от ``__repr__`` не создает инспектора: значения берутся из ``__dict__``
+        экземпляра, а список колонок вычисляется один раз для класса (с учетом
+        ``repr_include_fields`` и ``max_repr_elements``). Длинные значения обрезаются до
+        ``max_compact_repr_value_length`` символов.
+        """
+        plan = _get_repr_plan(
+            self.__class__,
+            frozenset(self.repr_include_fields) if self.repr_include_fields else None,
+            self.max_repr_elements,
+        )
+        max_length = self.max_compact_repr_value_length
+        values = self.__dict__
+        values_pairs_list: list[str] = []
+        for col in plan:
+            if col not in values:
+                values_pairs_list.append(f'{col}={NOT_LOADED_VALUE}')
+                continue
+            value = values[col]
+            if isinstance(value, str) and len(value) > max_length:
+                value_repr = f'{repr(value[:max_length])}{TRUNCATED_VALUE_SUFFIX}'
+            else:
+                value_repr = repr(value)
+                if len(value_repr) > max_length:
+                    value_repr = f'{value_repr[:max_length]}{TRUNCATED_VALUE_SUFFIX}'
+            values_pairs_list.append(f'{col}={value_repr}')
+        values_pairs = ', '.join(values_pairs_list)
+        return f'{self.__class__.__name__}({values_pairs})'
+
+    def lazy_repr(self: 'Base') -> LazyModelRepr:
+        """Отдает ленивую компактную репрезентацию экземпляра для передачи в логгер."""
+        return LazyModelRepr(self)
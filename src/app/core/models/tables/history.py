@@ -0,0 +1,52 @@
+"""Модуль таблицы истории изменений."""
+import datetime
+from typing import Any
+
+from sqlalchemy import Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.mixins.ids import IntegerIDMixin
+from app.core.models.tables.base import Base
+from app.core.models.types.datetime import UTCDateTime, Utcnow
+
+TABLE_NAME_LENGTH = 63
+ITEM_ID_LENGTH = 255
+FIELD_NAME_LENGTH = 63
+
+
+class ChangeHistory(IntegerIDMixin, Base):
+    """Запись истории изменений: изменение одного поля одной сущности.
+
+    Таблица только пополняется: изменение и удаление записей запрещено триггером в миграции.
+    Возрастающий ``id`` используется для пагинации по ключу.
+    """
+
+    __tablename__ = 'change_history'
+    __table_args__ = (
+        Index('ix_change_history_table_name_item_id_id', 'table_name', 'item_id', 'id'),
+    )
+
+    table_name: Mapped[str] = mapped_column(
+        String(TABLE_NAME_LENGTH),
+        nullable=False,
+        doc='Таблица измененной сущности',
+    )
+    item_id: Mapped[str] = mapped_column(
+        String(ITEM_ID_LENGTH),
+        nullable=False,
+        doc='Первичный ключ измененной сущности',
+    )
+    field: Mapped[str] = mapped_column(
+        String(FIELD_NAME_LENGTH),
+        nullable=False,
+        doc='Измененное поле',
+    )
+    old_value: Mapped[Any] = mapped_column(JSONB(none_as_null=True), nullable=True, doc='Было')
+    new_value: Mapped[Any] = mapped_column(JSONB(none_as_null=True), nullable=True, doc='Стало')
+    changed_at: Mapped[datetime.datetime] = mapped_column(
+        UTCDateTime,
+        nullable=False,
+        server_default=Utcnow(),
+        doc='Время изменения',
+    )
@@ -2,12 +2,15 @@ import datetime
 import uuid
 from typing import Literal, Self
 
-from sqlalchemy import UUID, ForeignKey, String
+from sqlalchemy import UUID, Enum, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.models.enums.watch_list import AnimeKindEnum
 from app.core.models.mixins.ids import UUIDMixin
 from app.core.models.mixins.time import TimeMixin
+from app.core.models.partitioning import Partitioning, PartitionStrategyEnum
 from app.core.models.tables import Base
+from app.core.models.tables.watch_list import WatchListElementBase
 from app.core.models.types.datetime import UTCDateTime
 
 
@@ -21,6 +24,7 @@ class TestBaseModel(UUIDMixin, TimeMixin, Base):
     __tablename__ = '__test_model__'
 
     text: Mapped[str | None] = mapped_column(String)
+    number: Mapped[int | None] = mapped_column(Integer)
     disabled_at: Mapped[datetime.datetime | None] = mapped_column(UTCDateTime)
     test_related_models: Mapped[list['TestRelatedModel']] = relationship(
         uselist=True,
@@ -55,3 +59,31 @@ class TestRelatedModel(UUIDMixin, TimeMixin, Base):
     def some_callable(self: Self) -> Literal['abc']:
         """тестовый метод."""
         return 'abc'
+
+
+class TestRangePartitionedModel(WatchListElementBase):
+    """Тестовая модель, секционированная по диапазону дат создания."""
+
+    __test__ = False  # pytest collect skip
+    __tablename__ = '__test_range_partitioned_model__'
+
+    partitioning = Partitioning(strategy=PartitionStrategyEnum.RANGE, column='created_at')
+    kind: Mapped[AnimeKindEnum] = mapped_column(
+        Enum(AnimeKindEnum),
+        nullable=False,
+        default=AnimeKindEnum.NOT_SET,
+    )
+
+
+class TestListPartitionedModel(WatchListElementBase):
+    """Тестовая модель, секционированная по статусу."""
+
+    __test__ = False  # pytest collect skip
+    __tablename__ = '__test_list_partitioned_model__'
+
+    partitioning = Partitioning(strategy=PartitionStrategyEnum.LIST, column='status')
+    kind: Mapped[AnimeKindEnum] = mapped_column(
+        Enum(AnimeKindEnum),
+        nullable=False,
+        default=AnimeKindEnum.NOT_SET,
+    )
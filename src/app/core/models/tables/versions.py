@@ -0,0 +1,71 @@
+"""Модуль таблицы версий таблиц.
+
+Версия таблицы увеличивается триггером уровня оператора (``FOR EACH STATEMENT``) после каждого
+``INSERT``, ``UPDATE``, ``DELETE`` и ``TRUNCATE`` таблицы в той же транзакции, поэтому новая
+версия видна ровно тогда, когда видны изменения. Чтение версии - запрос по первичному ключу.
+
+Строка версии блокируется до конца изменяющей транзакции: одновременные изменения одной таблицы
+фиксируются по очереди. Для таблиц с частыми одновременными изменениями это заметная цена.
+
+Триггеры создаются миграцией, а для схем из ``metadata.create_all`` (тестовые базы данных) -
+обработчиком ``after_create`` метаданных.
+"""
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, String, event, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.tables.base import Base
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy import MetaData, Table
+    from sqlalchemy.engine import Connection
+
+TABLE_NAME_LENGTH = 63
+BUMP_TABLE_VERSION_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION bump_table_version()
+        RETURNS TRIGGER AS $$
+    BEGIN
+        INSERT INTO table_versions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+        ON CONFLICT (table_name) DO UPDATE SET version = table_versions.version + 1;
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql';
+"""
+
+
+class TableVersion(Base):
+    """Версия таблицы: растет при каждом изменении данных таблицы."""
+
+    __tablename__ = 'table_versions'
+
+    table_name: Mapped[str] = mapped_column(
+        String(TABLE_NAME_LENGTH),
+        primary_key=True,
+        doc='Название таблицы',
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, doc='Версия таблицы')
+
+
+def get_bump_table_version_trigger_sql(table_name: str) -> str:
+    """Возвращает SQL создания триггера версии таблицы ``table_name``."""
+    return f"""
+        CREATE TRIGGER bump_table_version_{table_name}
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table_name}"
+        FOR EACH STATEMENT EXECUTE PROCEDURE bump_table_version();
+    """
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _create_version_triggers(
+    metadata: 'MetaData',
+    connection: 'Connection',
+    tables: 'Sequence[Table]' = (),
+    **_: object,
+) -> None:
+    connection.execute(text(BUMP_TABLE_VERSION_FUNCTION_SQL))
+    for table in tables:
+        if table.name != TableVersion.__tablename__:
+            connection.execute(text(get_bump_table_version_trigger_sql(table.name)))
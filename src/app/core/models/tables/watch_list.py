@@ -1,10 +1,13 @@
 """Модуль таблиц списка просмотренного/прочитанного/наигранного."""
-from sqlalchemy import CheckConstraint, Enum, Integer, SmallInteger, String
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Any, ClassVar
+
+from sqlalchemy import CheckConstraint, Enum, Index, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, MappedColumn, declared_attr, mapped_column
 
 from app.core.models.enums import watch_list as watch_list_enums
 from app.core.models.mixins.ids import UUIDMixin
 from app.core.models.mixins.time import TimeMixin
+from app.core.models.partitioning import Partitioning
 from app.core.models.tables.base import Base
 
 KIND_NOT_SET_MESSAGE = 'Сделайте атрибут "kind" полем модели (Enum).'
@@ -16,12 +19,31 @@ class WatchListElementBase(TimeMixin, UUIDMixin, Base):
     """Базовый класс элемента списка просмотренного."""
 
     __abstract__ = True
-    __table_args__ = (
-        CheckConstraint('score >= 0'),
-        CheckConstraint('score <= 100'),
-    )
 
     kind = None  # Установить в качестве ENUM.
+    partitioning: ClassVar[Partitioning | None] = None
+
+    @declared_attr.directive
+    def __table_args__(cls: 'type[WatchListElementBase]') -> tuple[Any, ...]:  # noqa: N805
+        """Ограничения и индексы таблицы.
+
+        Индексы покрывают сортировки админ-панели и сортировку по ``updated_at`` (с ``id`` для
+        пагинации по ключу). Триграммные индексы для поиска по ``name``/``native_name`` требуют
+        расширения ``pg_trgm`` и создаются только миграцией.
+        """
+        table_name = cls.__tablename__
+        table_args = (
+            CheckConstraint('score >= 0'),
+            CheckConstraint('score <= 100'),
+            Index(f'ix_{table_name}_kind', 'kind'),
+            Index(f'ix_{table_name}_status_score', 'status', 'score'),
+            Index(f'ix_{table_name}_score', 'score'),
+            Index(f'ix_{table_name}_repeat_view_count', 'repeat_view_count'),
+            Index(f'ix_{table_name}_updated_at_id', 'updated_at', 'id'),
+        )
+        if cls.partitioning is None:
+            return table_args
+        return (*table_args, {'postgresql_partition_by': cls.partitioning.partition_by})
 
     name: Mapped[str] = mapped_column(
         String(WATCH_LIST_ELEMENT_NAME_LENGTH),
@@ -64,6 +86,12 @@ class WatchListElementBase(TimeMixin, UUIDMixin, Base):
     )
 
     def __init_subclass__(cls: 'type[WatchListElementBase]') -> None:  # noqa: D105
+        if cls.partitioning is not None:
+            # PostgreSQL требует, чтобы ключ секционирования входил в первичный ключ. Колонка
+            # копируется, чтобы не изменить колонку базового класса и примеси.
+            column: MappedColumn[Any] = getattr(cls, cls.partitioning.column)._copy()
+            column.column.primary_key = True
+            setattr(cls, cls.partitioning.column, column)
         super().__init_subclass__()
         if cls.kind is None:
             raise NotImplementedError(KIND_NOT_SET_MESSAGE)
@@ -0,0 +1,8 @@
+"""Пакет представлений (views) базы данных проекта.
+
+Представления не входят в ``Base.metadata``: они создаются и удаляются только миграциями, поэтому
+их описания хранятся в отдельной ``MetaData``.
+"""
+from sqlalchemy import MetaData
+
+views_metadata = MetaData()
@@ -0,0 +1,117 @@
+"""Модуль представлений (views) списка просмотренного/прочитанного/наигранного."""
+import enum
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Enum,
+    Float,
+    Numeric,
+    SmallInteger,
+    String,
+    Table,
+    cast,
+    literal,
+    select,
+    union_all,
+)
+
+from app.core.models.enums import watch_list as watch_list_enums
+from app.core.models.tables.watch_list import Anime, Kinopoisk
+from app.core.models.views import views_metadata
+
+if TYPE_CHECKING:
+    from sqlalchemy.sql.selectable import Subquery
+
+    from app.core.models.tables.watch_list import WatchListElementBase
+
+WATCH_LIST_FEED_FIELDS = (
+    'id',
+    'name',
+    'native_name',
+    'description',
+    'my_opinion',
+    'score',
+    'repeat_view_count',
+    'status',
+    'created_at',
+    'updated_at',
+)
+
+
+def get_watch_list_stats_view(name: str, kind_enum: type[enum.Enum]) -> Table:
+    """Отдает описание материализованного представления статистики элементов списка.
+
+    Представление сгруппировано по статусу и виду элемента и содержит уникальный индекс по этим
+    колонкам, что позволяет обновлять его через ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` без
+    блокировки чтения.
+
+    Parameters
+    ----------
+    name
+        название представления в базе данных.
+    kind_enum
+        enum вида элемента списка.
+
+    Returns
+    -------
+    Table
+        описание представления.
+    """
+    return Table(
+        name,
+        views_metadata,
+        Column('status', Enum(watch_list_enums.StatusEnum)),
+        Column('kind', Enum(kind_enum)),
+        Column('items_count', BigInteger),
+        Column('score_avg', Numeric),
+        Column('score_min', SmallInteger),
+        Column('score_max', SmallInteger),
+        Column('score_median', Float),
+        Column('repeat_view_count_sum', BigInteger),
+    )
+
+
+anime_stats_view = get_watch_list_stats_view('anime_stats', watch_list_enums.AnimeKindEnum)
+kinopoisk_stats_view = get_watch_list_stats_view(
+    'kinopoisk_stats',
+    watch_list_enums.KinopoiskKindEnum,
+)
+
+
+def get_watch_list_feed_subquery(
+    models: 'dict[str, type[WatchListElementBase]]',
+    name: str = 'watch_list_feed',
+) -> 'Subquery':
+    """Отдает объединение (``UNION ALL``) таблиц элементов списка в виде подзапроса.
+
+    Помимо общих полей содержит колонку ``source`` (ключ таблицы из ``models``) и колонку ``kind``,
+    приведенную к строке (у каждой таблицы свой enum вида). Фильтры и сортировка, наложенные на
+    подзапрос, PostgreSQL переносит внутрь каждой ветки объединения, поэтому они используют индексы
+    таблиц.
+
+    Parameters
+    ----------
+    models
+        словарь моделей элементов списка по их ключу.
+    name
+        название подзапроса.
+
+    Returns
+    -------
+    Subquery
+        подзапрос объединения таблиц.
+    """
+    selects = [
+        select(
+            literal(source, String).label('source'),
+            cast(model.kind, String).label('kind'),  # type: ignore
+            *(getattr(model, field) for field in WATCH_LIST_FEED_FIELDS),
+        )
+        for source, model in models.items()
+    ]
+    return union_all(*selects).subquery(name)
+
+
+watch_list_feed = get_watch_list_feed_subquery({'anime': Anime, 'kinopoisk': Kinopoisk})
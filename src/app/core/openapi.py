@@ -0,0 +1,160 @@
+"""Модуль предварительно подготовленной схемы OpenAPI.
+
+FastAPI строит схему при первом запросе ``/openapi.json`` в каждом воркере и сериализует ее на
+каждый запрос. Здесь схема строится при запуске приложения один раз, сериализуется orjson и
+заранее сжимается (gzip, brotli - если установлен пакет ``brotli``). Ответ отдается с ``ETag`` и
+``Cache-Control``; клиенту с актуальной копией (``If-None-Match``) возвращается ``304``.
+"""
+import functools
+import pathlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import orjson
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.utils import http as http_utils
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from starlette.requests import Request
+
+OPENAPI_MEDIA_TYPE = 'application/json'
+
+
+@functools.lru_cache
+def read_description(path: pathlib.Path) -> str:
+    """Читает описание документации из файла (один раз на процесс)."""
+    with path.open(mode='r') as reader:
+        return reader.read()
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedContent:
+    """Подготовленное содержимое ответа.
+
+    Attributes
+    ----------
+    body
+        тело ответа без сжатия.
+    etag
+        ETag тела ответа.
+    encoded
+        сжатые варианты тела ответа по кодировкам (``gzip``, ``br``).
+    """
+
+    body: bytes
+    etag: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def render(
+        cls: type['RenderedContent'],
+        body: bytes,
+        encodings: tuple[str, ...] | None = None,
+    ) -> 'RenderedContent':
+        """Подготавливает содержимое: ETag и сжатые варианты тела."""
+        if encodings is None:
+            encodings = http_utils.get_supported_encodings()
+        return cls(
+            body=body,
+            etag=http_utils.make_etag(body),
+            encoded={encoding: http_utils.compress(body, encoding) for encoding in encodings},
+        )
+
+    def get_response(
+        self: 'RenderedContent',
+        request: 'Request',
+        *,
+        media_type: str,
+        cache_control: str,
+    ) -> Response:
+        """Возвращает ответ на запрос: ``304`` или тело в принимаемой клиентом кодировке."""
+        headers = {'ETag': self.etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        if http_utils.etag_matches(request.headers.get('if-none-match'), self.etag):
+            return Response(status_code=304, headers=headers)
+        encoding = http_utils.choose_encoding(
+            request.headers.get('accept-encoding', ''),
+            self.encoded,
+        )
+        if encoding is None:
+            return Response(self.body, media_type=media_type, headers=headers)
+        headers['Content-Encoding'] = encoding
+        return Response(self.encoded[encoding], media_type=media_type, headers=headers)
+
+
+class PrerenderedOpenAPI:
+    """Схема OpenAPI приложения, подготовленная один раз для каждого ``root_path``.
+
+    Как и в FastAPI, ``root_path`` запроса (``scope['root_path']``, например, от
+    ``uvicorn --root-path`` или прокси) добавляется в ``servers`` схемы. Значения ``root_path``
+    задаются конфигурацией сервера, а не клиентом, поэтому вариантов схемы немного.
+
+    Parameters
+    ----------
+    app
+        приложение FastAPI.
+    cache_control
+        значение заголовка ``Cache-Control`` ответа.
+    """
+
+    def __init__(self: 'PrerenderedOpenAPI', app: 'FastAPI', *, cache_control: str) -> None:
+        """Инициализация схемы."""
+        self.app = app
+        self.cache_control = cache_control
+        self.contents: dict[str, RenderedContent] = {}
+
+    def render(self: 'PrerenderedOpenAPI', root_path: str | None = None) -> RenderedContent:
+        """Строит, сериализует и сжимает схему для ``root_path`` (если она еще не подготовлена).
+
+        Parameters
+        ----------
+        root_path
+            ``root_path`` запроса (Default: ``None`` - ``root_path`` приложения).
+        """
+        if root_path is None:
+            root_path = self.app.root_path
+        root_path = root_path.rstrip('/')
+        content = self.contents.get(root_path)
+        if content is not None:
+            return content
+        schema = self.app.openapi()
+        servers = schema.get('servers', [])
+        if (
+            root_path
+            and self.app.root_path_in_servers
+            and root_path not in {server.get('url') for server in servers}
+        ):
+            schema = {**schema, 'servers': [{'url': root_path}, *servers]}
+        content = self.contents[root_path] = RenderedContent.render(orjson.dumps(schema))
+        return content
+
+    async def startup(self: 'PrerenderedOpenAPI') -> None:
+        """Обработчик запуска приложения: подготавливает схему для ``root_path`` приложения."""
+        self.render()
+
+    async def endpoint(self: 'PrerenderedOpenAPI', request: 'Request') -> Response:
+        """Эндпоинт схемы OpenAPI."""
+        return self.render(request.scope.get('root_path', '')).get_response(
+            request,
+            media_type=OPENAPI_MEDIA_TYPE,
+            cache_control=self.cache_control,
+        )
+
+
+def install_prerendered_openapi(app: 'FastAPI', *, cache_control: str) -> PrerenderedOpenAPI:
+    """Заменяет эндпоинт схемы OpenAPI приложения на подготовленную при запуске схему.
+
+    Если у приложения нет эндпоинта схемы (``openapi_url=None``), ничего не меняется.
+    """
+    openapi = PrerenderedOpenAPI(app, cache_control=cache_control)
+    if not app.openapi_url:
+        return openapi
+    routes = app.router.routes
+    for index, route in enumerate(routes):
+        if isinstance(route, Route) and route.path == app.openapi_url:
+            routes[index] = Route(app.openapi_url, openapi.endpoint, include_in_schema=False)
+            app.add_event_handler('startup', openapi.startup)
+            break
+    return openapi
@@ -0,0 +1,76 @@
+"""Модуль схем агрегации (статистики) данных."""
+import enum
+from typing import TYPE_CHECKING, Any, Self
+
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy import func as sql_func
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy.sql.elements import ColumnElement
+
+PERCENTILE_NOT_SET_MESSAGE = 'Для функции "percentile" нужно обязательно передать percentile.'
+
+
+class AggregateFunctionEnum(str, enum.Enum):
+    """Enum агрегирующих функций.
+
+    Хранит дополнительную информацию: функцию sqlalchemy для построения выражения (для перцентиля
+    выражение строится отдельно, потому что ему нужен параметр).
+    """
+
+    func: 'Callable[[Any], ColumnElement[Any]] | None'
+
+    COUNT = 'count', sql_func.count
+    AVG = 'avg', sql_func.avg
+    MIN = 'min', sql_func.min
+    MAX = 'max', sql_func.max
+    SUM = 'sum', sql_func.sum
+    PERCENTILE = 'percentile', None
+
+    def __new__(  # noqa: D102
+        cls: type['AggregateFunctionEnum'],
+        title: str,
+        func: 'Callable[[Any], ColumnElement[Any]] | None',
+    ) -> 'AggregateFunctionEnum':
+        obj = str.__new__(cls, title)
+        obj._value_ = title
+        obj.func = func
+        return obj
+
+
+class AggregationSchema(BaseModel):
+    """Схема агрегации по полю модели."""
+
+    field: str
+    function: AggregateFunctionEnum
+    percentile: float | None = Field(default=None, ge=0, le=1)
+    alias: str | None = None
+
+    @model_validator(mode='after')
+    def check_percentile(self: Self) -> Self:
+        """Проверяет, что для перцентиля передано его значение."""
+        if self.function == AggregateFunctionEnum.PERCENTILE and self.percentile is None:
+            raise ValueError(PERCENTILE_NOT_SET_MESSAGE)
+        return self
+
+    @property
+    def label(self: Self) -> str:
+        """Название колонки с результатом агрегации.
+
+        Пример: ``avg_score``, ``p50_score``.
+        """
+        if self.alias:
+            return self.alias
+        if self.function == AggregateFunctionEnum.PERCENTILE and self.percentile is not None:
+            return f'p{round(self.percentile * 100)}_{self.field}'
+        return f'{self.function.value}_{self.field}'
+
+    def get_expression(self: Self, column: Any) -> 'ColumnElement[Any]':  # noqa: ANN401
+        """Строит агрегирующее выражение для переданной колонки (с названием ``label``)."""
+        if self.function == AggregateFunctionEnum.PERCENTILE:
+            expression = sql_func.percentile_cont(self.percentile).within_group(column)
+        else:
+            expression = self.function.func(column)  # type: ignore
+        return expression.label(self.label)
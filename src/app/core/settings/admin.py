@@ -14,3 +14,11 @@ class AdminSettings(ProjectBaseSettings):
         default='some_secret_key',
         description='Секретный ключ для работы авторизации.',
     )
+    auth_check_ttl: float = Field(
+        default=5.0,
+        ge=0,
+        description=(
+            'Сколько секунд результат проверки существования администратора используется без '
+            'повторного запроса в базу данных (0 - проверять при каждом запросе).'
+        ),
+    )
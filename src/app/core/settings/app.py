@@ -7,7 +7,7 @@ from fastapi.openapi.models import Contact, License, Server
 from pydantic import AnyHttpUrl, Field
 from pydantic_settings import SettingsConfigDict
 
-from app.core.settings.base import APP_DIR, ProjectBaseSettings
+from app.core.settings.base import APP_DIR, LOGS_DIR, ProjectBaseSettings
 
 
 class ThemeEnum(str, enum.Enum):
@@ -67,6 +67,10 @@ class AppSettings(ProjectBaseSettings):
         default='/openapi.json',
         description='Относительный путь к openapi.json файлу',
     )
+    openapi_cache_control: str = Field(
+        default='public, max-age=300',
+        description='Заголовок Cache-Control ответа со схемой OpenAPI',
+    )
     redoc_url: str = Field(
         default='/redoc',
         description='Относительный путь к документации (redoc)',
@@ -140,6 +144,75 @@ class AppSettings(ProjectBaseSettings):
 
     path_to_description: pathlib.Path = APP_DIR / 'openapi_description.md'
 
+    metrics_enabled: bool = Field(
+        default=True,
+        description='Включить сбор метрик и эндпоинт метрик для Prometheus?',
+    )
+    metrics_url: str = Field(
+        default='/metrics',
+        description='Относительный путь к эндпоинту метрик',
+    )
+    compression_enabled: bool = Field(
+        default=True,
+        description='Сжимать ответы (gzip, brotli)?',
+    )
+    compression_minimum_size: int = Field(
+        default=1024,
+        ge=0,
+        description='Минимальный размер тела ответа (в байтах), начиная с которого он сжимается',
+    )
+    conditional_get_enabled: bool = Field(
+        default=True,
+        description='Отвечать 304 на условные запросы страниц списков просмотренного (ETag)?',
+    )
+    response_cache_enabled: bool = Field(
+        default=False,
+        description='Кэшировать страницы списков просмотренного в админ-панели?',
+    )
+    response_cache_url: str | None = Field(
+        default=None,
+        description='Адрес Redis для кэша ответов (None - кэш в памяти процесса)',
+    )
+    response_cache_ttl: float = Field(
+        default=30,
+        gt=0,
+        description='Время жизни записи кэша ответов (в секундах)',
+    )
+    response_cache_stale_ttl: float = Field(
+        default=30,
+        ge=0,
+        description='Сколько секунд после истечения записи она отдается, пока строится новая',
+    )
+    response_cache_max_size: int = Field(
+        default=1024,
+        gt=0,
+        description='Максимальное количество записей кэша ответов в памяти процесса',
+    )
+    profiling_enabled: bool = Field(
+        default=False,
+        description='Включить выборочное профилирование запросов?',
+    )
+    profiling_sample_rate: float = Field(
+        default=0.01,
+        ge=0,
+        le=1,
+        description='Доля профилируемых запросов',
+    )
+    profiling_interval: float = Field(
+        default=0.005,
+        gt=0,
+        description='Период снятия стеков профайлером (в секундах)',
+    )
+    profiling_threshold: float = Field(
+        default=0.5,
+        ge=0,
+        description='Длительность запроса (в секундах), начиная с которой сохраняется профиль',
+    )
+    profiling_dir: pathlib.Path = Field(
+        default=LOGS_DIR / 'profiles',
+        description='Директория для профилей запросов (формат speedscope)',
+    )
+
     @property
     def fastapi_kwargs(self: 'AppSettings') -> FastAPIKwargs:
         """Свойство, возвращающее настройки для FastAPI в виде словаря.
@@ -1,8 +1,21 @@
-"""Модуль базовых настроек проекта."""
+"""Модуль базовых настроек проекта.
+
+Env-файл (``dotenv/.env.<режим запуска>``) читается один раз на процесс: его значения кэшируются и
+используются всеми группами настроек (см. ``CachedDotEnvSettingsSource``). Настройки неизменяемые
+(``frozen``), поэтому проверка значений выполняется только при создании.
+"""
 import os
 import pathlib
+from collections.abc import Mapping
+from functools import lru_cache
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+from pydantic_settings.sources import read_env_file
 
 from app.utils import env as env_utils
 
@@ -24,16 +37,88 @@ env_file_name = f'{env_file_base_name}.{project_run_mode}'
 env_files_dir = PROJECT_ROOT_DIR / 'dotenv'
 
 
+@lru_cache
+def read_env_file_once(
+    path: pathlib.Path,
+    encoding: str | None,
+    case_sensitive: bool,  # noqa: FBT001
+) -> Mapping[str, str | None]:
+    """Читает env-файл (один раз на процесс для каждого файла и параметров чтения).
+
+    Parameters
+    ----------
+    path
+        путь к env-файлу.
+    encoding
+        кодировка файла.
+    case_sensitive
+        учитывать ли регистр названий переменных.
+
+    Returns
+    -------
+    Mapping[str, str | None]
+        переменные env-файла (пустой словарь, если файла нет).
+    """
+    if not path.is_file():
+        return {}
+    return read_env_file(path, encoding=encoding, case_sensitive=case_sensitive)
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """Источник настроек из env-файлов, который читает каждый файл один раз на процесс."""
+
+    def _read_env_files(
+        self: 'CachedDotEnvSettingsSource',
+        case_sensitive: bool,  # noqa: FBT001
+    ) -> Mapping[str, str | None]:
+        env_files = self.env_file
+        if env_files is None:
+            return {}
+        if isinstance(env_files, str | os.PathLike):
+            env_files = [env_files]
+        dotenv_vars: dict[str, str | None] = {}
+        for env_file in env_files:
+            dotenv_vars.update(
+                read_env_file_once(
+                    pathlib.Path(env_file).expanduser(),
+                    self.env_file_encoding,
+                    case_sensitive,
+                ),
+            )
+        return dotenv_vars
+
+
 class ProjectBaseSettings(BaseSettings):
     """Базовые настройки проекта."""
 
     model_config = SettingsConfigDict(
         extra='ignore',
         env_file=env_files_dir / env_file_name,
-        validate_assignment=True,
+        frozen=True,
         env_nested_delimiter='_',
     )
 
+    @classmethod
+    def settings_customise_sources(  # noqa: PLR0913
+        cls: type['ProjectBaseSettings'],
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """Источники настроек: env-файл читается через кэширующий источник."""
+        if isinstance(dotenv_settings, DotEnvSettingsSource):
+            dotenv_settings = CachedDotEnvSettingsSource(
+                settings_cls,
+                env_file=dotenv_settings.env_file,
+                env_file_encoding=dotenv_settings.env_file_encoding,
+                case_sensitive=dotenv_settings.case_sensitive,
+                env_prefix=dotenv_settings.env_prefix,
+                env_nested_delimiter=dotenv_settings.env_nested_delimiter,
+            )
+        return init_settings, env_settings, dotenv_settings, file_secret_settings
+
 
 class PathSettings(ProjectBaseSettings):
     """Настройки, содержащие базовые пути проекта."""
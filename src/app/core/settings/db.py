@@ -33,6 +33,23 @@ class DatabaseSettings(ProjectBaseSettings):
             name='postgres',
         )
 
+    @property
+    def asyncpg_db_url(self: 'DatabaseSettings') -> str:
+        """Свойство, возвращающее ссылку на базу данных проекта для прямого подключения asyncpg.
+
+        Returns
+        -------
+            str: ссылка на базу данных.
+        """
+        return POSTGRESQL_URL_TEMPLATE.format(
+            type=self.type_,
+            user=self.user,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            name=self.name,
+        )
+
     @property
     def db_url(self: 'DatabaseSettings') -> str:
         """Свойство, возвращающее ссылку на базу данных.
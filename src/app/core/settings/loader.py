@@ -0,0 +1,152 @@
+"""Модуль загрузки всех настроек проекта за один проход.
+
+``load_settings`` создает все группы настроек (приложение, база данных, аутентификация,
+админ-панель, пути) разом; env-файл при этом читается один раз (см. ``app.core.settings.base``).
+
+Снимок настроек можно сохранить в JSON-файл (``save_snapshot``, команда ``dump-settings``) и
+загрузить в воркерах без чтения env-файла и переменных окружения: путь к снимку передается
+переменной окружения ``SETTINGS_SNAPSHOT``. Снимок, сохраненный для другого режима запуска или
+env-файла, не используется.
+
+ВНИМАНИЕ! Снимок содержит секреты (ключи JWT и админ-панели, пароль базы данных) в открытом виде.
+"""
+import logging
+import os
+import pathlib
+from dataclasses import dataclass, fields
+from typing import Any
+
+import orjson
+from pydantic import SecretStr
+
+from app.core.settings.admin import AdminSettings
+from app.core.settings.app import AppSettings
+from app.core.settings.auth import AuthSettings
+from app.core.settings.base import (
+    PathSettings,
+    ProjectBaseSettings,
+    env_file_name,
+    env_files_dir,
+    project_run_mode,
+)
+from app.core.settings.db import DatabaseSettings
+
+SNAPSHOT_ENV_VARIABLE = 'SETTINGS_SNAPSHOT'
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class SettingsSnapshot:
+    """Снимок всех групп настроек проекта.
+
+    Attributes
+    ----------
+    app
+        настройки приложения.
+    db
+        настройки базы данных.
+    auth
+        настройки системы аутентификации.
+    admin
+        настройки админ-панели.
+    paths
+        настройки путей проекта.
+    """
+
+    app: AppSettings
+    db: DatabaseSettings
+    auth: AuthSettings
+    admin: AdminSettings
+    paths: PathSettings
+
+
+def get_snapshot_source() -> dict[str, str]:
+    """Возвращает режим запуска и env-файл, для которых создаются настройки."""
+    return {'run_mode': project_run_mode, 'env_file': (env_files_dir / env_file_name).as_posix()}
+
+
+def load_settings() -> SettingsSnapshot:
+    """Создает все группы настроек из переменных окружения и env-файла."""
+    return SettingsSnapshot(
+        **{item.name: item.type() for item in fields(SettingsSnapshot)},  # type: ignore
+    )
+
+
+def _serialize(value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, SecretStr):
+        return value.get_secret_value()
+    return str(value)
+
+
+def dump_snapshot(snapshot: SettingsSnapshot) -> bytes:
+    """Сериализует снимок настроек в JSON (секреты - в открытом виде)."""
+    groups: dict[str, Any] = {}
+    for item in fields(SettingsSnapshot):
+        settings: ProjectBaseSettings = getattr(snapshot, item.name)
+        groups[item.name] = settings.model_dump()
+    return orjson.dumps(
+        {'version': SNAPSHOT_VERSION, **get_snapshot_source(), 'groups': groups},
+        default=_serialize,
+    )
+
+
+def parse_snapshot(data: bytes) -> SettingsSnapshot:
+    """Восстанавливает снимок настроек из JSON.
+
+    Значения проверяются моделями настроек, но переменные окружения и env-файл не читаются.
+
+    Raises
+    ------
+    ValueError
+        снимок некорректный или сохранен для другой версии, режима запуска или env-файла.
+    """
+    try:
+        content = orjson.loads(data)
+    except orjson.JSONDecodeError as exc:
+        msg = 'снимок настроек не является корректным JSON.'
+        raise ValueError(msg) from exc
+    if not isinstance(content, dict) or content.get('version') != SNAPSHOT_VERSION:
+        msg = 'неподдерживаемая версия снимка настроек.'
+        raise ValueError(msg)
+    source = get_snapshot_source()
+    if any(content.get(key) != value for key, value in source.items()):
+        msg = f'снимок настроек сохранен для другого режима запуска или env-файла: {source}.'
+        raise ValueError(msg)
+    groups = content.get('groups', {})
+    return SettingsSnapshot(
+        **{
+            item.name: item.type.model_validate(groups.get(item.name, {}))  # type: ignore
+            for item in fields(SettingsSnapshot)
+        },
+    )
+
+
+def save_snapshot(snapshot: SettingsSnapshot, path: pathlib.Path) -> None:
+    """Сохраняет снимок настроек в файл (доступен на чтение только владельцу)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch(mode=0o600, exist_ok=True)
+    path.write_bytes(dump_snapshot(snapshot))
+
+
+def read_snapshot(path: pathlib.Path) -> SettingsSnapshot:
+    """Загружает снимок настроек из файла."""
+    return parse_snapshot(path.read_bytes())
+
+
+def get_settings_snapshot() -> SettingsSnapshot:
+    """Возвращает настройки: из снимка ``SETTINGS_SNAPSHOT``, если он подходит, иначе - заново.
+
+    Неподходящий или отсутствующий файл снимка не является ошибкой: настройки создаются из
+    переменных окружения и env-файла.
+    """
+    snapshot_path = os.environ.get(SNAPSHOT_ENV_VARIABLE)
+    if snapshot_path:
+        try:
+            return read_snapshot(pathlib.Path(snapshot_path))
+        except (OSError, ValueError) as exc:
+            logging.getLogger('app').warning(
+                'SETTINGS W1: снимок настроек "%s" не загружен: %s',
+                snapshot_path,
+                exc,
+            )
+    return load_settings()
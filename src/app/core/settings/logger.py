@@ -2,36 +2,68 @@
 
 ВНИМАНИЕ! Не импортируйте объект логирования отсюда! Воспользуйтесь импортом из конфига.
 """
+import pathlib
 from typing import Any, TypeGuard
 
 import orjson
 
+from app.utils import env as env_utils
+
 from .base import LOGS_DIR, STATIC_DIR
 
+LOG_SETTINGS_PATH = STATIC_DIR / 'default_logger_settings.json'
+
 
 def all_dict_str_keys(value: dict[Any, Any]) -> TypeGuard[dict[str, Any]]:
     """TypeGuard, проверяющий ключи в словаре: все ключи - строки."""
     return all(isinstance(key, str) for key in value.keys())  # noqa: SIM118
 
 
-with (STATIC_DIR / 'default_logger_settings.json').open('r') as reader:
-    log_settings_str = reader.read()
+def load_log_settings(path: pathlib.Path = LOG_SETTINGS_PATH) -> dict[str, Any]:
+    """Читает настройки логирования из JSON-файла и подготавливает их для ``dictConfig``.
+
+    Parameters
+    ----------
+    path
+        путь к файлу настроек (Default: ``static/default_logger_settings.json``).
+
+    Returns
+    -------
+    dict[str, Any]
+        настройки логирования (пустой словарь, если файл содержит некорректный JSON).
+    """
+    with path.open('r') as reader:
+        log_settings_str = reader.read()
+
+    try:
+        log_settings = orjson.loads(log_settings_str)
+        if not isinstance(log_settings, dict):
+            msg = (
+                'default_logger_settings.json должен содержать объект (словарь), а не список '
+                'объектов.'
+            )
+            raise TypeError(msg)  # noqa: TRY301
+        if not all_dict_str_keys(log_settings):  # type: ignore
+            msg = 'словарь должен содержать ключи только в виде строк.'
+            raise TypeError(msg)  # noqa: TRY301
+    except (orjson.JSONDecodeError, ValueError):
+        return {}
 
-try:
-    log_settings = orjson.loads(log_settings_str)
-    if not isinstance(log_settings, dict):
-        msg = (
-            'default_logger_settings.json должен содержать объект (словарь), а не список объектов.'
-        )
-        raise TypeError(msg)  # noqa: TRY301
-    if not all_dict_str_keys(log_settings):  # type: ignore
-        msg = 'словарь должен содержать ключи только в виде строк.'
-        raise TypeError(msg)  # noqa: TRY301
-except (orjson.JSONDecodeError, ValueError):
-    log_settings = {}
+    # NOTE: структурированные (JSON) логи включаются ключом "structured" настроек или переменной
+    #       окружения LOGGING_STRUCTURED: всем обработчикам назначается форматтер из ключа
+    #       "structured_formatter" (по умолчанию json_formatter).
+    structured = env_utils.getenv_bool(
+        'LOGGING_STRUCTURED',
+        str(log_settings.get('structured', False)).lower(),
+    )
+    structured_formatter = log_settings.get('structured_formatter', 'json_formatter')
+    for handler_data in log_settings.get('handlers', {}).values():
+        if 'filename' in handler_data:
+            filename: str = handler_data['filename']
+            handler_data['filename'] = filename.format(path=LOGS_DIR.as_posix())
+        if structured:
+            handler_data['formatter'] = structured_formatter
+    return log_settings
 
 
-for handler_data in log_settings.get('handlers', {}).values():
-    if 'filename' in handler_data:
-        filename: str = handler_data['filename']
-        handler_data['filename'] = filename.format(path=LOGS_DIR.as_posix())
+log_settings = load_log_settings()
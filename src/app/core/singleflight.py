@@ -0,0 +1,108 @@
+"""Модуль объединения одинаковых одновременных вызовов (single-flight).
+
+Первый вызов по ключу (ведущий) выполняет функцию, а вызовы с тем же ключом, начатые до его
+завершения, ждут и получают тот же результат. Ожидание ограничено ``timeout``: по его истечении,
+а также если ведущий вызов завершился ошибкой или был отменен, ожидающий вызов выполняет функцию
+сам - ошибка или отмена одного клиента не передается остальным.
+
+Количество вызовов по результатам (``leader``, ``shared``, ``timeout``, ``failed``) собирается в
+метрике ``single_flight_calls_total``.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+from app.core.metrics import Counter, registry
+
+T = TypeVar('T')
+SINGLE_FLIGHT_CALLS: Counter = registry.register(
+    Counter(
+        'single_flight_calls_total',
+        'Количество объединяемых вызовов по результату.',
+        ('flight', 'result'),
+    ),
+)
+
+
+class SingleFlight(Generic[T]):
+    """Группа объединяемых вызовов.
+
+    Parameters
+    ----------
+    name
+        название группы (метка ``flight`` метрики по умолчанию).
+    timeout
+        максимальное время ожидания результата ведущего вызова в секундах (Default: ``None`` -
+        без ограничения).
+    """
+
+    def __init__(self: 'SingleFlight[T]', name: str, *, timeout: float | None = None) -> None:
+        """Экземпляр группы вызовов."""
+        if timeout is not None and timeout <= 0:
+            msg = 'timeout должен быть больше 0.'
+            raise ValueError(msg)
+        self.name = name
+        self.timeout = timeout
+        self._calls: dict[Hashable, asyncio.Future[tuple[bool, T | None]]] = {}
+
+    def __contains__(self: 'SingleFlight[T]', key: Hashable) -> bool:
+        """Выполняется ли сейчас вызов по ключу."""
+        return key in self._calls
+
+    def __len__(self: 'SingleFlight[T]') -> int:
+        """Количество выполняющихся вызовов."""
+        return len(self._calls)
+
+    async def do(
+        self: 'SingleFlight[T]',
+        key: Hashable,
+        func: Callable[[], Awaitable[T]],
+        *,
+        timeout: float | None = None,
+        label: str | None = None,
+    ) -> tuple[T, bool]:
+        """Выполняет функцию или ждет результат выполняющегося вызова с тем же ключом.
+
+        Parameters
+        ----------
+        key
+            ключ вызова.
+        func
+            функция.
+        timeout
+            время ожидания результата ведущего вызова (Default: ``None`` - ``self.timeout``).
+        label
+            метка ``flight`` метрики (Default: ``None`` - название группы).
+
+        Returns
+        -------
+        tuple[T, bool]
+            результат и признак того, что он получен от другого (ведущего) вызова.
+        """
+        label = label or self.name
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                done, result = await asyncio.wait_for(
+                    asyncio.shield(future),
+                    timeout if timeout is not None else self.timeout,
+                )
+            except TimeoutError:
+                SINGLE_FLIGHT_CALLS.inc(label, 'timeout')
+                return await func(), False
+            if not done:
+                SINGLE_FLIGHT_CALLS.inc(label, 'failed')
+                return await func(), False
+            SINGLE_FLIGHT_CALLS.inc(label, 'shared')
+            return result, True  # type: ignore[return-value]
+        SINGLE_FLIGHT_CALLS.inc(label, 'leader')
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        outcome: tuple[bool, T | None] = (False, None)
+        try:
+            result = await func()
+            outcome = (True, result)
+        finally:
+            del self._calls[key]
+            future.set_result(outcome)
+        return result, False
@@ -0,0 +1,236 @@
+"""Модуль записи истории изменений.
+
+Изменения полей не пишутся в базу данных в момент обновления сущности: записи истории попадают в
+ограниченную асинхронную очередь процесса, а фоновая задача забирает их пачками и сохраняет одним
+``INSERT`` на пачку. Так запись истории не добавляет запросов к обработке самого запроса.
+
+Записи попадают в очередь только после фиксации транзакции, в которой изменена сущность
+(``defer_change_entries``): до фиксации они хранятся в сессии, а при откате отбрасываются.
+"""
+import asyncio
+import contextlib
+import datetime
+import enum
+import uuid
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import get_logger
+from app.core.models.tables.history import ChangeHistory
+from app.utils.datetime import get_utc_now
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.core.models.tables.base import Base
+
+    HistoryEntry = dict[str, Any]
+
+logger = get_logger('app')
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+PENDING_ENTRIES_KEY = 'change_history_pending_entries'
+
+
+def get_history_item_id(item: 'Base') -> str:
+    """Возвращает первичный ключ сущности строкой (составной ключ - через запятую)."""
+    identity = inspect(item).identity or ()
+    return ','.join(str(value) for value in identity)
+
+
+def to_history_value(value: Any) -> Any:  # noqa: ANN401
+    """Приводит значение поля к виду, пригодному для JSON.
+
+    Enum сохраняется по названию элемента (как в базе данных), даты и UUID - строками.
+    """
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def get_change_entries(
+    item: 'Base',
+    old_values: dict[str, Any],
+    changed_fields: Iterable[str],
+) -> list['HistoryEntry']:
+    """Собирает записи истории по измененным полям сущности.
+
+    Parameters
+    ----------
+    item
+        обновленный экземпляр модели.
+    old_values
+        значения полей до обновления.
+    changed_fields
+        измененные поля.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        записи истории для вставки в таблицу ``change_history``.
+    """
+    table_name = item.__tablename__
+    item_id = get_history_item_id(item)
+    changed_at = get_utc_now()
+    return [
+        dict(
+            table_name=table_name,
+            item_id=item_id,
+            field=field,
+            old_value=to_history_value(old_values.get(field)),
+            new_value=to_history_value(getattr(item, field)),
+            changed_at=changed_at,
+        )
+        for field in sorted(changed_fields)
+    ]
+
+
+class ChangeHistoryWriter:
+    """Фоновый пакетный писатель истории изменений.
+
+    Пока писатель не запущен (``start``), записи истории отбрасываются. При переполнении очереди
+    новые записи тоже отбрасываются (их количество хранится в ``dropped_count``): обновление
+    сущности не должно ждать записи истории.
+    """
+
+    def __init__(
+        self: 'ChangeHistoryWriter',
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ) -> None:
+        """Экземпляр писателя истории изменений.
+
+        Parameters
+        ----------
+        batch_size
+            максимальное количество записей в одной вставке.
+        flush_interval
+            сколько секунд ждать добора пачки после первой записи.
+        max_queue_size
+            максимальный размер очереди.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.dropped_count = 0
+        self._queue: 'asyncio.Queue[HistoryEntry] | None' = None
+        self._task: 'asyncio.Task[None] | None' = None
+        self._session_factory: 'async_sessionmaker[AsyncSession] | None' = None
+
+    @property
+    def is_running(self: 'ChangeHistoryWriter') -> bool:
+        """Запущена ли фоновая задача записи."""
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self: 'ChangeHistoryWriter',
+        session_factory: 'async_sessionmaker[AsyncSession]',
+    ) -> None:
+        """Запускает фоновую задачу записи в текущем цикле событий."""
+        if self.is_running:
+            return
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self: 'ChangeHistoryWriter') -> None:
+        """Дописывает накопленные записи и останавливает фоновую задачу."""
+        if not self.is_running:
+            return
+        await self.flush()
+        self._task.cancel()  # type: ignore
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task  # type: ignore
+        self._task = None
+
+    async def flush(self: 'ChangeHistoryWriter') -> None:
+        """Ждет, пока все записи из очереди будут сохранены."""
+        if self._queue is not None and self.is_running:
+            await self._queue.join()
+
+    def record(self: 'ChangeHistoryWriter', entries: Iterable['HistoryEntry']) -> None:
+        """Добавляет записи истории в очередь без ожидания."""
+        if not self.is_running or self._queue is None:
+            logger.debug('CHANGE-HISTORY D1: писатель истории не запущен, записи отброшены.')
+            return
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped_count += 1
+                logger.warning(
+                    'CHANGE-HISTORY W1: очередь истории переполнена, запись отброшена. '
+                    'Всего отброшено: %s.',
+                    self.dropped_count,
+                )
+
+    async def _collect_batch(self: 'ChangeHistoryWriter') -> list['HistoryEntry']:
+        """Ждет первую запись и добирает пачку в течение ``flush_interval`` секунд."""
+        queue: 'asyncio.Queue[HistoryEntry]' = self._queue  # type: ignore
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _write(self: 'ChangeHistoryWriter', batch: list['HistoryEntry']) -> None:
+        """Сохраняет пачку записей одной вставкой."""
+        try:
+            async with self._session_factory() as session:  # type: ignore
+                await session.execute(insert(ChangeHistory), batch)
+                await session.commit()
+        except Exception:
+            logger.exception('CHANGE-HISTORY E1: ошибка записи %s записей истории.', len(batch))
+        else:
+            logger.debug('CHANGE-HISTORY D2: записано %s записей истории.', len(batch))
+
+    async def _run(self: 'ChangeHistoryWriter') -> None:
+        """Цикл фоновой задачи: пачка из очереди -> вставка."""
+        queue: 'asyncio.Queue[HistoryEntry]' = self._queue  # type: ignore
+        while True:
+            batch = await self._collect_batch()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+
+change_history_writer = ChangeHistoryWriter()
+
+
+def defer_change_entries(session: 'AsyncSession', entries: Iterable['HistoryEntry']) -> None:
+    """Откладывает записи истории до фиксации транзакции сессии (при откате они отбрасываются)."""
+    session.sync_session.info.setdefault(PENDING_ENTRIES_KEY, []).extend(entries)
+
+
+@event.listens_for(Session, 'after_commit')
+def _record_pending_entries(session: Session) -> None:
+    entries = session.info.pop(PENDING_ENTRIES_KEY, None)
+    if entries:
+        change_history_writer.record(entries)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_pending_entries(session: Session) -> None:
+    session.info.pop(PENDING_ENTRIES_KEY, None)
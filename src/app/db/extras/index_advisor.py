@@ -0,0 +1,208 @@
+"""Модуль советника по индексам.
+
+Советник воспроизводит типовые запросы (формы запросов) репозиториев и админ-панели, получает их
+планы через ``EXPLAIN`` и предлагает индексы для тех запросов, которые выполняются без индексов
+(последовательным сканированием и/или отдельной сортировкой). Если в базе установлено расширение
+``pg_stat_statements``, дополнительно выводятся самые затратные запросы к таблицам.
+"""
+from collections.abc import Generator, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import get_logger
+from app.core.models.enums.watch_list import StatusEnum
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql import Select
+
+    from app.core.models.tables.watch_list import WatchListElementBase
+
+logger = get_logger('app')
+NOT_INDEXED_NODE_TYPES = frozenset({'Seq Scan', 'Sort'})
+PG_STAT_STATEMENTS_QUERY = text(
+    """
+        SELECT query, calls, total_exec_time, mean_exec_time
+        FROM pg_stat_statements
+        WHERE query ILIKE :pattern
+        ORDER BY total_exec_time DESC
+        LIMIT :limit
+    """,
+)
+
+
+class IndexProposal(NamedTuple):
+    """Предлагаемый индекс."""
+
+    table: str
+    columns: tuple[str, ...]
+    using: str = 'btree'
+    operator_class: str | None = None
+
+    @property
+    def name(self: 'IndexProposal') -> str:
+        """Название индекса в формате, принятом в моделях (``ix_<таблица>_<колонки>``)."""
+        suffix = '_trgm' if self.operator_class == 'gin_trgm_ops' else ''
+        return f'ix_{self.table}_{"_".join(self.columns)}{suffix}'
+
+    @property
+    def ddl(self: 'IndexProposal') -> str:
+        """SQL для создания индекса без блокировки записи в таблицу."""
+        columns = ', '.join(
+            f'{column} {self.operator_class}' if self.operator_class else column
+            for column in self.columns
+        )
+        return (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.name} '
+            f'ON {self.table} USING {self.using} ({columns});'
+        )
+
+
+class QueryShape(NamedTuple):
+    """Форма запроса: сам запрос и индекс, который должен его обслуживать."""
+
+    title: str
+    statement: 'Select[Any]'
+    proposal: IndexProposal
+
+
+class IndexAdvice(NamedTuple):
+    """Результат проверки формы запроса."""
+
+    shape: QueryShape
+    not_indexed_nodes: list[str]
+
+    @property
+    def is_index_needed(self: 'IndexAdvice') -> bool:
+        """Нужен ли индекс (есть ли в плане узлы без использования индекса)."""
+        return bool(self.not_indexed_nodes)
+
+
+def get_watch_list_query_shapes(
+    model: type['WatchListElementBase'],
+    *,
+    limit: int = 100,
+) -> list[QueryShape]:
+    """Возвращает формы запросов к таблице списка просмотренного.
+
+    Формы повторяют сортировки и поиск админ-панели, а также ленту, отсортированную по
+    ``updated_at`` (пагинация по ключу).
+    """
+    table_name = model.__tablename__
+    shapes = [
+        QueryShape(
+            title=f'{table_name}: сортировка по {field}',
+            statement=select(model).order_by(getattr(model, field)).limit(limit),
+            proposal=IndexProposal(table=table_name, columns=(field,)),
+        )
+        for field in ('kind', 'score', 'repeat_view_count')
+    ]
+    shapes.append(
+        QueryShape(
+            title=f'{table_name}: фильтр по status с сортировкой по score',
+            statement=(
+                select(model)
+                .where(model.status == StatusEnum.WATCHED)
+                .order_by(model.score.desc())
+                .limit(limit)
+            ),
+            proposal=IndexProposal(table=table_name, columns=('status', 'score')),
+        ),
+    )
+    shapes.append(
+        QueryShape(
+            title=f'{table_name}: лента по updated_at',
+            statement=(
+                select(model).order_by(model.updated_at.desc(), model.id.desc()).limit(limit)
+            ),
+            proposal=IndexProposal(table=table_name, columns=('updated_at', 'id')),
+        ),
+    )
+    shapes.extend(
+        QueryShape(
+            title=f'{table_name}: поиск по {field}',
+            statement=select(model).where(getattr(model, field).ilike('%search%')).limit(limit),
+            proposal=IndexProposal(
+                table=table_name,
+                columns=(field,),
+                using='gin',
+                operator_class='gin_trgm_ops',
+            ),
+        )
+        for field in ('name', 'native_name')
+    )
+    return shapes
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Generator[dict[str, Any], None, None]:
+    """Обходит все узлы плана запроса (результата ``EXPLAIN (FORMAT JSON)``)."""
+    yield plan
+    for sub_plan in plan.get('Plans', []):
+        yield from iter_plan_nodes(sub_plan)
+
+
+def get_not_indexed_nodes(plan: dict[str, Any], table: str) -> list[str]:
+    """Возвращает узлы плана, которые обрабатывают таблицу без индекса."""
+    nodes: list[str] = []
+    for node in iter_plan_nodes(plan):
+        node_type = node.get('Node Type')
+        if node_type not in NOT_INDEXED_NODE_TYPES:
+            continue
+        if node_type == 'Seq Scan' and node.get('Relation Name') != table:
+            continue
+        nodes.append(node_type)
+    return nodes
+
+
+async def explain(session: 'AsyncSession', statement: 'Select[Any]') -> dict[str, Any]:
+    """Возвращает план запроса.
+
+    Последовательное сканирование отключается на время транзакции, чтобы планировщик выбрал индекс
+    даже на маленькой таблице: если индекс все равно не используется, значит его нет.
+    """
+    compiled = statement.compile(
+        dialect=postgresql.dialect(),  # type: ignore
+        compile_kwargs={'literal_binds': True},
+    )
+    await session.execute(text('SET LOCAL enable_seqscan = off'))
+    result = await session.execute(text(f'EXPLAIN (FORMAT JSON) {compiled}'))
+    return result.scalar_one()[0]['Plan']
+
+
+async def advise(session: 'AsyncSession', shapes: Sequence[QueryShape]) -> list[IndexAdvice]:
+    """Проверяет формы запросов и возвращает рекомендации по индексам.
+
+    Транзакция откатывается после проверки, чтобы сбросить настройки планировщика.
+    """
+    advices: list[IndexAdvice] = []
+    for shape in shapes:
+        plan = await explain(session, shape.statement)
+        nodes = get_not_indexed_nodes(plan, shape.proposal.table)
+        logger.debug('INDEX-ADVISOR D1: "%s" - %s.', shape.title, nodes or 'индекс используется')
+        advices.append(IndexAdvice(shape=shape, not_indexed_nodes=nodes))
+    await session.rollback()
+    return advices
+
+
+async def get_top_statements(
+    session: 'AsyncSession',
+    table: str,
+    *,
+    limit: int = 5,
+) -> list[dict[str, Any]] | None:
+    """Возвращает самые затратные запросы к таблице из ``pg_stat_statements``.
+
+    Если расширение не установлено, возвращает None.
+    """
+    is_installed = await session.scalar(
+        text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements')"),
+    )
+    if not is_installed:
+        return None
+    result = await session.execute(
+        PG_STAT_STATEMENTS_QUERY,
+        {'pattern': f'%{table}%', 'limit': limit},
+    )
+    return [dict(row) for row in result.mappings()]
@@ -0,0 +1,258 @@
+"""Модуль онлайн-применения миграций.
+
+В онлайн-режиме миграции применяются по одной, каждая - в своей транзакции и с ограничениями
+``lock_timeout`` и ``statement_timeout``. Миграция, которая не дождалась блокировки (таблица занята
+длинными запросами), не держит очередь из остальных запросов к таблице: она откатывается и
+повторяется с экспоненциальной задержкой. Для каждого шага сохраняется длительность и количество
+попыток.
+
+Значения ограничений по умолчанию можно переопределить в самой миграции атрибутами модуля
+``lock_timeout`` и ``statement_timeout`` (например, ``statement_timeout = '0'`` для долгого
+создания индекса).
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from alembic import command
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_database_settings, get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from alembic.config import Config
+    from alembic.operations import Operations
+    from alembic.script import Script
+    from sqlalchemy.engine import Connection
+
+logger = get_logger('app')
+LOCK_NOT_AVAILABLE_SQLSTATE = '55P03'
+DEADLOCK_DETECTED_SQLSTATE = '40P01'
+RETRYABLE_SQLSTATES = frozenset({LOCK_NOT_AVAILABLE_SQLSTATE, DEADLOCK_DETECTED_SQLSTATE})
+CONNECTION_ATTRIBUTE = 'connection'
+TIMEOUTS_ATTRIBUTE = 'timeouts'
+INVALID_INDEX_QUERY = text(
+    'SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)',
+)
+
+
+class MigrationTimeouts(NamedTuple):
+    """Ограничения времени для одной миграции (в формате настроек PostgreSQL: ``5s``, ``500ms``)."""
+
+    lock_timeout: str
+    statement_timeout: str
+
+
+class MigrationStepReport(NamedTuple):
+    """Результат применения одной миграции."""
+
+    revision: str
+    description: str
+    duration: float
+    attempts: int
+
+
+@dataclass(frozen=True)
+class OnlineMigrationOptions:
+    """Параметры онлайн-применения миграций.
+
+    Attributes
+    ----------
+    lock_timeout
+        сколько ждать блокировку таблицы (Default: ``'5s'``).
+    statement_timeout
+        максимальная длительность одного запроса миграции (Default: ``'10min'``).
+    retries
+        сколько раз повторять миграцию, не дождавшуюся блокировки (Default: ``5``).
+    backoff
+        задержка перед первым повтором в секундах, далее удваивается (Default: ``0.5``).
+    max_backoff
+        максимальная задержка перед повтором в секундах (Default: ``30.0``).
+    """
+
+    lock_timeout: str = '5s'
+    statement_timeout: str = '10min'
+    retries: int = 5
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+
+    def get_delay(self: 'OnlineMigrationOptions', attempt: int) -> float:
+        """Возвращает задержку перед повтором: экспонента со случайным разбросом до 50%."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.0)  # noqa: S311
+
+    def get_timeouts(self: 'OnlineMigrationOptions', script: 'Script') -> MigrationTimeouts:
+        """Возвращает ограничения времени миграции с учетом атрибутов ее модуля."""
+        return MigrationTimeouts(
+            lock_timeout=getattr(script.module, 'lock_timeout', self.lock_timeout),
+            statement_timeout=getattr(script.module, 'statement_timeout', self.statement_timeout),
+        )
+
+
+def is_retryable_error(exc: DBAPIError) -> bool:
+    """Можно ли повторить миграцию после ошибки (блокировка не получена или взаимоблокировка)."""
+    return getattr(exc.orig, 'sqlstate', None) in RETRYABLE_SQLSTATES
+
+
+def set_timeouts(connection: 'Connection', timeouts: MigrationTimeouts) -> None:
+    """Устанавливает ограничения времени на уровне сессии.
+
+    Ограничения действуют и внутри транзакции миграции, и в блоках ``autocommit_block``.
+    """
+    for name, value in timeouts._asdict().items():
+        connection.execute(
+            text('SELECT set_config(:name, :value, false)'),
+            {'name': name, 'value': value},
+        )
+    connection.commit()
+
+
+def get_pending_revisions(
+    connection: 'Connection',
+    script: ScriptDirectory,
+    revision: str,
+) -> list['Script']:
+    """Возвращает непримененные миграции до ``revision`` в порядке применения."""
+    heads = MigrationContext.configure(connection).get_current_heads()
+    revisions = script.iterate_revisions(revision, heads or 'base')
+    connection.rollback()
+    return [item for item in reversed(list(revisions)) if item is not None]
+
+
+def _upgrade_step(
+    connection: 'Connection',
+    config: 'Config',
+    revision: str,
+    timeouts: MigrationTimeouts,
+) -> None:
+    """Применяет одну миграцию на переданном подключении (см. ``migrations/env.py``)."""
+    config.attributes[CONNECTION_ATTRIBUTE] = connection
+    config.attributes[TIMEOUTS_ATTRIBUTE] = timeouts
+    command.upgrade(config, revision)
+
+
+async def _run_step(
+    connection: Any,  # noqa: ANN401
+    config: 'Config',
+    script: 'Script',
+    options: OnlineMigrationOptions,
+) -> MigrationStepReport:
+    """Применяет одну миграцию с повторами, если блокировка не была получена."""
+    timeouts = options.get_timeouts(script)
+    attempt = 1
+    started_at = time.perf_counter()
+    while True:
+        try:
+            await connection.run_sync(_upgrade_step, config, script.revision, timeouts)
+            break
+        except DBAPIError as exc:
+            await connection.rollback()
+            if not is_retryable_error(exc) or attempt > options.retries:
+                raise
+            delay = options.get_delay(attempt)
+            logger.warning(
+                'ONLINE-MIGRATION W1: миграция %s не получила блокировку (попытка %s), '
+                'повтор через %.2f с.',
+                script.revision,
+                attempt,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+    report = MigrationStepReport(
+        revision=script.revision,
+        description=script.doc,
+        duration=time.perf_counter() - started_at,
+        attempts=attempt,
+    )
+    logger.info(
+        'ONLINE-MIGRATION I1: миграция %s применена за %.2f с.',
+        report.revision,
+        report.duration,
+    )
+    return report
+
+
+async def upgrade_online(
+    config: 'Config',
+    *,
+    revision: str = 'head',
+    options: OnlineMigrationOptions | None = None,
+    db_url: str | None = None,
+) -> list[MigrationStepReport]:
+    """Применяет миграции до ``revision`` в онлайн-режиме.
+
+    Parameters
+    ----------
+    config
+        конфиг alembic.
+    revision
+        миграция, до которой нужно обновиться (Default: ``'head'``).
+    options
+        параметры онлайн-режима (Default: ``None`` - параметры по умолчанию).
+    db_url
+        ссылка на базу данных (Default: ``None`` - база данных проекта).
+
+    Returns
+    -------
+    list[MigrationStepReport]
+        результаты применения каждой миграции.
+    """
+    options = options or OnlineMigrationOptions()
+    script_directory = ScriptDirectory.from_config(config)
+    engine = create_async_engine(db_url or get_database_settings().db_url)
+    reports: list[MigrationStepReport] = []
+    try:
+        async with engine.connect() as connection:
+            pending = await connection.run_sync(get_pending_revisions, script_directory, revision)
+            for script in pending:
+                reports.append(await _run_step(connection, config, script, options))
+    finally:
+        await engine.dispose()
+    return reports
+
+
+def create_index_concurrently(
+    op: 'Operations',
+    index_name: str,
+    table_name: str,
+    columns: 'Sequence[str]',
+    **kwargs: Any,  # noqa: ANN401
+) -> None:
+    """Помощник для миграций: создает индекс без блокировки записи в таблицу.
+
+    ``CREATE INDEX CONCURRENTLY`` нельзя выполнять внутри транзакции, поэтому индекс создается в
+    блоке ``autocommit_block``. Если прошлая попытка прервалась (например, по ``lock_timeout``) и
+    оставила невалидный индекс, он удаляется и создается заново.
+    """
+    context = op.get_context()
+    with context.autocommit_block():
+        if not context.as_sql and op.get_bind().scalar(INVALID_INDEX_QUERY, {'name': index_name}):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+        op.create_index(
+            index_name,
+            table_name,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kwargs,
+        )
+
+
+def drop_index_concurrently(op: 'Operations', index_name: str, table_name: str) -> None:
+    """Помощник для миграций: удаляет индекс без блокировки записи в таблицу."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
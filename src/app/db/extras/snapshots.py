@@ -0,0 +1,432 @@
+"""Модуль выгрузки и загрузки снимков данных через ``COPY``.
+
+Каждая таблица выгружается в отдельный файл потоком ``COPY ... TO STDOUT`` (бинарный формат
+PostgreSQL или CSV) и загружается обратно через ``COPY ... FROM STDIN`` - без построчной работы
+ORM. Таблицы обрабатываются параллельно (соединение на таблицу), файлы можно сжимать zstd
+(нужен пакет ``zstandard``).
+
+Структура каталога снимка::
+
+    manifest.json            # формат, сжатие и выгруженные таблицы (контрольная точка выгрузки)
+    import_checkpoint.json   # загруженные таблицы (контрольная точка загрузки)
+    <table>.bin[.zst]        # данные таблицы (.csv для CSV)
+
+Обе операции можно продолжить после сбоя (``resume``): уже выгруженные/загруженные таблицы
+пропускаются. Выгрузка всех таблиц одного запуска читает один снимок базы данных
+(``pg_export_snapshot``), поэтому данные таблиц согласованы между собой.
+"""
+import asyncio
+import enum
+import json
+import pathlib
+from collections.abc import AsyncGenerator, Sequence
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+import asyncpg
+from sqlalchemy import Integer
+
+from app.core.config import get_logger
+from app.core.models.tables.base import Base
+from app.core.models.tables.versions import TableVersion
+
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+
+    TableResult = dict[str, Any]
+
+logger = get_logger('app')
+MANIFEST_FILE_NAME = 'manifest.json'
+IMPORT_CHECKPOINT_FILE_NAME = 'import_checkpoint.json'
+READ_CHUNK_SIZE = 1024 * 1024
+ZSTD_NOT_INSTALLED_MESSAGE = 'Для сжатия zstd установите пакет zstandard: poetry install -E zstd.'
+MANIFEST_MISMATCH_MESSAGE_TEMPLATE = (
+    'Снимок в {path} выгружен с другими параметрами (формат {format}, сжатие {compression}): '
+    'продолжить выгрузку нельзя.'
+)
+MANIFEST_NOT_FOUND_MESSAGE_TEMPLATE = 'В каталоге {path} нет файла {file_name}.'
+UNKNOWN_TABLES_MESSAGE_TEMPLATE = 'Неизвестные таблицы: {tables}.'
+
+
+class SnapshotFormatEnum(str, enum.Enum):
+    """Enum форматов файлов снимка.
+
+    Хранит дополнительную информацию: расширение файла.
+    """
+
+    extension: str
+
+    BINARY = 'binary', 'bin'
+    CSV = 'csv', 'csv'
+
+    def __new__(  # noqa: D102
+        cls: type['SnapshotFormatEnum'],
+        title: str,
+        extension: str,
+    ) -> 'SnapshotFormatEnum':
+        obj = str.__new__(cls, title)
+        obj._value_ = title
+        obj.extension = extension
+        return obj
+
+
+def _get_zstandard() -> Any:  # noqa: ANN401
+    """Возвращает модуль ``zstandard`` (необязательная зависимость).
+
+    Raises
+    ------
+    RuntimeError
+        если пакет не установлен.
+    """
+    try:
+        import zstandard  # type: ignore
+    except ImportError as exc:
+        raise RuntimeError(ZSTD_NOT_INSTALLED_MESSAGE) from exc
+    return zstandard
+
+
+def get_snapshot_tables(names: Sequence[str] | None = None) -> list['Table']:
+    """Возвращает таблицы моделей в порядке зависимостей (сначала те, на которые ссылаются).
+
+    Версии таблиц (``table_versions``) в снимок не входят: после загрузки они должны продолжать
+    расти, а не вернуться к значениям на момент выгрузки.
+
+    Raises
+    ------
+    ValueError
+        если среди ``names`` есть таблицы, которых нет в моделях.
+    """
+    tables = [
+        table for table in Base.metadata.sorted_tables if table.name != TableVersion.__tablename__
+    ]
+    if not names:
+        return tables
+    unknown = set(names) - {table.name for table in tables}
+    if unknown:
+        raise ValueError(UNKNOWN_TABLES_MESSAGE_TEMPLATE.format(tables=', '.join(sorted(unknown))))
+    return [table for table in tables if table.name in names]
+
+
+def get_dependency_levels(tables: Sequence['Table']) -> list[list['Table']]:
+    """Разбивает таблицы на уровни: таблицы уровня ссылаются только на таблицы уровней выше.
+
+    Таблицы одного уровня можно загружать параллельно, не нарушая внешних ключей.
+    """
+    levels: dict[str, int] = {}
+    for table in tables:  # tables уже отсортированы по зависимостям.
+        parent_levels = [
+            levels[fk.column.table.name]
+            for fk in table.foreign_keys
+            if fk.column.table.name in levels and fk.column.table is not table
+        ]
+        levels[table.name] = max(parent_levels, default=-1) + 1
+    result: list[list['Table']] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for table in tables:
+        result[levels[table.name]].append(table)
+    return result
+
+
+def _get_file_name(table_name: str, format_: SnapshotFormatEnum, *, compress: bool) -> str:
+    suffix = '.zst' if compress else ''
+    return f'{table_name}.{format_.extension}{suffix}'
+
+
+def _read_json(path: pathlib.Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _write_json(path: pathlib.Path, data: dict[str, Any]) -> None:
+    """Записывает json атомарно: через временный файл и переименование."""
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2))
+    tmp_path.replace(path)
+
+
+def _quote_table(table: 'Table') -> str:
+    return f'"{table.name}"'
+
+
+async def _copy_table_to_file(
+    connection: asyncpg.Connection,
+    table: 'Table',
+    path: pathlib.Path,
+    *,
+    format_: SnapshotFormatEnum,
+    compress: bool,
+) -> int:
+    """Выгружает таблицу в файл (через временный ``.part`` файл) и возвращает число строк."""
+    part_path = path.with_name(f'{path.name}.part')
+    compressor = _get_zstandard().ZstdCompressor().compressobj() if compress else None
+    with part_path.open('wb') as writer:
+
+        async def write(chunk: bytes) -> None:
+            writer.write(compressor.compress(chunk) if compressor else chunk)
+
+        status = await connection.copy_from_table(
+            table.name,
+            columns=[column.name for column in table.columns],
+            output=write,
+            format=format_.value,
+        )
+        if compressor:
+            writer.write(compressor.flush())
+    part_path.replace(path)
+    return int(status.split()[-1])
+
+
+async def _iter_file_chunks(
+    reader: BinaryIO,
+    *,
+    compress: bool,
+) -> AsyncGenerator[bytes, None]:
+    decompressor = _get_zstandard().ZstdDecompressor().decompressobj() if compress else None
+    while chunk := reader.read(READ_CHUNK_SIZE):
+        data = decompressor.decompress(chunk) if decompressor else chunk
+        if data:
+            yield data
+        await asyncio.sleep(0)
+
+
+def _get_serial_columns(table: 'Table') -> list[str]:
+    return [
+        column.name
+        for column in table.primary_key.columns
+        if isinstance(column.type, Integer) and column.autoincrement in (True, 'auto')
+    ]
+
+
+async def _copy_file_to_table(
+    connection: asyncpg.Connection,
+    table: 'Table',
+    path: pathlib.Path,
+    *,
+    columns: list[str],
+    format_: SnapshotFormatEnum,
+    compress: bool,
+) -> int:
+    """Загружает файл в таблицу одной транзакцией и возвращает число строк."""
+    async with connection.transaction():
+        with path.open('rb') as reader:
+            status = await connection.copy_to_table(
+                table.name,
+                source=_iter_file_chunks(reader, compress=compress),
+                columns=columns,
+                format=format_.value,
+            )
+        # после COPY последовательности автоинкрементных ключей не сдвигаются сами.
+        for column in _get_serial_columns(table):
+            sequence = await connection.fetchval(
+                'SELECT pg_get_serial_sequence($1, $2)',
+                table.name,
+                column,
+            )
+            if sequence:
+                await connection.execute(
+                    f'SELECT setval($1, COALESCE(MAX("{column}"), 0) + 1, false) '  # noqa: S608
+                    f'FROM {_quote_table(table)}',
+                    sequence,
+                )
+    return int(status.split()[-1])
+
+
+async def export_snapshot(
+    dsn: str,
+    path: pathlib.Path,
+    *,
+    tables: Sequence[str] | None = None,
+    format_: SnapshotFormatEnum = SnapshotFormatEnum.BINARY,
+    compress: bool = False,
+    workers: int = 4,
+    resume: bool = False,
+) -> list['TableResult']:
+    """Выгружает таблицы в каталог снимка.
+
+    Parameters
+    ----------
+    dsn
+        ссылка на базу данных для asyncpg.
+    path
+        каталог снимка (создается, если его нет).
+    tables
+        названия таблиц (Default: ``None`` - все таблицы моделей).
+    format_
+        формат файлов (Default: ``SnapshotFormatEnum.BINARY``).
+    compress
+        сжимать ли файлы zstd? По умолчанию False.
+    workers
+        количество параллельно выгружаемых таблиц (Default: ``4``).
+    resume
+        продолжить ли прерванную выгрузку (пропустить выгруженные таблицы)? По умолчанию False.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        результат по каждой таблице: название, количество строк, была ли таблица пропущена.
+
+    Raises
+    ------
+    ValueError
+        если выгрузку нельзя продолжить из-за других параметров или таблицы неизвестны.
+    RuntimeError
+        если для сжатия не установлен пакет ``zstandard``.
+    """
+    if compress:
+        _get_zstandard()
+    snapshot_tables = get_snapshot_tables(tables)
+    path.mkdir(parents=True, exist_ok=True)
+    manifest_path = path / MANIFEST_FILE_NAME
+    manifest = _read_json(manifest_path) if resume else None
+    if manifest is not None and (
+        manifest['format'] != format_.value or manifest['compress'] != compress
+    ):
+        msg = MANIFEST_MISMATCH_MESSAGE_TEMPLATE.format(
+            path=path,
+            format=manifest['format'],
+            compression=manifest['compress'],
+        )
+        raise ValueError(msg)
+    if manifest is None:
+        manifest = {'format': format_.value, 'compress': compress, 'tables': {}}
+        _write_json(manifest_path, manifest)
+    results: list['TableResult'] = []
+    pending: list['Table'] = []
+    for table in snapshot_tables:
+        done = manifest['tables'].get(table.name)
+        if done is not None and (path / done['file']).exists():
+            results.append({'table': table.name, 'rows': done['rows'], 'skipped': True})
+        else:
+            pending.append(table)
+    if not pending:
+        return results
+    pool = await asyncpg.create_pool(dsn, min_size=1, max_size=min(workers, len(pending)) + 1)
+    semaphore = asyncio.Semaphore(workers)
+    try:
+        async with pool.acquire() as coordinator, coordinator.transaction(
+            isolation='repeatable_read',
+            readonly=True,
+        ):
+            snapshot_id = await coordinator.fetchval('SELECT pg_export_snapshot()')
+
+            async def export_table(table: 'Table') -> 'TableResult':
+                file_name = _get_file_name(table.name, format_, compress=compress)
+                async with semaphore, pool.acquire() as connection, connection.transaction(
+                    isolation='repeatable_read',
+                    readonly=True,
+                ):
+                    await connection.execute(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+                    rows = await _copy_table_to_file(
+                        connection,
+                        table,
+                        path / file_name,
+                        format_=format_,
+                        compress=compress,
+                    )
+                manifest['tables'][table.name] = {
+                    'file': file_name,
+                    'rows': rows,
+                    'columns': [column.name for column in table.columns],
+                }
+                _write_json(manifest_path, manifest)
+                logger.debug('SNAPSHOT D1: таблица %s выгружена, строк: %s.', table.name, rows)
+                return {'table': table.name, 'rows': rows, 'skipped': False}
+
+            results.extend(await asyncio.gather(*(export_table(table) for table in pending)))
+    finally:
+        await pool.close()
+    return results
+
+
+async def import_snapshot(
+    dsn: str,
+    path: pathlib.Path,
+    *,
+    tables: Sequence[str] | None = None,
+    workers: int = 4,
+    truncate: bool = True,
+    resume: bool = False,
+) -> list['TableResult']:
+    """Загружает таблицы из каталога снимка.
+
+    Таблицы загружаются уровнями зависимостей (параллельно внутри уровня), каждая - отдельной
+    транзакцией: при сбое таблица либо загружена целиком, либо не загружена вовсе. Очистка
+    (``truncate``) выполняется одной командой для всех еще не загруженных таблиц и очищает также
+    таблицы, ссылающиеся на них внешними ключами (``TRUNCATE ... CASCADE``).
+
+    Parameters
+    ----------
+    dsn
+        ссылка на базу данных для asyncpg.
+    path
+        каталог снимка.
+    tables
+        названия таблиц (Default: ``None`` - все выгруженные таблицы).
+    workers
+        количество параллельно загружаемых таблиц (Default: ``4``).
+    truncate
+        очищать ли таблицу перед загрузкой? По умолчанию True.
+    resume
+        продолжить ли прерванную загрузку (пропустить загруженные таблицы)? По умолчанию False.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        результат по каждой таблице: название, количество строк, была ли таблица пропущена.
+
+    Raises
+    ------
+    FileNotFoundError
+        если в каталоге нет файла ``manifest.json``.
+    RuntimeError
+        если снимок сжат, а пакет ``zstandard`` не установлен.
+    """
+    manifest = _read_json(path / MANIFEST_FILE_NAME)
+    if manifest is None:
+        msg = MANIFEST_NOT_FOUND_MESSAGE_TEMPLATE.format(path=path, file_name=MANIFEST_FILE_NAME)
+        raise FileNotFoundError(msg)
+    format_ = SnapshotFormatEnum(manifest['format'])
+    compress: bool = manifest['compress']
+    if compress:
+        _get_zstandard()
+    checkpoint_path = path / IMPORT_CHECKPOINT_FILE_NAME
+    checkpoint = (_read_json(checkpoint_path) if resume else None) or {'tables': {}}
+    _write_json(checkpoint_path, checkpoint)
+    snapshot_tables = [
+        table for table in get_snapshot_tables(tables) if table.name in manifest['tables']
+    ]
+    results: list['TableResult'] = []
+    semaphore = asyncio.Semaphore(workers)
+    pool = await asyncpg.create_pool(dsn, min_size=1, max_size=workers)
+
+    async def import_table(table: 'Table') -> 'TableResult':
+        if table.name in checkpoint['tables']:
+            return {'table': table.name, 'rows': checkpoint['tables'][table.name], 'skipped': True}
+        info = manifest['tables'][table.name]
+        async with semaphore, pool.acquire() as connection:
+            rows = await _copy_file_to_table(
+                connection,
+                table,
+                path / info['file'],
+                columns=info['columns'],
+                format_=format_,
+                compress=compress,
+            )
+        checkpoint['tables'][table.name] = rows
+        _write_json(checkpoint_path, checkpoint)
+        logger.debug('SNAPSHOT D2: таблица %s загружена, строк: %s.', table.name, rows)
+        return {'table': table.name, 'rows': rows, 'skipped': False}
+
+    try:
+        pending = [table for table in snapshot_tables if table.name not in checkpoint['tables']]
+        if truncate and pending:
+            # CASCADE: иначе очистку таблицы, на которую ссылаются внешние ключи, запрещает
+            # PostgreSQL (при загрузке части таблиц).
+            async with pool.acquire() as connection:
+                await connection.execute(
+                    f'TRUNCATE {", ".join(map(_quote_table, pending))} CASCADE',
+                )
+        for level in get_dependency_levels(snapshot_tables):
+            results.extend(await asyncio.gather(*(import_table(table) for table in level)))
+    finally:
+        await pool.close()
+    return results
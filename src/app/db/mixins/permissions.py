@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Literal
 from app.core.config import get_logger
 from app.core.exceptions.http import permissions as permission_http_exceptions
 from app.core.exceptions.results import Err
+from app.core.metrics import PERMISSION_DENIALS
 
 if TYPE_CHECKING:
     from sqlalchemy.sql.elements import ColumnElement
@@ -90,6 +91,7 @@ class PermissionMixin:
                 f'Метод: {ignore_method_name}'
             )
             logger.error('%s E1: %s', log_prefix, msg)
+            PERMISSION_DENIALS.inc(type(self).__name__, method_name, mode.name)
             Err(permission_http_exceptions.BasePermissionError()).unwrap()
         permitted_mode = self.PERMISSION_RULES[method_name]
         if mode.value >= permitted_mode.value:
@@ -110,6 +112,7 @@ class PermissionMixin:
             f'Метод "{ignore_method_name}"'
         )
         logger.error('%s E2: %s', log_prefix, msg)
+        PERMISSION_DENIALS.inc(type(self).__name__, method_name, mode.name)
         result.unwrap()
 
     def get_visibility_filter_from_permission(
@@ -1,12 +1,14 @@
 import datetime
+import math
 import re
 from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
-from sqlalchemy import CursorResult, and_
+from sqlalchemy import CursorResult, Text, and_, case, cast, column
 from sqlalchemy import exc as sqlalchemy_exc
-from sqlalchemy import func, or_, select, update
+from sqlalchemy import func, inspect, or_, select, text, update
 
 from app.core.config import get_logger
+from app.core.models.tables.versions import TableVersion
 from app.utils import datetime as datetime_utils
 
 if TYPE_CHECKING:
@@ -19,9 +21,12 @@ if TYPE_CHECKING:
     from sqlalchemy.orm.strategy_options import _AbstractLoad  # type: ignore
     from sqlalchemy.sql.elements import ColumnElement
     from sqlalchemy.sql.functions import Function
-    from sqlalchemy.sql.selectable import Select
+    from sqlalchemy.sql.schema import Table
+    from sqlalchemy.sql.selectable import FromClause, Select
 
+    from app.core.models.partitioning import Partition
     from app.core.models.tables.base import Base
+    from app.core.schemas.classes.aggregations import AggregationSchema
 
     BaseSQLAlchemyModel = TypeVar('BaseSQLAlchemyModel', bound=Base)
     BasePydanticModel = TypeVar('BasePydanticModel', bound=BaseModel)
@@ -30,6 +35,8 @@ if TYPE_CHECKING:
     Count = int
     Identity = str | int | UUID
     Deleted = bool
+    ChangedFields = set[str]
+    AggregationRow = dict[str, Any]
     JoinKwargs = dict[str, Any]
     Model = type[Base]
     JoinClause = ColumnElement[bool]
@@ -107,6 +114,11 @@ class BaseQuery:
         filters.extend(extra_filters or [])
         return filters
 
+    def _escape_search(self: 'BaseQuery', search: str) -> str:
+        """Экранирует значение для поиска через ``ilike``."""
+        search = re.escape(search)
+        return search.translate(str.maketrans({'%': r'\%', '_': r'\_', '/': r'\/'}))
+
     def _make_search_filter(
         self: 'BaseQuery',
         search: str,
@@ -130,6 +142,24 @@ class BaseQuery:
             and_(*filters)
         return or_(*filters)
 
+    def _get_model_column(
+        self: 'BaseQuery',
+        *,
+        model: type['BaseSQLAlchemyModel'],
+        field: str,
+    ) -> 'InstrumentedAttribute[Any]':
+        """Достает колонку модели по её названию.
+
+        Raises
+        ------
+        ValueError
+            выбрасывается, когда поле не присутствует в модели ``model``.
+        """
+        if not hasattr(model.__table__.columns, field):
+            msg = f'{field} не является полем модели {model.__name__}'
+            raise ValueError(msg)
+        return getattr(model, field)
+
     def _get_item_identity_filter(
         self: 'BaseQuery',
         *,
@@ -252,6 +282,64 @@ class BaseQuery:
             count = 0
         return count
 
+    async def get_db_items_version(
+        self: 'BaseQuery',
+        *,
+        model: type['BaseSQLAlchemyModel'],
+        item_identity: 'Identity | None' = None,
+        item_identity_field: str = 'id',
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+    ) -> str | None:
+        """Получение версии записей одним запросом по индексу.
+
+        Версия всех записей - версия таблицы (``TableVersion``), которую триггер увеличивает при
+        каждом изменении таблицы. Версия одной записи - системная колонка ``xmin``
+        (идентификатор транзакции, создавшей текущую версию строки): PostgreSQL создает новую
+        версию строки при каждом изменении.
+
+        Parameters
+        ----------
+        model
+            модель данных sqlalchemy.
+        item_identity
+            идентификатор записи (Default: ``None`` - версия всех записей).
+        item_identity_field
+            название поля для фильтрации (Default: ``'id'``).
+        filters
+            фильтры записи (Default: ``None``). Для версии всех записей не применяются: версия
+            таблицы меняется при изменении любой записи.
+
+        Returns
+        -------
+        str | None
+            версия записей (``None``, если таблица не изменялась или записи нет).
+
+        Raises
+        ------
+        ValueError
+            если у модели нет поля ``item_identity_field``.
+        """
+        if item_identity is None:
+            stmt = select(cast(TableVersion.version, Text)).where(
+                TableVersion.table_name == model.__table__.name,
+            )
+        else:
+            stmt = (
+                select(cast(column('xmin'), Text))
+                .select_from(model)
+                .where(
+                    self._get_item_identity_filter(
+                        model=model,
+                        item_identity=item_identity,
+                        item_identity_field=item_identity_field,
+                    ),
+                )
+            )
+            if filters:
+                stmt = stmt.filter(*filters)
+        result = await self.session.execute(stmt)
+        return result.scalar()
+
     async def get_db_item_list(
         self: 'BaseQuery',
         *,
@@ -295,8 +383,7 @@ class BaseQuery:
         """
         stmt = select(model)
         if search and search_by:
-            search = re.escape(search)
-            search = search.translate(str.maketrans({'%': r'\%', '_': r'\_', '/': r'\/'}))
+            search = self._escape_search(search)
             stmt = stmt.where(self._make_search_filter(search, model, *search_by))
         if joins:
             stmt = self._resolve_joins(stmt=stmt, joins=joins)
@@ -313,6 +400,286 @@ class BaseQuery:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_db_selectable_row_list(
+        self: 'BaseQuery',
+        *,
+        selectable: 'FromClause',
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+        search: str | None = None,
+        search_by: 'Sequence[str | ColumnElement[Any]] | None' = None,
+        order_by: 'Sequence[ColumnElement[Any]] | None' = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Получение списка строк произвольного selectable (view, подзапрос, объединение) из бд.
+
+        Parameters
+        ----------
+        selectable
+            таблица, представление или подзапрос.
+        filters
+            фильтры запроса по колонкам ``selectable`` (Default: ``None``).
+        search
+            значение для поиска (Default: ``None``).
+        search_by
+            названия колонок ``selectable`` или колонки для поиска (Default: ``None``).
+        order_by
+            поля для сортировки (Default: ``None``).
+        limit
+            ограничение по количеству записей (Default: ``None``).
+        offset
+            сдвиг по итоговой последовательности записей (Default: ``None``).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки результата.
+
+        Raises
+        ------
+        ValueError
+            если в ``search_by`` были переданы названия колонок, которых нет в ``selectable``.
+        """
+        stmt = select(selectable)
+        if search and search_by:
+            search = self._escape_search(search)
+            search_filters: list['ColumnElement[bool]'] = []
+            for search_field in search_by:
+                if isinstance(search_field, str):
+                    if search_field not in selectable.c:
+                        msg = f'{search_field} не является полем {selectable.description}'
+                        raise ValueError(msg)
+                    search_field = selectable.c[search_field]
+                search_filters.append(search_field.ilike(f'%{search}%'))
+            stmt = stmt.where(or_(*search_filters))
+        if filters:
+            stmt = stmt.where(*filters)
+        if order_by is not None:
+            stmt = stmt.order_by(*order_by)
+        if isinstance(limit, int):
+            stmt = stmt.limit(limit)
+        if isinstance(offset, int):
+            stmt = stmt.offset(offset)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_db_items_aggregation(
+        self: 'BaseQuery',
+        *,
+        model: type['BaseSQLAlchemyModel'],
+        aggregations: 'Sequence[AggregationSchema]',
+        group_by: 'Sequence[str] | None' = None,
+        joins: 'Sequence[Join] | None' = None,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+    ) -> list['AggregationRow']:
+        """Получение агрегированных данных (статистики) одним запросом в БД.
+
+        Parameters
+        ----------
+        model
+            модель данных sqlalchemy.
+        aggregations
+            агрегации по полям модели (count, avg, min, max, sum, percentile).
+        group_by
+            поля модели для группировки (Default: ``None``).
+        joins
+            sql-join'ы (Default: ``None``).
+        filters
+            фильтры запроса (Default: ``None``).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки результата: значения полей группировки и агрегаций по их ``label``.
+
+        Raises
+        ------
+        ValueError
+            если в ``aggregations`` или ``group_by`` были переданы поля, не присутствующие в модели
+            ``model``.
+        """
+        group_columns = [
+            self._get_model_column(model=model, field=group_field) for group_field in group_by or []
+        ]
+        aggregate_columns = [
+            aggregation.get_expression(self._get_model_column(model=model, field=aggregation.field))
+            for aggregation in aggregations
+        ]
+        stmt = select(*group_columns, *aggregate_columns).select_from(model)
+        if joins:
+            stmt = self._resolve_joins(stmt=stmt, joins=joins)
+        if filters:
+            stmt = stmt.where(*filters)
+        if group_columns:
+            stmt = stmt.group_by(*group_columns).order_by(*group_columns)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_db_items_histogram(
+        self: 'BaseQuery',
+        *,
+        model: type['BaseSQLAlchemyModel'],
+        field: str,
+        bucket_width: float,
+        lower: float = 0,
+        upper: float | None = None,
+        group_by: 'Sequence[str] | None' = None,
+        joins: 'Sequence[Join] | None' = None,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+    ) -> list['AggregationRow']:
+        """Получение гистограммы значений поля одним запросом в БД.
+
+        Значения поля распределяются по корзинам ширины ``bucket_width``, начиная с ``lower``.
+        Если передан ``upper``, значения вне диапазона не учитываются, а значение ``upper``, если
+        оно совпадает с границей корзины (диапазон делится на ширину нацело), попадает в
+        предыдущую, последнюю корзину диапазона. Пустые (NULL) значения не учитываются.
+
+        Parameters
+        ----------
+        model
+            модель данных sqlalchemy.
+        field
+            поле модели, по которому строится гистограмма.
+        bucket_width
+            ширина корзины.
+        lower
+            нижняя граница гистограммы (Default: ``0``).
+        upper
+            верхняя граница гистограммы (Default: ``None``).
+        group_by
+            поля модели для группировки (Default: ``None``).
+        joins
+            sql-join'ы (Default: ``None``).
+        filters
+            фильтры запроса (Default: ``None``).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки результата: значения полей группировки, нижняя граница корзины (``bucket``) и
+            количество записей в ней (``count``).
+
+        Raises
+        ------
+        ValueError
+            если поля не присутствуют в модели ``model`` или ``bucket_width`` не положительное.
+        """
+        if bucket_width <= 0:
+            msg = f'bucket_width должен быть больше 0. Был передан {bucket_width}.'
+            raise ValueError(msg)
+        column = self._get_model_column(model=model, field=field)
+        group_columns = [
+            self._get_model_column(model=model, field=group_field) for group_field in group_by or []
+        ]
+        bucket = func.floor((column - lower) / float(bucket_width)) * bucket_width + lower
+        range_filters = [column.is_not(None), column >= lower]
+        if upper is not None:
+            last_bucket_index = math.floor((upper - lower) / float(bucket_width))
+            if last_bucket_index > 0 and last_bucket_index * bucket_width + lower >= upper:
+                last_bucket_index -= 1
+            last_bucket = last_bucket_index * bucket_width + lower
+            bucket = case((column == upper, last_bucket), else_=bucket)
+            range_filters.append(column <= upper)
+        bucket = bucket.label('bucket')
+        stmt = (
+            select(*group_columns, bucket, func.count().label('count'))
+            .select_from(model)
+            .where(*range_filters)
+        )
+        if joins:
+            stmt = self._resolve_joins(stmt=stmt, joins=joins)
+        if filters:
+            stmt = stmt.where(*filters)
+        stmt = stmt.group_by(*group_columns, bucket).order_by(*group_columns, bucket)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_db_view_rows(
+        self: 'BaseQuery',
+        *,
+        view: 'Table',
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+    ) -> list['AggregationRow']:
+        """Получение всех строк представления (view) из БД.
+
+        Parameters
+        ----------
+        view
+            описание представления.
+        filters
+            фильтры запроса (Default: ``None``).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки представления.
+        """
+        stmt = select(view)
+        if filters:
+            stmt = stmt.where(*filters)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def refresh_materialized_view(
+        self: 'BaseQuery',
+        *,
+        view: 'Table',
+        concurrently: bool = True,
+        use_flush: bool = False,
+    ) -> None:
+        """Обновляет материализованное представление.
+
+        Parameters
+        ----------
+        view
+            описание представления.
+        concurrently
+            обновлять ли представление без блокировки чтения (``CONCURRENTLY``)? Для этого у
+            представления должен быть уникальный индекс. По умолчанию True.
+        use_flush
+            использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
+        """
+        preparer = self.session.get_bind().dialect.identifier_preparer
+        concurrently_clause = 'CONCURRENTLY ' if concurrently else ''
+        stmt = text(f'REFRESH MATERIALIZED VIEW {concurrently_clause}{preparer.format_table(view)}')
+        await self.session.execute(stmt)
+        if use_flush:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+        logger.debug('Обновление представления: успешное обновление. Представление: %s.', view.name)
+
+    async def create_partitions(
+        self: 'BaseQuery',
+        *,
+        model: type['BaseSQLAlchemyModel'],
+        partitions: 'Sequence[Partition]',
+        use_flush: bool = False,
+    ) -> None:
+        """Создает секции секционированной таблицы модели (уже существующие секции пропускаются).
+
+        Parameters
+        ----------
+        model
+            модель данных sqlalchemy.
+        partitions
+            секции для создания.
+        use_flush
+            использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
+        """
+        table_name = model.__tablename__
+        for partition in partitions:
+            await self.session.execute(text(partition.get_create_ddl(table_name)))
+        if use_flush:
+            await self.session.flush()
+        else:
+            await self.session.commit()
+        logger.debug(
+            'Создание секций: успешное создание. Таблица: %s, секции: %s.',
+            table_name,
+            [partition.name for partition in partitions],
+        )
+
     async def create_item(
         self: 'BaseQuery',
         *,
@@ -350,7 +717,7 @@ class BaseQuery:
 
         logger.debug(
             'Создание в БД: успешное создание. Экземпляр: %s. %s.',
-            item,
+            item.lazy_repr(),
             'Создание без фиксирования.' if use_flush else 'Создание и фиксирование.',
         )
         return item
@@ -363,9 +730,14 @@ class BaseQuery:
         set_none: bool = False,
         allowed_none_fields: 'Literal["*"] | Sequence[str]' = '*',
         use_flush: bool = False,
-    ) -> 'tuple[bool, BaseSQLAlchemyModel]':
+    ) -> 'tuple[ChangedFields, BaseSQLAlchemyModel]':
         """Изменение записи из БД.
 
+        Измененные колонки определяются по истории атрибутов SQLAlchemy, поэтому в итоговое
+        множество попадают только те поля, значения которых действительно отличаются от
+        загруженных. Если ни одна колонка не изменилась и не были переданы другие атрибуты
+        (связи и т.п.), ``.flush()``/``.commit()`` не вызываются.
+
         Parameters
         ----------
         data
@@ -375,20 +747,20 @@ class BaseQuery:
         set_none
             флаг, указывающий то, нужно ли устанавливать None в значение.
         allowed_none_fields
+            поля, которым разрешено устанавливать None (Default: ``'*'`` - всем полям).
         use_flush
             использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
 
         Returns
         -------
-        BaseSQLAlchemyModel
-            измененный экземпляр модели sqlalchemy.
-        tuple[bool, BaseSQLAlchemyModel]
-            флаг обновления сущности и обновленная сущность (экземпляр модели).
+        tuple[set[str], BaseSQLAlchemyModel]
+            множество измененных колонок (пустое, если сущность не изменилась) и обновленная
+            сущность (экземпляр модели).
         """
-        is_updated = False
         params = data if isinstance(data, dict) else data.model_dump()
         if not set_none:
             params = {key: value for key, value in params.items() if value is not None}
+        applied_fields: list[str] = []
         for field, value in params.items():
             if (
                 set_none
@@ -396,21 +768,33 @@ class BaseQuery:
                 and (allowed_none_fields != '*' and field not in allowed_none_fields)
             ):
                 continue
-            if not is_updated and getattr(item, field, None) != value:
-                is_updated = True
             setattr(item, field, value)
+            applied_fields.append(field)
+        state = inspect(item)
+        changed_fields: 'ChangedFields' = {
+            field
+            for field in applied_fields
+            if field in state.mapper.column_attrs and state.attrs[field].history.has_changes()
+        }
+        other_fields = [field for field in applied_fields if field not in state.mapper.column_attrs]
+        if not changed_fields and not other_fields:
+            logger.debug(
+                'Обновление строки БД: изменений нет, запрос не выполняется. Параметры: %s.',
+                params,
+            )
+            return changed_fields, item
         if use_flush:
             await self.session.flush()
         else:
             await self.session.commit()
         logger.debug(
             (
-                'Обновление строки БД: успешное обновление. Экземпляр: %r. Параметры: %s, '
+                'Обновление строки БД: успешное обновление. Экземпляр: %r. Измененные поля: %s, '
                 'set_none: %s, use_flush: %s.'
             ),
-            *(item, params, set_none, use_flush),
+            *(item.lazy_repr(), changed_fields, set_none, use_flush),
         )
-        return is_updated, item
+        return changed_fields, item
 
     async def delete_db_item(
         self: 'BaseQuery',
@@ -432,7 +816,7 @@ class BaseQuery:
         bool
             был ли экземпляр удалён из базы?
         """
-        item_repr = repr(item)
+        item_repr = item.lazy_repr()
         try:
             await self.session.delete(item)
             if use_flush:
@@ -1,5 +1,6 @@
 from typing import Self
 
+from app.core.context import track_repository_method
 from app.core.models.tables.admins import Admin
 from app.db.mixins.permissions import PermissionModeEnum
 from app.db.queries.base import BaseQuery
@@ -9,6 +10,7 @@ from app.db.repositories.base import BaseRepository
 class AdminRepository(BaseRepository[Admin, BaseQuery]):
     """Репозиторий для работы c администратором."""
 
+    @track_repository_method
     async def get_by_username(
         self: Self,
         *,
@@ -1,11 +1,23 @@
 """Модуль базового абстрактного репозитория."""
+import copy
 import datetime
 import enum
-from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, get_args
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any, Generic, Literal, NamedTuple, TypeVar, get_args
 
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.cache_key import HasCacheKey
+
+from app.core.cache import get_write_generations, has_uncommitted_changes, mark_table_changed
 from app.core.config import get_logger
+from app.core.context import repository_method, track_repository_method
 from app.core.exceptions import repositories as repository_exceptions
 from app.core.models.tables.base import Base
+from app.core.singleflight import SingleFlight
+from app.db.extras.history import change_history_writer, defer_change_entries, get_change_entries
 from app.db.mixins.permissions import PermissionMixin, PermissionModeEnum
 from app.db.queries.base import BaseQuery
 
@@ -19,10 +31,16 @@ if TYPE_CHECKING:
     from sqlalchemy.orm.strategy_options import _AbstractLoad  # type: ignore
     from sqlalchemy.sql.elements import ColumnElement
     from sqlalchemy.sql.functions import Function
+    from sqlalchemy.sql.schema import Table
+
+    from app.core.models.partitioning import Partition, Partitioning
+    from app.core.schemas.classes.aggregations import AggregationSchema
 
     Schema = TypeVar('Schema', bound=BaseModel)
 
     JoinRequired = bool
+    ChangedFields = set[str]
+    AggregationRow = dict[str, Any]
     Count = int
     Identity = str | int | UUID
     JoinKwargs = dict[str, Any]
@@ -36,6 +54,8 @@ if TYPE_CHECKING:
 logger = get_logger('app')
 BaseSQLAlchemyModel = TypeVar('BaseSQLAlchemyModel', bound=Base)
 Query = TypeVar('Query', bound=BaseQuery)
+R = TypeVar('R')
+read_flight: SingleFlight[Any] = SingleFlight('repository')
 
 
 MODEL_INCORRECT_STATE_MESSAGE_TEMPLATE = (
@@ -45,6 +65,78 @@ MODEL_INCORRECT_STATE_MESSAGE_TEMPLATE = (
     'тоже не был установлен. Убедитесь, что вы не удалили атрибут model_class перед '
     'вызовом метода отправки запроса в базу, либо передайте параметр model явно.'
 )
+STATS_VIEW_NOT_SET_MESSAGE_TEMPLATE = (
+    'У репозитория {repository_class} не установлен атрибут stats_view: статистика из '
+    'материализованного представления недоступна.'
+)
+PARTITIONING_NOT_SET_MESSAGE_TEMPLATE = (
+    'Таблица модели {model_class} репозитория {repository_class} не секционирована: у модели не '
+    'установлен атрибут partitioning.'
+)
+
+
+def get_read_key_part(value: Any) -> Hashable:  # noqa: ANN401
+    """Возвращает хэшируемое представление параметра запроса чтения (часть ключа объединения).
+
+    Выражения SQLAlchemy (фильтры, поля, стратегии загрузки) представляются ключом кэша
+    компиляции SQLAlchemy и значениями параметров: одинаковые по смыслу выражения дают равные
+    ключи.
+
+    Raises
+    ------
+    TypeError
+        если параметр нельзя представить ключом.
+    """
+    if hasattr(value, '__clause_element__'):
+        value = value.__clause_element__()
+    if isinstance(value, HasCacheKey):
+        cache_key = value._generate_cache_key()  # noqa: SLF001
+        if cache_key is None:
+            msg = f'у выражения {value!r} нет ключа кэша.'
+            raise TypeError(msg)
+        return cache_key.key, tuple(repr(param.effective_value) for param in cache_key.bindparams)
+    if isinstance(value, list | tuple):
+        return tuple(get_read_key_part(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, get_read_key_part(item)) for key, item in value.items()))
+    if isinstance(value, Hashable):
+        return value
+    msg = f'значение {value!r} нельзя представить ключом.'
+    raise TypeError(msg)
+
+
+class ItemSnapshot(NamedTuple):
+    """Снимок значений колонок экземпляра модели для передачи в другую сессию.
+
+    Attributes
+    ----------
+    model
+        модель данных sqlalchemy.
+    values
+        значения загруженных колонок.
+    """
+
+    model: type[Base]
+    values: dict[str, Any]
+
+    @classmethod
+    def take(cls: type['ItemSnapshot'], item: Base) -> 'ItemSnapshot':
+        """Снимает значения колонок экземпляра (изменения экземпляра на снимок не влияют)."""
+        state = inspect(item)
+        values = {
+            attr.key: copy.deepcopy(state.dict[attr.key])
+            for attr in state.mapper.column_attrs
+            if attr.key in state.dict
+        }
+        return cls(model=type(item), values=values)
+
+    def restore(self: 'ItemSnapshot') -> Base:
+        """Создает по снимку новый отсоединенный (detached) экземпляр модели."""
+        item = inspect(self.model).class_manager.new_instance()
+        for key, value in self.values.items():
+            set_committed_value(item, key, copy.deepcopy(value))
+        make_transient_to_detached(item)
+        return item
 
 
 class SelectModeEnum(str, enum.Enum):
@@ -58,11 +150,22 @@ class SelectModeEnum(str, enum.Enum):
 
 
 class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
-    """Абстрактный базовый класс для репозиториев."""
+    """Абстрактный базовый класс для репозиториев.
+
+    Одинаковые одновременные запросы чтения (``get``, ``count``, ``list`` с теми же параметрами и
+    режимом доступа) разных сессий объединяются: в базу данных отправляется один запрос, и все
+    вызовы получают его результат (``coalesce``). Экземпляры моделей другим сессиям передаются
+    снимками значений колонок (``coalesce_items``), поэтому запросы с загрузкой связанных
+    сущностей (``options``) не объединяются. Отключается атрибутом ``coalesce_reads``.
+    """
 
     model_class: type['BaseSQLAlchemyModel']
     query_class: type['Query']
     specific_column_mapping: 'dict[str, ColumnElement[Any]]' = {}
+    stats_view: 'Table | None' = None
+    track_history: bool = False
+    coalesce_reads: bool = True
+    coalesce_timeout: float = 5.0
 
     def __init__(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
@@ -110,6 +213,91 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
                 msg = f'Ошибка атрибута model_class или query_class для {cls.__name__}.'
                 raise repository_exceptions.RepositorySubclassNotSetAttributeError(msg) from exc
 
+    def get_read_key(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        method_name: str,
+        **params: Any,  # noqa: ANN401
+    ) -> Hashable | None:
+        """Возвращает ключ объединения одинаковых одновременных запросов чтения.
+
+        В ключ входят поколения записи таблицы модели и присоединенных таблиц
+        (``get_write_generations``): запрос, начатый после фиксации изменений этих таблиц, не
+        объединяется с запросами, начатыми до нее.
+
+        ``None`` означает, что запрос выполняется без объединения: оно отключено у репозитория
+        (``coalesce_reads``), в сессии есть незафиксированные изменения (результат другой сессии
+        их не увидит), запрос загружает связанные сущности (``options``: они не входят в снимок
+        экземпляра) или параметры нельзя представить ключом.
+        """
+        if (
+            not self.coalesce_reads
+            or params.get('options')
+            or has_uncommitted_changes(self.session)
+        ):
+            return None
+        try:
+            parts = sorted((name, get_read_key_part(value)) for name, value in params.items())
+        except TypeError:
+            return None
+        tables = [self.model_class.__table__.name]
+        for join in params.get('joins') or ():
+            target = join[0] if isinstance(join, tuple) else join
+            tables.append(inspect(target).mapper.local_table.name)
+        return type(self), method_name, get_write_generations(*tables), tuple(parts)
+
+    async def coalesce(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        key: Hashable | None,
+        func: Callable[[], Awaitable[R]],
+    ) -> tuple[R, bool]:
+        """Выполняет запрос чтения, объединяя его с одинаковыми одновременными запросами.
+
+        Результат ждется не дольше ``coalesce_timeout`` секунд, после чего запрос выполняется
+        отдельно.
+
+        Returns
+        -------
+        tuple[R, bool]
+            результат и признак того, что он получен запросом другой сессии (экземпляры моделей
+            передаются через ``coalesce_items``).
+        """
+        if key is None:
+            return await func(), False
+        return await read_flight.do(
+            key,
+            func,
+            timeout=self.coalesce_timeout,
+            label=repository_method.get(),
+        )
+
+    async def coalesce_items(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        key: Hashable | None,
+        func: 'Callable[[], Awaitable[Sequence[BaseSQLAlchemyModel]]]',
+    ) -> 'Sequence[BaseSQLAlchemyModel]':
+        """Выполняет запрос экземпляров моделей, объединяя его с одинаковыми запросами.
+
+        Ведущий запрос снимает значения колонок экземпляров сразу после загрузки, до возврата
+        результата (``ItemSnapshot``). Ожидающие запросы создают по снимкам свои экземпляры в сессии
+        репозитория без запросов к базе данных (``merge(load=False)``): изменения экземпляров
+        ведущей сессии на них не влияют.
+        """
+        if key is None:
+            return await func()
+
+        async def load() -> 'tuple[Sequence[BaseSQLAlchemyModel], tuple[ItemSnapshot, ...]]':
+            items = await func()
+            return items, tuple(ItemSnapshot.take(item) for item in items)
+
+        (items, snapshots), shared = await self.coalesce(key, load)
+        if not shared:
+            return items
+        return [
+            await self.session.merge(snapshot.restore(), load=False)  # type: ignore[misc]
+            for snapshot in snapshots
+        ]
+
+    @track_repository_method
     async def get(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -161,16 +349,31 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
             options = None
         if extra_filters:
             filters += tuple(extra_filters)
-        result = await self.queries.get_db_item(
-            model=self.model_class,
+
+        async def get_items() -> list['BaseSQLAlchemyModel']:
+            item = await self.queries.get_db_item(
+                model=self.model_class,
+                item_identity=item_identity,
+                item_identity_field=item_identity_field,
+                joins=joins,
+                options=options,
+                filters=filters,
+            )
+            return [item] if item is not None else []
+
+        key = self.get_read_key(
+            'get',
             item_identity=item_identity,
             item_identity_field=item_identity_field,
             joins=joins,
             options=options,
             filters=filters,
+            permission_mode=permission_mode,
         )
-        return result
+        items = await self.coalesce_items(key, get_items)
+        return items[0] if items else None
 
+    @track_repository_method
     async def count(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -207,13 +410,368 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
             _filters = ()
         filters = tuple(filters) if filters else ()
         filters += _filters
-        result = await self.queries.get_db_items_count(
+        count_items = functools.partial(
+            self.queries.get_db_items_count,
+            model=self.model_class,
+            joins=joins,
+            filters=filters,
+        )
+        key = self.get_read_key(
+            'count',
+            joins=joins,
+            filters=filters,
+            permission_mode=permission_mode,
+        )
+        result, _ = await self.coalesce(key, count_items)
+        return result
+
+    @track_repository_method
+    async def version(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        item_identity: 'Identity | None' = None,
+        item_identity_field: str = 'id',
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> str:
+        """Получение версии записей (для ETag): меняется при изменении записей.
+
+        Версия всех записей - версия таблицы, версия одной записи (если передан ``item_identity``)
+        - версия строки PostgreSQL (см. ``BaseQuery.get_db_items_version``).
+
+        Parameters
+        ----------
+        item_identity
+            идентификатор записи (Default: ``None`` - версия всех записей).
+        item_identity_field
+            название поля для фильтрации (Default: ``'id'``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        str
+            версия записей.
+        """
+        join_required, filters = self.get_visibility_filter_from_permission(
+            method_name='read_list' if item_identity is None else 'read_detail',
+            mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+            ignore_method_name='version',
+        )
+        if join_required:
+            filters = ()
+        version = await self.queries.get_db_items_version(
+            model=self.model_class,
+            item_identity=item_identity,
+            item_identity_field=item_identity_field,
+            filters=filters,
+        )
+        return f'{self.model_class.__tablename__}:{version or "-"}'
+
+    @track_repository_method
+    async def aggregate(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        aggregations: 'Sequence[AggregationSchema]',
+        group_by: 'Sequence[str] | None' = None,
+        joins: 'Sequence[Join] | None' = None,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> list['AggregationRow']:
+        """Получение агрегированных данных (статистики) из БД одним запросом.
+
+        Пример: средняя оценка и медиана оценки по статусам:
+        ```
+        await repo.aggregate(
+            aggregations=[
+                AggregationSchema(field='score', function=AggregateFunctionEnum.AVG),
+                AggregationSchema(
+                    field='score',
+                    function=AggregateFunctionEnum.PERCENTILE,
+                    percentile=0.5,
+                ),
+            ],
+            group_by=['status'],
+        )
+        ```
+
+        Parameters
+        ----------
+        aggregations
+            агрегации по полям модели.
+        group_by
+            поля модели для группировки (Default: ``None``).
+        joins
+            sql-join'ы (Default: ``None``).
+        filters
+            фильтры запроса (Default: ``None``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки результата: значения полей группировки и агрегаций по их ``label``.
+        """
+        join_required, _filters = self.get_visibility_filter_from_permission(
+            method_name='read_count',
+            mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+            ignore_method_name='aggregate',
+        )
+        if join_required and not joins:
+            _filters = ()
+        filters = tuple(filters) if filters else ()
+        filters += _filters
+        result = await self.queries.get_db_items_aggregation(
+            model=self.model_class,
+            aggregations=aggregations,
+            group_by=group_by,
+            joins=joins,
+            filters=filters,
+        )
+        return result
+
+    @track_repository_method
+    async def histogram(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        field: str,
+        bucket_width: float,
+        lower: float = 0,
+        upper: float | None = None,
+        group_by: 'Sequence[str] | None' = None,
+        joins: 'Sequence[Join] | None' = None,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> list['AggregationRow']:
+        """Получение гистограммы значений поля из БД одним запросом.
+
+        Parameters
+        ----------
+        field
+            поле модели, по которому строится гистограмма.
+        bucket_width
+            ширина корзины.
+        lower
+            нижняя граница гистограммы (Default: ``0``).
+        upper
+            верхняя граница гистограммы (Default: ``None``).
+        group_by
+            поля модели для группировки (Default: ``None``).
+        joins
+            sql-join'ы (Default: ``None``).
+        filters
+            фильтры запроса (Default: ``None``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки результата: значения полей группировки, нижняя граница корзины (``bucket``) и
+            количество записей в ней (``count``).
+        """
+        join_required, _filters = self.get_visibility_filter_from_permission(
+            method_name='read_count',
+            mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+            ignore_method_name='histogram',
+        )
+        if join_required and not joins:
+            _filters = ()
+        filters = tuple(filters) if filters else ()
+        filters += _filters
+        result = await self.queries.get_db_items_histogram(
             model=self.model_class,
+            field=field,
+            bucket_width=bucket_width,
+            lower=lower,
+            upper=upper,
+            group_by=group_by,
             joins=joins,
             filters=filters,
         )
         return result
 
+    @track_repository_method
+    async def stats(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> list['AggregationRow']:
+        """Получение заранее посчитанной статистики из материализованного представления.
+
+        Фильтры видимости не применяются: представление содержит только агрегаты.
+
+        Parameters
+        ----------
+        filters
+            фильтры по колонкам представления (Default: ``None``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            строки представления.
+
+        Raises
+        ------
+        RepositoryBaseMethodAccessError
+            если у репозитория не установлен атрибут ``stats_view``.
+        """
+        if self.stats_view is None:
+            msg = STATS_VIEW_NOT_SET_MESSAGE_TEMPLATE.format(
+                repository_class=self.__class__.__name__,
+            )
+            raise repository_exceptions.RepositoryBaseMethodAccessError(msg)
+        self.check_permissions(
+            method_name='read_count',
+            mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+            ignore_method_name='stats',
+        )
+        result = await self.queries.get_db_view_rows(view=self.stats_view, filters=filters)
+        return result
+
+    @track_repository_method
+    async def refresh_stats(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        concurrently: bool = True,
+        use_flush: bool = False,
+    ) -> None:
+        """Обновляет материализованное представление статистики.
+
+        Parameters
+        ----------
+        concurrently
+            обновлять ли представление без блокировки чтения? По умолчанию True.
+        use_flush
+            использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
+
+        Raises
+        ------
+        RepositoryBaseMethodAccessError
+            если у репозитория не установлен атрибут ``stats_view``.
+        """
+        if self.stats_view is None:
+            msg = STATS_VIEW_NOT_SET_MESSAGE_TEMPLATE.format(
+                repository_class=self.__class__.__name__,
+            )
+            raise repository_exceptions.RepositoryBaseMethodAccessError(msg)
+        await self.queries.refresh_materialized_view(
+            view=self.stats_view,
+            concurrently=concurrently,
+            use_flush=use_flush,
+        )
+
+    def _get_partitioning(self: 'BaseRepository[BaseSQLAlchemyModel, Query]') -> 'Partitioning':
+        """Возвращает описание секционирования таблицы модели.
+
+        Raises
+        ------
+        RepositoryBaseMethodAccessError
+            если таблица модели не секционирована.
+        """
+        partitioning: 'Partitioning | None' = getattr(self.model_class, 'partitioning', None)
+        if partitioning is None:
+            msg = PARTITIONING_NOT_SET_MESSAGE_TEMPLATE.format(
+                model_class=self.model_class.__name__,
+                repository_class=self.__class__.__name__,
+            )
+            raise repository_exceptions.RepositoryBaseMethodAccessError(msg)
+        return partitioning
+
+    def get_partition_filters(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        values: 'Sequence[Any] | None' = None,
+        lower: Any = None,  # noqa: ANN401
+        upper: Any = None,  # noqa: ANN401
+    ) -> list['ColumnElement[bool]']:
+        """Возвращает фильтры по ключу секционирования для передачи в ``get``/``list``/``count``.
+
+        С этими фильтрами PostgreSQL читает только подходящие секции (partition pruning), а не все.
+
+        Parameters
+        ----------
+        values
+            значения ключа (для секционирования по списку).
+        lower
+            нижняя граница ключа, включительно (для секционирования по диапазону).
+        upper
+            верхняя граница ключа, не включительно (для секционирования по диапазону).
+
+        Returns
+        -------
+        list[ColumnElement[bool]]
+            фильтры запроса.
+
+        Raises
+        ------
+        RepositoryBaseMethodAccessError
+            если таблица модели не секционирована.
+        """
+        partitioning = self._get_partitioning()
+        return partitioning.get_filters(self.model_class, values=values, lower=lower, upper=upper)
+
+    @track_repository_method
+    async def create_partitions(
+        self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
+        *,
+        start: datetime.date | None = None,
+        count: int = 1,
+        use_flush: bool = False,
+    ) -> list['Partition']:
+        """Создает недостающие секции таблицы модели.
+
+        Для секционирования по списку создаются секции для всех значений Enum-колонки, для
+        секционирования по диапазону - ``count`` секций, начиная с периода даты ``start``.
+
+        Parameters
+        ----------
+        start
+            дата, с периода которой создаются секции-диапазоны (по умолчанию - текущая дата).
+        count
+            количество секций-диапазонов (Default: ``1``).
+        use_flush
+            использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
+
+        Returns
+        -------
+        list[Partition]
+            секции таблицы (и созданные, и уже существовавшие).
+
+        Raises
+        ------
+        RepositoryBaseMethodAccessError
+            если таблица модели не секционирована.
+        """
+        partitioning = self._get_partitioning()
+        partitions = partitioning.get_model_partitions(self.model_class, start=start, count=count)
+        await self.queries.create_partitions(
+            model=self.model_class,
+            partitions=partitions,
+            use_flush=use_flush,
+        )
+        return partitions
+
+    @track_repository_method
     async def list(  # noqa: A003
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -280,19 +838,25 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
         if select_mode == SelectModeEnum.BRIEF:
             joins = None
             options = None
-        result = await self.queries.get_db_item_list(
+        params = {
+            'joins': joins,
+            'options': options,
+            'filters': filters,
+            'search': search,
+            'search_by': search_by,
+            'order_by': order_by,
+            'limit': limit,
+            'offset': offset,
+        }
+        list_items = functools.partial(
+            self.queries.get_db_item_list,
             model=self.model_class,
-            joins=joins,
-            options=options,
-            filters=filters,
-            search=search,
-            search_by=search_by,
-            order_by=order_by,
-            limit=limit,
-            offset=offset,
+            **params,
         )
-        return result
+        key = self.get_read_key('list', permission_mode=permission_mode, **params)
+        return await self.coalesce_items(key, list_items)
 
+    @track_repository_method
     async def create(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -327,6 +891,7 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
             ignore_permissions=ignore_permissions,
             ignore_method_name='create',
         )
+        mark_table_changed(self.session, self.model_class.__table__.name)
         result = await self.queries.create_item(
             model=self.model_class,
             data=data,
@@ -334,6 +899,7 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
         )
         return result
 
+    @track_repository_method
     async def update(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -344,20 +910,25 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
         use_flush: bool = False,
         permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
         ignore_permissions: bool = False,
-    ) -> 'tuple[bool, BaseSQLAlchemyModel]':
+    ) -> 'tuple[ChangedFields, BaseSQLAlchemyModel]':
         """Изменение записи из БД.
 
+        Если данные не отличаются от текущих значений ``item``, запрос в базу данных не
+        выполняется. Если у репозитория включен ``track_history``, изменения полей передаются в
+        фоновую запись истории (таблица ``change_history``) после ``.commit()``/``.flush()``.
+
         Parameters
         ----------
-        model
-            модель данных sqlalchemy.
         data
-            данные для создания экземпляра модели.
+            данные для обновления экземпляра модели.
+        item
+            экземпляр модели.
+        set_none
+            флаг, указывающий то, нужно ли устанавливать None в значение.
+        allowed_none_fields
+            поля, которым разрешено устанавливать None (Default: ``'*'`` - всем полям).
         use_flush
             использовать ли ``.flush()`` у сессии вместо ``.commit()``? По умолчанию False.
-        return_is_updated_flag
-            возвращать ли результат с флагом обновления данных? По умолчанию False. Флаг говорит,
-            были ли изменены данные у текущего `item``'а или нет.
         permission_mode
             режим доступа к ресурсу.
         ignore_permissions
@@ -365,10 +936,9 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
 
         Returns
         -------
-        BaseSQLAlchemyModel
-            измененный экземпляр модели sqlalchemy.
-        tuple[bool, BaseSQLAlchemyModel]
-            флаг обновления сущности и обновленная сущность (экземпляр модели).
+        tuple[set[str], BaseSQLAlchemyModel]
+            множество измененных колонок (пустое, если сущность не изменилась) и обновленная
+            сущность (экземпляр модели).
         """
         self.check_permissions(
             method_name='update',
@@ -376,15 +946,34 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
             ignore_permissions=ignore_permissions,
             ignore_method_name='update',
         )
-        result = await self.queries.change_db_item(
+        mark_table_changed(self.session, self.model_class.__table__.name)
+        old_values: dict[str, Any] | None = None
+        if self.track_history:
+            # NOTE: снимок всех загруженных колонок: измененные поля определяются по истории
+            # атрибутов, а не по ``differ_include_fields``.
+            state = inspect(item)
+            old_values = {
+                attr.key: state.dict[attr.key]
+                for attr in state.mapper.column_attrs
+                if attr.key in state.dict
+            }
+        changed_fields, item = await self.queries.change_db_item(
             data=data,
             item=item,
             set_none=set_none,
             allowed_none_fields=allowed_none_fields,
             use_flush=use_flush,
         )
-        return result
+        if old_values is not None and changed_fields:
+            entries = get_change_entries(item, old_values, changed_fields)
+            # NOTE: без use_flush транзакция уже зафиксирована в change_db_item.
+            if use_flush:
+                defer_change_entries(self.session, entries)
+            else:
+                change_history_writer.record(entries)
+        return changed_fields, item
 
+    @track_repository_method
     async def disable(
         self: 'BaseRepository[BaseSQLAlchemyModel, Query]',
         *,
@@ -433,6 +1022,7 @@ class BaseRepository(Generic[BaseSQLAlchemyModel, Query], PermissionMixin):
             ignore_permissions=ignore_permissions,
             ignore_method_name='disable',
         )
+        mark_table_changed(self.session, self.model_class.__table__.name)
         result = await self.queries.disable_db_items(
             model=self.model_class,
             ids_to_disable=ids_to_disable,
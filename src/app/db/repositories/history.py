@@ -0,0 +1,86 @@
+"""Модуль репозитория истории изменений."""
+from typing import TYPE_CHECKING, Self
+
+from app.core.context import track_repository_method
+from app.core.models.tables.history import ChangeHistory
+from app.db.extras.history import get_history_item_id
+from app.db.mixins.permissions import PermissionModeEnum
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.sql.elements import ColumnElement
+
+    from app.core.models.tables.base import Base
+
+HistoryCursor = int
+
+
+class ChangeHistoryRepository(BaseRepository[ChangeHistory, BaseQuery]):
+    """Репозиторий для чтения истории изменений.
+
+    Записи отдаются от новых к старым с пагинацией по ключу (``id``) вместо offset.
+    """
+
+    @track_repository_method
+    async def list_changes(
+        self: Self,
+        *,
+        table_name: str | None = None,
+        item_id: str | None = None,
+        item: 'Base | None' = None,
+        fields: 'Sequence[str] | None' = None,
+        limit: int = 50,
+        after: HistoryCursor | None = None,
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> 'tuple[Sequence[ChangeHistory], HistoryCursor | None]':
+        """Получение страницы истории изменений.
+
+        Parameters
+        ----------
+        table_name
+            таблица измененных сущностей (Default: ``None``).
+        item_id
+            первичный ключ измененной сущности строкой (Default: ``None``).
+        item
+            измененная сущность: заменяет ``table_name`` и ``item_id`` (Default: ``None``).
+        fields
+            измененные поля (Default: ``None`` - все поля).
+        limit
+            размер страницы (Default: ``50``).
+        after
+            курсор (``id``) последней записи предыдущей страницы (Default: ``None``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        tuple[Sequence[ChangeHistory], int | None]
+            записи истории и курсор следующей страницы (None, если страница последняя).
+        """
+        if item is not None:
+            table_name = item.__tablename__
+            item_id = get_history_item_id(item)
+        filters: list['ColumnElement[bool]'] = []
+        if table_name is not None:
+            filters.append(ChangeHistory.table_name == table_name)
+        if item_id is not None:
+            filters.append(ChangeHistory.item_id == item_id)
+        if fields:
+            filters.append(ChangeHistory.field.in_(fields))
+        if after is not None:
+            filters.append(ChangeHistory.id < after)
+        items = await self.list(
+            filters=filters,
+            order_by=(ChangeHistory.id.desc(),),
+            limit=limit,
+            permission_mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+        )
+        next_cursor = items[-1].id if len(items) == limit else None
+        return items, next_cursor
@@ -0,0 +1,128 @@
+"""Модуль репозиториев списка просмотренного/прочитанного/наигранного."""
+import datetime
+from typing import TYPE_CHECKING, Any, Self
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+from app.core.context import track_repository_method
+from app.core.models.tables.watch_list import Anime, Kinopoisk
+from app.core.models.views.watch_list import anime_stats_view, kinopoisk_stats_view, watch_list_feed
+from app.db.mixins.permissions import PermissionMixin, PermissionModeEnum
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql.base import ReadOnlyColumnCollection
+    from sqlalchemy.sql.elements import ColumnElement
+
+    FeedRow = dict[str, Any]
+
+FeedCursor = tuple[datetime.datetime, UUID]
+
+
+class AnimeRepository(BaseRepository[Anime, BaseQuery]):
+    """Репозиторий для работы с аниме."""
+
+    stats_view = anime_stats_view
+    track_history = True
+
+
+class KinopoiskRepository(BaseRepository[Kinopoisk, BaseQuery]):
+    """Репозиторий для работы с контентом с Кинопоиска."""
+
+    stats_view = kinopoisk_stats_view
+    track_history = True
+
+
+class WatchListFeedRepository(PermissionMixin):
+    """Репозиторий для чтения элементов всех списков просмотренного одним запросом.
+
+    Работает с объединением (``UNION ALL``) таблиц ``anime`` и ``kinopoisk``. Фильтры строятся по
+    колонкам объединения (``repo.columns``), у каждой строки есть колонка ``source`` с названием
+    таблицы. Записи отдаются от последних обновленных к первым с пагинацией по ключу
+    (``updated_at``, ``id``) вместо offset.
+    """
+
+    selectable = watch_list_feed
+
+    def __init__(self: Self, session: 'AsyncSession') -> None:
+        """Экземпляр репозитория объединенного списка просмотренного.
+
+        Parameters
+        ----------
+        session
+            сессия `sqlalchemy`.
+        """
+        self.session = session
+        self.queries = BaseQuery(session)
+
+    @property
+    def columns(self: Self) -> 'ReadOnlyColumnCollection[str, ColumnElement[Any]]':
+        """Колонки объединения таблиц для построения фильтров."""
+        return self.selectable.c
+
+    @track_repository_method
+    async def list(  # noqa: A003
+        self: Self,
+        *,
+        filters: 'Sequence[ColumnElement[bool]] | None' = None,
+        search: str | None = None,
+        search_by: 'Sequence[str | ColumnElement[Any]] | None' = None,
+        limit: int | None = None,
+        after: FeedCursor | None = None,
+        permission_mode: PermissionModeEnum = PermissionModeEnum.ANYONE,
+        ignore_permissions: bool = False,
+    ) -> 'tuple[list[FeedRow], FeedCursor | None]':
+        """Получение списка последних обновленных элементов из всех таблиц.
+
+        Parameters
+        ----------
+        filters
+            фильтры запроса по колонкам ``columns`` (Default: ``None``).
+        search
+            значение для поиска (Default: ``None``).
+        search_by
+            названия колонок или колонки для поиска (Default: ``None``).
+        limit
+            ограничение по количеству записей (Default: ``None``).
+        after
+            курсор (``updated_at``, ``id``) последней записи предыдущей страницы (Default:
+            ``None``).
+        permission_mode
+            режим доступа к ресурсу.
+        ignore_permissions
+            не производить проверку доступа?
+
+        Returns
+        -------
+        tuple[list[dict[str, Any]], tuple[datetime, UUID] | None]
+            строки объединения и курсор следующей страницы (None, если страница последняя).
+        """
+        join_required, _filters = self.get_visibility_filter_from_permission(
+            method_name='read_list',
+            mode=permission_mode,
+            ignore_permissions=ignore_permissions,
+            ignore_method_name='list',
+        )
+        if join_required:
+            _filters = ()
+        filters = tuple(filters) if filters else ()
+        filters += _filters
+        if after is not None:
+            filters += (tuple_(self.columns.updated_at, self.columns.id) < tuple_(*after),)
+        rows = await self.queries.get_db_selectable_row_list(
+            selectable=self.selectable,
+            filters=filters,
+            search=search,
+            search_by=search_by,
+            order_by=(self.columns.updated_at.desc(), self.columns.id.desc()),
+            limit=limit,
+        )
+        next_cursor = None
+        if limit is not None and len(rows) == limit:
+            next_cursor = (rows[-1]['updated_at'], rows[-1]['id'])
+        return rows, next_cursor
@@ -1,20 +1,39 @@
 """Точка входа в проект."""
+import functools
 import pathlib
 import sys
 
 from fastapi import FastAPI
 from sqladmin import Admin
+from starlette.middleware import Middleware
 
 sys.path.insert(0, pathlib.Path(__file__).absolute().parent.parent.as_posix())
 
 from app.admin.auth import authentication_backend
 from app.admin.views import all_views
 from app.api.v1.api import api_v1_router
+from app.core.cache import configure_response_cache
 from app.core.config import get_application_settings, get_logger
+from app.core.context import install_db_timing as install_request_db_timing
 from app.core.exceptions.handlers import verbose_http_exception_handler
 from app.core.exceptions.http.base import BaseVerboseHTTPException
-from app.core.meta import engine
-from app.utils.admin import admin_bulk_add_views
+from app.core.logs.bootstrap import install_reload_signal
+from app.core.meta import Session, engine
+from app.core.metrics import install_db_metrics, metrics_endpoint
+from app.core.middlewares.compression import CompressionMiddleware
+from app.core.middlewares.conditional import ConditionalGetMiddleware
+from app.core.middlewares.context import RequestContextMiddleware
+from app.core.middlewares.metrics import MetricsMiddleware
+from app.core.middlewares.profiling import ProfilingMiddleware, install_db_timing
+from app.core.middlewares.response_cache import ResponseCacheMiddleware
+from app.core.openapi import install_prerendered_openapi, read_description
+from app.db.extras.history import change_history_writer
+from app.utils.admin import (
+    add_admin_inner_middleware,
+    admin_bulk_add_views,
+    get_cached_resources,
+    get_conditional_resources,
+)
 
 logger = get_logger('app')
 
@@ -29,15 +48,65 @@ def get_application() -> FastAPI:
     """
     app_settings = get_application_settings()
 
-    with app_settings.path_to_description.open(mode='r') as reader:
-        description = reader.read()
+    description = read_description(app_settings.path_to_description)
     app = FastAPI(description=description, **app_settings.fastapi_kwargs)
     app.include_router(api_v1_router)
+    install_prerendered_openapi(app, cache_control=app_settings.openapi_cache_control)
     app.add_exception_handler(  # type: ignore
         BaseVerboseHTTPException,
         verbose_http_exception_handler,
     )
     admin = Admin(app=app, engine=engine, authentication_backend=authentication_backend)
     admin_bulk_add_views(admin, all_views)
+    if app_settings.conditional_get_enabled:
+        add_admin_inner_middleware(
+            admin,
+            Middleware(
+                ConditionalGetMiddleware,
+                resources=get_conditional_resources(all_views),
+                session_factory=Session,
+                get_principal=authentication_backend.get_principal,
+                version=app_settings.version,
+            ),
+        )
+    if app_settings.response_cache_enabled:
+        response_cache = configure_response_cache(
+            url=app_settings.response_cache_url,
+            ttl=app_settings.response_cache_ttl,
+            stale_ttl=app_settings.response_cache_stale_ttl,
+            max_size=app_settings.response_cache_max_size,
+        )
+        add_admin_inner_middleware(
+            admin,
+            Middleware(
+                ResponseCacheMiddleware,
+                cache=response_cache,
+                resources=get_cached_resources(all_views),
+                get_permission_mode=authentication_backend.get_permission_mode,
+            ),
+        )
+    app.add_event_handler('startup', functools.partial(change_history_writer.start, Session))
+    app.add_event_handler('shutdown', change_history_writer.stop)
+    app.add_event_handler('startup', install_reload_signal)
+    if app_settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=app_settings.compression_minimum_size,
+        )
+    if app_settings.metrics_enabled:
+        install_db_metrics(engine.sync_engine)
+        app.add_route(app_settings.metrics_url, metrics_endpoint, include_in_schema=False)
+        app.add_middleware(MetricsMiddleware)
+    if app_settings.profiling_enabled:
+        install_db_timing(engine.sync_engine)
+        app.add_middleware(
+            ProfilingMiddleware,
+            sample_rate=app_settings.profiling_sample_rate,
+            interval=app_settings.profiling_interval,
+            threshold=app_settings.profiling_threshold,
+            output_dir=app_settings.profiling_dir,
+        )
+    install_request_db_timing(engine.sync_engine)
+    app.add_middleware(RequestContextMiddleware)
 
     return app
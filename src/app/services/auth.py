@@ -1,4 +1,5 @@
 import datetime
+import time
 from typing import Any
 from uuid import UUID
 
@@ -7,6 +8,7 @@ from passlib import context
 
 from app.core.config import get_auth_settings, get_logger
 from app.core.exceptions.results import Err, Ok, Result
+from app.core.metrics import JWT_DURATION
 from app.utils.datetime import get_utc_now
 
 logger = get_logger('app')
@@ -47,11 +49,14 @@ def encode_jwt_token(
         'is_admin': is_admin,
         'exp': get_utc_now() + expire_time_delta,
     }
-    return jwt.encode(
+    started_at = time.perf_counter()
+    token = jwt.encode(
         payload=payload,
         key=key.get_secret_value(),
         algorithm=settings.hasher_algorithm,
     )
+    JWT_DURATION.observe(time.perf_counter() - started_at, 'encode')
+    return token
 
 
 def encode_jwt_tokens_pair(
@@ -73,6 +78,7 @@ def decode_jwt_token(
     """Преобразование JWT-токена в словарь."""
     key = settings.refresh_secret_key if is_refresh_token else settings.access_secret_key
     decoded_token: dict[str, Any] = {}
+    started_at = time.perf_counter()
     try:
         decoded_token = jwt.decode(
             jwt=token,
@@ -86,4 +92,5 @@ def decode_jwt_token(
     except jwt.PyJWTError as exc:
         logger.exception('TOKEN-DECODE E2: отловлена базовая ошибка PyJWT.')
         result = Err(exc)
+    JWT_DURATION.observe(time.perf_counter() - started_at, 'decode')
     return result  # type: ignore
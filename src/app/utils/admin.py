@@ -1,13 +1,17 @@
 """Модуль утилит для админ-панели."""
 import enum
+import re
 from typing import TYPE_CHECKING, TypeVar
 
 from app.core.config import get_logger
+from app.core.middlewares.conditional import ConditionalResource
+from app.core.middlewares.response_cache import CachedResource
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
-    from sqladmin import Admin, BaseView
+    from sqladmin import Admin, BaseView, ModelView
+    from starlette.middleware import Middleware
 
     from app.core.models.tables.base import Base
 
@@ -22,6 +26,64 @@ def admin_bulk_add_views(admin: 'Admin', views: 'Iterable[type[BaseView]]') -> N
         admin.add_view(view)
 
 
+def get_conditional_resources(
+    views: 'Iterable[type[ModelView]]',
+    prefix: str = '',
+) -> list[ConditionalResource]:
+    """Возвращает ресурсы условных запросов для страниц списка и записи админ-панели.
+
+    Пути ресурсов - относительно ``prefix`` (Default: ``''`` - относительно приложения
+    админ-панели). Учитываются только страницы с атрибутом ``repository_class`` (репозиторий
+    модели страницы).
+    """
+    resources: list[ConditionalResource] = []
+    for view in views:
+        repository_class = getattr(view, 'repository_class', None)
+        if repository_class is None:
+            continue
+        base_path = f'{re.escape(prefix)}/{re.escape(view.identity)}'
+        identity_type = view.model.__table__.primary_key.columns[0].type.python_type
+        resources.extend(
+            (
+                ConditionalResource(re.compile(f'{base_path}/list'), repository_class),
+                ConditionalResource(
+                    re.compile(f'{base_path}/details/(?P<identity>[^/]+)'),
+                    repository_class,
+                    identity_type,
+                ),
+            ),
+        )
+    return resources
+
+
+def get_cached_resources(views: 'Iterable[type[ModelView]]') -> list[CachedResource]:
+    """Возвращает кэшируемые ресурсы для страниц списка и записи админ-панели.
+
+    Пути ресурсов - относительно приложения админ-панели. Учитываются только страницы с атрибутом
+    ``repository_class``.
+    """
+    resources: list[CachedResource] = []
+    for view in views:
+        if getattr(view, 'repository_class', None) is None:
+            continue
+        tables = (view.model.__table__.name,)
+        resources.append(
+            CachedResource(re.compile(f'/{re.escape(view.identity)}/(list|details/[^/]+)'), tables),
+        )
+    return resources
+
+
+def add_admin_inner_middleware(admin: 'Admin', middleware: 'Middleware') -> None:
+    """Добавляет middleware в приложение админ-панели после middleware авторизации (сессии).
+
+    ``Admin`` ставит свои middleware (``middlewares``) перед middleware авторизации, поэтому
+    middleware, которому нужна сессия, добавляется в конец списка до запуска приложения (стек
+    middleware собирается при первом запросе).
+    """
+    admin.admin.user_middleware.append(middleware)
+    admin.admin.middleware_stack = None
+
+
 def enum_field_verbose(model_instance: 'Base', attribute_name: str) -> str:
     """Заменяет enum.name на enum.value в выводе поля сущности."""
     incorrect_value = '<Incorrect field>'
@@ -31,7 +93,7 @@ def enum_field_verbose(model_instance: 'Base', attribute_name: str) -> str:
     else:
         cls_name = model_instance.__class__.__name__
         logger.warning(
-            'ENUM-FIELD-VERBOSE W: поле "%s" нет в модели %s или оно не является перечислением.',
+            'ENUM-FIELD-VERBOSE W1: поле "%s" нет в модели %s или оно не является перечислением.',
             attribute_name,
             cls_name,
         )
@@ -0,0 +1,106 @@
+"""Модуль утилит для работы с HTTP: ETag, условные запросы и сжатие ответов."""
+import gzip
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+GZIP = 'gzip'
+BROTLI = 'br'
+IDENTITY = 'identity'
+
+
+def get_brotli() -> Any | None:  # noqa: ANN401
+    """Возвращает модуль ``brotli`` (extra ``brotli``) или ``None``, если его нет."""
+    try:
+        import brotli  # type: ignore
+    except ImportError:
+        return None
+    return brotli
+
+
+def get_supported_encodings() -> tuple[str, ...]:
+    """Возвращает поддерживаемые кодировки сжатия в порядке предпочтения."""
+    if get_brotli() is None:
+        return (GZIP,)
+    return (BROTLI, GZIP)
+
+
+def compress(data: bytes, encoding: str, *, quality: int | None = None) -> bytes:
+    """Сжимает данные алгоритмом ``encoding`` (``gzip`` или ``br``).
+
+    Parameters
+    ----------
+    data
+        данные.
+    encoding
+        кодировка сжатия.
+    quality
+        степень сжатия: ``1-9`` для gzip, ``0-11`` для brotli (Default: ``None`` - максимальная).
+
+    Raises
+    ------
+    ValueError
+        если кодировка не поддерживается.
+    """
+    if encoding == GZIP:
+        return gzip.compress(data, compresslevel=9 if quality is None else quality, mtime=0)
+    brotli = get_brotli()
+    if encoding == BROTLI and brotli is not None:
+        return brotli.compress(data, quality=11 if quality is None else quality)
+    msg = f'кодировка сжатия "{encoding}" не поддерживается.'
+    raise ValueError(msg)
+
+
+def get_accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Разбирает заголовок ``Accept-Encoding``: кодировки и их веса (``q``)."""
+    encodings: dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, *params = (part.strip() for part in item.split(';'))
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[name.lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, available: Iterable[str]) -> str | None:
+    """Выбирает кодировку сжатия из ``available`` (в порядке предпочтения), принимаемую клиентом.
+
+    Returns
+    -------
+    str | None
+        кодировка или ``None``, если ответ нужно отдать без сжатия.
+    """
+    accepted = get_accepted_encodings(accept_encoding)
+    default = accepted.get('*', 0.0)
+    best: str | None = None
+    best_quality = 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, default)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def make_etag(data: bytes) -> str:
+    """Возвращает сильный ETag содержимого (в кавычках)."""
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком ``If-None-Match`` (слабое сравнение, как требует RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        candidate.strip().removeprefix('W/') == opaque for candidate in if_none_match.split(',')
+    )
@@ -0,0 +1,20 @@
+"""Пакет бенчмарков слоя данных (``BaseQuery``/``BaseRepository``).
+
+Запуск (из каталога ``src``)::
+
+    PROJECT_RUN_MODE=test python -m benchmarks --size 1000 --size 100000
+
+Нагрузочное тестирование приложения по HTTP::
+
+    PROJECT_RUN_MODE=test python -m benchmarks.load --profile mixed --workers 2
+
+Базовые значения (``baselines.json``) пересобираются после изменений горячих путей слоя данных
+командой (размеры по умолчанию - 1 000, 100 000 и 1 000 000 строк)::
+
+    PROJECT_RUN_MODE=test python -m benchmarks --save-baseline
+
+Задержки и память в базовых значениях зависят от машины: для сравнения задержек базовые значения
+стоит собрать на той же машине. Количество запросов на операцию от машины не зависит.
+
+Подробнее - ``python -m benchmarks --help`` и ``python -m benchmarks.load --help``.
+"""
@@ -0,0 +1,119 @@
+"""Точка входа бенчмарков: ``python -m benchmarks``."""
+import asyncio
+import pathlib
+from typing import Annotated, Optional
+
+import typer
+from typer import secho
+
+from benchmarks.cases import CASES, DEFAULT_DB_NAME, prepare_database, run_cases
+from benchmarks.harness import (
+    DEFAULT_TOLERANCE,
+    BenchmarkResult,
+    compare_with_baselines,
+    load_baselines,
+    save_baselines,
+)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+BASELINES_PATH = pathlib.Path(__file__).parent / 'baselines.json'
+HEADER = f'{"сценарий":<20}{"оп/с":>10}{"p50, мс":>10}{"p99, мс":>10}{"запросов":>10}{"КиБ":>10}'
+
+app = typer.Typer()
+
+
+def print_result(result: BenchmarkResult) -> None:
+    """Выводит строку результата бенчмарка."""
+    secho(
+        f'{result.key:<20}{result.throughput:>10.1f}{result.p50_ms:>10.3f}{result.p99_ms:>10.3f}'
+        f'{result.statements_per_op:>10.2f}{result.allocated_kib:>10.1f}',
+    )
+
+
+async def run(
+    *,
+    sizes: list[int],
+    iterations: int,
+    warmup: int,
+    cases: list[str] | None,
+    db_name: str,
+) -> list[BenchmarkResult]:
+    """Выполняет бенчмарки на всех размерах таблицы."""
+    engine = await prepare_database(db_name)
+    results: list[BenchmarkResult] = []
+    secho(HEADER, bold=True)
+    try:
+        for size in sizes:
+            results.extend(
+                await run_cases(
+                    engine,
+                    size=size,
+                    iterations=iterations,
+                    warmup=warmup,
+                    cases=cases,
+                    on_result=print_result,
+                ),
+            )
+    finally:
+        await engine.dispose()
+    return results
+
+
+@app.command()
+def main(
+    size: Annotated[
+        Optional[list[int]],
+        typer.Option(help='размер таблицы anime (можно указать несколько раз)'),
+    ] = None,
+    iterations: Annotated[int, typer.Option(help='количество измеряемых вызовов')] = 200,
+    warmup: Annotated[int, typer.Option(help='количество вызовов для прогрева')] = 20,
+    case: Annotated[
+        Optional[list[str]],
+        typer.Option(help=f'сценарий ({", ".join(case.name for case in CASES)})'),
+    ] = None,
+    db_name: Annotated[str, typer.Option(help='база данных бенчмарков')] = DEFAULT_DB_NAME,
+    baselines: Annotated[
+        pathlib.Path,
+        typer.Option(help='файл базовых значений'),
+    ] = BASELINES_PATH,
+    save_baseline: Annotated[
+        bool,
+        typer.Option(help='сохранить результаты как базовые значения?'),
+    ] = False,
+    tolerance: Annotated[
+        float,
+        typer.Option(help='допустимое ухудшение задержек и памяти (доля)'),
+    ] = DEFAULT_TOLERANCE,
+):
+    """Измеряет операции BaseRepository на таблице anime и сравнивает с базовыми значениями.
+
+    Количество запросов на операцию сравнивается строго, задержки и память - с допуском. При
+    регрессиях команда завершается с кодом 1.
+    """
+    results = asyncio.run(
+        run(
+            sizes=size or DEFAULT_SIZES,
+            iterations=iterations,
+            warmup=warmup,
+            cases=case,
+            db_name=db_name,
+        ),
+    )
+    if save_baseline:
+        save_baselines(baselines, results)
+        secho(f'Базовые значения сохранены: {baselines}.', fg='green')
+        return
+    regressions = compare_with_baselines(results, load_baselines(baselines), tolerance=tolerance)
+    for regression in regressions:
+        secho(
+            f'Регрессия {regression.key} {regression.metric}: '
+            f'{regression.baseline} -> {regression.current:.3f}.',
+            fg='red',
+        )
+    if regressions:
+        raise typer.Exit(code=1)
+    secho('Регрессий нет.', fg='green')
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,246 @@
+"""Модуль сценариев бенчмарков репозитория аниме.
+
+Таблица ``anime`` в отдельной базе данных заполняется ``size`` строками одним
+``INSERT ... SELECT generate_series``. Сценарии чтения выполняются как есть. Сценарии записи
+выполняются внутри одной транзакции с ``use_flush=True``, которая откатывается после бенчмарка,
+чтобы размер таблицы не менялся между сценариями.
+"""
+import contextlib
+from collections.abc import AsyncGenerator, Callable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import asyncpg
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_database_settings
+from app.core.models.enums.watch_list import AnimeKindEnum, StatusEnum
+from app.core.models.tables.base import Base
+from app.core.models.tables.watch_list import Anime
+from app.db.repositories.watch_list import AnimeRepository
+from benchmarks.harness import BenchmarkResult, measure_allocations, run_benchmark
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+    from benchmarks.harness import Operation
+
+    OperationFactory = Callable[[AnimeRepository, list[Anime]], Operation]
+
+DEFAULT_DB_NAME = 'benchmark_db'
+SEED_QUERY_TEMPLATE = """
+    INSERT INTO anime (
+        id, name, native_name, score, repeat_view_count, status, kind, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'Аниме ' || i,
+        'anime ' || i,
+        i % 101,
+        i % 5,
+        (CAST(:statuses AS text[]))[i % :statuses_count + 1]::{status_type},
+        (CAST(:kinds AS text[]))[i % :kinds_count + 1]::{kind_type},
+        now() - i * interval '1 minute',
+        now() - i * interval '1 minute'
+    FROM generate_series(1, :size) AS i
+"""
+
+
+class BenchmarkCase(NamedTuple):
+    """Сценарий бенчмарка: операция над репозиторием и признак записи (откат после сценария)."""
+
+    name: str
+    make_operation: 'OperationFactory'
+    is_write: bool = False
+
+
+def _get(repo: AnimeRepository, items: list[Anime]) -> 'Operation':
+    ids = [item.id for item in items]
+
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        return await repo.get(item_identity=ids[index % len(ids)])
+
+    return operation
+
+
+def _list(repo: AnimeRepository, _: list[Anime]) -> 'Operation':
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        return await repo.list(
+            search=f'Аниме {index % 100}',
+            search_by=['name', 'native_name'],
+            filters=[Anime.status == StatusEnum.WATCHED],
+            order_by=[Anime.score.desc()],
+            limit=50,
+        )
+
+    return operation
+
+
+def _count(repo: AnimeRepository, _: list[Anime]) -> 'Operation':
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        statuses = list(StatusEnum)
+        return await repo.count(filters=[Anime.status == statuses[index % len(statuses)]])
+
+    return operation
+
+
+def _create(repo: AnimeRepository, _: list[Anime]) -> 'Operation':
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        data = dict(name=f'Новое аниме {index}', native_name=f'new anime {index}', score=50)
+        return await repo.create(data=data, use_flush=True)
+
+    return operation
+
+
+def _update(repo: AnimeRepository, items: list[Anime]) -> 'Operation':
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        item = items[index % len(items)]
+        data = dict(score=((item.score or 0) + 1) % 101, my_opinion=f'мнение {index}')
+        return await repo.update(data=data, item=item, use_flush=True)
+
+    return operation
+
+
+def _disable(repo: AnimeRepository, items: list[Anime]) -> 'Operation':
+    ids: list['uuid.UUID'] = [item.id for item in items]
+
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        return await repo.disable(
+            ids_to_disable={ids[index % len(ids)]},
+            id_field=Anime.id,
+            disable_field=Anime.updated_at,
+            allow_filter_by_value=False,
+            use_flush=True,
+        )
+
+    return operation
+
+
+def _delete(repo: AnimeRepository, items: list[Anime]) -> 'Operation':
+    async def operation(index: int) -> Any:  # noqa: ANN401
+        return await repo.queries.delete_db_item(item=items[index], use_flush=True)
+
+    return operation
+
+
+CASES = (
+    BenchmarkCase('get', _get),
+    BenchmarkCase('list', _list),
+    BenchmarkCase('count', _count),
+    BenchmarkCase('create', _create, is_write=True),
+    BenchmarkCase('update', _update, is_write=True),
+    BenchmarkCase('disable', _disable, is_write=True),
+    BenchmarkCase('delete', _delete, is_write=True),
+)
+
+
+def get_benchmark_db_url(db_name: str = DEFAULT_DB_NAME) -> str:
+    """Возвращает ссылку SQLAlchemy на базу данных бенчмарков."""
+    url = make_url(get_database_settings().db_url).set(database=db_name)
+    return url.render_as_string(hide_password=False)
+
+
+async def prepare_database(db_name: str = DEFAULT_DB_NAME) -> 'AsyncEngine':
+    """Создает (если нужно) базу данных бенчмарков со схемой всех моделей и возвращает движок."""
+    connection = await asyncpg.connect(get_database_settings().asyncpg_postgresql_url)
+    try:
+        with contextlib.suppress(asyncpg.DuplicateDatabaseError):
+            await connection.execute(f'CREATE DATABASE {db_name}')
+    finally:
+        await connection.close()
+    engine = create_async_engine(get_benchmark_db_url(db_name))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def seed(engine: 'AsyncEngine', size: int) -> None:
+    """Заполняет таблицу ``anime`` ровно ``size`` строками (если строк уже столько - ничего)."""
+    async with engine.begin() as conn:
+        if await conn.scalar(select(func.count()).select_from(Anime)) == size:
+            return
+        await conn.execute(text('TRUNCATE anime CASCADE'))
+        columns = Anime.__table__.columns
+        query = SEED_QUERY_TEMPLATE.format(
+            status_type=columns['status'].type.name,  # type: ignore
+            kind_type=columns['kind'].type.name,  # type: ignore
+        )
+        statuses = [status.name for status in StatusEnum]
+        kinds = [kind.name for kind in AnimeKindEnum]
+        await conn.execute(
+            text(query),
+            dict(
+                statuses=statuses,
+                statuses_count=len(statuses),
+                kinds=kinds,
+                kinds_count=len(kinds),
+                size=size,
+            ),
+        )
+    async with engine.connect() as conn:
+        autocommit_conn = await conn.execution_options(isolation_level='AUTOCOMMIT')
+        await autocommit_conn.execute(text('VACUUM ANALYZE anime'))
+
+
+@contextlib.asynccontextmanager
+async def get_session(
+    engine: 'AsyncEngine',
+    *,
+    rollback: bool,
+) -> AsyncGenerator['AsyncSession', None]:
+    """Сессия для сценария: для сценариев записи все изменения откатываются после сценария."""
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            if rollback:
+                await session.rollback()
+
+
+async def run_cases(
+    engine: 'AsyncEngine',
+    *,
+    size: int,
+    iterations: int,
+    warmup: int,
+    cases: 'list[str] | None' = None,
+    on_result: 'Callable[[BenchmarkResult], None] | None' = None,
+) -> list[BenchmarkResult]:
+    """Выполняет сценарии бенчмарков на таблице из ``size`` строк."""
+    await seed(engine, size)
+    allocation_iterations = min(20, iterations)
+    total_calls = warmup + iterations + allocation_iterations
+    async with get_session(engine, rollback=False) as session:
+
+        async def ping(_: int) -> None:
+            await session.execute(select(1))
+
+        await ping(0)
+        allocation_floor_kib = await measure_allocations(ping, start=0, iterations=20)
+    results: list[BenchmarkResult] = []
+    for case in CASES:
+        if cases and case.name not in cases:
+            continue
+        async with get_session(engine, rollback=case.is_write) as session:
+            repo = AnimeRepository(session)
+            items = list(
+                await repo.list(order_by=[Anime.id], limit=total_calls),
+            )
+            result = await run_benchmark(
+                engine,
+                case.make_operation(repo, items),
+                case=case.name,
+                size=size,
+                iterations=iterations,
+                warmup=warmup,
+                allocation_iterations=allocation_iterations,
+                allocation_floor_kib=allocation_floor_kib,
+            )
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
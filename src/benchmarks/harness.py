@@ -0,0 +1,215 @@
+"""Модуль измерений бенчмарков.
+
+Каждый бенчмарк - асинхронная операция, которая выполняется ``iterations`` раз. Для операции
+считаются пропускная способность, задержки (p50/p99), количество SQL-запросов и объем памяти,
+выделенной Python на одну операцию (``tracemalloc``). Память измеряется отдельным коротким проходом,
+чтобы трассировка не искажала время. Из памяти вычитается пик пустого запроса (``SELECT 1``): так
+буфер чтения сокета asyncio (до 256 КиБ на ответ) не скрывает изменения в самом слое данных.
+"""
+import statistics
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import orjson
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    import pathlib
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+Operation = Callable[[int], Awaitable[Any]]
+NANOSECONDS_IN_MILLISECOND = 1_000_000
+DEFAULT_TOLERANCE = 0.25
+
+
+class BenchmarkResult(NamedTuple):
+    """Результат бенчмарка одной операции на одном размере таблицы."""
+
+    case: str
+    size: int
+    iterations: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    statements_per_op: float
+    allocated_kib: float
+
+    @property
+    def key(self: 'BenchmarkResult') -> str:
+        """Ключ результата в файле базовых значений."""
+        return f'{self.case}[{self.size}]'
+
+
+class Regression(NamedTuple):
+    """Ухудшение метрики относительно базового значения."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+
+class StatementCounter:
+    """Счетчик SQL-запросов, отправленных через движок."""
+
+    def __init__(self: 'StatementCounter', engine: 'AsyncEngine') -> None:
+        """Экземпляр счетчика запросов движка ``engine``."""
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self: 'StatementCounter', *_: Any) -> None:  # noqa: ANN401
+        self.count += 1
+
+    def __enter__(self: 'StatementCounter') -> 'StatementCounter':  # noqa: D105
+        event.listen(self.engine.sync_engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self: 'StatementCounter', *_: object) -> None:  # noqa: D105
+        event.remove(self.engine.sync_engine, 'before_cursor_execute', self._on_execute)
+
+
+def get_percentile(timings: list[int], percentile: int) -> float:
+    """Возвращает перцентиль задержек в миллисекундах (задержки - в наносекундах)."""
+    if len(timings) == 1:
+        return timings[0] / NANOSECONDS_IN_MILLISECOND
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return quantiles[percentile - 1] / NANOSECONDS_IN_MILLISECOND
+
+
+async def measure_allocations(operation: Operation, *, start: int, iterations: int) -> float:
+    """Возвращает средний пик памяти Python (КиБ), выделенной за одну операцию."""
+    if iterations <= 0:
+        return 0.0
+    tracemalloc.start()
+    try:
+        total = 0
+        for index in range(start, start + iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await operation(index)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+    finally:
+        tracemalloc.stop()
+    return total / iterations / 1024
+
+
+async def run_benchmark(
+    engine: 'AsyncEngine',
+    operation: Operation,
+    *,
+    case: str,
+    size: int,
+    iterations: int,
+    warmup: int = 10,
+    allocation_iterations: int = 20,
+    allocation_floor_kib: float = 0.0,
+) -> BenchmarkResult:
+    """Выполняет бенчмарк операции.
+
+    Parameters
+    ----------
+    engine
+        движок, через который операция работает с базой данных (для подсчета запросов).
+    operation
+        асинхронная операция; принимает порядковый номер вызова (по нему выбираются данные).
+    case
+        название бенчмарка.
+    size
+        размер таблицы.
+    iterations
+        количество измеряемых вызовов.
+    warmup
+        количество вызовов для прогрева: кэши запросов и компиляции (Default: ``10``).
+    allocation_iterations
+        количество вызовов для измерения памяти (Default: ``20``).
+    allocation_floor_kib
+        память пустого запроса, которая вычитается из результата (Default: ``0.0``).
+
+    Returns
+    -------
+    BenchmarkResult
+        результат бенчмарка.
+    """
+    for index in range(warmup):
+        await operation(index)
+    timings: list[int] = []
+    with StatementCounter(engine) as counter:
+        started_at = time.perf_counter_ns()
+        for index in range(warmup, warmup + iterations):
+            operation_started_at = time.perf_counter_ns()
+            await operation(index)
+            timings.append(time.perf_counter_ns() - operation_started_at)
+        total = time.perf_counter_ns() - started_at
+    allocated_kib = await measure_allocations(
+        operation,
+        start=warmup + iterations,
+        iterations=allocation_iterations,
+    )
+    return BenchmarkResult(
+        case=case,
+        size=size,
+        iterations=iterations,
+        throughput=iterations / (total / 1_000_000_000),
+        p50_ms=get_percentile(timings, 50),
+        p99_ms=get_percentile(timings, 99),
+        statements_per_op=counter.count / iterations,
+        allocated_kib=max(allocated_kib - allocation_floor_kib, 0.0),
+    )
+
+
+def load_baselines(path: 'pathlib.Path') -> dict[str, dict[str, float]]:
+    """Загружает базовые значения (пустой словарь, если файла нет)."""
+    if not path.exists():
+        return {}
+    return orjson.loads(path.read_bytes())
+
+
+def save_baselines(path: 'pathlib.Path', results: list[BenchmarkResult]) -> None:
+    """Сохраняет результаты как базовые значения (остальные базовые значения сохраняются)."""
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.key] = {
+            'throughput': round(result.throughput, 2),
+            'p50_ms': round(result.p50_ms, 4),
+            'p99_ms': round(result.p99_ms, 4),
+            'statements_per_op': result.statements_per_op,
+            'allocated_kib': round(result.allocated_kib, 2),
+        }
+    path.write_bytes(orjson.dumps(baselines, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+
+
+def compare_with_baselines(
+    results: list[BenchmarkResult],
+    baselines: dict[str, dict[str, float]],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[Regression]:
+    """Сравнивает результаты с базовыми значениями.
+
+    Задержки и память считаются ухудшенными, если выросли больше чем на ``tolerance`` (доля).
+    Количество запросов сравнивается строго: лишний запрос на операцию (например, N+1) - всегда
+    регрессия.
+    """
+    regressions: list[Regression] = []
+    for result in results:
+        baseline = baselines.get(result.key)
+        if baseline is None:
+            continue
+        for metric in ('p50_ms', 'p99_ms', 'allocated_kib'):
+            current = getattr(result, metric)
+            if current > baseline[metric] * (1 + tolerance):
+                regressions.append(Regression(result.key, metric, baseline[metric], current))
+        if result.statements_per_op > baseline['statements_per_op']:
+            regressions.append(
+                Regression(
+                    result.key,
+                    'statements_per_op',
+                    baseline['statements_per_op'],
+                    result.statements_per_op,
+                ),
+            )
+    return regressions
@@ -0,0 +1,486 @@
+"""Модуль нагрузочного тестирования приложения по HTTP.
+
+Приложение (``app.main:get_application``) запускается через uvicorn с ``--workers N`` поверх базы
+данных бенчмарков, а асинхронный драйвер на httpx создает нагрузку по профилю: каждый виртуальный
+пользователь в цикле выбирает сценарий по весам и сразу отправляет следующий запрос после ответа
+(закрытая модель нагрузки). Нагрузка повышается ступенями (количество пользователей), для каждой
+ступени считаются пропускная способность, перцентили задержек, доля ошибок и гистограмма задержек.
+Точка насыщения - ступень, после которой рост пользователей почти не увеличивает пропускную
+способность (или растет доля ошибок): дальше увеличиваются только задержки.
+
+Запуск (из каталога ``src``)::
+
+    PROJECT_RUN_MODE=test python -m benchmarks.load --profile mixed --workers 2
+
+Драйвер тоже потребляет процессор: для честных цифр запускайте его на отдельных ядрах или машине
+(``--url`` - нагрузка уже запущенного приложения).
+"""
+import asyncio
+import bisect
+import contextlib
+import os
+import pathlib
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple, Optional
+
+import httpx
+import orjson
+import typer
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from typer import secho
+
+from app.core.models.tables.admins import Admin
+from app.core.models.tables.watch_list import Anime
+from benchmarks.cases import DEFAULT_DB_NAME, prepare_database, seed
+
+if TYPE_CHECKING:
+    import uuid
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+SRC_DIR = pathlib.Path(__file__).absolute().parent.parent
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64]
+SATURATION_THROUGHPUT_GAIN = 0.05
+SATURATION_ERROR_RATE = 0.01
+LOAD_ADMIN_USERNAME = 'load_test_admin'
+LOAD_ADMIN_PASSWORD = 'load_test_password'  # noqa: S105
+SERVER_START_TIMEOUT = 30.0
+HTTP_FOUND = 302
+HTTP_BAD_REQUEST = 400
+
+app = typer.Typer()
+
+
+class LoadContext(NamedTuple):
+    """Данные для сценариев: идентификаторы записей аниме."""
+
+    anime_ids: list['uuid.UUID']
+
+
+Request = Callable[[httpx.AsyncClient, random.Random, LoadContext], Awaitable[httpx.Response]]
+
+
+class Scenario(NamedTuple):
+    """Сценарий нагрузки: запрос и его вес в профиле."""
+
+    name: str
+    request: Request
+    weight: int = 1
+
+
+class Profile(NamedTuple):
+    """Профиль нагрузки: набор сценариев и необходимость входа в админ-панель."""
+
+    scenarios: tuple[Scenario, ...]
+    requires_login: bool = True
+
+
+class Sample(NamedTuple):
+    """Результат одного запроса."""
+
+    scenario: str
+    latency_ms: float
+    is_ok: bool
+
+
+class LevelResult(NamedTuple):
+    """Результат одной ступени нагрузки."""
+
+    concurrency: int
+    requests: int
+    throughput: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    error_rate: float
+    histogram: list[int]
+
+
+async def login(client: httpx.AsyncClient, *_: Any) -> httpx.Response:  # noqa: ANN401
+    """Вход в админ-панель (проверка пароля и выпуск JWT-токена)."""
+    return await client.post(
+        '/admin/login',
+        data={'username': LOAD_ADMIN_USERNAME, 'password': LOAD_ADMIN_PASSWORD},
+    )
+
+
+async def list_anime(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    _: LoadContext,
+) -> httpx.Response:
+    """Страница списка с сортировкой и пагинацией."""
+    params = {'sortBy': rng.choice(['score', 'kind', 'status']), 'sort': 'desc'}
+    params['page'] = str(rng.randint(1, 20))
+    return await client.get('/admin/anime/list', params=params)
+
+
+async def search_anime(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    _: LoadContext,
+) -> httpx.Response:
+    """Страница списка с поиском по названию."""
+    return await client.get('/admin/anime/list', params={'search': f'Аниме {rng.randint(1, 999)}'})
+
+
+async def get_anime(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    context: LoadContext,
+) -> httpx.Response:
+    """Страница записи."""
+    return await client.get(f'/admin/anime/details/{rng.choice(context.anime_ids)}')
+
+
+async def edit_anime(
+    client: httpx.AsyncClient,
+    rng: random.Random,
+    context: LoadContext,
+) -> httpx.Response:
+    """Изменение записи через форму админ-панели."""
+    return await client.post(
+        f'/admin/anime/edit/{rng.choice(context.anime_ids)}',
+        data={'my_opinion': f'мнение {rng.randint(1, 1_000_000)}'},
+    )
+
+
+PROFILES = {
+    'list': Profile((Scenario('list', list_anime),)),
+    'search': Profile((Scenario('search', search_anime),)),
+    'detail': Profile((Scenario('detail', get_anime),)),
+    'login': Profile((Scenario('login', login),), requires_login=False),
+    'mixed': Profile(
+        (
+            Scenario('list', list_anime, weight=40),
+            Scenario('search', search_anime, weight=20),
+            Scenario('detail', get_anime, weight=30),
+            Scenario('edit', edit_anime, weight=10),
+        ),
+    ),
+}
+
+
+def is_successful(response: httpx.Response) -> bool:
+    """Успешен ли ответ (перенаправление после входа и сохранения формы - тоже успех)."""
+    return response.status_code < HTTP_BAD_REQUEST and (
+        response.status_code != HTTP_FOUND or '/login' not in response.headers.get('location', '')
+    )
+
+
+def get_histogram(latencies: Sequence[float]) -> list[int]:
+    """Возвращает количество задержек в корзинах ``HISTOGRAM_BUCKETS_MS`` (+ корзина сверх)."""
+    histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for latency in latencies:
+        histogram[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+    return histogram
+
+
+def get_level_result(concurrency: int, samples: Sequence[Sample], duration: float) -> LevelResult:
+    """Считает метрики ступени нагрузки."""
+    latencies = sorted(sample.latency_ms for sample in samples)
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p90, p99 = quantiles[49], quantiles[89], quantiles[98]
+    else:
+        p50 = p90 = p99 = latencies[0] if latencies else 0.0
+    errors = sum(1 for sample in samples if not sample.is_ok)
+    return LevelResult(
+        concurrency=concurrency,
+        requests=len(samples),
+        throughput=len(samples) / duration,
+        p50_ms=p50,
+        p90_ms=p90,
+        p99_ms=p99,
+        error_rate=errors / len(samples) if samples else 0.0,
+        histogram=get_histogram(latencies),
+    )
+
+
+def find_saturation_point(levels: Sequence[LevelResult]) -> LevelResult | None:
+    """Возвращает ступень насыщения.
+
+    Это последняя ступень перед той, на которой пропускная способность выросла меньше чем на
+    ``SATURATION_THROUGHPUT_GAIN`` или доля ошибок превысила ``SATURATION_ERROR_RATE``. Если
+    насыщение не достигнуто, возвращает None.
+    """
+    for previous, current in zip(levels, levels[1:], strict=False):
+        if current.error_rate > SATURATION_ERROR_RATE:
+            return previous
+        if current.throughput < previous.throughput * (1 + SATURATION_THROUGHPUT_GAIN):
+            return previous
+    return None
+
+
+async def run_level(
+    base_url: str,
+    profile: Profile,
+    context: LoadContext,
+    *,
+    concurrency: int,
+    duration: float,
+) -> LevelResult:
+    """Создает нагрузку ``concurrency`` виртуальными пользователями в течение ``duration`` с."""
+    loop = asyncio.get_running_loop()
+    samples: list[Sample] = []
+    weights = [scenario.weight for scenario in profile.scenarios]
+    limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    clients = [
+        httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) for _ in range(concurrency)
+    ]
+    for client in clients:
+        if profile.requires_login:
+            await login(client)
+    deadline = loop.time() + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(index)  # noqa: S311
+        client = clients[index]
+        while loop.time() < deadline:
+            (scenario,) = rng.choices(profile.scenarios, weights)
+            started_at = time.perf_counter()
+            try:
+                response = await scenario.request(client, rng, context)
+                is_ok = is_successful(response)
+            except httpx.HTTPError:
+                is_ok = False
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            samples.append(Sample(scenario.name, latency_ms, is_ok))
+
+    started_at = loop.time()
+    try:
+        await asyncio.gather(*(user(index) for index in range(concurrency)))
+    finally:
+        for client in clients:
+            await client.aclose()
+    return get_level_result(concurrency, samples, loop.time() - started_at)
+
+
+async def prepare_load_data(engine: 'AsyncEngine', size: int) -> LoadContext:
+    """Заполняет базу данных бенчмарков и создает администратора для входа в админ-панель."""
+    await seed(engine, size)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with session_factory() as session:
+        await session.execute(delete(Admin).where(Admin.username == LOAD_ADMIN_USERNAME))
+        session.add(Admin(username=LOAD_ADMIN_USERNAME, password=LOAD_ADMIN_PASSWORD))
+        await session.commit()
+        anime_ids = list(await session.scalars(select(Anime.id).limit(1000)))
+    return LoadContext(anime_ids=anime_ids)
+
+
+def start_server(
+    *,
+    workers: int,
+    port: int,
+    db_name: str,
+    log_path: pathlib.Path | None = None,
+) -> subprocess.Popen[bytes]:
+    """Запускает процесс uvicorn с приложением.
+
+    Вывод приложения пишется в ``log_path`` (по умолчанию отбрасывается).
+    """
+    command = [
+        sys.executable,
+        '-m',
+        'uvicorn',
+        '--factory',
+        'app.main:get_application',
+        '--host',
+        '127.0.0.1',
+        '--port',
+        str(port),
+        '--workers',
+        str(workers),
+        '--no-access-log',
+        '--log-level',
+        'warning',
+    ]
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(log_path.open('ab')) if log_path else subprocess.DEVNULL
+        env = {**os.environ, 'DB_NAME': db_name}
+        return subprocess.Popen(
+            command,  # noqa: S603
+            cwd=SRC_DIR,
+            env=env,
+            stdout=output,
+            stderr=output,
+        )
+
+
+@contextlib.asynccontextmanager
+async def run_server(
+    *,
+    workers: int,
+    port: int,
+    db_name: str,
+    log_path: pathlib.Path | None = None,
+) -> AsyncGenerator[str, None]:
+    """Запускает приложение и возвращает его адрес; по выходе процесс останавливается."""
+    base_url = f'http://127.0.0.1:{port}'
+    process = start_server(workers=workers, port=port, db_name=db_name, log_path=log_path)
+    try:
+        await wait_for_server(base_url)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=SERVER_START_TIMEOUT)
+
+
+async def wait_for_server(base_url: str) -> None:
+    """Ждет, пока приложение начнет отвечать.
+
+    Raises
+    ------
+    RuntimeError
+        если приложение не ответило за ``SERVER_START_TIMEOUT`` секунд.
+    """
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            with contextlib.suppress(httpx.HTTPError):
+                response = await client.get('/openapi.json')
+                if response.status_code == httpx.codes.OK:
+                    return
+            await asyncio.sleep(0.2)
+    msg = f'Приложение не запустилось за {SERVER_START_TIMEOUT} секунд.'
+    raise RuntimeError(msg)
+
+
+def print_level(level: LevelResult) -> None:
+    """Выводит метрики ступени нагрузки."""
+    secho(
+        f'{level.concurrency:>6}{level.requests:>9}{level.throughput:>10.1f}{level.p50_ms:>10.2f}'
+        f'{level.p90_ms:>10.2f}{level.p99_ms:>10.2f}{level.error_rate:>9.2%}',
+    )
+
+
+def print_histogram(level: LevelResult) -> None:
+    """Выводит гистограмму задержек ступени нагрузки."""
+    labels = [f'<={bucket} мс' for bucket in HISTOGRAM_BUCKETS_MS]
+    labels.append(f'>{HISTOGRAM_BUCKETS_MS[-1]} мс')
+    total = max(level.requests, 1)
+    for label, count in zip(labels, level.histogram, strict=True):
+        if count:
+            secho(f'    {label:>12} {"#" * max(1, round(40 * count / total)):<40} {count}')
+
+
+async def run(
+    *,
+    profiles: list[str],
+    concurrency: list[int],
+    duration: float,
+    workers: int,
+    port: int,
+    size: int,
+    db_name: str,
+    url: str | None,
+    server_log: pathlib.Path | None,
+) -> dict[str, Any]:
+    """Выполняет нагрузочные профили и возвращает отчет."""
+    engine = await prepare_database(db_name)
+    try:
+        context = await prepare_load_data(engine, size)
+    finally:
+        await engine.dispose()
+    report: dict[str, Any] = {'workers': workers, 'size': size, 'profiles': {}}
+    server = (
+        contextlib.nullcontext(url)
+        if url
+        else run_server(workers=workers, port=port, db_name=db_name, log_path=server_log)
+    )
+    async with server as base_url:  # type: ignore
+        for name in profiles:
+            secho(f'Профиль {name}:', bold=True)
+            secho(
+                f'{"польз.":>6}{"запросов":>9}{"зап/с":>10}{"p50, мс":>10}{"p90, мс":>10}'
+                f'{"p99, мс":>10}{"ошибки":>9}',
+            )
+            levels: list[LevelResult] = []
+            for level_concurrency in concurrency:
+                level = await run_level(
+                    base_url,
+                    PROFILES[name],
+                    context,
+                    concurrency=level_concurrency,
+                    duration=duration,
+                )
+                levels.append(level)
+                print_level(level)
+                print_histogram(level)
+            saturation = find_saturation_point(levels)
+            if saturation is None:
+                secho('Насыщение не достигнуто.', fg='yellow')
+            else:
+                secho(
+                    f'Насыщение: {saturation.concurrency} польз., '
+                    f'{saturation.throughput:.1f} зап/с, p99 {saturation.p99_ms:.2f} мс.',
+                    fg='green',
+                )
+            report['profiles'][name] = {
+                'levels': [level._asdict() for level in levels],
+                'saturation': saturation._asdict() if saturation else None,
+                'histogram_buckets_ms': HISTOGRAM_BUCKETS_MS,
+            }
+    return report
+
+
+@app.command()
+def main(
+    profile: Annotated[
+        Optional[list[str]],
+        typer.Option(help=f'профиль нагрузки ({", ".join(PROFILES)})'),
+    ] = None,
+    concurrency: Annotated[
+        Optional[list[int]],
+        typer.Option(help='количество виртуальных пользователей ступени (можно несколько раз)'),
+    ] = None,
+    duration: Annotated[float, typer.Option(help='длительность ступени в секундах')] = 10.0,
+    workers: Annotated[int, typer.Option(help='количество процессов uvicorn')] = 1,
+    port: Annotated[int, typer.Option(help='порт приложения')] = 8765,
+    size: Annotated[int, typer.Option(help='количество записей в таблице anime')] = 100_000,
+    db_name: Annotated[str, typer.Option(help='база данных бенчмарков')] = DEFAULT_DB_NAME,
+    url: Annotated[
+        Optional[str],
+        typer.Option(help='адрес уже запущенного приложения (uvicorn не запускается)'),
+    ] = None,
+    output: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(help='файл для отчета в формате JSON'),
+    ] = None,
+    server_log: Annotated[
+        Optional[pathlib.Path],
+        typer.Option(help='файл для вывода приложения'),
+    ] = None,
+):
+    """Нагрузочное тестирование приложения по профилям с поиском точки насыщения."""
+    unknown = set(profile or []) - set(PROFILES)
+    if unknown:
+        secho(f'Неизвестные профили: {", ".join(sorted(unknown))}.', fg='red')
+        raise typer.Exit(code=1)
+    report = asyncio.run(
+        run(
+            profiles=profile or list(PROFILES),
+            concurrency=concurrency or DEFAULT_CONCURRENCY,
+            duration=duration,
+            workers=workers,
+            port=port,
+            size=size,
+            db_name=db_name,
+            url=url,
+            server_log=server_log,
+        ),
+    )
+    if output is not None:
+        output.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        secho(f'Отчет сохранен: {output}.', fg='green')
+
+
+if __name__ == '__main__':
+    app()
@@ -1,6 +1,8 @@
 """Пакет команд для работы с проектом."""
+from pathlib import Path
 from typing import Annotated, Optional
 
+import click
 import typer
 
 from .custom_typers import AsyncTyper
@@ -20,6 +22,18 @@ async def create_admin(username: str, password: str):
     await create_admin_command(username, password)
 
 
+@cli.command()
+def dump_settings(path: Annotated[Path, typer.Argument(help='путь к файлу снимка настроек')]):
+    """Сохраняет снимок настроек проекта для быстрого запуска воркеров.
+
+    Путь к снимку передается воркерам переменной окружения SETTINGS_SNAPSHOT. Снимок содержит
+    секреты в открытом виде.
+    """
+    from app.core.settings.loader import load_settings, save_snapshot
+
+    save_snapshot(load_settings(), path)
+
+
 @db_cli.command()
 def migrate(revision: Annotated[str, typer.Argument(help='id миграции')] = 'head'):
     """Применяет миграции до переданной.
@@ -31,6 +45,38 @@ def migrate(revision: Annotated[str, typer.Argument(help='id миграции')]
     migrate(revision=revision)
 
 
+@db_cli.async_command()
+async def migrate_online(
+    revision: Annotated[str, typer.Argument(help='id миграции')] = 'head',
+    lock_timeout: Annotated[
+        str,
+        typer.Option(help='сколько ждать блокировку таблицы (например, 5s или 500ms)'),
+    ] = '5s',
+    statement_timeout: Annotated[
+        str,
+        typer.Option(help='максимальная длительность одного запроса миграции'),
+    ] = '10min',
+    retries: Annotated[
+        int,
+        typer.Option(help='сколько раз повторять миграцию, не дождавшуюся блокировки'),
+    ] = 5,
+):
+    """Применяет миграции по одной под нагрузкой (онлайн-режим).
+
+    Каждая миграция выполняется с ограничениями lock_timeout и statement_timeout и повторяется с
+    экспоненциальной задержкой, если не дождалась блокировки. В конце выводится длительность
+    каждого шага.
+    """
+    from .commands.db import migrate_online_command
+
+    await migrate_online_command(
+        revision=revision,
+        lock_timeout=lock_timeout,
+        statement_timeout=statement_timeout,
+        retries=retries,
+    )
+
+
 @db_cli.command()
 def revert_migrations(revision: Annotated[str, typer.Argument(help='id миграции')] = 'base'):
     """отменяет миграции до переданной. Если ничего не передано.
@@ -58,3 +104,99 @@ def make_migration(
     from .commands.db import make_migration
 
     make_migration(message=message, autogenerate=auto)
+
+
+@db_cli.async_command()
+async def refresh_stats(
+    concurrently: Annotated[
+        bool,
+        typer.Option(help='обновить без блокировки чтения (CONCURRENTLY)?'),
+    ] = True,
+):
+    """Обновляет материализованные представления статистики списков просмотренного."""
+    from .commands.db import refresh_stats_command
+
+    await refresh_stats_command(concurrently=concurrently)
+
+
+@db_cli.async_command()
+async def index_advice(
+    limit: Annotated[
+        int,
+        typer.Option(help='количество запросов из pg_stat_statements для каждой таблицы'),
+    ] = 5,
+):
+    """Проверяет планы типовых запросов к спискам просмотренного и предлагает индексы."""
+    from .commands.db import index_advice_command
+
+    await index_advice_command(limit=limit)
+
+
+@db_cli.async_command()
+async def create_partitions(
+    count: Annotated[
+        int,
+        typer.Option(help='количество будущих секций-диапазонов, начиная с текущего периода'),
+    ] = 3,
+):
+    """Создает недостающие секции секционированных таблиц списков просмотренного."""
+    from .commands.db import create_partitions_command
+
+    await create_partitions_command(count=count)
+
+
+@db_cli.async_command(name='export')
+async def export_snapshot(
+    path: Annotated[Path, typer.Argument(help='каталог снимка')],
+    format_: Annotated[
+        str,
+        typer.Option(
+            '--format',
+            click_type=click.Choice(['binary', 'csv']),
+            help='формат файлов таблиц',
+        ),
+    ] = 'binary',
+    compress: Annotated[bool, typer.Option(help='сжимать файлы zstd?')] = False,
+    workers: Annotated[int, typer.Option(help='количество параллельно выгружаемых таблиц')] = 4,
+    table: Annotated[
+        Optional[list[str]],
+        typer.Option(help='таблица для выгрузки (можно указать несколько раз)'),
+    ] = None,
+    resume: Annotated[bool, typer.Option(help='продолжить прерванную выгрузку?')] = False,
+):
+    """Выгружает таблицы в каталог снимка через COPY."""
+    from app.db.extras.snapshots import SnapshotFormatEnum
+
+    from .commands.db import export_snapshot_command
+
+    await export_snapshot_command(
+        path=path,
+        format_=SnapshotFormatEnum(format_),
+        compress=compress,
+        workers=workers,
+        tables=table,
+        resume=resume,
+    )
+
+
+@db_cli.async_command(name='import')
+async def import_snapshot(
+    path: Annotated[Path, typer.Argument(help='каталог снимка')],
+    workers: Annotated[int, typer.Option(help='количество параллельно загружаемых таблиц')] = 4,
+    table: Annotated[
+        Optional[list[str]],
+        typer.Option(help='таблица для загрузки (можно указать несколько раз)'),
+    ] = None,
+    truncate: Annotated[bool, typer.Option(help='очищать таблицы перед загрузкой?')] = True,
+    resume: Annotated[bool, typer.Option(help='продолжить прерванную загрузку?')] = False,
+):
+    """Загружает таблицы из каталога снимка через COPY."""
+    from .commands.db import import_snapshot_command
+
+    await import_snapshot_command(
+        path=path,
+        workers=workers,
+        tables=table,
+        truncate=truncate,
+        resume=resume,
+    )
@@ -1,7 +1,14 @@
+from pathlib import Path
+
 from alembic import command
 from alembic.config import Config
+from typer import Exit, secho
 
-from app.core.config import get_path_settings
+from app.core.config import get_database_settings, get_path_settings
+from app.core.meta import Session
+from app.core.models.tables.watch_list import Anime, Kinopoisk
+from app.db.extras import index_advisor, online_migrations, snapshots
+from app.db.repositories.watch_list import AnimeRepository, KinopoiskRepository
 
 path_settings = get_path_settings()
 
@@ -20,7 +27,141 @@ def revert_migrations(*, revision: str = 'head'):
     command.downgrade(config, revision)
 
 
+async def migrate_online_command(
+    *,
+    revision: str = 'head',
+    lock_timeout: str = '5s',
+    statement_timeout: str = '10min',
+    retries: int = 5,
+):
+    """Функция применения миграций в онлайн-режиме с отчетом по шагам."""
+    options = online_migrations.OnlineMigrationOptions(
+        lock_timeout=lock_timeout,
+        statement_timeout=statement_timeout,
+        retries=retries,
+    )
+    reports = await online_migrations.upgrade_online(
+        Config(ini_file_path),
+        revision=revision,
+        options=options,
+    )
+    if not reports:
+        secho('Нет миграций для применения.', fg='yellow')
+    for report in reports:
+        secho(
+            f'{report.revision} ({report.description}): {report.duration:.2f} с, '
+            f'попыток: {report.attempts}.',
+            fg='green',
+        )
+
+
 def make_migration(*, message: str | None = None, autogenerate: bool = False):
     """Функция-alias для команды ``alembic revision``."""
     config = Config(ini_file_path)
     command.revision(config, message, autogenerate)
+
+
+async def refresh_stats_command(*, concurrently: bool = True):
+    """Функция обновления материализованных представлений статистики."""
+    async with Session() as session:
+        for repository_class in (AnimeRepository, KinopoiskRepository):
+            repo = repository_class(session)
+            await repo.refresh_stats(concurrently=concurrently)
+            secho(f'Статистика {repo.model_class.__tablename__} обновлена.', fg='green')
+
+
+async def index_advice_command(*, limit: int = 5):
+    """Функция проверки планов типовых запросов и вывода рекомендаций по индексам."""
+    async with Session() as session:
+        for model in (Anime, Kinopoisk):
+            shapes = index_advisor.get_watch_list_query_shapes(model)
+            for advice in await index_advisor.advise(session, shapes):
+                if not advice.is_index_needed:
+                    secho(f'{advice.shape.title}: индекс используется.', fg='green')
+                    continue
+                nodes = ', '.join(advice.not_indexed_nodes)
+                secho(f'{advice.shape.title}: без индекса ({nodes}).', fg='yellow')
+                secho(f'    {advice.shape.proposal.ddl}')
+            statements = await index_advisor.get_top_statements(
+                session,
+                model.__tablename__,
+                limit=limit,
+            )
+            if statements is None:
+                secho('Расширение pg_stat_statements не установлено.', fg='yellow')
+                continue
+            for statement in statements:
+                calls, mean_time = statement['calls'], statement['mean_exec_time']
+                secho(f'{calls} вызовов, {mean_time:.2f} мс в среднем: {statement["query"]}')
+
+
+async def create_partitions_command(*, count: int = 3):
+    """Функция создания недостающих секций секционированных таблиц."""
+    async with Session() as session:
+        for repository_class in (AnimeRepository, KinopoiskRepository):
+            repo = repository_class(session)
+            table_name = repo.model_class.__tablename__
+            if repo.model_class.partitioning is None:
+                secho(f'Таблица {table_name} не секционирована, пропуск.', fg='yellow')
+                continue
+            partitions = await repo.create_partitions(count=count)
+            names = ', '.join(partition.name for partition in partitions)
+            secho(f'Секции {table_name} созданы: {names}.', fg='green')
+
+
+def _print_snapshot_results(results: list[dict], action: str) -> None:
+    for result in results:
+        if result['skipped']:
+            secho(f'{result["table"]}: пропущена (уже {action}), строк: {result["rows"]}.')
+        else:
+            secho(f'{result["table"]}: {action}, строк: {result["rows"]}.', fg='green')
+
+
+async def export_snapshot_command(
+    *,
+    path: Path,
+    format_: snapshots.SnapshotFormatEnum = snapshots.SnapshotFormatEnum.BINARY,
+    compress: bool = False,
+    workers: int = 4,
+    tables: list[str] | None = None,
+    resume: bool = False,
+):
+    """Функция выгрузки таблиц в каталог снимка."""
+    try:
+        results = await snapshots.export_snapshot(
+            get_database_settings().asyncpg_db_url,
+            path,
+            tables=tables,
+            format_=format_,
+            compress=compress,
+            workers=workers,
+            resume=resume,
+        )
+    except (ValueError, RuntimeError) as exc:
+        secho(str(exc), fg='red')
+        raise Exit(code=1) from exc
+    _print_snapshot_results(results, 'выгружена')
+
+
+async def import_snapshot_command(
+    *,
+    path: Path,
+    workers: int = 4,
+    tables: list[str] | None = None,
+    truncate: bool = True,
+    resume: bool = False,
+):
+    """Функция загрузки таблиц из каталога снимка."""
+    try:
+        results = await snapshots.import_snapshot(
+            get_database_settings().asyncpg_db_url,
+            path,
+            tables=tables,
+            workers=workers,
+            truncate=truncate,
+            resume=resume,
+        )
+    except (ValueError, RuntimeError, FileNotFoundError) as exc:
+        secho(str(exc), fg='red')
+        raise Exit(code=1) from exc
+    _print_snapshot_results(results, 'загружена')
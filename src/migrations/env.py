@@ -13,6 +13,11 @@ sys.path.insert(0, (pathlib.Path(__file__).absolute().parent.parent).as_posix())
 
 from app.core.config import get_database_settings  # noqa: E402
 from app.core.models.tables.base import Base  # noqa: E402
+from app.db.extras.online_migrations import (  # noqa: E402
+    CONNECTION_ATTRIBUTE,
+    TIMEOUTS_ATTRIBUTE,
+    set_timeouts,
+)
 
 if TYPE_CHECKING:
     from alembic.config import Config
@@ -22,8 +27,9 @@ if TYPE_CHECKING:
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
+# This line sets up loggers basically. Online runner (see app.db.extras.online_migrations) passes
+# its own connection and keeps application logging as is.
+if config.config_file_name is not None and CONNECTION_ATTRIBUTE not in config.attributes:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -63,7 +69,8 @@ def is_object_included(_, name: str, type_: str, *__: Any, **___: Any) -> bool:
     """Custom filter function for inner alembic use.
 
     Check if table in `exclude tables` variable: if table name in `exclude_tables`, don't pass it in
-    autogenerated migrations, else pass.
+    autogenerated migrations, else pass. Trigram indexes (`*_trgm`) depend on `pg_trgm` extension,
+    exist only in migrations and are never passed too.
 
     Parameters
     ----------
@@ -77,6 +84,8 @@ def is_object_included(_, name: str, type_: str, *__: Any, **___: Any) -> bool:
     bool
         flag of passing in migrations.
     """  # noqa
+    if type_ == 'index' and name is not None and name.endswith('_trgm'):
+        return False
     return exclude_tables is None or not (type_ == 'table' and name in exclude_tables)
 
 
@@ -108,12 +117,21 @@ def run_migrations_offline() -> None:
 def do_run_migrations(connection: Connection) -> None:
     """Do run migrations.
 
+    If online runner passed lock and statement timeouts, they are set on connection first.
+
     Parameters
     ----------
     connection
         engine connection.
     """
-    context.configure(connection=connection, target_metadata=target_metadata)
+    timeouts = config.attributes.get(TIMEOUTS_ATTRIBUTE)
+    if timeouts is not None:
+        set_timeouts(connection, timeouts)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=is_object_included,  # type: ignore
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -142,5 +160,7 @@ async def run_migrations_online() -> None:
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif (connection := config.attributes.get(CONNECTION_ATTRIBUTE)) is not None:
+    do_run_migrations(connection)
 else:
     asyncio.run(run_migrations_online())
@@ -0,0 +1,43 @@
+"""watch list stats materialized views.
+
+Revision ID: 5b4e9efcd280
+Revises: 9e9ff391bff4
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5b4e9efcd280'
+down_revision = '9e9ff391bff4'
+branch_labels = None
+depends_on = None
+STATS_VIEWS = {'anime': 'anime_stats', 'kinopoisk': 'kinopoisk_stats'}
+
+
+def upgrade() -> None:
+    for table_name, view_name in STATS_VIEWS.items():
+        op.execute(
+            f"""
+                CREATE MATERIALIZED VIEW {view_name} AS
+                SELECT
+                    status,
+                    kind,
+                    count(*) AS items_count,
+                    avg(score) AS score_avg,
+                    min(score) AS score_min,
+                    max(score) AS score_max,
+                    percentile_cont(0.5) WITHIN GROUP (ORDER BY score) AS score_median,
+                    sum(repeat_view_count) AS repeat_view_count_sum
+                FROM {table_name}
+                GROUP BY status, kind
+                WITH DATA;
+            """,
+        )
+        # уникальный индекс нужен для REFRESH MATERIALIZED VIEW CONCURRENTLY.
+        op.execute(f'CREATE UNIQUE INDEX {view_name}_status_kind_idx ON {view_name} (status, kind)')
+
+
+def downgrade() -> None:
+    for view_name in STATS_VIEWS.values():
+        op.execute(f'DROP MATERIALIZED VIEW IF EXISTS {view_name}')
@@ -0,0 +1,51 @@
+"""watch list indexes.
+
+Revision ID: 7c1d2e3f4a5b
+Revises: 5b4e9efcd280
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.extras.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision = '7c1d2e3f4a5b'
+down_revision = '5b4e9efcd280'
+branch_labels = None
+depends_on = None
+# Индексы создаются дольше обычной миграции: ограничение на длительность запроса снято.
+statement_timeout = '0'
+TABLES = ('anime', 'kinopoisk')
+BTREE_INDEXES = {
+    'kind': ['kind'],
+    'status_score': ['status', 'score'],
+    'score': ['score'],
+    'repeat_view_count': ['repeat_view_count'],
+    'updated_at_id': ['updated_at', 'id'],
+}
+TRGM_INDEXES = ('name', 'native_name')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table_name in TABLES:
+        for suffix, columns in BTREE_INDEXES.items():
+            create_index_concurrently(op, f'ix_{table_name}_{suffix}', table_name, columns)
+        for column in TRGM_INDEXES:
+            create_index_concurrently(
+                op,
+                f'ix_{table_name}_{column}_trgm',
+                table_name,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        for column in TRGM_INDEXES:
+            drop_index_concurrently(op, f'ix_{table_name}_{column}_trgm', table_name)
+        for suffix in BTREE_INDEXES:
+            drop_index_concurrently(op, f'ix_{table_name}_{suffix}', table_name)
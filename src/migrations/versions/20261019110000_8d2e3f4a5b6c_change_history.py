@@ -0,0 +1,69 @@
+"""change history.
+
+Revision ID: 8d2e3f4a5b6c
+Revises: 7c1d2e3f4a5b
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from app.core.models.types import datetime as dt_custom_types
+
+# revision identifiers, used by Alembic.
+revision = '8d2e3f4a5b6c'
+down_revision = '7c1d2e3f4a5b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_history',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('item_id', sa.String(length=255), nullable=False),
+        sa.Column('field', sa.String(length=63), nullable=False),
+        sa.Column('old_value', postgresql.JSONB(none_as_null=True), nullable=True),
+        sa.Column('new_value', postgresql.JSONB(none_as_null=True), nullable=True),
+        sa.Column(
+            'changed_at',
+            dt_custom_types.UTCDateTime(timezone=True),
+            server_default=sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('id'),
+    )
+    op.create_index(
+        'ix_change_history_table_name_item_id_id',
+        'change_history',
+        ['table_name', 'item_id', 'id'],
+        unique=False,
+    )
+    # история только пополняется: изменение и удаление записей запрещены.
+    op.execute(
+        """
+            CREATE OR REPLACE FUNCTION forbid_change_history_modification()
+                RETURNS TRIGGER AS $$
+            BEGIN
+                RAISE EXCEPTION 'change_history is append-only';
+            END;
+            $$ language 'plpgsql';
+        """,
+    )
+    op.execute(
+        """
+            CREATE TRIGGER forbid_change_history_modification
+            BEFORE UPDATE OR DELETE ON change_history
+            FOR EACH ROW EXECUTE PROCEDURE forbid_change_history_modification();
+        """,
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER forbid_change_history_modification ON change_history')
+    op.execute('DROP FUNCTION forbid_change_history_modification')
+    op.drop_index('ix_change_history_table_name_item_id_id', table_name='change_history')
+    op.drop_table('change_history')
@@ -0,0 +1,42 @@
+"""table versions.
+
+Revision ID: 9f3e4a5b6c7d
+Revises: 8d2e3f4a5b6c
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.models.tables.versions import (
+    BUMP_TABLE_VERSION_FUNCTION_SQL,
+    get_bump_table_version_trigger_sql,
+)
+
+# revision identifiers, used by Alembic.
+revision = '9f3e4a5b6c7d'
+down_revision = '8d2e3f4a5b6c'
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = ('admins', 'anime', 'kinopoisk', 'change_history')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    # версия таблицы увеличивается после каждого изменяющего оператора.
+    op.execute(BUMP_TABLE_VERSION_FUNCTION_SQL)
+    for table_name in VERSIONED_TABLES:
+        op.execute(get_bump_table_version_trigger_sql(table_name))
+
+
+def downgrade() -> None:
+    for table_name in VERSIONED_TABLES:
+        op.execute(f'DROP TRIGGER bump_table_version_{table_name} ON "{table_name}"')
+    op.execute('DROP FUNCTION bump_table_version')
+    op.drop_table('table_versions')
@@ -1,14 +1,15 @@
 import asyncio
 import contextlib
+import os
 import uuid
 from asyncio import AbstractEventLoop, current_task
 from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
-import asyncpg
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from mimesis import Locale, Text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_scoped_session,
@@ -21,12 +22,12 @@ from app.core.config import get_database_settings, get_logger
 from app.core.models import tables
 from app.core.models.tables.tests import TestBaseModel, TestRelatedModel
 from app.main import get_application
-from tests.utils.database import db_create_item
+from tests.utils.database import db_create_item, drop_database, provision_database, truncate_tables
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Awaitable, Generator
 
-    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
     BaseSQLAlchemyModel = TypeVar('BaseSQLAlchemyModel', bound=tables.Base)
 
@@ -61,6 +62,15 @@ if TYPE_CHECKING:
 
 
 logger = get_logger('tests')
+TEMPLATE_DB_NAME = 'pytest_db_template'
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Регистрация маркеров тестов."""
+    config.addinivalue_line(
+        'markers',
+        'db_commit: тест фиксирует данные в БД вместо отката транзакции после теста.',
+    )
 
 
 @pytest.fixture(scope='session')
@@ -80,16 +90,20 @@ def event_loop() -> 'Generator[AbstractEventLoop, None, None]':
 
 
 @pytest.fixture(scope='session')
-def db_url() -> str:
-    """Фикстура, возвращающая url к тестовой базе данных."""
-    database_settings = get_database_settings()
-    return database_settings.test_db_url
+def db_name() -> str:
+    """Фикстура, возвращающая название тестовой базы данных.
+
+    Каждый процесс pytest-xdist работает со своей базой данных.
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    return 'pytest_db' if worker is None else f'pytest_db_{worker}'
 
 
 @pytest.fixture(scope='session')
-def db_name() -> str:
-    """Фикстура, возвращающая название тестовой базы данных."""
-    return 'pytest_db'
+def db_url(db_name: str) -> str:
+    """Фикстура, возвращающая url к тестовой базе данных."""
+    url = make_url(get_database_settings().test_db_url).set(database=db_name)
+    return url.render_as_string(hide_password=False)
 
 
 @pytest_asyncio.fixture(scope='session')  # type: ignore
@@ -97,36 +111,62 @@ async def db_engine(
     db_url: str,
     db_name: str,
 ) -> 'AsyncGenerator[AsyncEngine, None]':
-    """Инициализация коннектора тестовой БД."""
-    database_settings = get_database_settings()
-    with contextlib.suppress(Exception):
-        pool = await asyncpg.create_pool(database_settings.asyncpg_postgresql_url)
-        if pool:
-            async with pool.acquire() as conn:
-                await conn.execute(f'CREATE DATABASE {db_name}')
-            await pool.close()
+    """Инициализация коннектора тестовой БД.
+
+    База данных создается копией шаблонной базы данных со схемой всех моделей.
+    """
+    admin_dsn = get_database_settings().asyncpg_postgresql_url
+    await provision_database(
+        admin_dsn,
+        db_url,
+        db_name,
+        template_name=TEMPLATE_DB_NAME,
+        metadata=tables.Base.metadata,
+    )
     engine = create_async_engine(db_url, echo=False, pool_pre_ping=True)
     try:
         yield engine
     finally:
         await engine.dispose()
     with contextlib.suppress(Exception):
-        pool = await asyncpg.create_pool(database_settings.asyncpg_postgresql_url)
-        if pool:
-            async with pool.acquire() as conn:
-                await conn.execute(f'DROP DATABASE IF EXISTS {db_name}')
-            await pool.close()  # type: ignore
+        await drop_database(admin_dsn, db_name)
 
 
-@pytest.fixture(scope='session')
-def db_session_factory(db_engine: 'AsyncEngine') -> 'async_scoped_session[AsyncSession]':
+@pytest_asyncio.fixture()  # type: ignore
+async def db_bind(
+    request: pytest.FixtureRequest,
+    db_engine: 'AsyncEngine',
+) -> 'AsyncGenerator[AsyncEngine | AsyncConnection, None]':
+    """Подключение теста к тестовой БД.
+
+    По умолчанию тест выполняется внутри внешней транзакции, которая откатывается после теста, а
+    сессии фиксируют изменения в точках сохранения (SAVEPOINT). Тесты с маркером ``db_commit``
+    (данные должны быть видны другим подключениям) работают с базой данных напрямую: таблицы
+    очищаются до и после теста.
+    """
+    if request.node.get_closest_marker('db_commit') is not None:
+        await truncate_tables(db_engine, tables.Base.metadata)
+        yield db_engine
+        await truncate_tables(db_engine, tables.Base.metadata)
+        return
+    async with db_engine.connect() as connection:
+        transaction = await connection.begin()
+        yield connection
+        await transaction.rollback()
+
+
+@pytest.fixture()
+def db_session_factory(
+    db_bind: 'AsyncEngine | AsyncConnection',
+) -> 'async_scoped_session[AsyncSession]':
     """Фабрика тестовых сессий."""
     return async_scoped_session(
         async_sessionmaker(
-            bind=db_engine,
+            bind=db_bind,
             autocommit=False,
             autoflush=False,
             expire_on_commit=False,
+            join_transaction_mode='create_savepoint',
         ),
         current_task,
     )
@@ -141,15 +181,12 @@ async def db_session(
         yield session
 
 
-@pytest_asyncio.fixture()  # type: ignore
-async def testing_app(
+@pytest.fixture()
+def testing_app(
     test_models: list[tables.Base],
-    db_engine: 'AsyncEngine',
     db_session_factory: 'async_scoped_session[AsyncSession]',
-) -> 'AsyncGenerator[TestClient, None]':
+) -> TestClient:
     """Фикстура-менеджер создания тестового клиента."""
-    async with db_engine.begin() as conn:
-        await conn.run_sync(tables.Base.metadata.create_all)
     app = get_application()
 
     async def get_session() -> 'AsyncGenerator[AsyncSession, None]':
@@ -158,10 +195,7 @@ async def testing_app(
             yield session
 
     app.dependency_overrides[app_get_session] = get_session
-    client = TestClient(app)
-    yield client
-    async with db_engine.begin() as conn:
-        await conn.run_sync(tables.Base.metadata.drop_all)
+    return TestClient(app)
 
 
 @pytest.fixture()
@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from starlette.requests import Request
+
+from app.admin.auth import AdminAuthBackend
+from app.db.mixins.permissions import PermissionModeEnum
+from app.db.repositories.admins import AdminRepository
+from app.services import auth
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.asyncio()
+async def test_admin_exists_check_ttl(mocker: 'MockerFixture') -> None:
+    """Существование администратора запоминается на check_ttl, отсутствие - не запоминается."""
+    get = mocker.patch.object(AdminRepository, 'get', return_value=object())
+    backend = AdminAuthBackend(secret_key='secret', check_ttl=60)  # noqa: S106
+    assert await backend.admin_exists('admin-id')
+    assert await backend.admin_exists('admin-id')
+    assert get.call_count == 1
+    get.return_value = None
+    assert not await backend.admin_exists('other-id')
+    assert not await backend.admin_exists('other-id')
+    assert get.call_count == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_get_permission_mode_authenticates(mocker: 'MockerFixture') -> None:
+    """Режим доступа определяется после полной проверки администратора с выдачей нового токена."""
+    get = mocker.patch.object(AdminRepository, 'get', return_value=object())
+    backend = AdminAuthBackend(secret_key='secret')  # noqa: S106
+    token = auth.encode_jwt_token('admin-id', is_admin=True, is_refresh_token=True)
+    request = Request({'type': 'http', 'session': {'token': token}})
+    assert await backend.get_permission_mode(request) == PermissionModeEnum.ADMIN
+    assert get.call_count == 1
+    assert backend.get_token_user_id(request) == 'admin-id'
@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    compare_with_baselines,
+    get_percentile,
+    load_baselines,
+    save_baselines,
+)
+
+if TYPE_CHECKING:
+    import pathlib
+
+
+def get_result(**kwargs: float) -> BenchmarkResult:
+    """Результат бенчмарка с переопределенными метриками."""
+    params = dict(
+        case='get',
+        size=1000,
+        iterations=100,
+        throughput=1000.0,
+        p50_ms=1.0,
+        p99_ms=2.0,
+        statements_per_op=1.0,
+        allocated_kib=10.0,
+    )
+    params.update(kwargs)
+    return BenchmarkResult(**params)  # type: ignore
+
+
+def test_get_percentile() -> None:
+    """Проверка перцентилей задержек (наносекунды -> миллисекунды)."""
+    timings = [index * 1_000_000 for index in range(1, 101)]
+    assert get_percentile(timings, 50) == 50.5  # noqa: PLR2004
+    assert 99 < get_percentile(timings, 99) < 100  # noqa: PLR2004
+    assert get_percentile([3_000_000], 99) == 3  # noqa: PLR2004
+
+
+def test_baselines_roundtrip_and_compare(tmp_path: 'pathlib.Path') -> None:
+    """Проверка сохранения базовых значений и поиска регрессий."""
+    path = tmp_path / 'baselines.json'
+    assert load_baselines(path) == {}
+    save_baselines(path, [get_result()])
+    baselines = load_baselines(path)
+    assert baselines['get[1000]']['p50_ms'] == 1.0
+    assert compare_with_baselines([get_result(p50_ms=1.2)], baselines) == []
+    assert compare_with_baselines([get_result(size=10)], baselines) == []
+    regressions = compare_with_baselines(
+        [get_result(p50_ms=1.5, statements_per_op=2.0)],
+        baselines,
+    )
+    assert [(regression.key, regression.metric) for regression in regressions] == [
+        ('get[1000]', 'p50_ms'),
+        ('get[1000]', 'statements_per_op'),
+    ]
@@ -0,0 +1,59 @@
+import httpx
+
+from benchmarks.load import (
+    LevelResult,
+    Sample,
+    find_saturation_point,
+    get_histogram,
+    get_level_result,
+    is_successful,
+)
+
+
+def get_level(concurrency: int, throughput: float, error_rate: float = 0.0) -> LevelResult:
+    """Результат ступени нагрузки с переданной пропускной способностью."""
+    return LevelResult(
+        concurrency=concurrency,
+        requests=100,
+        throughput=throughput,
+        p50_ms=1.0,
+        p90_ms=2.0,
+        p99_ms=3.0,
+        error_rate=error_rate,
+        histogram=[],
+    )
+
+
+def test_get_histogram() -> None:
+    """Проверка распределения задержек по корзинам."""
+    histogram = get_histogram([0.5, 1, 1.5, 7, 10_000])
+    assert histogram[:4] == [2, 1, 0, 1]
+    assert histogram[-1] == 1
+    assert sum(histogram) == 5  # noqa: PLR2004
+
+
+def test_get_level_result() -> None:
+    """Проверка метрик ступени нагрузки."""
+    samples = [Sample('list', float(index), index % 10 != 0) for index in range(1, 101)]
+    level = get_level_result(4, samples, duration=2.0)
+    assert level.throughput == 50  # noqa: PLR2004
+    assert level.error_rate == 0.1  # noqa: PLR2004
+    assert level.p50_ms == 50.5  # noqa: PLR2004
+    assert get_level_result(1, [], duration=1.0).requests == 0
+
+
+def test_find_saturation_point() -> None:
+    """Проверка поиска точки насыщения по приросту пропускной способности и ошибкам."""
+    levels = [get_level(1, 100), get_level(2, 190), get_level(4, 195), get_level(8, 150)]
+    assert find_saturation_point(levels) == levels[1]
+    levels = [get_level(1, 100), get_level(2, 190, error_rate=0.05)]
+    assert find_saturation_point(levels) == levels[0]
+    assert find_saturation_point([get_level(1, 100), get_level(2, 200)]) is None
+
+
+def test_is_successful() -> None:
+    """Проверка: перенаправление на страницу входа - ошибка, остальные перенаправления - нет."""
+    assert is_successful(httpx.Response(200))
+    assert is_successful(httpx.Response(302, headers={'location': '/admin/anime/list'}))
+    assert not is_successful(httpx.Response(302, headers={'location': '/admin/login'}))
+    assert not is_successful(httpx.Response(500))
@@ -1,7 +1,10 @@
+from decimal import Decimal
 from string import Template
 
+import orjson
 import pytest
 
+from app.core.exceptions.handlers import verbose_http_exception_handler
 from app.core.exceptions.http import base as base_http_exceptions
 
 attr = 'attr'
@@ -90,3 +93,29 @@ def test_class_as_dict_with_params() -> None:
     with pytest.raises(TestHttpException1) as exc_info:
         raise TestHttpException1()
     assert exc_info.value.as_dict(attr, loc, test='test') == test_http_exception1_dict
+
+
+def test_format_template_cache() -> None:
+    """Заполнение шаблона учитывает типы и представление аргументов и работает с нехэшируемыми."""
+    template = 'value: {value}'
+    assert base_http_exceptions.format_template(template, {'value': 1}) == 'value: 1'
+    assert base_http_exceptions.format_template(template, {'value': True}) == 'value: True'
+    assert base_http_exceptions.format_template(template, {'value': [1]}) == 'value: [1]'
+    assert base_http_exceptions.format_template(template, {'value': 0.0}) == 'value: 0.0'
+    assert base_http_exceptions.format_template(template, {'value': -0.0}) == 'value: -0.0'
+    for value in ('1.0', '1'):
+        formatted = base_http_exceptions.format_template(template, {'value': Decimal(value)})
+        assert formatted == f'value: {value}'
+    assert TestHttpException2(test=1).message == 'test message: 1'
+
+
+@pytest.mark.asyncio()
+async def test_exception_handler_body() -> None:
+    """Обработчик отправляет подготовленное тело исключения."""
+    exc = TestHttpException1(test='test', headers={'X-Test': 'test'}).with_attr(attr).with_loc(loc)
+    assert exc.as_bytes() is exc.as_bytes()
+    response = await verbose_http_exception_handler(None, exc)  # type: ignore[arg-type]
+    assert response.status_code == exc.status_code
+    assert response.headers['x-test'] == 'test'
+    assert response.media_type == 'application/json'
+    assert orjson.loads(response.body) == test_http_exception1_dict
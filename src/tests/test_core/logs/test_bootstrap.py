@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+import signal
+from typing import Any
+
+import pytest
+
+from app.core.logs import bootstrap, queues
+
+
+class ListHandler(logging.Handler):
+    """Обработчик, сохраняющий записи."""
+
+    def __init__(self: 'ListHandler') -> None:  # noqa: D107
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self: 'ListHandler', record: logging.LogRecord) -> None:  # noqa: D102
+        self.records.append(record)
+
+
+def test_configure_logging_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Настройки применяются один раз на процесс, повторно - только с ``force``."""
+    calls: list[dict[str, Any]] = []
+    monkeypatch.setattr(bootstrap, '_configured', False)
+    monkeypatch.setattr(bootstrap.logging.config, 'dictConfig', calls.append)
+    settings = {'version': 1, 'queue': {'enabled': False}}
+    bootstrap.configure_logging(settings)
+    bootstrap.configure_logging(settings)
+    assert bootstrap.is_configured()
+    assert calls == [settings]
+    bootstrap.configure_logging(settings, force=True)
+    assert len(calls) == 2  # noqa: PLR2004
+
+
+def test_reload_levels_keeps_handlers() -> None:
+    """Уровни логгеров и обработчиков меняются, обработчики остаются прежними."""
+    handler = ListHandler()
+    handler.set_name('tests-bootstrap-handler')
+    logger = logging.getLogger('tests.bootstrap.reload')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    levels = bootstrap.reload_levels(
+        {
+            'loggers': {'tests.bootstrap.reload': {'level': 'ERROR'}},
+            'handlers': {'tests-bootstrap-handler': {'level': 'WARNING'}},
+        },
+    )
+    assert levels == {'tests.bootstrap.reload': 'ERROR'}
+    assert logger.level == logging.ERROR
+    assert handler.level == logging.WARNING
+    assert logger.handlers == [handler]
+    logger.warning('не попадет в лог')
+    logger.error('попадет в лог')
+    assert [record.getMessage() for record in handler.records] == ['попадет в лог']
+
+
+def test_queue_logging_detach() -> None:
+    """После fork обработчики возвращаются логгеру без ожидания потоков очереди."""
+    handler = ListHandler()
+    logger = logging.getLogger('tests.bootstrap.detach')
+    logger.handlers = [handler]
+    logger.propagate = False
+    queue_logging = queues.QueueLogging()
+    queue_logging.start(['tests.bootstrap.detach'])
+    listener = queue_logging.listeners['tests.bootstrap.detach']
+    assert logger.handlers != [handler]
+    queue_logging.detach()
+    listener.stop()
+    assert logger.handlers == [handler]
+    assert queue_logging.listeners == {}
+    assert queue_logging.handlers == {}
+
+
+@pytest.mark.asyncio()
+async def test_reload_signal(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Сигнал ``SIGHUP`` перечитывает уровни логирования в event loop'е."""
+    reloaded = asyncio.Event()
+    monkeypatch.setattr(bootstrap, 'reload_levels', reloaded.set)
+    await bootstrap.install_reload_signal()
+    loop = asyncio.get_running_loop()
+    try:
+        os.kill(os.getpid(), signal.SIGHUP)
+        await asyncio.wait_for(reloaded.wait(), timeout=1)
+    finally:
+        loop.remove_signal_handler(signal.SIGHUP)
@@ -0,0 +1,100 @@
+import logging
+
+import pytest
+
+from app.core.logs import filters
+
+
+class ListHandler(logging.Handler):
+    """Обработчик, сохраняющий сообщения записей."""
+
+    def __init__(self: 'ListHandler') -> None:  # noqa: D107
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self: 'ListHandler', record: logging.LogRecord) -> None:  # noqa: D102
+        self.messages.append(record.getMessage())
+
+
+class Clock:
+    """Управляемое время для фильтра."""
+
+    def __init__(self: 'Clock') -> None:  # noqa: D107
+        self.now = 0.0
+
+    def __call__(self: 'Clock') -> float:  # noqa: D102
+        return self.now
+
+
+def get_logger(name: str, log_filter: logging.Filter) -> tuple[logging.Logger, ListHandler]:
+    """Логгер с фильтром и обработчиком, сохраняющим сообщения."""
+    handler = ListHandler()
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.filters = [log_filter]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, handler
+
+
+def test_rate_limit_and_summary() -> None:
+    """Сверх лимита записи с кодом подавляются, после окна пишется сводка."""
+    clock = Clock()
+    log_filter = filters.RateLimitFilter(
+        {'CHECK-PERMISSION E2': {'limit': 2, 'period': 60}},
+        clock=clock,
+    )
+    logger, handler = get_logger('tests.filters.limit', log_filter)
+    before = filters.LOG_RECORDS_SUPPRESSED.get('CHECK-PERMISSION E2')
+    for index in range(5):
+        logger.error('%s E2: отказ %s', 'CHECK-PERMISSION', index)
+    logger.info('APP I1: без правила')
+    assert handler.messages == [
+        'CHECK-PERMISSION E2: отказ 0',
+        'CHECK-PERMISSION E2: отказ 1',
+        'APP I1: без правила',
+    ]
+    assert filters.LOG_RECORDS_SUPPRESSED.get('CHECK-PERMISSION E2') == before + 3
+    clock.now = 61
+    logger.error('CHECK-PERMISSION E2: отказ 5')
+    assert handler.messages[3:] == [
+        'LOGGING W2: подавлено похожих сообщений "CHECK-PERMISSION E2": 3 за 61 с.',
+        'CHECK-PERMISSION E2: отказ 5',
+    ]
+
+
+def test_prefix_rule_and_flush() -> None:
+    """Правило префикса действует на каждый код отдельно, ``flush`` пишет сводки сразу."""
+    log_filter = filters.RateLimitFilter({'TOKEN-DECODE': filters.RateLimitRule(1, 60)})
+    logger, handler = get_logger('tests.filters.prefix', log_filter)
+    for _ in range(3):
+        logger.warning('TOKEN-DECODE E1: истек')
+        logger.warning('TOKEN-DECODE E2: подпись')
+    assert handler.messages == ['TOKEN-DECODE E1: истек', 'TOKEN-DECODE E2: подпись']
+    log_filter.flush()
+    assert sorted(handler.messages[2:]) == [
+        'LOGGING W2: подавлено похожих сообщений "TOKEN-DECODE E1": 2 за 0 с.',
+        'LOGGING W2: подавлено похожих сообщений "TOKEN-DECODE E2": 2 за 0 с.',
+    ]
+
+
+def test_sample_rate() -> None:
+    """Сверх лимита пропускается доля записей ``sample_rate``."""
+    log_filter = filters.RateLimitFilter({'SPAM W1': {'limit': 0, 'period': 60, 'sample_rate': 1}})
+    logger, handler = get_logger('tests.filters.sample', log_filter)
+    logger.warning('SPAM W1: сообщение')
+    assert handler.messages == ['SPAM W1: сообщение']
+
+
+@pytest.mark.parametrize(
+    'rule',
+    [
+        {'limit': -1, 'period': 60},
+        {'limit': 1, 'period': 0},
+        {'limit': 1, 'period': 60, 'sample_rate': 2},
+    ],
+)
+def test_invalid_rule(rule: dict[str, float]) -> None:
+    """Некорректные правила не принимаются."""
+    with pytest.raises(ValueError, match='некорректное правило'):
+        filters.RateLimitFilter({'SPAM W1': rule})
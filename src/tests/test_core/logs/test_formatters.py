@@ -0,0 +1,105 @@
+import logging
+import queue
+import sys
+from typing import Any
+
+import orjson
+import pytest
+
+from app.core.context import RequestContext, repository_method, request_context
+from app.core.logs import formatters
+from app.core.logs.queues import BoundedQueueHandler
+
+
+def make_record(message: str, *args: Any, **extra: Any) -> logging.LogRecord:  # noqa: ANN401
+    """Запись лога логгера app."""
+    record = logging.getLogger('app').makeRecord(
+        'app',
+        logging.WARNING,
+        __file__,
+        10,
+        message,
+        args,
+        None,
+        func='test',
+        extra=extra or None,
+    )
+    return record
+
+
+@pytest.mark.parametrize(
+    ('message', 'code'),
+    [
+        ('CHECK-PERMISSION E2: отказ в доступе', 'CHECK-PERMISSION E2'),
+        ('TOKEN-DECODE E1: токен истек', 'TOKEN-DECODE E1'),
+        ('сообщение без кода', None),
+        ('PROFILING: без номера', None),
+    ],
+)
+def test_get_log_code(message: str, code: str | None) -> None:
+    """Код сообщения извлекается из его начала."""
+    assert formatters.get_log_code(message) == code
+
+
+def test_json_formatter() -> None:
+    """Запись выводится JSON-строкой с кодом, полями процесса и дополнительными полями."""
+    formatter = formatters.JSONFormatter(static_fields={'service': 'test'}, max_message_length=30)
+    record = make_record('TOKEN-DECODE E1: токен %s истек очень давно', 'abc', user_id=5)
+    data = orjson.loads(formatter.format(record))
+    assert data['message'] == 'TOKEN-DECODE E1: токен abc ист'
+    assert data['code'] == 'TOKEN-DECODE E1'
+    assert data['level'] == 'WARNING'
+    assert data['logger'] == 'app'
+    assert data['service'] == 'test'
+    assert data['user_id'] == 5  # noqa: PLR2004
+    assert data['pid'] == formatters.get_process_fields()['pid']
+    assert 'request_id' not in data
+    assert 'exception' not in data
+
+
+def test_json_formatter_exception() -> None:
+    """Трейсбек исключения выводится отдельным полем."""
+    formatter = formatters.JSONFormatter()
+    try:
+        raise RuntimeError('ошибка')  # noqa: TRY301, EM101, TRY003
+    except RuntimeError:
+        record = logging.getLogger('app').makeRecord(
+            'app',
+            logging.ERROR,
+            __file__,
+            10,
+            'сбой',
+            (),
+            exc_info=sys.exc_info(),
+        )
+    data = orjson.loads(formatter.format(record))
+    assert 'RuntimeError: ошибка' in data['exception']
+
+
+def test_json_formatter_context() -> None:
+    """Контекст запроса берется из переменных или из копии, сохраненной очередью."""
+    formatter = formatters.JSONFormatter()
+    records: 'queue.Queue[Any]' = queue.Queue()
+    handler = BoundedQueueHandler(records, logger_name='app')
+    context = RequestContext(request_id='abc', method='GET', path='/items/1', scope={})
+    context.db_time = 0.0125
+    context.db_statements = 2
+    request_token = request_context.set(context)
+    method_token = repository_method.set('AnimeRepository.get')
+    try:
+        direct = orjson.loads(formatter.format(make_record('сообщение')))
+        handler.handle(make_record('из очереди'))
+    finally:
+        repository_method.reset(method_token)
+        request_context.reset(request_token)
+    queued = orjson.loads(formatter.format(records.get_nowait()))
+    for data in (direct, queued):
+        assert data['request_id'] == 'abc'
+        assert data['method'] == 'GET'
+        assert data['path'] == '/items/1'
+        assert data['route'] == '<unmatched>'
+        assert data['db_time_ms'] == 12.5  # noqa: PLR2004
+        assert data['db_statements'] == 2  # noqa: PLR2004
+        assert data['repository_method'] == 'AnimeRepository.get'
+        assert 'context' not in data
+    assert 'request_id' not in orjson.loads(formatter.format(make_record('вне запроса')))
@@ -0,0 +1,116 @@
+import logging
+import queue
+import threading
+from typing import Any
+
+import pytest
+
+from app.core.logs import queues
+
+
+class ListHandler(logging.Handler):
+    """Обработчик, сохраняющий записи и потоки, в которых они обработаны."""
+
+    def __init__(self: 'ListHandler') -> None:  # noqa: D107
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+        self.threads: set[str] = set()
+
+    def emit(self: 'ListHandler', record: logging.LogRecord) -> None:  # noqa: D102
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+
+def get_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    """Логгер без распространения записей с одним обработчиком."""
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+@pytest.mark.parametrize(
+    ('drop_policy', 'expected'),
+    [
+        (queues.DropPolicyEnum.DROP_NEW, ['запись 0', 'запись 1']),
+        (queues.DropPolicyEnum.DROP_OLD, ['запись 3', 'запись 4']),
+    ],
+)
+def test_drop_policy(drop_policy: queues.DropPolicyEnum, expected: list[str]) -> None:
+    """При переполнении очереди записи отбрасываются по политике и считаются."""
+    records: 'queue.Queue[Any]' = queue.Queue(maxsize=2)
+    name = f'tests.queues.{drop_policy.value}'
+    handler = queues.BoundedQueueHandler(records, logger_name=name, drop_policy=drop_policy)
+    logger = get_logger(name, handler)
+    before = queues.LOG_RECORDS_DROPPED.get(name)
+    for index in range(5):
+        logger.info('запись %s', index)
+    assert handler.dropped == 3  # noqa: PLR2004
+    assert queues.LOG_RECORDS_DROPPED.get(name) == before + 3
+    assert [records.get_nowait().getMessage() for _ in range(2)] == expected
+
+
+def test_dropped_summary() -> None:
+    """Когда в очереди появляется место, в нее попадает запись о количестве отброшенных."""
+    records: 'queue.Queue[Any]' = queue.Queue(maxsize=2)
+    handler = queues.BoundedQueueHandler(records, logger_name='tests.queues.summary')
+    logger = get_logger('tests.queues.summary', handler)
+    for message in ('первая', 'вторая', 'третья', 'четвертая'):
+        logger.info(message)
+    assert [records.get_nowait().getMessage() for _ in range(2)] == ['первая', 'вторая']
+    logger.info('пятая')
+    assert records.get_nowait().getMessage() == 'пятая'
+    summary = records.get_nowait()
+    assert summary.levelno == logging.WARNING
+    assert summary.name == 'tests.queues.summary'
+    assert summary.getMessage() == ('LOGGING W1: очередь логов переполнена, отброшено записей: 2.')
+    logger.info('шестая')
+    assert records.get_nowait().getMessage() == 'шестая'
+    assert records.empty()
+
+
+def test_prepare_keeps_exception() -> None:
+    """Аргументы подставляются сразу, а трейсбек форматируется обработчиками."""
+    records: 'queue.Queue[Any]' = queue.Queue()
+    handler = queues.BoundedQueueHandler(records, logger_name='tests.queues.prepare')
+    logger = get_logger('tests.queues.prepare', handler)
+    values = ['a']
+    try:
+        raise RuntimeError('ошибка')  # noqa: TRY301, EM101, TRY003
+    except RuntimeError:
+        logger.exception('значения %s', values)
+    values.append('b')
+    record = records.get_nowait()
+    assert record.getMessage() == "значения ['a']"
+    assert record.exc_info is not None
+    assert 'RuntimeError: ошибка' in logging.Formatter().format(record)
+
+
+def test_queue_logging_start_stop() -> None:
+    """Обработчики логгера работают в фоновом потоке и возвращаются логгеру после остановки."""
+    handler = ListHandler()
+    logger = get_logger('tests.queues.listener', handler)
+    queue_logging = queues.QueueLogging()
+    queue_logging.start(['tests.queues.listener', 'tests.queues.empty'], max_size=100)
+    assert list(queue_logging.listeners) == ['tests.queues.listener']
+    assert isinstance(logger.handlers[0], queues.BoundedQueueHandler)
+    for index in range(10):
+        logger.info('запись %s', index)
+    queue_logging.stop()
+    assert logger.handlers == [handler]
+    assert [record.getMessage() for record in handler.records] == [
+        f'запись {index}' for index in range(10)
+    ]
+    assert threading.current_thread().name not in handler.threads
+    assert queue_logging.dropped == 0
+    with pytest.raises(ValueError, match='max_size'):
+        queue_logging.start(['tests.queues.listener'], max_size=0)
+
+
+def test_get_queue_settings() -> None:
+    """Настройки очереди берутся из секции queue настроек логирования."""
+    assert queues.get_queue_settings({}) == (False, 10_000, queues.DropPolicyEnum.DROP_NEW)
+    assert queues.get_queue_settings(
+        {'queue': {'enabled': True, 'max_size': 5, 'drop_policy': 'drop_old'}},
+    ) == (True, 5, queues.DropPolicyEnum.DROP_OLD)
@@ -0,0 +1,88 @@
+import gzip
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.middlewares import compression
+from app.utils import http as http_utils
+
+BODY = 'описание ' * 500
+
+
+async def text_endpoint(_: object) -> PlainTextResponse:
+    """Эндпоинт с большим текстовым ответом."""
+    return PlainTextResponse(BODY)
+
+
+async def small_endpoint(_: object) -> JSONResponse:
+    """Эндпоинт с маленьким ответом."""
+    return JSONResponse({'ok': True})
+
+
+async def binary_endpoint(_: object) -> Response:
+    """Эндпоинт с несжимаемым типом содержимого."""
+    return Response(b'0' * 4096, media_type='image/png')
+
+
+async def stream_endpoint(_: object) -> StreamingResponse:
+    """Эндпоинт с потоковым ответом."""
+
+    async def chunks():  # noqa: ANN202
+        yield BODY.encode()
+        yield BODY.encode()
+
+    return StreamingResponse(chunks(), media_type='text/plain')
+
+
+def get_app(monkeypatch: pytest.MonkeyPatch) -> Starlette:
+    """Приложение со сжатием ответов (без brotli)."""
+    monkeypatch.setattr(http_utils, 'get_brotli', lambda: None)
+    app = Starlette(
+        routes=[
+            Route('/text', text_endpoint),
+            Route('/small', small_endpoint),
+            Route('/binary', binary_endpoint),
+            Route('/stream', stream_endpoint),
+        ],
+    )
+    app.add_middleware(compression.CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+@pytest.mark.asyncio()
+async def test_compression(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Большие текстовые ответы сжимаются, остальные отдаются как есть."""
+    app = get_app(monkeypatch)
+    headers = {'Accept-Encoding': 'gzip, br'}
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        response = await client.get('/text', headers=headers)
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['vary'] == 'Accept-Encoding'
+        assert int(response.headers['content-length']) < len(BODY.encode())
+        assert response.text == BODY
+        for path in ('/small', '/binary', '/stream'):
+            response = await client.get(path, headers=headers)
+            assert 'content-encoding' not in response.headers
+        response = await client.get('/text', headers={'Accept-Encoding': 'identity'})
+        assert 'content-encoding' not in response.headers
+
+
+@pytest.mark.asyncio()
+async def test_compression_in_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Большие тела сжимаются в отдельном потоке."""
+    monkeypatch.setattr(compression, 'THREAD_COMPRESSION_SIZE', 1024)
+    app = get_app(monkeypatch)
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        response = await client.get('/text', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert gzip.compress(BODY.encode()) != response.content
+    assert response.text == BODY
+
+
+def test_invalid_minimum_size() -> None:
+    """Отрицательный минимальный размер не принимается."""
+    with pytest.raises(ValueError, match='minimum_size'):
+        compression.CompressionMiddleware(Starlette(), minimum_size=-1)
@@ -0,0 +1,158 @@
+import re
+import uuid
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middlewares.conditional import ConditionalGetMiddleware, ConditionalResource
+from app.core.models.tables.tests import TestBaseModel
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from starlette.requests import Request
+
+    from tests.conftest import TestBaseModelFactoryProtocol
+
+
+class ConditionalRepository(BaseRepository[TestBaseModel, BaseQuery]):
+    """Тестовый репозиторий."""
+
+
+async def get_principal(request: 'Request') -> str | None:
+    """Пользователь из сессии."""
+    return request.session.get('user')
+
+
+def get_app(session_factory: 'async_sessionmaker[AsyncSession]') -> tuple[Starlette, list[str]]:
+    """Приложение с условными запросами к списку и записям; возвращает и журнал вызовов.
+
+    Как и админ-панель, приложение меняет сессию (токен) при каждом запросе страницы.
+    """
+    calls: list[str] = []
+
+    async def endpoint(request: 'Request') -> PlainTextResponse:
+        calls.append(request.url.path)
+        request.session['token'] = uuid.uuid4().hex
+        return PlainTextResponse('страница')
+
+    async def login(request: 'Request') -> PlainTextResponse:
+        request.session['user'] = request.query_params['user']
+        return PlainTextResponse('вход')
+
+    app = Starlette(
+        routes=[
+            Route('/login', login),
+            Route('/items', endpoint),
+            Route('/items/{item_id}', endpoint),
+        ],
+        middleware=[
+            Middleware(SessionMiddleware, secret_key='test'),  # noqa: S106
+            Middleware(
+                ConditionalGetMiddleware,
+                resources=[
+                    ConditionalResource(re.compile('/items'), ConditionalRepository),
+                    ConditionalResource(
+                        re.compile('/items/(?P<identity>[^/]+)'),
+                        ConditionalRepository,
+                        uuid.UUID,
+                    ),
+                ],
+                session_factory=session_factory,
+                get_principal=get_principal,
+                version='1.0.0',
+            ),
+        ],
+    )
+    return app, calls
+
+
+@pytest.mark.asyncio()
+async def test_conditional_list(
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Актуальной копии списка отвечается 304 без обработки запроса."""
+    app, calls = get_app(db_session_factory)
+    await test_base_model_factory()
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/login', params={'user': 'first'})
+        response = await client.get('/items')
+        etag = response.headers['etag']
+        assert etag.startswith('W/"')
+        assert response.headers['cache-control'] == 'private, no-cache'
+        response = await client.get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 304  # noqa: PLR2004
+        assert calls == ['/items']
+        await test_base_model_factory()
+        response = await client.get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 200  # noqa: PLR2004
+        assert response.headers['etag'] != etag
+        etag = response.headers['etag']
+        await client.get('/login', params={'user': 'second'})
+        response = await client.get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 200  # noqa: PLR2004
+        assert response.headers['etag'] != etag
+
+
+@pytest.mark.asyncio()
+async def test_conditional_detail(
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """ETag записи не зависит от других записей; некорректный идентификатор - без ETag."""
+    app, calls = get_app(db_session_factory)
+    item = await test_base_model_factory()
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/login', params={'user': 'first'})
+        etag = (await client.get(f'/items/{item.id}')).headers['etag']
+        await test_base_model_factory()
+        response = await client.get(f'/items/{item.id}', headers={'If-None-Match': etag})
+        assert response.status_code == 304  # noqa: PLR2004
+        response = await client.get('/items/not-uuid')
+        assert 'etag' not in response.headers
+    assert calls == [f'/items/{item.id}', '/items/not-uuid']
+
+
+@pytest.mark.asyncio()
+async def test_conditional_rotating_session_cookie(
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """ETag не зависит от cookie сессии, которая меняется при каждом ответе."""
+    app, calls = get_app(db_session_factory)
+    await test_base_model_factory()
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/login', params={'user': 'first'})
+        response = await client.get('/items')
+        etag, cookie = response.headers['etag'], client.cookies['session']
+        assert 'set-cookie' in response.headers
+        await client.get('/items')
+        assert client.cookies['session'] != cookie
+        response = await client.get('/items', headers={'If-None-Match': etag})
+        assert response.status_code == 304  # noqa: PLR2004
+    assert calls == ['/items', '/items']
+
+
+@pytest.mark.asyncio()
+async def test_conditional_anonymous(
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    mocker: 'MockerFixture',
+) -> None:
+    """Для неавторизованного клиента версия записей не запрашивается, и ETag не добавляется."""
+    app, calls = get_app(db_session_factory)
+    version = mocker.spy(ConditionalRepository, 'version')
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        response = await client.get('/items', headers={'If-None-Match': '*'})
+    assert response.status_code == 200  # noqa: PLR2004
+    assert 'etag' not in response.headers
+    assert version.call_count == 0
+    assert calls == ['/items']
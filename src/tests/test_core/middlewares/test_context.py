@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core import context as request_context_utils
+from app.core.middlewares.context import RequestContextMiddleware
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from starlette.requests import Request
+
+
+def get_app(engine: 'AsyncEngine | None' = None) -> Starlette:
+    """Приложение, эндпоинт которого возвращает контекст запроса."""
+
+    async def endpoint(_: 'Request') -> JSONResponse:
+        if engine is not None:
+            async with engine.connect() as conn:
+                await conn.execute(text('SELECT pg_sleep(0.01)'))
+                await conn.execute(text('SELECT 1'))
+        context = request_context_utils.request_context.get()
+        assert context is not None
+        return JSONResponse(
+            {
+                'request_id': context.request_id,
+                'path': context.path,
+                'route': context.route,
+                'db_statements': context.db_statements,
+                'db_time': context.db_time,
+            },
+        )
+
+    app = Starlette(routes=[Route('/items/{item_id}', endpoint)])
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ('header', 'expected'),
+    [('external-id.1', 'external-id.1'), ('bad request id', None), (None, None)],
+)
+async def test_request_id(header: str | None, expected: str | None) -> None:
+    """Идентификатор запроса берется из заголовка или генерируется и возвращается в ответе."""
+    headers = {'X-Request-ID': header} if header is not None else {}
+    async with AsyncClient(app=get_app(), base_url='http://t') as client:
+        response = await client.get('/items/1', headers=headers)
+    data = response.json()
+    assert response.headers['x-request-id'] == data['request_id']
+    if expected is not None:
+        assert data['request_id'] == expected
+    else:
+        assert len(data['request_id']) == 32  # noqa: PLR2004
+    assert data['path'] == '/items/1'
+    assert data['route'] == '/items/{item_id}'
+    assert request_context_utils.request_context.get() is None
+
+
+@pytest.mark.asyncio()
+async def test_request_db_timing(db_engine: 'AsyncEngine') -> None:
+    """Время и количество запросов к базе данных накапливаются в контексте запроса."""
+    request_context_utils.install_db_timing(db_engine.sync_engine)
+    request_context_utils.install_db_timing(db_engine.sync_engine)
+    async with AsyncClient(app=get_app(db_engine), base_url='http://t') as client:
+        response = await client.get('/items/1')
+    data = response.json()
+    assert data['db_statements'] == 2  # noqa: PLR2004
+    assert data['db_time'] >= 0.01  # noqa: PLR2004
@@ -0,0 +1,66 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Mount, Route
+
+from app.core.context import UNMATCHED_ROUTE
+from app.core.metrics import CONTENT_TYPE, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from app.core.middlewares.metrics import MetricsMiddleware
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from starlette.requests import Request
+
+
+async def item_endpoint(_: 'Request') -> PlainTextResponse:
+    """Эндпоинт элемента."""
+    return PlainTextResponse('ok')
+
+
+async def failing_endpoint(_: 'Request') -> PlainTextResponse:
+    """Эндпоинт с ошибкой."""
+    msg = 'ошибка'
+    raise RuntimeError(msg)
+
+
+@pytest.mark.asyncio()
+async def test_metrics_middleware() -> None:
+    """Длительность запросов пишется по шаблону маршрута и статусу ответа."""
+    app = Starlette(
+        routes=[
+            Route('/items/{item_id}', item_endpoint),
+            Mount('/nested', routes=[Route('/{name}/fail', failing_endpoint)]),
+        ],
+    )
+    app.add_middleware(MetricsMiddleware)
+    labels = ('GET', '/items/{item_id}', '200')
+    failed_labels = ('GET', '/nested/{name}/fail', '500')
+    unmatched_labels = ('GET', UNMATCHED_ROUTE, '404')
+    before = [
+        HTTP_REQUEST_DURATION.get_count(*item) for item in (labels, failed_labels, unmatched_labels)
+    ]
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/items/1')
+        await client.get('/items/2')
+        await client.get('/missing')
+        with pytest.raises(RuntimeError):
+            await client.get('/nested/abc/fail')
+    after = [
+        HTTP_REQUEST_DURATION.get_count(*item) for item in (labels, failed_labels, unmatched_labels)
+    ]
+    assert [count - previous for count, previous in zip(after, before, strict=True)] == [2, 1, 1]
+    assert HTTP_REQUESTS_IN_PROGRESS.get('GET') == 0
+
+
+def test_metrics_endpoint(testing_app: 'TestClient') -> None:
+    """Эндпоинт метрик приложения отдает метрики в формате Prometheus."""
+    testing_app.get('/metrics')
+    response = testing_app.get('/metrics')
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.headers['content-type'] == CONTENT_TYPE
+    assert 'http_request_duration_seconds_count{method="GET",route="/metrics",status="200"}' in (
+        response.text
+    )
@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import orjson
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middlewares import profiling
+
+if TYPE_CHECKING:
+    import pathlib
+    from types import FrameType
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from starlette.requests import Request
+
+
+def busy_wait(seconds: float) -> None:
+    """Нагружает процессор ``seconds`` секунд."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def slow_endpoint(_: 'Request') -> PlainTextResponse:
+    """Эндпоинт, который и ждет, и нагружает процессор."""
+    await asyncio.sleep(0.05)
+    busy_wait(0.05)
+    return PlainTextResponse('ok')
+
+
+def get_app(tmp_path: 'pathlib.Path', *, sample_rate: float, threshold: float) -> Starlette:
+    """Приложение с одним медленным эндпоинтом под middleware профилирования."""
+    app = Starlette(routes=[Route('/slow/{item}', slow_endpoint)])
+    app.add_middleware(
+        profiling.ProfilingMiddleware,
+        sample_rate=sample_rate,
+        interval=0.001,
+        threshold=threshold,
+        output_dir=tmp_path,
+    )
+    return app
+
+
+@pytest.mark.asyncio()
+async def test_profile_saved(tmp_path: 'pathlib.Path') -> None:
+    """Профиль медленного запроса сохраняется со стеками вычислений и ожидания."""
+    app = get_app(tmp_path, sample_rate=1, threshold=0)
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        response = await client.get('/slow/1')
+    assert response.status_code == 200
+    files = list(tmp_path.glob('*.speedscope.json'))
+    assert len(files) == 1
+    assert '-GET-slow_1-' in files[0].name
+    data = orjson.loads(files[0].read_bytes())
+    assert data['$schema'] == profiling.SPEEDSCOPE_SCHEMA
+    frame_names = {frame['name'] for frame in data['shared']['frames']}
+    assert 'busy_wait' in frame_names
+    assert profiling.AWAIT_FRAME in frame_names
+    profile = data['profiles'][0]
+    assert profile['type'] == 'sampled'
+    assert len(profile['samples']) == len(profile['weights'])
+    assert profile['endValue'] >= 0.1
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(('sample_rate', 'threshold'), [(0, 0), (1, 10)])
+async def test_profile_not_saved(
+    tmp_path: 'pathlib.Path',
+    sample_rate: float,
+    threshold: float,
+) -> None:
+    """Профиль не сохраняется для невыбранных и быстрых запросов."""
+    app = get_app(tmp_path, sample_rate=sample_rate, threshold=threshold)
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        response = await client.get('/slow/1')
+    assert response.status_code == 200
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize(('sample_rate', 'interval'), [(-0.1, 0.01), (1.1, 0.01), (0.5, 0)])
+def test_middleware_invalid_arguments(
+    tmp_path: 'pathlib.Path',
+    sample_rate: float,
+    interval: float,
+) -> None:
+    """Некорректные параметры middleware."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        profiling.ProfilingMiddleware(
+            Starlette(),
+            sample_rate=sample_rate,
+            interval=interval,
+            threshold=0,
+            output_dir=tmp_path,
+        )
+
+
+@pytest.mark.asyncio()
+async def test_sampler_remove_waits_for_sample(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Профиль не изменяется после ``remove``: снятие стеков и удаление под одной блокировкой."""
+    task = asyncio.current_task()
+    assert task is not None
+    profile = profiling.RequestProfile(method='GET', path='/', task=task, thread_id=0)
+    sampler = profiling.Sampler(interval=10)
+    sampler.add(profile)
+    sampling = threading.Event()
+    resume = threading.Event()
+    add_sample = profile.add_sample
+
+    def slow_add_sample(frames: dict[int, 'FrameType']) -> None:
+        sampling.set()
+        resume.wait(timeout=5)
+        add_sample(frames)
+
+    monkeypatch.setattr(profile, 'add_sample', slow_add_sample)
+    thread = threading.Thread(target=sampler.sample)
+    thread.start()
+    assert sampling.wait(timeout=5)
+    removed = threading.Event()
+    remover = threading.Thread(target=lambda: (sampler.remove(profile), removed.set()))
+    remover.start()
+    assert not removed.wait(timeout=0.05)
+    resume.set()
+    thread.join()
+    remover.join()
+    samples = profile.samples.copy()
+    sampler.sample()
+    assert profile.samples == samples
+    assert sum(samples.values()) == 1
+
+
+@pytest.mark.asyncio()
+async def test_db_timing(db_engine: 'AsyncEngine') -> None:
+    """Учитываются только запросы к БД внутри профилируемого запроса."""
+    profiling.install_db_timing(db_engine.sync_engine)
+    profiling.install_db_timing(db_engine.sync_engine)
+    task = asyncio.current_task()
+    assert task is not None
+    profile = profiling.RequestProfile(method='GET', path='/', task=task, thread_id=0)
+    async with db_engine.connect() as conn:
+        await conn.execute(text('SELECT pg_sleep(0.02)'))
+        token = profiling.current_profile.set(profile)
+        try:
+            await conn.execute(text('SELECT pg_sleep(0.02)'))
+            await conn.execute(text('SELECT 1'))
+        finally:
+            profiling.current_profile.reset(token)
+        await conn.execute(text('SELECT 1'))
+    profile.finish()
+    assert profile.db_statements == 2
+    assert 0.02 <= profile.db_time <= profile.duration
+    assert 0 < profile.db_share <= 1
@@ -0,0 +1,109 @@
+import re
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app.core.cache import MemoryCacheBackend, ResponseCache
+from app.core.middlewares.response_cache import CachedResource, ResponseCacheMiddleware
+from app.db.mixins.permissions import PermissionModeEnum
+
+if TYPE_CHECKING:
+    from starlette.requests import Request
+
+
+def get_app(cache: ResponseCache) -> tuple[Starlette, list[str]]:
+    """Приложение с кэшем ответов списка; возвращает и журнал вызовов."""
+    calls: list[str] = []
+
+    async def endpoint(request: 'Request') -> PlainTextResponse:
+        calls.append(str(request.url.query))
+        status_code = int(request.query_params.get('status', 200))
+        return PlainTextResponse(f'страница {len(calls)}', status_code=status_code)
+
+    async def get_permission_mode(request: 'Request') -> PermissionModeEnum | None:
+        if request.headers.get('authorization') != 'admin':
+            return None
+        return PermissionModeEnum.ADMIN
+
+    app = Starlette(routes=[Route('/items', endpoint), Route('/other', endpoint)])
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=cache,
+        resources=[CachedResource(re.compile('/items'), ('items',))],
+        get_permission_mode=get_permission_mode,
+    )
+    return app, calls
+
+
+@pytest.mark.asyncio()
+async def test_response_cache() -> None:
+    """Ответ кэшируется по адресу и параметрам запроса до изменения таблицы."""
+    cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+    app, calls = get_app(cache)
+    headers = {'authorization': 'admin'}
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        first = await client.get('/items?a=1&b=2', headers=headers)
+        second = await client.get('/items?b=2&a=1', headers=headers)
+        assert first.text == second.text == 'страница 1'
+        assert second.headers['content-type'] == first.headers['content-type']
+        assert (await client.get('/items?a=2', headers=headers)).text == 'страница 2'
+        await cache.versions.bump('items')
+        assert (await client.get('/items?a=1&b=2', headers=headers)).text == 'страница 3'
+        other_host = await client.get('http://other/items?a=1&b=2', headers=headers)
+        assert other_host.text == 'страница 4'
+        other_scheme = await client.get('https://t/items?a=1&b=2', headers=headers)
+        assert other_scheme.text == 'страница 5'
+    assert len(calls) == 5  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_response_cache_skipped() -> None:
+    """Без режима доступа, для других путей и ответов с ошибкой кэш не используется."""
+    cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+    app, calls = get_app(cache)
+    headers = {'authorization': 'admin'}
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/items')
+        await client.get('/items')
+        await client.get('/other', headers=headers)
+        await client.get('/other', headers=headers)
+        not_found = await client.get('/items?status=404', headers=headers)
+        assert not_found.status_code == 404  # noqa: PLR2004
+        await client.get('/items?status=404', headers=headers)
+    assert len(calls) == 6  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_response_cache_session() -> None:
+    """Изменения сессии при проверке клиента и при построении ответа сохраняются."""
+    cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+
+    async def items(request: 'Request') -> PlainTextResponse:
+        request.session['rendered'] = request.session.get('rendered', 0) + 1
+        return PlainTextResponse('страница')
+
+    async def session(request: 'Request') -> JSONResponse:
+        return JSONResponse(request.session)
+
+    async def get_permission_mode(request: 'Request') -> PermissionModeEnum:
+        request.session['token'] = request.session.get('token', 0) + 1
+        return PermissionModeEnum.ADMIN
+
+    app = Starlette(routes=[Route('/items', items), Route('/session', session)])
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=cache,
+        resources=[CachedResource(re.compile('/items'), ('items',))],
+        get_permission_mode=get_permission_mode,
+    )
+    app.add_middleware(SessionMiddleware, secret_key='secret')  # noqa: S106
+    async with AsyncClient(app=app, base_url='http://t') as client:
+        await client.get('/items')
+        assert (await client.get('/session')).json() == {'token': 1, 'rendered': 1}
+        await client.get('/items')
+        assert (await client.get('/session')).json() == {'token': 2, 'rendered': 1}
@@ -295,3 +295,107 @@ async def test_model_repr_include_fields(
     item = await test_base_model_factory()
     item.repr_include_fields = {'id', 'text'}
     assert repr(item) == f'{item.__class__.__name__}(id={item.id}, text=\'{item.text}\')'
+
+
+@pytest.mark.asyncio()
+async def test_diff_many_changed_fields(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка пакетного сравнения: наборы измененных полей для словаря, модели и схемы."""
+    item = await test_base_model_factory(text='abc')
+    item_2 = await test_base_model_factory(text='abc')
+
+    class TestPydanticSchema(BaseModel):
+        __test__ = False
+
+        text: str | None
+        not_a_column: int = 0
+
+    result = TestBaseModel.diff_many(
+        [
+            (item, {'text': 'abcd', 'not_a_column': 1}),
+            (item, {'text': 'abc'}),
+            (item, TestPydanticSchema(text='abcd')),
+            (item, item_2),
+        ],
+    )
+    assert result[0] == {'text'}
+    assert result[1] == set()
+    assert result[2] == {'text'}
+    assert 'id' in result[3]
+    assert 'text' not in result[3]
+
+
+@pytest.mark.asyncio()
+async def test_diff_many_include_fields(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка пакетного сравнения: include поля."""
+    item = await test_base_model_factory(text='abc')
+    item_2 = await test_base_model_factory(text='abcd')
+    result = TestBaseModel.diff_many(
+        [(item, item_2), (item, {'id': uuid.uuid4(), 'text': 'abc'})],
+        include_fields={'text'},
+    )
+    assert result == [{'text'}, set()]
+
+
+@pytest.mark.asyncio()
+async def test_diff_many_type_error(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+    test_related_model_factory: 'TestRelatedModelFactoryProtocol',
+) -> None:
+    """Проверка пакетного сравнения: отличаются типы данных."""
+    item = await test_base_model_factory()
+    item_2 = await test_related_model_factory()
+    msg = (
+        'Был передан item неправильного типа данных. '
+        f'Ожидались: Dict, BaseModel, {item.__class__.__name__}. Пришёл: {type(item_2)}.'
+    )
+    with pytest.raises(TypeError, match=msg):
+        TestBaseModel.diff_many([(item, item_2)])  # type: ignore
+
+
+@pytest.mark.asyncio()
+async def test_model_compact_repr_truncates_values(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка компактного repr модели: длинные значения обрезаются."""
+    item = TestBaseModel(id=25, text='a' * 100)
+    item.repr_include_fields = {'text'}
+    item.max_compact_repr_value_length = 5
+    assert item.compact_repr() == f"{item.__class__.__name__}(id=25, text='aaaaa'...)"
+
+
+@pytest.mark.asyncio()
+async def test_model_compact_repr_not_loaded(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка компактного repr модели: незагруженные значения и максимальное число элементов."""
+    item = TestBaseModel(id=25)
+    item.repr_include_fields = {'text'}
+    assert item.compact_repr() == f'{item.__class__.__name__}(id=25, text=<Not loaded>)'
+    item.max_repr_elements = 1
+    assert item.compact_repr() == f'{item.__class__.__name__}(id=25)'
+
+
+@pytest.mark.asyncio()
+async def test_model_lazy_repr(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка ленивого repr модели: строка собирается только при приведении к строке."""
+    item = await test_base_model_factory()
+    lazy = item.lazy_repr()
+    assert str(lazy) == repr(lazy) == item.compact_repr()
+    item.text = 'changed'
+    assert 'changed' in str(lazy)
@@ -0,0 +1,49 @@
+import datetime
+
+import pytest
+
+from app.core.models.enums.watch_list import StatusEnum
+from app.core.models.partitioning import Partition, Partitioning, PartitionStrategyEnum
+
+
+def test_range_partitions_aligned_to_interval() -> None:
+    """Проверка секций-диапазонов: границы выровнены по интервалу и переходят через год."""
+    partitioning = Partitioning(
+        strategy=PartitionStrategyEnum.RANGE,
+        column='created_at',
+        interval_months=3,
+    )
+    partitions = partitioning.get_range_partitions(
+        'anime',
+        start=datetime.date(2026, 11, 15),
+        count=2,
+    )
+    assert partitions == [
+        Partition(name='anime_p2026_10', bound="FROM ('2026-10-01') TO ('2027-01-01')"),
+        Partition(name='anime_p2027_01', bound="FROM ('2027-01-01') TO ('2027-04-01')"),
+    ]
+    assert partitions[0].get_create_ddl('anime') == (
+        "CREATE TABLE IF NOT EXISTS anime_p2026_10 PARTITION OF anime "
+        "FOR VALUES FROM ('2026-10-01') TO ('2027-01-01')"
+    )
+
+
+def test_list_partitions_from_enum() -> None:
+    """Проверка секций-списков: по секции на элемент Enum (по названию элемента)."""
+    partitioning = Partitioning(strategy=PartitionStrategyEnum.LIST, column='status')
+    partitions = partitioning.get_list_partitions('anime', [StatusEnum.WATCHED, 'CUSTOM'])
+    assert partitions == [
+        Partition(name='anime_watched', bound="IN ('WATCHED')"),
+        Partition(name='anime_custom', bound="IN ('CUSTOM')"),
+    ]
+
+
+@pytest.mark.parametrize('interval_months', [0, 5, 24])
+def test_incorrect_interval(interval_months: int) -> None:
+    """Проверка ошибки при интервале, не делящем год на равные части."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        Partitioning(
+            strategy=PartitionStrategyEnum.RANGE,
+            column='created_at',
+            interval_months=interval_months,
+        )
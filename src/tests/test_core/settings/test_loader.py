@@ -0,0 +1,68 @@
+import os
+import pathlib
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.settings import base, loader
+
+
+def test_env_file_read_once() -> None:
+    """Все группы настроек создаются по одному прочтению env-файла."""
+    base.read_env_file_once.cache_clear()
+    loader.load_settings()
+    info = base.read_env_file_once.cache_info()
+    assert info.misses == 1
+    assert info.hits == 4  # noqa: PLR2004
+
+
+def test_settings_frozen() -> None:
+    """Настройки неизменяемые."""
+    snapshot = loader.load_settings()
+    with pytest.raises(ValidationError):
+        snapshot.db.port = 1  # type: ignore
+    with pytest.raises(AttributeError):
+        snapshot.db = snapshot.db  # type: ignore
+
+
+def test_snapshot_round_trip(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Снимок восстанавливается с секретами и без чтения переменных окружения."""
+    snapshot = loader.load_settings()
+    path = tmp_path / 'settings.json'
+    loader.save_snapshot(snapshot, path)
+    monkeypatch.setenv('DB_PORT', '1')
+    monkeypatch.setenv(loader.SNAPSHOT_ENV_VARIABLE, path.as_posix())
+    restored = loader.get_settings_snapshot()
+    assert restored == snapshot
+    assert restored.db.port == snapshot.db.port != 1
+    assert (
+        restored.auth.access_secret_key.get_secret_value()
+        == snapshot.auth.access_secret_key.get_secret_value()
+    )
+    assert os.stat(path).st_mode & 0o777 == 0o600  # noqa: PTH116, PLR2004
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'not json',
+        b'{"version": 0}',
+        b'{"version": 1, "run_mode": "prod", "env_file": "/", "groups": {}}',
+    ],
+)
+def test_invalid_snapshot(data: bytes) -> None:
+    """Некорректный или чужой снимок не загружается."""
+    with pytest.raises(ValueError, match='снимок настроек|снимка настроек'):
+        loader.parse_snapshot(data)
+
+
+def test_invalid_snapshot_fallback(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Если снимок не подходит, настройки создаются заново."""
+    path = tmp_path / 'settings.json'
+    path.write_bytes(b'{"version": 0}')
+    monkeypatch.setenv(loader.SNAPSHOT_ENV_VARIABLE, path.as_posix())
+    monkeypatch.setenv('DB_PORT', '1')
+    assert loader.get_settings_snapshot().db.port == 1
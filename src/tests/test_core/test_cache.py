@@ -0,0 +1,146 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import CacheEntry, MemoryCacheBackend, ResponseCache
+from app.core.models.tables.tests import TestBaseModel
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+TABLE = TestBaseModel.__table__.name
+
+
+class CacheRepository(BaseRepository[TestBaseModel, BaseQuery]):
+    """Тестовый репозиторий."""
+
+
+class Computer:
+    """Счетчик вызовов функции построения значения."""
+
+    def __init__(self: 'Computer', value: bytes | None = b'value', delay: float = 0) -> None:
+        """Функция возвращает ``value`` через ``delay`` секунд."""
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self: 'Computer') -> bytes | None:
+        """Построение значения."""
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.fixture()
+def response_cache(monkeypatch: pytest.MonkeyPatch) -> ResponseCache:
+    """Кэш ответов процесса в памяти."""
+    cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+    monkeypatch.setattr(cache_module, 'response_cache', cache)
+    return cache
+
+
+@pytest.mark.asyncio()
+async def test_memory_backend_lru() -> None:
+    """Хранилище в памяти вытесняет самые давно использованные значения и истекшие значения."""
+    backend = MemoryCacheBackend(max_size=2)
+    await backend.set('a', b'1', 60)
+    await backend.set('b', b'2', 60)
+    assert await backend.get('a') == b'1'
+    await backend.set('c', b'3', 60)
+    assert await backend.get_many(['a', 'b', 'c']) == [b'1', None, b'3']
+    await backend.set('d', b'4', -1)
+    assert await backend.get('d') is None
+    assert await backend.incr('counter') == 1
+    assert await backend.get('counter') == b'1'
+    with pytest.raises(ValueError, match='max_size'):
+        MemoryCacheBackend(max_size=0)
+
+
+def test_entry_dump_load() -> None:
+    """Запись кэша восстанавливается после сериализации."""
+    entry = CacheEntry(versions=(1, 2), created_at=100.5, value=b'first\nsecond')
+    assert CacheEntry.load(entry.dump()) == entry
+
+
+@pytest.mark.asyncio()
+async def test_cache_hit_and_invalidation(response_cache: ResponseCache) -> None:
+    """Значение строится один раз до изменения версии таблицы."""
+    compute = Computer()
+    for _ in range(3):
+        assert await response_cache.get_or_set('key', (TABLE,), compute) == b'value'
+    assert compute.calls == 1
+    await response_cache.versions.bump(TABLE)
+    assert await response_cache.get_or_set('key', (TABLE,), compute) == b'value'
+    assert compute.calls == 2  # noqa: PLR2004
+    assert await response_cache.get_or_set('key', ('other',), compute) == b'value'
+    assert compute.calls == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_cache_not_cacheable(response_cache: ResponseCache) -> None:
+    """Значение ``None`` не сохраняется."""
+    compute = Computer(value=None)
+    assert await response_cache.get_or_set('key', (TABLE,), compute) is None
+    assert await response_cache.get_or_set('key', (TABLE,), compute) is None
+    assert compute.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_cache_coalescing(response_cache: ResponseCache) -> None:
+    """Одновременные промахи по ключу строят значение один раз."""
+    compute = Computer(delay=0.05)
+    results = await asyncio.gather(
+        *(response_cache.get_or_set('key', (TABLE,), compute) for _ in range(5)),
+    )
+    assert results == [b'value'] * 5
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio()
+async def test_cache_coalescing_after_bump(response_cache: ResponseCache) -> None:
+    """Запрос после изменения таблицы не получает значение, построение которого начато до него."""
+    old = Computer(b'old', delay=0.05)
+    first = asyncio.create_task(response_cache.get_or_set('key', (TABLE,), old))
+    await asyncio.sleep(0.01)
+    await response_cache.versions.bump(TABLE)
+    new = Computer(b'new')
+    assert await response_cache.get_or_set('key', (TABLE,), new) == b'new'
+    assert await first == b'old'
+    assert new.calls == 1
+
+
+@pytest.mark.asyncio()
+async def test_cache_stale_while_revalidate() -> None:
+    """Устаревшая запись отдается сразу, а новая строится в фоне."""
+    now = 1000.0
+    cache = ResponseCache(MemoryCacheBackend(), ttl=10, stale_ttl=10, clock=lambda: now)
+    await cache.get_or_set('key', (TABLE,), Computer(b'old'))
+    now += 15
+    compute = Computer(b'new')
+    assert await cache.get_or_set('key', (TABLE,), compute) == b'old'
+    await asyncio.sleep(0.01)
+    assert compute.calls == 1
+    assert await cache.get_or_set('key', (TABLE,), compute) == b'new'
+    now += 30
+    assert await cache.get_or_set('key', (TABLE,), Computer(b'newest')) == b'newest'
+
+
+@pytest.mark.asyncio()
+async def test_repository_bumps_version(
+    response_cache: ResponseCache,
+    db_session: 'AsyncSession',
+) -> None:
+    """Методы записи репозитория увеличивают версию таблицы после фиксации транзакции."""
+    repo = CacheRepository(db_session)
+    await repo.create(data={'text': 'first'}, use_flush=True)
+    assert await response_cache.versions.get((TABLE,)) == (0,)
+    await db_session.rollback()
+    assert await response_cache.versions.get((TABLE,)) == (0,)
+    item = await repo.create(data={'text': 'second'})
+    assert await response_cache.versions.get((TABLE,)) == (1,)
+    await repo.update(data={'text': 'third'}, item=item)
+    assert await response_cache.versions.get((TABLE,)) == (2,)
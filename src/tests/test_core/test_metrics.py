@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from app.core import metrics
+from app.core.models.tables.tests import TestBaseModel
+from app.db.mixins.permissions import PermissionModeEnum
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+from app.services import auth
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+class MetricsRepository(BaseRepository[TestBaseModel, BaseQuery]):
+    """Тестовый репозиторий с запретом удаления."""
+
+    __test__ = False
+    PERMISSION_RULES = {**BaseRepository.PERMISSION_RULES, 'delete': PermissionModeEnum.NO_ONE}
+
+
+def test_render_metrics() -> None:
+    """Проверка текстового формата счетчиков, датчиков и гистограмм."""
+    registry = metrics.Registry()
+    counter = registry.register(metrics.Counter('test_total', 'Счетчик.', ('name',)))
+    gauge = registry.register(metrics.Gauge('test_gauge', 'Датчик.'))
+    histogram = registry.register(
+        metrics.Histogram('test_seconds', 'Гистограмма.', ('name',), buckets=(0.1, 1)),
+    )
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    histogram.observe(0.05, 'x')
+    histogram.observe(0.1, 'x')
+    histogram.observe(5, 'x')
+    assert counter.get('a"b') == 3  # noqa: PLR2004
+    assert histogram.get_count('x') == 3  # noqa: PLR2004
+    assert registry.render().decode().splitlines() == [
+        '# HELP test_total Счетчик.',
+        '# TYPE test_total counter',
+        'test_total{name="a\\"b"} 3.0',
+        '# HELP test_gauge Датчик.',
+        '# TYPE test_gauge gauge',
+        'test_gauge 1.0',
+        '# HELP test_seconds Гистограмма.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{name="x",le="0.1"} 2.0',
+        'test_seconds_bucket{name="x",le="1.0"} 2.0',
+        'test_seconds_bucket{name="x",le="+Inf"} 3.0',
+        'test_seconds_sum{name="x"} 5.15',
+        'test_seconds_count{name="x"} 3.0',
+    ]
+    with pytest.raises(ValueError, match='уже зарегистрирована'):
+        registry.register(metrics.Counter('test_total', 'Счетчик.'))
+    registry.clear()
+    assert counter.get('a"b') == 0
+
+
+@pytest.mark.asyncio()
+async def test_db_metrics(db_engine: 'AsyncEngine', db_session: 'AsyncSession') -> None:
+    """SQL-запросы считаются по методам репозиториев, состояние пула берется из движка."""
+    repo = MetricsRepository(db_session)
+    metrics.install_db_metrics(db_engine.sync_engine)
+    try:
+        await repo.count()
+        before = metrics.DB_STATEMENTS.get('MetricsRepository.count')
+        await repo.count()
+        await repo.count()
+        assert metrics.DB_STATEMENTS.get('MetricsRepository.count') == before + 2  # noqa: PLR2004
+        rendered = metrics.registry.render().decode()
+        assert 'db_statements_total{repository_method="MetricsRepository.count"}' in rendered
+        assert 'db_pool_connections{state="checkedout"}' in rendered
+    finally:
+        metrics.uninstall_db_metrics(db_engine.sync_engine)
+
+
+def test_permission_denials() -> None:
+    """Отказы в доступе считаются по репозиторию, методу и режиму доступа."""
+    repo = MetricsRepository.__new__(MetricsRepository)
+    before = metrics.PERMISSION_DENIALS.get('MetricsRepository', 'delete', 'ADMIN')
+    with pytest.raises(Exception):  # noqa: B017, PT011
+        repo.check_permissions('delete', PermissionModeEnum.ADMIN)
+    repo.check_permissions('read_list', PermissionModeEnum.ADMIN)
+    assert metrics.PERMISSION_DENIALS.get('MetricsRepository', 'delete', 'ADMIN') == before + 1
+
+
+def test_jwt_metrics() -> None:
+    """Создание и проверка JWT-токенов попадают в гистограмму."""
+    encoded = metrics.JWT_DURATION.get_count('encode')
+    decoded = metrics.JWT_DURATION.get_count('decode')
+    token = auth.encode_jwt_token('user')
+    auth.decode_jwt_token(token)
+    auth.decode_jwt_token(b'invalid')
+    assert metrics.JWT_DURATION.get_count('encode') == encoded + 1
+    assert metrics.JWT_DURATION.get_count('decode') == decoded + 2  # noqa: PLR2004
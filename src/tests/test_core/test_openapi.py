@@ -0,0 +1,79 @@
+import gzip
+import pathlib
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import openapi
+from app.utils import http as http_utils
+
+
+def get_app(
+    cache_control: str = 'public, max-age=60',
+    root_path: str = '/api',
+) -> tuple[FastAPI, openapi.PrerenderedOpenAPI]:
+    """Приложение с подготовленной схемой OpenAPI."""
+    app = FastAPI(title='test', root_path=root_path)
+
+    @app.get('/items')
+    async def items() -> list[int]:
+        return [1]
+
+    return app, openapi.install_prerendered_openapi(app, cache_control=cache_control)
+
+
+def test_prerendered_openapi() -> None:
+    """Схема строится один раз и отдается сжатой с ETag и Cache-Control."""
+    app, prerendered = get_app()
+    with TestClient(app) as client:
+        assert list(prerendered.contents) == ['/api']
+        response = client.get('/openapi.json', headers={'Accept-Encoding': 'gzip'})
+    content = prerendered.contents['/api']
+    assert response.status_code == 200  # noqa: PLR2004
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['cache-control'] == 'public, max-age=60'
+    assert response.headers['etag'] == content.etag
+    schema = orjson.loads(response.content)
+    assert '/items' in schema['paths']
+    assert schema['servers'] == [{'url': '/api'}]
+    assert gzip.decompress(content.encoded['gzip']) == content.body
+
+
+def test_prerendered_openapi_request_root_path() -> None:
+    """Как в FastAPI, в ``servers`` схемы попадает ``root_path`` запроса."""
+    app, prerendered = get_app(root_path='')
+    client = TestClient(app, root_path='/proxy')
+    assert orjson.loads(client.get('/openapi.json').content)['servers'] == [{'url': '/proxy'}]
+    assert 'servers' not in orjson.loads(TestClient(app).get('/openapi.json').content)
+    assert set(prerendered.contents) == {'/proxy', ''}
+
+
+def test_prerendered_openapi_not_modified() -> None:
+    """Клиенту с актуальной копией схемы возвращается 304 без тела."""
+    app, prerendered = get_app()
+    client = TestClient(app)
+    etag = client.get('/openapi.json').headers['etag']
+    response = client.get('/openapi.json', headers={'If-None-Match': etag})
+    assert response.status_code == 304  # noqa: PLR2004
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+
+
+def test_prerendered_openapi_identity(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Без поддерживаемого сжатия схема отдается как есть."""
+    monkeypatch.setattr(http_utils, 'get_brotli', lambda: None)
+    app, _ = get_app()
+    response = TestClient(app).get('/openapi.json', headers={'Accept-Encoding': 'br'})
+    assert 'content-encoding' not in response.headers
+    assert orjson.loads(response.content)['info']['title'] == 'test'
+
+
+def test_read_description_once(tmp_path: pathlib.Path) -> None:
+    """Описание документации читается из файла один раз."""
+    path = tmp_path / 'description.md'
+    path.write_text('описание')
+    assert openapi.read_description(path) == 'описание'
+    path.write_text('другое описание')
+    assert openapi.read_description(path) == 'описание'
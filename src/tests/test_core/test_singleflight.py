@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SINGLE_FLIGHT_CALLS, SingleFlight
+
+
+class Computer:
+    """Счетчик вызовов функции."""
+
+    def __init__(self: 'Computer', delay: float = 0, *, fail: bool = False) -> None:
+        """Функция возвращает номер вызова через ``delay`` секунд или завершается ошибкой."""
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self: 'Computer') -> int:
+        """Вызов функции."""
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay)
+        if self.fail and call == 1:
+            msg = 'ошибка'
+            raise RuntimeError(msg)
+        return call
+
+
+@pytest.mark.asyncio()
+async def test_single_flight_shared() -> None:
+    """Одновременные вызовы по ключу выполняют функцию один раз."""
+    flight: SingleFlight[int] = SingleFlight('test-shared')
+    func = Computer(delay=0.02)
+    results = await asyncio.gather(*(flight.do('key', func) for _ in range(4)))
+    assert results == [(1, False), (1, True), (1, True), (1, True)]
+    assert len(flight) == 0
+    assert await flight.do('key', func) == (2, False)
+    assert SINGLE_FLIGHT_CALLS.get('test-shared', 'shared') == 3  # noqa: PLR2004
+    assert SINGLE_FLIGHT_CALLS.get('test-shared', 'leader') == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_single_flight_timeout() -> None:
+    """Ожидание ограничено: после timeout функция выполняется отдельно."""
+    flight: SingleFlight[int] = SingleFlight('test-timeout', timeout=0.01)
+    func = Computer(delay=0.05)
+    results = await asyncio.gather(flight.do('key', func), flight.do('key', func))
+    assert results == [(1, False), (2, False)]
+    assert SINGLE_FLIGHT_CALLS.get('test-timeout', 'timeout') == 1
+    with pytest.raises(ValueError, match='timeout'):
+        SingleFlight('test-timeout', timeout=0)
+
+
+@pytest.mark.asyncio()
+async def test_single_flight_leader_failed() -> None:
+    """Ошибка ведущего вызова не передается ожидающим: они выполняют функцию сами."""
+    flight: SingleFlight[int] = SingleFlight('test-failed')
+    func = Computer(delay=0.02, fail=True)
+    leader, follower = await asyncio.gather(
+        flight.do('key', func),
+        flight.do('key', func),
+        return_exceptions=True,
+    )
+    assert isinstance(leader, RuntimeError)
+    assert follower == (2, False)
+    assert 'key' not in flight
+    assert SINGLE_FLIGHT_CALLS.get('test-failed', 'failed') == 1
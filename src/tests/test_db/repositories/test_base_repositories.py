@@ -1,24 +1,31 @@
+import asyncio
 import datetime
+import uuid
 from typing import TYPE_CHECKING, Any, Protocol
 from zoneinfo import ZoneInfo
 
 import freezegun
 import pytest
 from mimesis import Datetime, Locale, Text
+from sqlalchemy import inspect, update
 from sqlalchemy.orm import joinedload
 
-from app.core.exceptions.repositories import RepositorySubclassNotSetAttributeError
+from app.core.exceptions.repositories import (
+    RepositoryBaseMethodAccessError,
+    RepositorySubclassNotSetAttributeError,
+)
 from app.core.models.tables.tests import Base, TestBaseModel, TestRelatedModel
+from app.core.schemas.classes.aggregations import AggregateFunctionEnum, AggregationSchema
 from app.core.schemas.classes.tests import TestBaseCreateModel, TestBaseUpdateModel
 from app.db.queries.base import BaseQuery
 from app.db.repositories.base import BaseRepository, SelectModeEnum
 
 if TYPE_CHECKING:
-    import uuid
     from collections.abc import Awaitable
 
     from fastapi.testclient import TestClient
-    from sqlalchemy.ext.asyncio import AsyncSession
+    from pytest_mock import MockerFixture
+    from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session
     from sqlalchemy.sql.elements import ColumnElement
 
     class TestBaseModelFactoryProtocol(Protocol):  # noqa
@@ -168,6 +175,137 @@ async def test_get_items_count(
     assert count == len(item_ids)
 
 
+@pytest.mark.asyncio()
+async def test_items_version(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка версии записей: версии таблицы и записи меняются при их изменении."""
+    repo = TestRepository(db_session)
+    item = await test_base_model_factory()
+    version = await repo.version()
+    item_version = await repo.version(item_identity=item.id)
+    assert version.startswith('__test_model__:')
+    assert item_version.startswith('__test_model__:')
+    other_item = await test_base_model_factory()
+    assert await repo.version() != version
+    assert await repo.version(item_identity=item.id) == item_version
+    missing_version = await repo.version(item_identity=uuid.uuid4())
+    assert missing_version == '__test_model__:-'
+    version = await repo.version()
+    await db_session.execute(
+        update(TestBaseModel).where(TestBaseModel.id == other_item.id).values(text='changed'),
+    )
+    assert await repo.version() != version
+    assert await repo.version(item_identity=item.id) == item_version
+
+
+@pytest.mark.asyncio()
+async def test_items_version_changed_without_updated_at(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Версия меняется при изменении записи, даже если ``updated_at`` не стал больше."""
+    repo = TestRepository(db_session)
+    old = datetime.datetime(2023, 1, 1, tzinfo=datetime.UTC)
+    item = await test_base_model_factory(updated_at=old)
+    await test_base_model_factory(updated_at=old + datetime.timedelta(days=1))
+    await db_session.commit()
+    version = await repo.version()
+    item_version = await repo.version(item_identity=item.id)
+    await db_session.execute(
+        update(TestBaseModel).where(TestBaseModel.id == item.id).values(text='changed'),
+    )
+    await db_session.execute(
+        update(TestBaseModel).where(TestBaseModel.id == item.id).values(updated_at=old),
+    )
+    await db_session.commit()
+    assert await repo.version() != version
+    assert await repo.version(item_identity=item.id) != item_version
+
+
+@pytest.mark.asyncio()
+async def test_coalesce_reads(
+    testing_app: 'TestClient',
+    db_session_factory: 'async_scoped_session[AsyncSession]',
+    test_base_model_list_factory: 'TestBaseModelListFactoryProtocol',
+    mocker: 'MockerFixture',
+) -> None:
+    """Одинаковые одновременные запросы разных сессий выполняются один раз.
+
+    Изменение экземпляров сессией ведущего запроса не влияет на результат остальных.
+    """
+    await test_base_model_list_factory(count=3)
+    get_db_item_list = BaseQuery.get_db_item_list
+
+    async def slow_get_db_item_list(self: BaseQuery, **kwargs: Any) -> Any:  # noqa: ANN401
+        await asyncio.sleep(0.05)
+        return await get_db_item_list(self, **kwargs)
+
+    spy = mocker.patch.object(
+        BaseQuery,
+        'get_db_item_list',
+        autospec=True,
+        side_effect=slow_get_db_item_list,
+    )
+
+    async def get_list(text: str) -> list[tuple[uuid.UUID, str]]:
+        async with db_session_factory() as session:
+            filters = [TestBaseModel.text != text]
+            items = await TestRepository(session).list(filters=filters, order_by=['id'])
+            assert all(item in session for item in items)
+            result = [(item.id, item.text) for item in items]
+            items[0].text = 'changed'
+            return result
+
+    results = await asyncio.gather(get_list('a'), get_list('a'), get_list('a'))
+    assert spy.call_count == 1
+    assert len(results[0]) == 3  # noqa: PLR2004
+    assert results[0] == results[1] == results[2]
+    await get_list('b')
+    assert spy.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+async def test_coalesce_reads_after_commit(
+    testing_app: 'TestClient',
+    db_session_factory: 'async_scoped_session[AsyncSession]',
+    test_base_model_list_factory: 'TestBaseModelListFactoryProtocol',
+    mocker: 'MockerFixture',
+) -> None:
+    """Запрос, начатый после фиксации изменений таблицы, не получает результат более раннего."""
+    await test_base_model_list_factory(count=2)
+    get_db_item_list = BaseQuery.get_db_item_list
+
+    async def slow_get_db_item_list(self: BaseQuery, **kwargs: Any) -> Any:  # noqa: ANN401
+        await asyncio.sleep(0.05)
+        return await get_db_item_list(self, **kwargs)
+
+    spy = mocker.patch.object(
+        BaseQuery,
+        'get_db_item_list',
+        autospec=True,
+        side_effect=slow_get_db_item_list,
+    )
+
+    async def get_list() -> int:
+        async with db_session_factory() as session:
+            return len(await TestRepository(session).list())
+
+    async def create_and_get_list() -> int:
+        async with db_session_factory() as session:
+            await TestRepository(session).create(data={'text': 'new'})
+        return await get_list()
+
+    first = asyncio.create_task(get_list())
+    await asyncio.sleep(0.01)
+    assert await create_and_get_list() == 3  # noqa: PLR2004
+    await first
+    assert spy.call_count == 2  # noqa: PLR2004
+
+
 @pytest.mark.asyncio()
 async def test_get_items_count_filtered(
     testing_app: 'TestClient',
@@ -283,6 +421,71 @@ async def test_update_item(
     assert new_item.disabled_at.replace(tzinfo=utc) != item_disabled_at
 
 
+@pytest.mark.asyncio()
+async def test_update_item_changed_fields(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка обновления сущности: возвращаются только реально измененные поля."""
+    utc = ZoneInfo('UTC')
+    now = datetime.datetime.now(tz=utc)
+    repo = TestRepository(db_session)
+    created_item = await test_base_model_factory(text='some text', disabled_at=now)
+    item = await repo.get(item_identity=created_item.id)
+    assert item is not None
+    update_data = TestBaseUpdateModel(text='other text', disabled_at=item.disabled_at)
+    changed_fields, new_item = await repo.update(data=update_data, item=item)
+    assert changed_fields == {'text'}
+    db_item = await repo.get(item_identity=item.id)
+    assert db_item is not None
+    assert db_item.text == 'other text'
+    assert new_item is item
+
+
+@pytest.mark.asyncio()
+async def test_update_item_no_changes_skip_commit(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+    mocker: 'MockerFixture',
+) -> None:
+    """Проверка обновления сущности: без изменений запрос в базу данных не выполняется."""
+    repo = TestRepository(db_session)
+    created_item = await test_base_model_factory(text='some text', disabled_at=None)
+    item = await repo.get(item_identity=created_item.id)
+    assert item is not None
+    commit_spy = mocker.spy(db_session, 'commit')
+    flush_spy = mocker.spy(db_session, 'flush')
+    changed_fields, _ = await repo.update(data={'text': 'some text'}, item=item)
+    assert changed_fields == set()
+    commit_spy.assert_not_called()
+    flush_spy.assert_not_called()
+
+
+@pytest.mark.asyncio()
+async def test_update_item_relationship_only(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+    mocker: 'MockerFixture',
+) -> None:
+    """Проверка обновления сущности: изменение только связи фиксируется в базе данных."""
+    repo = TestRepository(db_session)
+    created_item = await test_base_model_factory(text='some text')
+    item = await repo.get(item_identity=created_item.id)
+    assert item is not None
+    commit_spy = mocker.spy(db_session, 'commit')
+    related_item = TestRelatedModel(text='related')
+    changed_fields, _ = await repo.update(
+        data={'test_related_models': [related_item]},
+        item=item,
+    )
+    assert changed_fields == set()
+    commit_spy.assert_called_once()
+    assert inspect(related_item).persistent
+
+
 @pytest.mark.asyncio()
 async def test_disable_items(
     testing_app: 'TestClient',
@@ -306,3 +509,108 @@ async def test_disable_items(
     assert item is not None
     assert item.disabled_at is not None
     assert item.disabled_at == some_future
+
+
+@pytest.mark.asyncio()
+async def test_aggregate_items(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка агрегации сущностей с группировкой."""
+    repo = TestRepository(db_session)
+    for text, number in (('a', 10), ('a', 20), ('a', 60), ('b', 5), ('b', None)):
+        await test_base_model_factory(text=text, number=number)
+    result = await repo.aggregate(
+        aggregations=[
+            AggregationSchema(field='id', function=AggregateFunctionEnum.COUNT),
+            AggregationSchema(field='number', function=AggregateFunctionEnum.AVG),
+            AggregationSchema(field='number', function=AggregateFunctionEnum.MIN),
+            AggregationSchema(field='number', function=AggregateFunctionEnum.MAX),
+            AggregationSchema(
+                field='number',
+                function=AggregateFunctionEnum.PERCENTILE,
+                percentile=0.5,
+            ),
+        ],
+        group_by=['text'],
+    )
+    assert result == [
+        {
+            'text': 'a',
+            'count_id': 3,
+            'avg_number': 30,
+            'min_number': 10,
+            'max_number': 60,
+            'p50_number': 20,
+        },
+        {
+            'text': 'b',
+            'count_id': 2,
+            'avg_number': 5,
+            'min_number': 5,
+            'max_number': 5,
+            'p50_number': 5,
+        },
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_aggregate_items_invalid_field(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка агрегации сущностей: поле не присутствует в модели."""
+    repo = TestRepository(db_session)
+    with pytest.raises(ValueError, match='abc не является полем модели TestBaseModel'):
+        await repo.aggregate(
+            aggregations=[AggregationSchema(field='abc', function=AggregateFunctionEnum.MAX)],
+        )
+
+
+@pytest.mark.asyncio()
+async def test_histogram_items(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка гистограммы значений поля."""
+    repo = TestRepository(db_session)
+    for number in (0, 5, 10, 95, 100, None):
+        await test_base_model_factory(text='a', number=number)
+    result = await repo.histogram(field='number', bucket_width=10, upper=100)
+    assert result == [
+        {'bucket': 0, 'count': 2},
+        {'bucket': 10, 'count': 1},
+        {'bucket': 90, 'count': 2},
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_histogram_items_range_not_divisible(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    test_base_model_factory: 'TestBaseModelFactoryProtocol',
+) -> None:
+    """Проверка гистограммы: диапазон не делится на ширину корзины нацело."""
+    repo = TestRepository(db_session)
+    for number in (0, 35, 65, 85, 95, 100):
+        await test_base_model_factory(text='a', number=number)
+    result = await repo.histogram(field='number', bucket_width=30, upper=100)
+    assert result == [
+        {'bucket': 0, 'count': 1},
+        {'bucket': 30, 'count': 1},
+        {'bucket': 60, 'count': 2},
+        {'bucket': 90, 'count': 2},
+    ]
+
+
+@pytest.mark.asyncio()
+async def test_stats_view_not_set(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка статистики из представления: представление не установлено."""
+    repo = TestRepository(db_session)
+    with pytest.raises(RepositoryBaseMethodAccessError):
+        await repo.stats()
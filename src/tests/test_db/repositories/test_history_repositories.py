@@ -0,0 +1,125 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from app.core.models.enums.watch_list import StatusEnum
+from app.core.models.tables.history import ChangeHistory
+from app.core.models.tables.watch_list import Anime
+from app.db.extras.history import ChangeHistoryWriter, change_history_writer
+from app.db.repositories.history import ChangeHistoryRepository
+from app.db.repositories.watch_list import AnimeRepository
+from tests.utils.database import db_create_item
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@pytest.mark.asyncio()
+@pytest.mark.db_commit()
+async def test_update_records_history(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Проверка записи истории изменений при обновлении и чтения ее страницами."""
+    monkeypatch.setattr(change_history_writer, 'flush_interval', 0.01)
+    change_history_writer.start(db_session_factory)
+    try:
+        item = await db_create_item(db_session_factory, Anime, dict(name='name', score=10))
+        repo = AnimeRepository(db_session)
+        item = await repo.get(item_identity=item.id)
+        await repo.update(data=dict(score=20, status=StatusEnum.WATCHED), item=item)
+        await repo.update(data=dict(score=20), item=item)  # без изменений - без истории.
+        await repo.update(data=dict(score=30), item=item)
+        await change_history_writer.flush()
+    finally:
+        await change_history_writer.stop()
+    history_repo = ChangeHistoryRepository(db_session)
+    first_page, cursor = await history_repo.list_changes(item=item, limit=2)
+    assert [(entry.field, entry.old_value, entry.new_value) for entry in first_page] == [
+        ('score', 20, 30),
+        ('status', 'SCHEDULED', 'WATCHED'),
+    ]
+    assert cursor is not None
+    last_page, cursor = await history_repo.list_changes(item=item, limit=2, after=cursor)
+    assert [(entry.field, entry.old_value, entry.new_value) for entry in last_page] == [
+        ('score', 10, 20),
+    ]
+    assert cursor is None
+    score_changes, _ = await history_repo.list_changes(
+        table_name='anime',
+        item_id=str(item.id),
+        fields=['score'],
+    )
+    assert len(score_changes) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+@pytest.mark.db_commit()
+async def test_update_history_rollback(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Проверка: история пишется только после фиксации транзакции, при откате - отбрасывается."""
+    recorded: list[dict[str, object]] = []
+    monkeypatch.setattr(change_history_writer, 'record', recorded.extend)
+    item = await db_create_item(db_session_factory, Anime, dict(name='name', score=10))
+    item_id = item.id
+    repo = AnimeRepository(db_session)
+    item = await repo.get(item_identity=item_id)
+    await repo.update(data=dict(score=20), item=item, use_flush=True)
+    assert recorded == []
+    await db_session.rollback()
+    assert recorded == []
+    item = await repo.get(item_identity=item_id)
+    await repo.update(data=dict(score=30), item=item, use_flush=True)
+    await db_session.commit()
+    assert [(entry['field'], entry['old_value'], entry['new_value']) for entry in recorded] == [
+        ('score', 10, 30),
+    ]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.db_commit()
+async def test_update_history_old_value_outside_differ_fields(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Проверка: старое значение записывается и для полей вне ``differ_include_fields``."""
+    recorded: list[dict[str, object]] = []
+    monkeypatch.setattr(change_history_writer, 'record', recorded.extend)
+    monkeypatch.setattr(Anime, 'differ_include_fields', ['name'])
+    item = await db_create_item(db_session_factory, Anime, dict(name='name', score=10))
+    repo = AnimeRepository(db_session)
+    item = await repo.get(item_identity=item.id)
+    await repo.update(data=dict(name='new name', score=20), item=item)
+    assert [(entry['field'], entry['old_value'], entry['new_value']) for entry in recorded] == [
+        ('name', 'name', 'new name'),
+        ('score', 10, 20),
+    ]
+
+
+@pytest.mark.asyncio()
+@pytest.mark.db_commit()
+async def test_history_writer_queue_overflow(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+) -> None:
+    """Проверка писателя истории: записи сверх размера очереди отбрасываются."""
+    writer = ChangeHistoryWriter(flush_interval=0.01, max_queue_size=2)
+    entries = [dict(table_name='anime', item_id='1', field=f'field_{i}') for i in range(3)]
+    writer.record(entries)  # писатель не запущен - записи отбрасываются без ошибок.
+    writer.start(db_session_factory)
+    writer.record(entries)
+    await writer.stop()
+    assert writer.dropped_count == 1
+    items, _ = await ChangeHistoryRepository(db_session).list_changes(table_name='anime')
+    assert {item.field for item in items} == {'field_0', 'field_1'}
+    assert all(isinstance(item, ChangeHistory) for item in items)
@@ -0,0 +1,108 @@
+import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions.repositories import RepositoryBaseMethodAccessError
+from app.core.models.enums.watch_list import StatusEnum
+from app.core.models.tables.tests import TestListPartitionedModel, TestRangePartitionedModel
+from app.db.extras import index_advisor
+from app.db.queries.base import BaseQuery
+from app.db.repositories.base import BaseRepository
+from app.db.repositories.watch_list import AnimeRepository
+from app.utils.datetime import get_utc_now
+from tests.utils.database import db_create_item
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+class RangePartitionedRepository(BaseRepository[TestRangePartitionedModel, BaseQuery]):
+    """Тестовый репозиторий таблицы, секционированной по диапазону."""
+
+
+class ListPartitionedRepository(BaseRepository[TestListPartitionedModel, BaseQuery]):
+    """Тестовый репозиторий таблицы, секционированной по списку."""
+
+
+def get_scanned_tables(plan: dict) -> set[str]:
+    """Возвращает таблицы (секции), которые читает план запроса."""
+    return {
+        node['Relation Name']
+        for node in index_advisor.iter_plan_nodes(plan)
+        if 'Relation Name' in node
+    }
+
+
+@pytest.mark.asyncio()
+async def test_range_partitions_pruning(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+) -> None:
+    """Проверка секционирования по диапазону: создание секций и чтение только нужной секции."""
+    now = get_utc_now()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    previous_month = (month_start - datetime.timedelta(days=1)).date()
+    repo = RangePartitionedRepository(db_session)
+    partitions = await repo.create_partitions(start=previous_month, count=3)
+    assert len(partitions) == 3  # noqa: PLR2004
+    # повторное создание не падает на существующих секциях.
+    await repo.create_partitions(start=previous_month, count=3)
+    old_item = await db_create_item(
+        db_session_factory,
+        TestRangePartitionedModel,
+        dict(name='old', created_at=month_start - datetime.timedelta(days=1)),
+    )
+    await db_create_item(db_session_factory, TestRangePartitionedModel, dict(name='new'))
+    filters = repo.get_partition_filters(lower=month_start)
+    items = await repo.list(filters=filters)
+    assert [item.name for item in items] == ['new']
+    item = await repo.get(
+        item_identity=old_item.id,
+        extra_filters=repo.get_partition_filters(upper=month_start),
+    )
+    assert item is not None
+    plan = await index_advisor.explain(
+        db_session,
+        select(TestRangePartitionedModel).where(*filters),
+    )
+    assert get_scanned_tables(plan) == {partition.name for partition in partitions[1:]}
+
+
+@pytest.mark.asyncio()
+async def test_list_partitions_pruning(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+) -> None:
+    """Проверка секционирования по списку: секция на каждый статус и чтение только нужной."""
+    repo = ListPartitionedRepository(db_session)
+    partitions = await repo.create_partitions()
+    assert len(partitions) == len(StatusEnum)
+    for status in (StatusEnum.WATCHED, StatusEnum.ABANDONED):
+        await db_create_item(
+            db_session_factory,
+            TestListPartitionedModel,
+            dict(name=status.name, status=status),
+        )
+    filters = repo.get_partition_filters(values=[StatusEnum.WATCHED])
+    items = await repo.list(filters=filters)
+    assert [item.name for item in items] == ['WATCHED']
+    plan = await index_advisor.explain(db_session, select(TestListPartitionedModel).where(*filters))
+    assert get_scanned_tables(plan) == {f'{TestListPartitionedModel.__tablename__}_watched'}
+
+
+@pytest.mark.asyncio()
+async def test_partitioning_not_set(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка секционирования: таблица модели не секционирована."""
+    repo = AnimeRepository(db_session)
+    with pytest.raises(RepositoryBaseMethodAccessError):
+        repo.get_partition_filters(values=[StatusEnum.WATCHED])
+    with pytest.raises(RepositoryBaseMethodAccessError):
+        await repo.create_partitions()
@@ -0,0 +1,60 @@
+import datetime
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.models.tables.watch_list import Anime, Kinopoisk
+from app.db.repositories.watch_list import WatchListFeedRepository
+from tests.utils.database import db_create_item
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@pytest.mark.asyncio()
+async def test_watch_list_feed_keyset_pagination(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+) -> None:
+    """Проверка объединенного списка: сортировка по updated_at и пагинация по ключу."""
+    now = datetime.datetime.now(tz=ZoneInfo('UTC'))
+    for index, model in enumerate((Anime, Kinopoisk, Anime, Kinopoisk, Anime)):
+        await db_create_item(
+            db_session_factory,
+            model,
+            dict(name=f'name {index}', updated_at=now - datetime.timedelta(days=index)),
+        )
+    repo = WatchListFeedRepository(db_session)
+    first_page, cursor = await repo.list(limit=2)
+    assert [row['name'] for row in first_page] == ['name 0', 'name 1']
+    assert [row['source'] for row in first_page] == ['anime', 'kinopoisk']
+    assert cursor is not None
+    second_page, cursor = await repo.list(limit=2, after=cursor)
+    assert [row['name'] for row in second_page] == ['name 2', 'name 3']
+    last_page, cursor = await repo.list(limit=2, after=cursor)
+    assert [row['name'] for row in last_page] == ['name 4']
+    assert cursor is None
+
+
+@pytest.mark.asyncio()
+async def test_watch_list_feed_filters_and_search(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    db_session_factory: 'async_sessionmaker[AsyncSession]',
+) -> None:
+    """Проверка объединенного списка: фильтры и поиск по колонкам объединения."""
+    await db_create_item(db_session_factory, Anime, dict(name='Naruto', score=80))
+    await db_create_item(db_session_factory, Kinopoisk, dict(name='Matrix', score=90))
+    await db_create_item(db_session_factory, Kinopoisk, dict(name='Mad Max', score=60))
+    repo = WatchListFeedRepository(db_session)
+    rows, _ = await repo.list(filters=[repo.columns.score >= 80])
+    assert {row['name'] for row in rows} == {'Naruto', 'Matrix'}
+    rows, _ = await repo.list(search='ma', search_by=['name'])
+    assert {row['name'] for row in rows} == {'Matrix', 'Mad Max'}
+    rows, _ = await repo.list(filters=[repo.columns.source == 'anime'])
+    assert [row['kind'] for row in rows] == ['NOT_SET']
+    with pytest.raises(ValueError, match='abc не является полем watch_list_feed'):
+        await repo.list(search='ma', search_by=['abc'])
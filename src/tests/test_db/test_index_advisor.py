@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING
+
+import pytest
+
+from app.core.models.tables.watch_list import Anime
+from app.db.extras import index_advisor
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def test_index_proposal_ddl() -> None:
+    """Проверка SQL создания предлагаемых индексов."""
+    btree = index_advisor.IndexProposal(table='anime', columns=('status', 'score'))
+    trgm = index_advisor.IndexProposal(
+        table='anime',
+        columns=('name',),
+        using='gin',
+        operator_class='gin_trgm_ops',
+    )
+    assert btree.ddl == (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_anime_status_score '
+        'ON anime USING btree (status, score);'
+    )
+    assert trgm.ddl == (
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_anime_name_trgm '
+        'ON anime USING gin (name gin_trgm_ops);'
+    )
+
+
+def test_get_not_indexed_nodes() -> None:
+    """Проверка поиска узлов плана без использования индекса."""
+    plan = {
+        'Node Type': 'Limit',
+        'Plans': [
+            {
+                'Node Type': 'Sort',
+                'Plans': [{'Node Type': 'Seq Scan', 'Relation Name': 'anime'}],
+            },
+        ],
+    }
+    assert index_advisor.get_not_indexed_nodes(plan, 'anime') == ['Sort', 'Seq Scan']
+    assert index_advisor.get_not_indexed_nodes(plan['Plans'][0]['Plans'][0], 'kinopoisk') == []
+
+
+@pytest.mark.asyncio()
+async def test_advise_model_indexes(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+) -> None:
+    """Проверка, что индексы модели обслуживают сортировки, а поиск требует индекса."""
+    shapes = index_advisor.get_watch_list_query_shapes(Anime)
+    advices = {
+        advice.shape.proposal.name: advice
+        for advice in await index_advisor.advise(db_session, shapes)
+    }
+    for name in (
+        'ix_anime_kind',
+        'ix_anime_score',
+        'ix_anime_repeat_view_count',
+        'ix_anime_status_score',
+        'ix_anime_updated_at_id',
+    ):
+        assert not advices[name].is_index_needed
+    assert advices['ix_anime_name_trgm'].is_index_needed
+    assert advices['ix_anime_native_name_trgm'].is_index_needed
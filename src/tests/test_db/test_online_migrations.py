@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.models.tables.tests import TestBaseModel
+from app.db.extras import online_migrations
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class LockedConnection:
+    """Подключение, на котором первые ``failures`` попыток миграции не получают блокировку."""
+
+    def __init__(self: 'LockedConnection', failures: int, sqlstate: str) -> None:  # noqa: D107
+        self.failures = failures
+        self.sqlstate = sqlstate
+        self.calls = 0
+
+    async def run_sync(self: 'LockedConnection', *_: Any) -> None:  # noqa: D102, ANN401
+        self.calls += 1
+        if self.calls <= self.failures:
+            orig = SimpleNamespace(sqlstate=self.sqlstate)
+            statement = 'ALTER TABLE'
+            raise DBAPIError(statement, {}, orig)  # type: ignore  # noqa: TRY003
+
+    async def rollback(self: 'LockedConnection') -> None:  # noqa: D102
+        pass
+
+
+def get_script(**module_attributes: str) -> Any:  # noqa: ANN401
+    """Объект миграции alembic с переданными атрибутами модуля."""
+    return SimpleNamespace(
+        revision='abc',
+        doc='test migration.',
+        module=SimpleNamespace(**module_attributes),
+    )
+
+
+def test_get_timeouts() -> None:
+    """Проверка переопределения ограничений времени атрибутами модуля миграции."""
+    options = online_migrations.OnlineMigrationOptions(lock_timeout='1s', statement_timeout='1min')
+    assert options.get_timeouts(get_script()) == ('1s', '1min')
+    assert options.get_timeouts(get_script(statement_timeout='0')) == ('1s', '0')
+
+
+def test_get_delay() -> None:
+    """Проверка экспоненциальной задержки с ограничением сверху."""
+    options = online_migrations.OnlineMigrationOptions(backoff=1, max_backoff=4)
+    assert 0.5 <= options.get_delay(1) <= 1  # noqa: PLR2004
+    assert 1 <= options.get_delay(2) <= 2  # noqa: PLR2004
+    assert 2 <= options.get_delay(10) <= 4  # noqa: PLR2004
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    ('failures', 'sqlstate', 'attempts'),
+    [
+        (0, online_migrations.LOCK_NOT_AVAILABLE_SQLSTATE, 1),
+        (2, online_migrations.LOCK_NOT_AVAILABLE_SQLSTATE, 3),
+        (1, online_migrations.DEADLOCK_DETECTED_SQLSTATE, 2),
+    ],
+)
+async def test_run_step_retries(failures: int, sqlstate: str, attempts: int) -> None:
+    """Проверка повтора миграции, не получившей блокировку."""
+    connection = LockedConnection(failures, sqlstate)
+    options = online_migrations.OnlineMigrationOptions(retries=2, backoff=0)
+    script = get_script()
+    report = await online_migrations._run_step(connection, None, script, options)  # type: ignore
+    assert report.attempts == attempts
+    assert report.revision == 'abc'
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(
+    'sqlstate',
+    [online_migrations.LOCK_NOT_AVAILABLE_SQLSTATE, '42P01'],
+)
+async def test_run_step_raises(sqlstate: str) -> None:
+    """Проверка: исчерпанные повторы и прочие ошибки пробрасываются дальше."""
+    connection = LockedConnection(3, sqlstate)
+    options = online_migrations.OnlineMigrationOptions(retries=2, backoff=0)
+    with pytest.raises(DBAPIError):
+        await online_migrations._run_step(connection, None, get_script(), options)  # type: ignore
+
+
+@pytest.mark.asyncio()
+async def test_lock_timeout_is_retryable(
+    testing_app: 'TestClient',
+    db_engine: 'AsyncEngine',
+) -> None:
+    """Проверка: ошибка lock_timeout при занятой таблице считается повторяемой."""
+    timeouts = online_migrations.MigrationTimeouts(lock_timeout='50ms', statement_timeout='5s')
+    table_name = TestBaseModel.__tablename__
+    async with db_engine.connect() as holder, db_engine.connect() as migrator:
+        await holder.execute(text(f'LOCK TABLE "{table_name}" IN ACCESS EXCLUSIVE MODE'))
+        await migrator.run_sync(online_migrations.set_timeouts, timeouts)
+        with pytest.raises(DBAPIError) as exc_info:
+            await migrator.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN extra int'))
+        assert online_migrations.is_retryable_error(exc_info.value)
+        await migrator.rollback()
+        await holder.rollback()
+        await migrator.execute(text('RESET lock_timeout'))
+        await migrator.execute(text('RESET statement_timeout'))
@@ -0,0 +1,121 @@
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.core.models.tables.history import ChangeHistory
+from app.core.models.tables.tests import TestBaseModel, TestRelatedModel
+from app.db.extras import snapshots
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import Awaitable, Callable
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+pytestmark = pytest.mark.db_commit
+TEST_TABLES = [TestBaseModel.__tablename__, TestRelatedModel.__tablename__]
+
+
+@pytest.fixture()
+def dsn(db_url: str) -> str:
+    """Ссылка на тестовую базу данных для asyncpg."""
+    return db_url.replace('+asyncpg', '')
+
+
+async def get_count(db_session: 'AsyncSession', model: type) -> int:
+    """Количество строк в таблице модели."""
+    return await db_session.scalar(select(func.count()).select_from(model))  # type: ignore
+
+
+def test_dependency_levels() -> None:
+    """Проверка уровней зависимостей: связанная таблица загружается после основной."""
+    tables = snapshots.get_snapshot_tables(TEST_TABLES)
+    levels = snapshots.get_dependency_levels(tables)
+    assert [[table.name for table in level] for level in levels] == [[name] for name in TEST_TABLES]
+    with pytest.raises(ValueError):  # noqa: PT011
+        snapshots.get_snapshot_tables(['unknown'])
+
+
+@pytest.mark.asyncio()
+async def test_export_import_binary_compressed(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    dsn: str,
+    tmp_path: 'pathlib.Path',
+    test_related_model_factory: 'Callable[..., Awaitable[TestRelatedModel]]',
+) -> None:
+    """Проверка выгрузки и загрузки снимка в бинарном формате со сжатием zstd."""
+    pytest.importorskip('zstandard')
+    for _ in range(3):
+        await test_related_model_factory()
+    results = await snapshots.export_snapshot(dsn, tmp_path, tables=TEST_TABLES, compress=True)
+    assert {result['table']: result['rows'] for result in results} == dict.fromkeys(TEST_TABLES, 3)
+    assert (tmp_path / f'{TestBaseModel.__tablename__}.bin.zst').exists()
+    await test_related_model_factory()
+    results = await snapshots.import_snapshot(dsn, tmp_path, workers=2)
+    assert all(not result['skipped'] for result in results)
+    assert await get_count(db_session, TestBaseModel) == 3  # noqa: PLR2004
+    assert await get_count(db_session, TestRelatedModel) == 3  # noqa: PLR2004
+    results = await snapshots.import_snapshot(dsn, tmp_path, resume=True)
+    assert all(result['skipped'] for result in results)
+
+
+@pytest.mark.asyncio()
+async def test_import_referenced_table(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    dsn: str,
+    tmp_path: 'pathlib.Path',
+    test_related_model_factory: 'Callable[..., Awaitable[TestRelatedModel]]',
+) -> None:
+    """Проверка загрузки таблицы, на которую ссылаются внешние ключи: ссылающиеся очищаются."""
+    for _ in range(2):
+        await test_related_model_factory()
+    await snapshots.export_snapshot(dsn, tmp_path, tables=TEST_TABLES[:1])
+    await snapshots.import_snapshot(dsn, tmp_path)
+    assert await get_count(db_session, TestBaseModel) == 2  # noqa: PLR2004
+    assert await get_count(db_session, TestRelatedModel) == 0
+
+
+@pytest.mark.asyncio()
+async def test_export_resume(
+    testing_app: 'TestClient',
+    dsn: str,
+    tmp_path: 'pathlib.Path',
+) -> None:
+    """Проверка продолжения выгрузки: выгруженные таблицы пропускаются, параметры сверяются."""
+    await snapshots.export_snapshot(dsn, tmp_path, tables=TEST_TABLES[:1])
+    results = await snapshots.export_snapshot(dsn, tmp_path, tables=TEST_TABLES, resume=True)
+    assert [result['skipped'] for result in results] == [True, False]
+    with pytest.raises(ValueError):  # noqa: PT011
+        await snapshots.export_snapshot(
+            dsn,
+            tmp_path,
+            format_=snapshots.SnapshotFormatEnum.CSV,
+            resume=True,
+        )
+
+
+@pytest.mark.asyncio()
+async def test_export_import_csv_resets_sequence(
+    testing_app: 'TestClient',
+    db_session: 'AsyncSession',
+    dsn: str,
+    tmp_path: 'pathlib.Path',
+) -> None:
+    """Проверка CSV-снимка: после загрузки автоинкремент продолжает нумерацию."""
+    entries = [dict(table_name='anime', item_id=str(i), field='score') for i in range(5)]
+    await db_session.execute(insert(ChangeHistory), entries)
+    await db_session.commit()
+    await snapshots.export_snapshot(
+        dsn,
+        tmp_path,
+        tables=[ChangeHistory.__tablename__],
+        format_=snapshots.SnapshotFormatEnum.CSV,
+    )
+    await snapshots.import_snapshot(dsn, tmp_path)
+    await db_session.execute(insert(ChangeHistory), entries[:1])
+    await db_session.commit()
+    assert await db_session.scalar(select(func.max(ChangeHistory.id))) == 6  # noqa: PLR2004
@@ -1,8 +1,11 @@
+import pytest
 from fastapi import FastAPI
 
 from app import main
 from app.core.exceptions.http.base import BaseVerboseHTTPException
+from app.core.middlewares.profiling import ProfilingMiddleware
 from app.core.settings import base as base_settings
+from app.core.settings.app import AppSettings
 
 
 def test_app_description_set() -> None:
@@ -13,3 +16,13 @@ def test_app_description_set() -> None:
         description = reader.read()
     assert app.description == description
     assert BaseVerboseHTTPException in app.exception_handlers
+
+
+def test_app_profiling_middleware(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Middleware профилирования подключается только при включенной настройке."""
+    app = main.get_application()
+    assert ProfilingMiddleware not in {middleware.cls for middleware in app.user_middleware}
+    settings = AppSettings(profiling_enabled=True)
+    monkeypatch.setattr(main, 'get_application_settings', lambda: settings)
+    app = main.get_application()
+    assert ProfilingMiddleware in {middleware.cls for middleware in app.user_middleware}
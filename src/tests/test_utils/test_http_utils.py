@@ -0,0 +1,47 @@
+import gzip
+
+import pytest
+
+from app.utils import http as http_utils
+
+
+@pytest.mark.parametrize(
+    ('accept_encoding', 'expected_result'),
+    [
+        ('gzip, deflate, br', 'br'),
+        ('gzip;q=1, br;q=0.5', 'gzip'),
+        ('br;q=0, gzip;q=0', None),
+        ('*', 'br'),
+        ('identity', None),
+        ('', None),
+    ],
+)
+def test_choose_encoding(accept_encoding: str, expected_result: str | None) -> None:
+    """Выбор кодировки сжатия по заголовку Accept-Encoding."""
+    available = (http_utils.BROTLI, http_utils.GZIP)
+    assert http_utils.choose_encoding(accept_encoding, available) == expected_result
+
+
+@pytest.mark.parametrize(
+    ('if_none_match', 'expected_result'),
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"cba", "abc"', True),
+        ('*', True),
+        ('"cba"', False),
+        (None, False),
+    ],
+)
+def test_etag_matches(if_none_match: str | None, expected_result: bool) -> None:  # noqa: FBT001
+    """Сравнение ETag с заголовком If-None-Match."""
+    assert http_utils.etag_matches(if_none_match, '"abc"') == expected_result
+
+
+def test_compress() -> None:
+    """Сжатие gzip детерминировано, неподдерживаемая кодировка не принимается."""
+    data = b'{"openapi": "3.1.0"}' * 10
+    assert gzip.decompress(http_utils.compress(data, http_utils.GZIP)) == data
+    assert http_utils.compress(data, http_utils.GZIP) == http_utils.compress(data, 'gzip')
+    with pytest.raises(ValueError, match='не поддерживается'):
+        http_utils.compress(data, 'deflate')
@@ -1,14 +1,23 @@
+import hashlib
 from typing import TYPE_CHECKING, Any, TypeVar
 
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from sqlalchemy import MetaData
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
     from app.core.models.tables.base import Base
 
     BaseSQLAlchemyModel = TypeVar('BaseSQLAlchemyModel', bound=Base)
 
+TEMPLATE_LOCK_KEY = 7_036_036
+
 
 async def db_create_item(
     db_session_factory: 'async_sessionmaker[AsyncSession]',
@@ -28,3 +37,85 @@ async def db_create_item(
             raise
         else:
             return item
+
+
+def get_schema_hash(metadata: 'MetaData') -> str:
+    """Возвращает хэш схемы: SQL создания таблиц и индексов и типы колонок (значения Enum)."""
+    dialect = postgresql.dialect()
+    statements: list[str] = []
+    for table in metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(repr(column.type) for column in table.columns)
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name or '')
+        )
+    return hashlib.sha256('\n'.join(statements).encode()).hexdigest()
+
+
+async def provision_database(
+    admin_dsn: str,
+    db_url: str,
+    db_name: str,
+    *,
+    template_name: str,
+    metadata: 'MetaData',
+) -> None:
+    """Создает базу данных для тестов копией шаблонной базы данных.
+
+    Шаблонная база данных со схемой из ``metadata`` создается один раз и пересоздается только при
+    изменении схемы (хэш схемы хранится в комментарии к базе данных). Копирование шаблона
+    (``CREATE DATABASE ... TEMPLATE``) быстрее создания схемы, поэтому каждый процесс pytest-xdist
+    получает собственную базу данных почти бесплатно. Процессы создают шаблон по очереди, под
+    advisory-блокировкой.
+
+    Parameters
+    ----------
+    admin_dsn
+        ссылка asyncpg на служебную базу данных (``postgres``).
+    db_url
+        ссылка SQLAlchemy на создаваемую базу данных (по ней строится ссылка на шаблон).
+    db_name
+        название создаваемой базы данных.
+    template_name
+        название шаблонной базы данных.
+    metadata
+        метаданные моделей.
+    """
+    connection = await asyncpg.connect(admin_dsn)
+    try:
+        await connection.execute('SELECT pg_advisory_lock($1)', TEMPLATE_LOCK_KEY)
+        schema_hash = get_schema_hash(metadata)
+        template_hash = await connection.fetchval(
+            "SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = $1",
+            template_name,
+        )
+        if template_hash != schema_hash:
+            await connection.execute(f'DROP DATABASE IF EXISTS {template_name} WITH (FORCE)')
+            await connection.execute(f'CREATE DATABASE {template_name}')
+            template_url = db_url.rsplit('/', 1)[0] + f'/{template_name}'
+            engine = create_async_engine(template_url)
+            async with engine.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+            await engine.dispose()
+            await connection.execute(f"COMMENT ON DATABASE {template_name} IS '{schema_hash}'")
+        await connection.execute(f'DROP DATABASE IF EXISTS {db_name} WITH (FORCE)')
+        await connection.execute(f'CREATE DATABASE {db_name} TEMPLATE {template_name}')
+    finally:
+        await connection.close()
+
+
+async def drop_database(admin_dsn: str, db_name: str) -> None:
+    """Удаляет базу данных для тестов."""
+    connection = await asyncpg.connect(admin_dsn)
+    try:
+        await connection.execute(f'DROP DATABASE IF EXISTS {db_name} WITH (FORCE)')
+    finally:
+        await connection.close()
+
+
+async def truncate_tables(engine: 'AsyncEngine', metadata: 'MetaData') -> None:
+    """Очищает все таблицы и сбрасывает последовательности автоинкремента."""
+    table_names = ', '.join(f'"{table.name}"' for table in metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(text(f'TRUNCATE {table_names} RESTART IDENTITY CASCADE'))